@@ -0,0 +1,108 @@
+"""Benchmark: worker payload size and worker startup time vs. plan size.
+
+Compares the legacy payload (whole plan in ``jobs`` + ``indices``) with the
+compact ``bucket_jobs_v1`` payload built by ``executor.build_bucket_payload``.
+
+For each plan size it reports:
+- pickled bytes per worker (what ProcessPoolExecutor sends to each spawn worker)
+- time from submit until every worker has unpickled its payload and returned
+
+No browser is needed: the worker only counts the jobs it received.
+
+Usage:
+    python scripts/bench_worker_payload.py [--sizes 100,1000,5000] [--workers 4] [--no-spawn]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from dou_snaptrack.cli.batch.executor import build_bucket_payload, common_payload
+from dou_snaptrack.cli.batch.summary_config import SummaryConfig
+
+
+def _fake_jobs(n: int) -> list[dict]:
+    """Jobs shaped like an expanded plan (topic x combo)."""
+    return [
+        {
+            "topic": f"Tópico {i % 7}",
+            "query": "licitação OR contrato OR portaria",
+            "data": f"{1 + i % 28:02d}-01-2025",
+            "secao": "DO1",
+            "key1_type": "text",
+            "key1": f"Ministério da Gestão e da Inovação em Serviços Públicos {i}",
+            "label1": "Órgão",
+            "key2_type": "text",
+            "key2": "Todos",
+            "label2": "Tipo do Ato",
+            "max_links": 30,
+            "summary_keywords": ["licitação", "contrato", "portaria", "nomeação"],
+            "_combo_index": i + 1,
+        }
+        for i in range(n)
+    ]
+
+
+def _legacy_payload(bucket: list[int], jobs: list[dict], common: dict) -> dict:
+    return {"jobs": jobs, "indices": bucket, **common}
+
+
+def _buckets(n: int, workers: int) -> list[list[int]]:
+    size = -(-n // workers)
+    return [list(range(start + 1, min(n, start + size) + 1)) for start in range(0, n, size)]
+
+
+def _count_jobs(payload: dict) -> int:
+    return len(payload.get("bucket_jobs") or payload.get("indices") or [])
+
+
+def _startup_sec(payloads: list[dict], workers: int) -> float:
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+        # Aquece o pool: mede só o envio/unpickle dos payloads
+        list(ex.map(_count_jobs, [{}] * workers))
+        t0 = time.perf_counter()
+        list(ex.map(_count_jobs, payloads))
+        return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="10,100,1000,5000")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--no-spawn", action="store_true", help="only measure payload bytes")
+    args = ap.parse_args(argv)
+
+    run_args = SimpleNamespace(headful=False, slowmo=0, log_file=None)
+    common = common_payload({}, Path("resultados"), "{topic}_{secao}_{date}_{idx}.json", run_args, None, True, SummaryConfig())
+
+    print(f"{'jobs':>6} {'legacy B/worker':>16} {'compact B/worker':>17} {'ratio':>6} {'legacy s':>9} {'compact s':>10}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        jobs = _fake_jobs(n)
+        buckets = _buckets(n, args.workers)
+        legacy = [_legacy_payload(b, jobs, common) for b in buckets]
+        compact = [build_bucket_payload(b, jobs, common) for b in buckets]
+        legacy_bytes = max(len(pickle.dumps(p)) for p in legacy)
+        compact_bytes = max(len(pickle.dumps(p)) for p in compact)
+        legacy_sec = compact_sec = float("nan")
+        if not args.no_spawn:
+            legacy_sec = _startup_sec(legacy, args.workers)
+            compact_sec = _startup_sec(compact, args.workers)
+        print(
+            f"{n:>6} {legacy_bytes:>16,} {compact_bytes:>17,} {legacy_bytes / compact_bytes:>6.1f} "
+            f"{legacy_sec:>9.3f} {compact_sec:>10.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
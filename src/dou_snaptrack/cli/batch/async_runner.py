@@ -6,7 +6,6 @@ for faster parallel collection.
 
 from __future__ import annotations
 
-import json
 import os
 from collections.abc import Callable
 from pathlib import Path
@@ -76,9 +75,19 @@ def try_fast_async_mode(
                 "metrics": async_result.get("metrics", {}),
                 "mode": "fast_async",
             }
+            # Resultado parcial (subprocess morto/travado): finalize_with_aggregation e o
+            # resume dependem dessas chaves para manter os JSONs individuais
+            for key in ("partial", "all_success", "error", "journal"):
+                if key in async_result:
+                    report[key] = async_result[key]
 
             elapsed = async_result.get("elapsed", 0)
-            log_fn("[FAST ASYNC] ✓ SUCESSO!")
+            if report.get("partial"):
+                log_fn(f"[FAST ASYNC] ⚠ PARCIAL: {report.get('error') or 'execução interrompida'}")
+                if report.get("journal"):
+                    log_fn(f"[FAST ASYNC]   Journal: {report['journal']} (use resume para completar)")
+            else:
+                log_fn("[FAST ASYNC] ✓ SUCESSO!")
             log_fn(f"[FAST ASYNC]   Tempo: {elapsed:.1f}s")
             log_fn(f"[FAST ASYNC]   Jobs OK: {report['ok']}/{report['total_jobs']}")
             log_fn(f"[FAST ASYNC]   Jobs FAIL: {report['fail']}/{report['total_jobs']}")
@@ -122,8 +131,34 @@ def _try_direct_async(async_input: dict[str, Any], log_fn: Callable[[str], None]
         return None
 
 
+def partial_from_journal(async_input: dict[str, Any], error: str) -> dict[str, Any] | None:
+    """Build a partial result from the collector's run journal (killed subprocess).
+
+    Jobs that never finished are counted as failures.
+
+    Returns:
+        Partial result dictionary, or None if nothing was journaled.
+    """
+    from ...ui.collectors.dou_helpers import RUN_JOURNAL_NAME, report_from_journal
+
+    journal = async_input.get("journal_path") or (
+        str(Path(async_input["out_dir"]) / RUN_JOURNAL_NAME) if async_input.get("out_dir") else None
+    )
+    partial = report_from_journal(journal) if journal else None
+    if not partial:
+        return None
+    partial["fail"] = max(partial["fail"], len(async_input.get("jobs") or []) - partial["ok"])
+    partial.update({"partial": True, "all_success": False, "error": error, "journal": journal})
+    return partial
+
+
 def _run_fast_async_subprocess(async_input: dict[str, Any], log_fn: Callable[[str], None]) -> dict[str, Any] | None:
-    """Run async collector in subprocess.
+    """Run async collector in a streaming subprocess.
+
+    The input goes over stdin and the child reports each finished job as it
+    happens (see ``utils.stream_ipc``). A child that stays silent for
+    ``DOU_STREAM_IDLE_TIMEOUT`` seconds is cancelled; its partial result (or
+    the run journal) is used instead of waiting for a global timeout.
 
     Args:
         async_input: Input configuration
@@ -132,87 +167,73 @@ def _run_fast_async_subprocess(async_input: dict[str, Any], log_fn: Callable[[st
     Returns:
         Result dictionary or None if failed
     """
-    import subprocess
     import sys
-    import tempfile
 
-    try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as f:
-            json.dump(async_input, f, ensure_ascii=False)
-            input_path = f.name
-
-        output_path = input_path.replace(".json", "_result.json")
-
-        py = sys.executable or "python"
-        cmd = [py, "-m", "dou_snaptrack.ui.collectors.dou_parallel"]
-
-        # O módulo usa variáveis de ambiente para input/output
-        env = os.environ.copy()
-        env["INPUT_JSON_PATH"] = input_path
-        env["RESULT_JSON_PATH"] = output_path
-        env["PYTHONIOENCODING"] = "utf-8"
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=600, env=env)
-
-        output_data = None
-        if Path(output_path).exists():
-            try:
-                with open(output_path, encoding="utf-8") as f:
-                    output_data = json.load(f)
-            except Exception as read_err:
-                log_fn(f"[FAST ASYNC] Falha ao ler resultado: {read_err}")
-
-        # Sempre logar resultado do subprocess para diagnóstico
-        log_fn(f"[FAST ASYNC] Subprocess retornou code={result.returncode}")
-
-        if output_data:
-            log_fn(
-                f"[FAST ASYNC] Resultado: ok={output_data.get('ok')} fail={output_data.get('fail')} "
-                f"items={output_data.get('items_total')} elapsed={output_data.get('elapsed', 0):.1f}s"
-            )
-            if output_data.get("error"):
-                log_fn(f"[FAST ASYNC] Erro do coletor: {output_data.get('error')}")
-            if output_data.get("traceback"):
-                log_fn(f"[FAST ASYNC] Traceback: {output_data.get('traceback')[:500]}")
-        else:
-            log_fn("[FAST ASYNC] Nenhum output_data encontrado no arquivo de resultado")
-
-        # Mostrar stderr/stdout se houver erro ou se debug estiver ativo
-        debug_logs = os.environ.get("DOU_FAST_ASYNC_DEBUG", "0").lower() in ("1", "true", "yes")
-        if result.returncode != 0 or debug_logs:
-            if result.stderr:
-                # Mostrar últimas linhas do stderr (mais útil que as primeiras)
-                stderr_lines = result.stderr.strip().split('\n')
-                if len(stderr_lines) > 20:
-                    log_fn(f"[FAST ASYNC] stderr ({len(stderr_lines)} linhas, últimas 20):")
-                    for line in stderr_lines[-20:]:
-                        log_fn(f"  {line}")
-                else:
-                    log_fn("[FAST ASYNC] stderr:")
-                    for line in stderr_lines:
-                        log_fn(f"  {line}")
-            if result.stdout:
-                log_fn(f"[FAST ASYNC] stdout: {result.stdout[:800]}")
-
-        # Return whatever the collector produced so the caller can decide if it is usable
-        if output_data:
-            return output_data
-
-        log_fn("[FAST ASYNC] ERRO: Arquivo de resultado não existe ou está vazio")
-        log_fn(f"[FAST ASYNC] Esperado em: {output_path}")
-        return None
+    from ...utils.stream_ipc import STREAM_IDLE_TIMEOUT_SEC, StreamingChild
 
+    debug_logs = os.environ.get("DOU_FAST_ASYNC_DEBUG", "0").lower() in ("1", "true", "yes")
+    py = sys.executable or "python"
+    cmd = [py, "-m", "dou_snaptrack.ui.collectors.dou_parallel", "--stream"]
+    env = os.environ.copy()
+    env["PYTHONIOENCODING"] = "utf-8"
+
+    try:
+        child = StreamingChild(
+            cmd,
+            env=env,
+            name="fast-async",
+            on_stderr=(lambda line: log_fn(f"  {line}")) if debug_logs else None,
+        )
     except Exception as e:
         log_fn(f"[FAST ASYNC] Subprocess error: {e}")
         return None
-    finally:
-        keep_tmp = os.environ.get("DOU_KEEP_FAST_ASYNC_TMP", "0").lower() in ("1", "true", "yes")
-        if keep_tmp:
-            log_fn(f"[FAST ASYNC] Mantendo arquivos temporários: {input_path}, {output_path}")
-        else:
-            # Cleanup temp files
-            try:
-                Path(input_path).unlink(missing_ok=True)
-                Path(output_path).unlink(missing_ok=True)
-            except Exception:
-                pass
+
+    child.send("run", input=async_input)
+    child.close_input()
+
+    output_data = None
+    try:
+        for msg in child.messages(STREAM_IDLE_TIMEOUT_SEC):
+            kind = msg.get("type")
+            if kind == "job":
+                entry = msg.get("entry") or {}
+                status = "OK" if entry.get("success") else "FAIL"
+                log_fn(
+                    f"[FAST ASYNC] Job {msg.get('done')}/{msg.get('total')} {status}: "
+                    f"{entry.get('key1', '')} ({entry.get('item_count', 0)} itens)"
+                )
+            elif kind == "done":
+                output_data = msg.get("result")
+            elif kind == "error":
+                log_fn(f"[FAST ASYNC] Erro do coletor: {msg.get('error')}")
+                output_data = output_data or msg.get("result")
+    except TimeoutError:
+        log_fn(f"[FAST ASYNC] Subprocess sem eventos há {STREAM_IDLE_TIMEOUT_SEC:.0f}s; cancelando")
+        output_data = child.finish()
+        if not output_data:
+            return partial_from_journal(async_input, "Subprocess travado (sem eventos)")
+
+    log_fn(f"[FAST ASYNC] Subprocess retornou code={child.returncode}")
+
+    if output_data:
+        log_fn(
+            f"[FAST ASYNC] Resultado: ok={output_data.get('ok')} fail={output_data.get('fail')} "
+            f"items={output_data.get('items_total')} elapsed={output_data.get('elapsed', 0):.1f}s"
+        )
+        if output_data.get("error"):
+            log_fn(f"[FAST ASYNC] Erro do coletor: {output_data.get('error')}")
+        if output_data.get("traceback"):
+            log_fn(f"[FAST ASYNC] Traceback: {output_data.get('traceback')[:500]}")
+
+    # Sem debug o stderr não é repassado em tempo real: mostrar o final em caso de erro
+    if (child.returncode or not output_data) and not debug_logs and child.stderr_tail:
+        tail = list(child.stderr_tail)[-20:]
+        log_fn(f"[FAST ASYNC] stderr (últimas {len(tail)} linhas):")
+        for line in tail:
+            log_fn(f"  {line}")
+
+    if output_data:
+        return output_data
+
+    log_fn("[FAST ASYNC] ERRO: subprocess terminou sem resultado")
+    return partial_from_journal(async_input, f"Subprocess terminou sem resultado (code={child.returncode})")
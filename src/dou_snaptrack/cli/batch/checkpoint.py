@@ -0,0 +1,146 @@
+"""Checkpoint journal for resumable batch runs.
+
+Every finished job appends one NDJSON line to ``out_dir/_batch_checkpoint.ndjson``
+with its signature (date, secao, key1, key2, query) and output path. With
+``resume`` enabled, ``run_batch`` skips jobs whose signature is already in the
+checkpoint (and whose output still exists) and reuses their outputs in the
+report and in ``aggregate_outputs_by_date``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+CHECKPOINT_NAME = "_batch_checkpoint.ndjson"
+
+
+def job_signature(job: dict[str, Any], defaults: dict[str, Any] | None = None) -> str:
+    """Stable signature of a job: (date, secao, key1, key2, query)."""
+    defaults = defaults or {}
+    parts = [
+        str(job.get("data") or defaults.get("data") or ""),
+        str(job.get("secao") or defaults.get("secaoDefault") or defaults.get("secao") or ""),
+        str(job.get("key1") or ""),
+        str(job.get("key2") or ""),
+        str(job.get("query") or ""),
+    ]
+    raw = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def record_job_done(
+    out_dir: Path,
+    job: dict[str, Any],
+    defaults: dict[str, Any] | None,
+    output: str | None,
+    items: int,
+    job_index: int | None = None,
+) -> None:
+    """Append a finished job to the checkpoint (one short line, safe across worker processes)."""
+    line = json.dumps(
+        {
+            "sig": job_signature(job, defaults),
+            "job_index": job_index,
+            "output": output,
+            "items": int(items or 0),
+            "ts": round(time.time(), 1),
+        },
+        ensure_ascii=False,
+    )
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with (out_dir / CHECKPOINT_NAME).open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+    except Exception:
+        pass
+
+
+def load_completed(out_dir: Path) -> dict[str, dict[str, Any]]:
+    """Completed jobs by signature whose output file still exists.
+
+    Outputs removed by a previous plan aggregation do not count as completed.
+    """
+    done: dict[str, dict[str, Any]] = {}
+    try:
+        lines = (out_dir / CHECKPOINT_NAME).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return done
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        sig = entry.get("sig")
+        output = entry.get("output")
+        if not sig or not output or not Path(output).exists():
+            continue
+        done[sig] = entry
+    return done
+
+
+def import_run_journal(out_dir: Path, jobs: list[dict[str, Any]], defaults: dict[str, Any] | None) -> int:
+    """Fold the fast-async run journal into the checkpoint.
+
+    The fast-async collector journals each job as it finishes (see
+    ``dou_helpers.RunJournal``); this makes jobs of a killed run resumable.
+    Entries whose fields no longer match the plan's job at that index are ignored.
+
+    Returns:
+        Number of jobs added to the checkpoint.
+    """
+    from ...ui.collectors.dou_helpers import RUN_JOURNAL_NAME, read_journal
+
+    known = load_completed(out_dir)
+    added = 0
+    for entry in read_journal(out_dir / RUN_JOURNAL_NAME):
+        if not entry.success or not entry.output or not (1 <= entry.job_index <= len(jobs)):
+            continue
+        job = jobs[entry.job_index - 1]
+        if (str(job.get("key1") or ""), str(job.get("key2") or "Todos")) != (entry.key1, entry.key2 or "Todos"):
+            continue
+        if job_signature(job, defaults) in known:
+            continue
+        record_job_done(out_dir, job, defaults, entry.output, entry.item_count, entry.job_index)
+        added += 1
+    return added
+
+
+def split_resumable(
+    jobs: list[dict[str, Any]], out_dir: Path, defaults: dict[str, Any] | None
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Split the plan into pending jobs and reusable checkpoint entries.
+
+    Pending jobs carry ``_plan_index`` (their 1-based index in the full plan) so
+    output names and metrics keep the original numbering.
+
+    Returns:
+        Tuple of (pending_jobs, reused_entries)
+    """
+    done = load_completed(out_dir)
+    pending: list[dict[str, Any]] = []
+    reused: list[dict[str, Any]] = []
+    for i, job in enumerate(jobs, start=1):
+        entry = done.get(job_signature(job, defaults))
+        if entry:
+            reused.append(entry)
+        else:
+            pending.append({**job, "_plan_index": job.get("_plan_index") or i})
+    return pending, reused
+
+
+def merge_resumed(report: dict[str, Any], reused: list[dict[str, Any]], total_jobs: int) -> dict[str, Any]:
+    """Add reused checkpoint entries to the report of the pending jobs.
+
+    Reused outputs go first so plan aggregation sees the whole plan.
+    """
+    merged = dict(report)
+    merged["total_jobs"] = total_jobs
+    merged["ok"] = int(report.get("ok") or 0) + len(reused)
+    merged["items_total"] = int(report.get("items_total") or 0) + sum(int(e.get("items") or 0) for e in reused)
+    merged["outputs"] = [e["output"] for e in reused] + list(report.get("outputs") or [])
+    merged["resumed"] = {"reused": len(reused), "executed": total_jobs - len(reused)}
+    return merged
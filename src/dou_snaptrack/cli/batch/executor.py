@@ -1,404 +1,651 @@
-"""Executor strategies for batch processing.
-
-This module contains different execution strategies (subprocess, thread, process)
-to reduce complexity of the main batch.py file.
+"""Executor backends for batch processing.
+
+Every backend runs the same bucket payloads (see ``build_bucket_payload``) and
+yields one ``BucketResult`` per bucket as soon as it finishes; ``run_executor``
+is the single place where results are merged into the report.
+
+Backends (``DOU_POOL``): ``inline``, ``thread``, ``process``, ``subprocess``
+and ``async`` (single browser, see ``async_runner``). Instead of a global
+"first result" timeout, each job gets ``DOU_JOB_TIMEOUT_SEC`` seconds: a
+bucket that makes no progress for that long is stopped and counted as failed
+(jobs it already finished are kept). The clock starts when the bucket actually
+starts running, not when it is submitted. ``Executor.cancel()`` stops every
+backend before its next job.
+
+Timeouts are hard only for ``process`` and ``subprocess``: the timed-out
+bucket's own process is terminated and the next queued bucket takes its slot. Python threads cannot be killed: on ``inline``/``thread`` a timed
+out bucket is only abandoned; its current job keeps running (and may still
+write its output and hold its browser) until it returns, and the bucket stops
+before the next job. Use ``DOU_POOL=subprocess`` when jobs can hang for good.
 """
 
 from __future__ import annotations
 
 import contextlib
-import json
 import os
-import subprocess
+import queue
 import sys
-from collections.abc import Callable
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from ...constants import TIMEOUT_SUBPROCESS_LONG
+from ...utils.stream_ipc import CANCEL_GRACE_SEC, StreamingChild
+
+# Tempo máximo por job sem progresso do bucket
+JOB_TIMEOUT_SEC = float(os.environ.get("DOU_JOB_TIMEOUT_SEC", "300") or "300")
+# Folga para o primeiro job de um bucket (spawn do processo + launch do browser)
+WORKER_STARTUP_SEC = 60.0
+# Intervalo de verificação de timeouts/cancelamento
+POLL_SEC = 1.0
 
 
-def execute_with_subprocess(
-    buckets: list[list[int]],
-    jobs: list[dict[str, Any]],
+def common_payload(
     defaults: dict[str, Any],
     out_dir: Path,
     out_pattern: str,
     args,
     state_file_path: Path | None,
     reuse_page: bool,
-    summary: dict[str, Any],
-    parallel: int,
-    log_fn: Callable[[str], None],
+    summary,
 ) -> dict[str, Any]:
-    """Execute batch using subprocess pool.
+    """Payload fields shared by every bucket of a run."""
+    return {
+        "defaults": defaults,
+        "out_dir": str(out_dir),
+        "out_pattern": out_pattern,
+        "headful": bool(args.headful),
+        "slowmo": int(args.slowmo),
+        "state_file": str(state_file_path) if state_file_path else None,
+        "reuse_page": reuse_page,
+        "summary": {"lines": summary.lines, "mode": summary.mode, "keywords": summary.keywords},
+        "log_file": getattr(args, "log_file", None),
+    }
+
+
+def build_bucket_payload(bucket: list[int], jobs: list[dict[str, Any]], common: dict[str, Any]) -> dict[str, Any]:
+    """Compact worker payload (``bucket_jobs_v1``): only the bucket's own jobs.
+
+    The legacy format shipped the whole plan (``jobs`` + ``indices``) to every
+    worker, so each spawned process unpickled all jobs; payload size now grows
+    with the bucket, not with the plan.
 
     Args:
-        buckets: List of job index buckets
+        bucket: 1-based job indices of this worker
         jobs: All jobs
-        defaults: Default configuration
-        out_dir: Output directory
-        out_pattern: Output filename pattern
-        args: Command-line arguments
-        state_file_path: Path to state file
-        reuse_page: Whether to reuse browser page
-        summary: Summary configuration
-        parallel: Number of workers
-        log_fn: Logging function
+        common: Shared fields from ``common_payload``
 
     Returns:
-        Report dictionary with ok, fail, items_total, and outputs
+        Payload dictionary accepted by ``_worker_process``
     """
-    report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
-    log_fn(f"[Parent] Using subprocess pool (workers={parallel})")
-
-    futs = []
-    tmp_dir = out_dir / "_subproc"
-    tmp_dir.mkdir(parents=True, exist_ok=True)
-
-    for w_id, bucket in enumerate(buckets):
-        if not bucket:
+    bucket_jobs = []
+    for j_idx in bucket:
+        try:
+            job = jobs[j_idx - 1]
+        except IndexError:
             continue
-
-        log_fn(
-            f"[Parent] Scheduling (subproc) bucket {w_id+1}/{len(buckets)} size={len(bucket)} first_idx={bucket[0] if bucket else '-'}"
-        )
-
-        bucket_jobs = []
-        for j_idx in bucket:
-            try:
-                job = jobs[j_idx - 1]
-            except Exception:
-                continue
-            bucket_jobs.append({"index": j_idx, "job": job})
-
-        payload = {
-            "payload_schema": "bucket_jobs_v1",
-            "bucket_jobs": bucket_jobs,
-            "total_jobs": len(jobs),
-            "defaults": defaults,
-            "out_dir": str(out_dir),
-            "out_pattern": out_pattern,
-            "headful": bool(args.headful),
-            "slowmo": int(args.slowmo),
-            "state_file": str(state_file_path) if state_file_path else None,
-            "reuse_page": reuse_page,
-            "summary": {"lines": summary.lines, "mode": summary.mode, "keywords": summary.keywords},
-            "log_file": getattr(args, "log_file", None),
+        bucket_jobs.append({"index": j_idx, "job": job})
+    return {
+        "payload_schema": "bucket_jobs_v1",
+        "bucket_jobs": bucket_jobs,
+        "total_jobs": len(jobs),
+        **common,
+    }
+
+
+def empty_report() -> dict[str, Any]:
+    return {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
+
+
+@dataclass
+class BucketResult:
+    """Outcome of one bucket (``result`` has ok, fail, items_total and outputs)."""
+
+    bucket_id: int
+    result: dict[str, Any]
+    error: str | None = None
+
+
+@dataclass
+class _Bucket:
+    """Progress of a running bucket, used for per-job timeouts."""
+
+    bucket_id: int
+    payload: dict[str, Any]
+    events: list[dict[str, Any]] = field(default_factory=list)
+    started_at: float | None = None
+    last_progress: float | None = None
+    stop: threading.Event = field(default_factory=threading.Event)
+    timed_out: bool = False
+
+    @property
+    def size(self) -> int:
+        return len(self.payload.get("bucket_jobs") or self.payload.get("indices") or [])
+
+    def start(self) -> None:
+        if self.started_at is None:
+            self.started_at = self.last_progress = time.monotonic()
+
+    def progress(self, event: dict[str, Any]) -> None:
+        self.events.append(event)
+        self.last_progress = time.monotonic()
+
+    def deadline(self, job_timeout_sec: float) -> float:
+        """When the bucket times out, measured from the last reported job (inf if it has not started)."""
+        if self.started_at is None or self.last_progress is None:
+            return float("inf")
+        startup = WORKER_STARTUP_SEC if not self.events else 0.0
+        return self.last_progress + startup + job_timeout_sec
+
+    def partial(self, error: str) -> BucketResult:
+        """Result from the jobs reported so far; the rest count as failed."""
+        result = {
+            "ok": sum(e.get("ok", 0) for e in self.events),
+            "fail": sum(e.get("fail", 0) for e in self.events) + max(0, self.size - len(self.events)),
+            "items_total": sum(e.get("items_total", 0) for e in self.events),
+            "outputs": [o for e in self.events for o in e.get("outputs", [])],
         }
+        return BucketResult(self.bucket_id, result, error)
 
-        payload_path = (tmp_dir / f"payload_{w_id+1}.json").resolve()
-        result_path = (tmp_dir / f"result_{w_id+1}.json").resolve()
-        payload_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
 
-        # Build subprocess command
-        py = sys.executable or "python"
-        cmd = [py, "-m", "dou_snaptrack.cli.worker_entry", "--payload", str(payload_path), "--out", str(result_path)]
+class Executor:
+    """Base backend: runs bucket payloads and yields results as buckets finish.
 
-        # Set up environment with proper PYTHONPATH
-        repo_root = Path(__file__).resolve().parents[3]
-        src_dir = (repo_root / "src").resolve()
-        env = os.environ.copy()
-        existing_pp = env.get("PYTHONPATH", "")
-        if str(src_dir) not in (existing_pp.split(";") if os.name == "nt" else existing_pp.split(":")):
-            separator = ";" if os.name == "nt" else ":"
-            env["PYTHONPATH"] = (str(src_dir) + separator + existing_pp) if existing_pp else str(src_dir)
-
-        p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=str(repo_root), env=env)
-        futs.append((p, result_path))
+    Args:
+        parallel: Number of concurrent workers
+        log_fn: Logging function
+        worker_fn: Worker function (``_worker_process``) for in-process backends
+        job_timeout_sec: Per-job timeout (no progress for this long = bucket failed)
+    """
 
-    log_fn(f"[Parent] {len(futs)} subprocesses spawned")
+    name = "base"
+
+    def __init__(
+        self,
+        parallel: int,
+        log_fn: Callable[[str], None],
+        worker_fn: Callable | None = None,
+        job_timeout_sec: float = JOB_TIMEOUT_SEC,
+    ):
+        self.parallel = max(1, int(parallel))
+        self.log_fn = log_fn
+        self.worker_fn = worker_fn
+        self.job_timeout_sec = job_timeout_sec
+        self.timed_out = 0
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Stop every bucket before its next job (thread-safe)."""
+        self._cancel.set()
+
+    def run(self, payloads: list[dict[str, Any]]) -> Iterator[BucketResult]:
+        raise NotImplementedError
+
+    def _timeout(self, bucket: _Bucket) -> BucketResult:
+        self.timed_out += 1
+        bucket.timed_out = True
+        bucket.stop.set()
+        self.log_fn(f"[Parent] {self.name} bucket {bucket.bucket_id}: job sem progresso há {self.job_timeout_sec:.0f}s")
+        return bucket.partial(f"job timeout ({self.job_timeout_sec:.0f}s)")
+
+    def _thread_worker(self, bucket: _Bucket) -> dict[str, Any]:
+        """Run worker_fn in the current thread, reporting per-job progress."""
+        bucket.start()
+        return self.worker_fn(  # type: ignore[misc]
+            bucket.payload,
+            on_job=lambda j_idx, r: bucket.progress({"job_index": j_idx, **r}),
+            should_stop=lambda: bucket.stop.is_set() or self.cancelled,
+        )
 
-    # Collect results
-    for p, result_path in futs:
-        try:
-            out = p.communicate(timeout=TIMEOUT_SUBPROCESS_LONG)[0].decode("utf-8", errors="ignore") if p.stdout else ""
-        except Exception:
-            out = ""
+    def _drain(self, futs: dict[Future, _Bucket]) -> Iterator[BucketResult]:
+        """Yield futures as they complete, enforcing per-job timeouts and cancellation."""
+        pending = set(futs)
+        while pending:
+            done, _ = wait(pending, timeout=POLL_SEC, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                bucket = futs[fut]
+                try:
+                    yield BucketResult(bucket.bucket_id, fut.result())
+                except Exception as e:
+                    yield bucket.partial(str(e))
+            now = time.monotonic()
+            for fut in list(pending):
+                bucket = futs[fut]
+                if self.cancelled:
+                    fut.cancel()
+                    bucket.stop.set()
+                    pending.discard(fut)
+                    yield bucket.partial("cancelled")
+                elif now > bucket.deadline(self.job_timeout_sec):
+                    pending.discard(fut)
+                    yield self._timeout(bucket)
+
+
+class InlineExecutor(Executor):
+    """One bucket at a time in a helper thread (keeps Playwright sync off any running loop)."""
+
+    name = "inline"
+
+    def run(self, payloads: list[dict[str, Any]]) -> Iterator[BucketResult]:
+        for i, payload in enumerate(payloads, start=1):
+            bucket = _Bucket(i, payload)
+            if self.cancelled:
+                yield bucket.partial("cancelled")
+                continue
+            pool = ThreadPoolExecutor(max_workers=1)
+            try:
+                yield from self._drain({pool.submit(self._thread_worker, bucket): bucket})
+            finally:
+                pool.shutdown(wait=False)
 
-        if out:
-            log_fn(out.strip())
 
-        if result_path.exists():
-            try:
-                r = json.loads(result_path.read_text(encoding="utf-8"))
-                report["ok"] += r.get("ok", 0)
-                report["fail"] += r.get("fail", 0)
-                report["items_total"] += r.get("items_total", 0)
-                report["outputs"].extend(r.get("outputs", []))
-                log_fn(f"[Parent] Subproc done: ok={r.get('ok',0)} fail={r.get('fail',0)} items={r.get('items_total',0)}")
-            except Exception as e:
-                log_fn(f"[Subproc parse FAIL] {e}")
-        else:
-            log_fn("[Subproc FAIL] result file missing")
+class ThreadExecutor(Executor):
+    """Buckets on a thread pool (one sync Playwright per thread).
 
-    return report
+    A timed-out bucket is abandoned, not killed: its thread finishes the
+    current job and keeps its pool slot until then.
+    """
 
+    name = "thread"
 
-def execute_with_threads(
-    buckets: list[list[int]],
-    jobs: list[dict[str, Any]],
-    defaults: dict[str, Any],
-    out_dir: Path,
-    out_pattern: str,
-    args,
-    state_file_path: Path | None,
-    reuse_page: bool,
-    summary: dict[str, Any],
-    parallel: int,
-    log_fn: Callable[[str], None],
-    worker_fn: Callable,
-) -> dict[str, Any]:
-    """Execute batch using thread pool.
+    def run(self, payloads: list[dict[str, Any]]) -> Iterator[BucketResult]:
+        pool = ThreadPoolExecutor(max_workers=self.parallel)
+        try:
+            futs = {}
+            for i, payload in enumerate(payloads, start=1):
+                bucket = _Bucket(i, payload)
+                futs[pool.submit(self._thread_worker, bucket)] = bucket
+            yield from self._drain(futs)
+        finally:
+            # Threads que estouraram o timeout param sozinhas antes do próximo job
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessExecutor(Executor):
+    """One spawned process per bucket, at most ``parallel`` at a time.
+
+    Each child reports its start, every finished job and its final result on
+    its own pipe, so the per-job timeout is measured between jobs as in the
+    subprocess backend. A bucket that times out has its process terminated and
+    its slot goes to the next queued bucket; the timeout is reported right
+    away. Buckets whose process never came up (spawn failed or no start within
+    ``WORKER_STARTUP_SEC``) are re-run on threads at the end.
 
     Args:
-        buckets: List of job index buckets
-        jobs: All jobs
-        defaults: Default configuration
-        out_dir: Output directory
-        out_pattern: Output filename pattern
-        args: Command-line arguments
-        state_file_path: Path to state file
-        reuse_page: Whether to reuse browser page
-        summary: Summary configuration
-        parallel: Number of workers
-        log_fn: Logging function
-        worker_fn: Worker function to call
-
-    Returns:
-        Report dictionary with ok, fail, items_total, and outputs
+        init_worker_fn: Called in each child with ``log_file`` before the bucket
+        log_file: Passed to ``init_worker_fn``
     """
-    report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
-    log_fn(f"[Parent] Using ThreadPoolExecutor (workers={parallel})")
 
-    with ThreadPoolExecutor(max_workers=max(1, parallel)) as tpex:
-        futs = []
-        for w_id, bucket in enumerate(buckets):
-            if not bucket:
-                continue
+    name = "process"
 
-            log_fn(
-                f"[Parent] Scheduling (thread) bucket {w_id+1}/{len(buckets)} size={len(bucket)} first_idx={bucket[0] if bucket else '-'}"
-            )
+    def __init__(self, *args, init_worker_fn: Callable | None = None, log_file: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.init_worker_fn = init_worker_fn
+        self.log_file = log_file
 
-            payload = {
-                "jobs": jobs,
-                "defaults": defaults,
-                "out_dir": str(out_dir),
-                "out_pattern": out_pattern,
-                "headful": bool(args.headful),
-                "slowmo": int(args.slowmo),
-                "state_file": str(state_file_path) if state_file_path else None,
-                "reuse_page": reuse_page,
-                "summary": {"lines": summary.lines, "mode": summary.mode, "keywords": summary.keywords},
-                "indices": bucket,
-                "log_file": getattr(args, "log_file", None),
-            }
-            futs.append(tpex.submit(worker_fn, payload))
-
-        log_fn(f"[Parent] {len(futs)} thread-futures scheduled")
-
-        for fut in as_completed(futs):
-            try:
-                r = fut.result()
-                report["ok"] += r.get("ok", 0)
-                report["fail"] += r.get("fail", 0)
-                report["items_total"] += r.get("items_total", 0)
-                report["outputs"].extend(r.get("outputs", []))
-                log_fn(f"[Parent] Thread future done: ok={r.get('ok',0)} fail={r.get('fail',0)} items={r.get('items_total',0)}")
-            except Exception as e:
-                log_fn(f"[Worker FAIL thread] {e}")
+    def run(self, payloads: list[dict[str, Any]]) -> Iterator[BucketResult]:
+        import multiprocessing as mp
 
-    return report
+        ctx = mp.get_context("spawn")
+        stop = ctx.Event()
+        waiting = [_Bucket(i, p) for i, p in enumerate(payloads, start=1)]
+        running: dict[Any, _ChildProcess] = {}
+        unstarted: list[_Bucket] = []
+        self.log_fn("[Parent] Process executor started")
+        try:
+            yield from self._loop(ctx, stop, waiting, running, unstarted)
+        finally:
+            # Consumidor abandonou a iteração: não deixar processos órfãos
+            for child in running.values():
+                child.kill()
+
+        if unstarted and not self.cancelled:
+            self.log_fn(f"[Parent] {len(unstarted)} worker(s) de processo não iniciaram. Fazendo fallback para threads…")
+            fallback = ThreadExecutor(self.parallel, self.log_fn, self.worker_fn, self.job_timeout_sec)
+            fallback._cancel = self._cancel
+            for outcome in fallback.run([b.payload for b in unstarted]):
+                yield BucketResult(unstarted[outcome.bucket_id - 1].bucket_id, outcome.result, outcome.error)
+            self.timed_out += fallback.timed_out
+
+    def _loop(
+        self,
+        ctx,
+        stop,
+        waiting: list[_Bucket],
+        running: dict[Any, _ChildProcess],
+        unstarted: list[_Bucket],
+    ) -> Iterator[BucketResult]:
+        from multiprocessing.connection import wait as wait_conns
+
+        cancel_sent_at: float | None = None
+        while waiting or running:
+            while waiting and len(running) < self.parallel and not self.cancelled:
+                bucket = waiting.pop(0)
+                try:
+                    child = _ChildProcess.spawn(
+                        ctx, bucket, self.worker_fn, self.init_worker_fn, self.log_file, stop
+                    )
+                except Exception as e:
+                    self.log_fn(f"[Parent] spawn do bucket {bucket.bucket_id} falhou: {e}")
+                    unstarted.append(bucket)
+                    continue
+                running[child.conn] = child
+            if self.cancelled:
+                for bucket in waiting:
+                    yield bucket.partial("cancelled")
+                waiting = []
+                if cancel_sent_at is None:
+                    cancel_sent_at = time.monotonic()
+                    stop.set()
+            if not running:
+                continue
 
+            for conn in wait_conns(list(running), timeout=POLL_SEC):
+                child = running[conn]
+                outcome = child.read()
+                if child.finished:
+                    running.pop(conn)
+                    child.kill()
+                if outcome is not None:
+                    yield outcome
+
+            now = time.monotonic()
+            for conn, child in list(running.items()):
+                bucket = child.bucket
+                grace_over = cancel_sent_at is not None and now - cancel_sent_at > CANCEL_GRACE_SEC
+                if grace_over:
+                    running.pop(conn)
+                    child.kill()
+                    yield bucket.partial("cancelled")
+                elif bucket.started_at is None and now > child.spawned_at + WORKER_STARTUP_SEC + self.job_timeout_sec:
+                    running.pop(conn)
+                    child.kill()
+                    if cancel_sent_at is None:
+                        unstarted.append(bucket)
+                    else:
+                        yield bucket.partial("cancelled")
+                elif now > bucket.deadline(self.job_timeout_sec):
+                    running.pop(conn)
+                    child.kill()
+                    yield self._timeout(bucket)
+
+
+@dataclass
+class _ChildProcess:
+    """A bucket running in a spawned process, reporting over a one-way pipe."""
+
+    bucket: _Bucket
+    process: Any
+    conn: Any
+    spawned_at: float = field(default_factory=time.monotonic)
+    finished: bool = False
+
+    @classmethod
+    def spawn(cls, ctx, bucket: _Bucket, worker_fn, init_fn, log_file, stop) -> _ChildProcess:
+        reader, writer = ctx.Pipe(duplex=False)
+        proc = ctx.Process(
+            target=_run_in_process,
+            args=(worker_fn, init_fn, log_file, bucket.payload, writer, stop),
+            name=f"bucket-{bucket.bucket_id}",
+            daemon=True,
+        )
+        try:
+            proc.start()
+        finally:
+            # Só o filho escreve: fechar a ponta do pai para receber EOF quando ele sair
+            writer.close()
+        return cls(bucket, proc, reader)
+
+    def read(self) -> BucketResult | None:
+        """Handle one message; returns the bucket result once it is known."""
+        try:
+            kind, data = self.conn.recv()
+        except (EOFError, OSError):
+            # Saiu sem "done": vale o que já foi reportado por job
+            self.finished = True
+            self.process.join(timeout=5)
+            return self.bucket.partial(f"exit code {self.process.exitcode} sem resultado")
+        if kind == "start":
+            self.bucket.start()
+        elif kind == "job":
+            self.bucket.progress(data)
+        elif kind == "done":
+            self.finished = True
+            return BucketResult(self.bucket.bucket_id, data or {})
+        elif kind == "error":
+            self.finished = True
+            return self.bucket.partial(str(data))
+        return None
+
+    def kill(self) -> None:
+        with contextlib.suppress(Exception):
+            self.conn.close()
+        with contextlib.suppress(Exception):
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(timeout=5)
+
+
+def _run_in_process(worker_fn: Callable, init_fn: Callable | None, log_file: str | None, payload, conn, stop) -> None:
+    """Child entry point: run one bucket and stream start, per-job and final events."""
+    try:
+        if init_fn is not None:
+            init_fn(log_file)
+        conn.send(("start", None))
+        result = worker_fn(
+            payload,
+            on_job=lambda j_idx, r: conn.send(("job", {"job_index": j_idx, **r})),
+            should_stop=stop.is_set,
+        )
+        conn.send(("done", result))
+    except Exception as e:
+        with contextlib.suppress(Exception):
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        with contextlib.suppress(Exception):
+            conn.close()
 
-def execute_inline_with_threads(
-    buckets: list[list[int]],
-    jobs: list[dict[str, Any]],
-    defaults: dict[str, Any],
-    out_dir: Path,
-    out_pattern: str,
-    args,
-    state_file_path: Path | None,
-    reuse_page: bool,
-    summary: dict[str, Any],
-    log_fn: Callable[[str], None],
-    worker_fn: Callable,
-) -> dict[str, Any]:
-    """Execute batch inline using single-threaded approach.
 
-    Args:
-        buckets: List of job index buckets
-        jobs: All jobs
-        defaults: Default configuration
-        out_dir: Output directory
-        out_pattern: Output filename pattern
-        args: Command-line arguments
-        state_file_path: Path to state file
-        reuse_page: Whether to reuse browser page
-        summary: Summary configuration
-        log_fn: Logging function
-        worker_fn: Worker function to call
+class SubprocessExecutor(Executor):
+    """One ``worker_entry --stream`` child per bucket, at most ``parallel`` at a time.
 
-    Returns:
-        Report dictionary with ok, fail, items_total, and outputs
+    Children report each job as it finishes (see ``utils.stream_ipc``), so the
+    per-job timeout is measured between events.
     """
-    report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
-    log_fn("[Parent] Running single bucket inline (thread, no ProcessPool)")
 
-    for w_id, bucket in enumerate(buckets):
-        if not bucket:
-            continue
+    name = "subprocess"
 
-        log_fn(
-            f"[Parent] Scheduling bucket {w_id+1}/{len(buckets)} size={len(bucket)} first_idx={bucket[0] if bucket else '-'}"
-        )
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        repo_root = Path(__file__).resolve().parents[3]
+        src_dir = (repo_root / "src").resolve()
+        env = os.environ.copy()
+        existing_pp = env.get("PYTHONPATH", "")
+        if str(src_dir) not in (existing_pp.split(";") if os.name == "nt" else existing_pp.split(":")):
+            separator = ";" if os.name == "nt" else ":"
+            env["PYTHONPATH"] = (str(src_dir) + separator + existing_pp) if existing_pp else str(src_dir)
+        self.env = env
+        self.cwd = str(repo_root)
+        self.cmd = [sys.executable or "python", "-m", "dou_snaptrack.cli.worker_entry", "--stream"]
+
+    def run(self, payloads: list[dict[str, Any]]) -> Iterator[BucketResult]:
+        # Todos os filhos entregam eventos na mesma fila: o pai agrega na ordem em que os jobs terminam
+        sink: queue.Queue = queue.Queue()
+        waiting = [_Bucket(i, p) for i, p in enumerate(payloads, start=1)]
+        running: dict[StreamingChild, _Bucket] = {}
+        cancel_sent_at: float | None = None
+        try:
+            yield from self._loop(sink, waiting, running, cancel_sent_at)
+        finally:
+            # Consumidor abandonou a iteração (p.ex. KeyboardInterrupt): não deixar filhos órfãos
+            for child in running:
+                child.kill()
+
+    def _loop(
+        self,
+        sink: queue.Queue,
+        waiting: list[_Bucket],
+        running: dict[StreamingChild, _Bucket],
+        cancel_sent_at: float | None,
+    ) -> Iterator[BucketResult]:
+        while waiting or running:
+            while waiting and len(running) < self.parallel and not self.cancelled:
+                bucket = waiting.pop(0)
+                try:
+                    child = StreamingChild(
+                        self.cmd, env=self.env, cwd=self.cwd, name=f"subproc-{bucket.bucket_id}",
+                        on_stderr=self.log_fn, sink=sink,
+                    )
+                except Exception as e:
+                    yield bucket.partial(f"spawn: {e}")
+                    continue
+                child.send("run", payload=bucket.payload)
+                child.close_input()
+                bucket.start()
+                running[child] = bucket
+            if self.cancelled:
+                for bucket in waiting:
+                    yield bucket.partial("cancelled")
+                waiting = []
+                if cancel_sent_at is None:
+                    cancel_sent_at = time.monotonic()
+                    for child in running:
+                        child.cancel()
+            if not running:
+                continue
 
-        payload = {
+            try:
+                child, msg = sink.get(timeout=POLL_SEC)
+            except queue.Empty:
+                child, msg = None, {}
+            bucket = running.get(child) if child is not None else None
+            kind = msg.get("type")
+            if bucket is not None and kind == "job":
+                bucket.progress(msg)
+                self.log_fn(
+                    f"[Parent] {child.name} job {msg.get('job_index')}: ok={msg.get('ok', 0)} "
+                    f"fail={msg.get('fail', 0)} items={msg.get('items_total', 0)}"
+                )
+            elif bucket is not None and kind == "done":
+                running.pop(child)
+                yield BucketResult(bucket.bucket_id, msg.get("result") or {})
+            elif bucket is not None and kind == "error":
+                self.log_fn(f"[Subproc FAIL] {child.name}: {msg.get('error')}")
+            elif bucket is not None and kind == "exit":
+                # Terminou sem "done": vale o que já foi reportado por job
+                running.pop(child)
+                yield bucket.partial(f"exit code {msg.get('returncode')} sem resultado")
+
+            now = time.monotonic()
+            for child, bucket in list(running.items()):
+                grace_over = cancel_sent_at is not None and now - cancel_sent_at > CANCEL_GRACE_SEC
+                if grace_over or now > bucket.deadline(self.job_timeout_sec):
+                    child.kill()
+                    running.pop(child)
+                    yield bucket.partial("cancelled") if grace_over else self._timeout(bucket)
+
+
+class AsyncExecutor(Executor):
+    """All buckets merged into one fast-async run (single browser, many contexts)."""
+
+    name = "async"
+
+    def run(self, payloads: list[dict[str, Any]]) -> Iterator[BucketResult]:
+        from .async_runner import _try_direct_async
+
+        if not payloads or self.cancelled:
+            return
+        jobs = [
+            {**entry["job"], "_plan_index": entry["job"].get("_plan_index") or entry["index"]}
+            for payload in payloads
+            for entry in payload.get("bucket_jobs") or []
+        ]
+        first = payloads[0]
+        async_input = {
             "jobs": jobs,
-            "defaults": defaults,
-            "out_dir": str(out_dir),
-            "out_pattern": out_pattern,
-            "headful": bool(args.headful),
-            "slowmo": int(args.slowmo),
-            "state_file": str(state_file_path) if state_file_path else None,
-            "reuse_page": reuse_page,
-            "summary": {"lines": summary.lines, "mode": summary.mode, "keywords": summary.keywords},
-            "indices": bucket,
-            "log_file": getattr(args, "log_file", None),
+            "defaults": first.get("defaults") or {},
+            "out_dir": first.get("out_dir"),
+            "out_pattern": first.get("out_pattern"),
+            "max_workers": self.parallel,
         }
-
-        try:
-            with ThreadPoolExecutor(max_workers=1) as tpex:
-                fut = tpex.submit(worker_fn, payload)
-                r = fut.result()
-                report["ok"] += r.get("ok", 0)
-                report["fail"] += r.get("fail", 0)
-                report["items_total"] += r.get("items_total", 0)
-                report["outputs"].extend(r.get("outputs", []))
-                log_fn(f"[Parent] Inline (thread) done: ok={r.get('ok',0)} fail={r.get('fail',0)} items={r.get('items_total',0)}")
-        except Exception as e:
-            log_fn(f"[Worker FAIL inline-thread] {e}")
-
-    return report
+        r = _try_direct_async(async_input, self.log_fn) or {}
+        result = {
+            "ok": r.get("ok", 0),
+            "fail": max(r.get("fail", 0), len(jobs) - r.get("ok", 0)),
+            "items_total": r.get("items_total", 0),
+            "outputs": r.get("outputs", []),
+        }
+        yield BucketResult(1, result, r.get("error"))
 
 
-def execute_with_process_pool(
-    buckets: list[list[int]],
-    jobs: list[dict[str, Any]],
-    defaults: dict[str, Any],
-    out_dir: Path,
-    out_pattern: str,
-    args,
-    state_file_path: Path | None,
-    reuse_page: bool,
-    summary: dict[str, Any],
+def make_executor(
+    pool_pref: str,
     parallel: int,
     log_fn: Callable[[str], None],
     worker_fn: Callable,
-    init_worker_fn: Callable,
-    log_file: str | None,
+    init_worker_fn: Callable | None = None,
+    log_file: str | None = None,
+) -> Executor:
+    """Pick the backend for ``DOU_POOL`` (inline whenever ``parallel <= 1``)."""
+    if pool_pref == "async":
+        return AsyncExecutor(parallel, log_fn, worker_fn)
+    if parallel <= 1 or pool_pref == "inline":
+        return InlineExecutor(parallel, log_fn, worker_fn)
+    if pool_pref == "subprocess":
+        return SubprocessExecutor(parallel, log_fn, worker_fn)
+    if pool_pref == "thread":
+        return ThreadExecutor(parallel, log_fn, worker_fn)
+    return ProcessExecutor(parallel, log_fn, worker_fn, init_worker_fn=init_worker_fn, log_file=log_file)
+
+
+def run_executor(
+    executor: Executor, payloads: list[dict[str, Any]], log_fn: Callable[[str], None]
 ) -> dict[str, Any]:
-    """Execute batch using process pool with timeout and fallback.
+    """Run payloads on a backend, merging each bucket into the report as it finishes.
 
     Args:
-        buckets: List of job index buckets
-        jobs: All jobs
-        defaults: Default configuration
-        out_dir: Output directory
-        out_pattern: Output filename pattern
-        args: Command-line arguments
-        state_file_path: Path to state file
-        reuse_page: Whether to reuse browser page
-        summary: Summary configuration
-        parallel: Number of workers
+        executor: Backend from ``make_executor``
+        payloads: Bucket payloads from ``build_bucket_payload``
         log_fn: Logging function
-        worker_fn: Worker function to call
-        init_worker_fn: Worker initialization function
-        log_file: Path to log file
 
     Returns:
-        Report dictionary with ok, fail, items_total, and outputs
+        Report dictionary with ok, fail, items_total, outputs and executor stats
     """
-    import multiprocessing as mp
-
-    report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
-    ctx = mp.get_context("spawn")
-
-    with ProcessPoolExecutor(
-        max_workers=max(1, parallel), mp_context=ctx, initializer=init_worker_fn, initargs=(log_file,)
-    ) as ex:
-        log_fn("[Parent] ProcessPoolExecutor started")
-        futs = []
-
-        for w_id, bucket in enumerate(buckets):
-            if not bucket:
-                continue
-
+    report = empty_report()
+    log_fn(f"[Parent] Executor={executor.name} workers={executor.parallel} buckets={len(payloads)}")
+    started = time.perf_counter()
+    try:
+        for outcome in executor.run(payloads):
+            r = outcome.result
+            report["ok"] += r.get("ok", 0)
+            report["fail"] += r.get("fail", 0)
+            report["items_total"] += r.get("items_total", 0)
+            report["outputs"].extend(r.get("outputs", []))
+            suffix = f" error={outcome.error}" if outcome.error else ""
             log_fn(
-                f"[Parent] Scheduling bucket {w_id+1}/{len(buckets)} size={len(bucket)} first_idx={bucket[0] if bucket else '-'}"
-            )
-
-            payload = {
-                "jobs": jobs,
-                "defaults": defaults,
-                "out_dir": str(out_dir),
-                "out_pattern": out_pattern,
-                "headful": bool(args.headful),
-                "slowmo": int(args.slowmo),
-                "state_file": str(state_file_path) if state_file_path else None,
-                "reuse_page": reuse_page,
-                "summary": {"lines": summary.lines, "mode": summary.mode, "keywords": summary.keywords},
-                "indices": bucket,
-                "log_file": getattr(args, "log_file", None),
-            }
-            futs.append(ex.submit(worker_fn, payload))
-
-        log_fn(f"[Parent] {len(futs)} futures scheduled")
-
-        try:
-            # Wait for workers with timeout
-            any_done = False
-            for fut in as_completed(futs, timeout=60):
-                any_done = True
-                try:
-                    r = fut.result()
-                    report["ok"] += r.get("ok", 0)
-                    report["fail"] += r.get("fail", 0)
-                    report["items_total"] += r.get("items_total", 0)
-                    report["outputs"].extend(r.get("outputs", []))
-                    log_fn(f"[Parent] Future done: ok={r.get('ok',0)} fail={r.get('fail',0)} items={r.get('items_total',0)}")
-                except Exception as e:
-                    log_fn(f"[Worker FAIL] {e}")
-
-            if not any_done:
-                raise TimeoutError("no worker finished within timeout")
-
-        except TimeoutError:
-            log_fn("[Parent] Timeout aguardando workers. Fazendo fallback para execução inline…")
-
-            # Fallback to thread pool
-            with contextlib.suppress(Exception):
-                ex.shutdown(wait=False, cancel_futures=True)
-
-            # Execute fallback
-            fallback_report = execute_with_threads(
-                buckets,
-                jobs,
-                defaults,
-                out_dir,
-                out_pattern,
-                args,
-                state_file_path,
-                reuse_page,
-                summary,
-                parallel,
-                log_fn,
-                worker_fn,
+                f"[Parent] Bucket {outcome.bucket_id} done: ok={r.get('ok', 0)} "
+                f"fail={r.get('fail', 0)} items={r.get('items_total', 0)}{suffix}"
             )
-
-            # Replace report with fallback results
-            report = fallback_report
-
+    except KeyboardInterrupt:
+        executor.cancel()
+        raise
+    report["executor"] = {
+        "backend": executor.name,
+        "workers": executor.parallel,
+        "buckets": len(payloads),
+        "timed_out": executor.timed_out,
+        "cancelled": executor.cancelled,
+        "elapsed_sec": round(time.perf_counter() - started, 1),
+    }
     return report
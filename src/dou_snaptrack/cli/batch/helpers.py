@@ -429,6 +429,10 @@ def finalize_with_aggregation(
         plan_name = (cfg.get("plan_name") or (cfg.get("defaults", {}) or {}).get("plan_name") or "").strip()
         if not plan_name:
             return
+        if report.get("partial"):
+            # Execução interrompida: manter os JSONs individuais para um --resume
+            log_fn("[AGG] Execução parcial; agregação adiada (use resume para completar o plano)")
+            return
 
         prev_outputs = list(report.get("outputs", []))
         agg_files = aggregate_outputs_by_date(prev_outputs, out_dir, plan_name)
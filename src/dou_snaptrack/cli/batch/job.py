@@ -29,13 +29,14 @@ def process_single_job(
     run_once_fn,
     render_out_filename_fn,
     apply_summary_overrides_fn,
+    total_jobs: int | None = None,
 ) -> dict[str, Any]:
     """Process a single job and return results.
 
     Args:
         job: Job configuration
         job_index: Index of job in batch
-        jobs: All jobs
+        jobs: All jobs (empty with compact bucket payloads)
         defaults: Default configuration
         out_dir: Output directory
         out_pattern: Output filename pattern
@@ -48,10 +49,12 @@ def process_single_job(
         run_once_fn: Function to run once
         render_out_filename_fn: Function to render output filename
         apply_summary_overrides_fn: Function to apply summary overrides
+        total_jobs: Plan size for logging (defaults to ``len(jobs)``)
 
     Returns:
         Dictionary with ok, fail, items_total, outputs, elapsed, job_metrics
     """
+    from .checkpoint import record_job_done
     from .worker import (
         apply_fast_mode_optimizations,
         extract_job_parameters,
@@ -59,10 +62,13 @@ def process_single_job(
         recreate_page_after_failure,
     )
 
+    # Resumed runs keep the plan's original numbering (output names, metrics)
+    job_index = int(job.get("_plan_index") or job_index)
+
     start_ts = time.time()
     result_dict = {"ok": 0, "fail": 0, "items_total": 0, "outputs": [], "job_metrics": None}
 
-    print(f"\n[PW{os.getpid()}] [Job {job_index}/{len(jobs)}] {job.get('topic','')}: {job.get('query','')}")
+    print(f"\n[PW{os.getpid()}] [Job {job_index}/{total_jobs or len(jobs)}] {job.get('topic','')}: {job.get('query','')}")
     print(f"[DEBUG] Job {job_index} start_ts={start_ts:.3f}")
 
     # Extract and validate job parameters
@@ -126,6 +132,10 @@ def process_single_job(
                     bulletin_out=bulletin_out,
                     summary=SummaryConfig(lines=s_cfg.lines, mode=s_cfg.mode, keywords=s_cfg.keywords),
                     detail_parallel=params["detail_parallel"],
+                    detail_backend=params.get("detail_backend"),
+                    detail_mode=params.get("detail_mode"),
+                    listing_backend=params.get("listing_backend"),
+                    snapshot_dir=str(out_dir),
                     page=cur_page,
                     keep_page_open=keep_open,
                 )
@@ -146,6 +156,7 @@ def process_single_job(
         result_dict["ok"] = 1
         result_dict["outputs"] = [str(out_path)]
         result_dict["items_total"] = result.get("total", 0) if isinstance(result, dict) else 0
+        record_job_done(out_dir, job, defaults, str(out_path), result_dict["items_total"], job_index)
 
         elapsed = time.time() - start_ts
         items_count = result.get("total", 0) if isinstance(result, dict) else 0
@@ -3,8 +3,7 @@ from __future__ import annotations
 import contextlib
 import json
 import os
-import subprocess
-import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -68,8 +67,41 @@ def expand_batch_config(cfg: dict[str, Any]) -> list[dict[str, Any]]:
 
     return jobs
 
-def _worker_process(payload: dict[str, Any]) -> dict[str, Any]:
-    """Process-based worker to avoid Playwright sync threading issues."""
+def _payload_work(
+    jobs: list[dict[str, Any]] | None,
+    indices: list[int] | None,
+    bucket_jobs: list[dict[str, Any]] | None,
+) -> list[tuple[int, dict[str, Any]]]:
+    """(job_index, job) pairs of a worker payload, in either payload format."""
+    if bucket_jobs:
+        work = []
+        for entry in bucket_jobs:
+            try:
+                j_idx = int(entry.get("index") or 0)
+            except Exception:
+                j_idx = 0
+            job = entry.get("job") or {}
+            if isinstance(job, dict) and j_idx > 0:
+                work.append((j_idx, job))
+        return work
+    # Legacy mode: indices + full jobs list
+    if not jobs or not indices:
+        return []
+    return [(j_idx, jobs[j_idx - 1]) for j_idx in indices]
+
+
+def _worker_process(
+    payload: dict[str, Any],
+    on_job: Callable[[int, dict[str, Any]], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> dict[str, Any]:
+    """Process-based worker to avoid Playwright sync threading issues.
+
+    Args:
+        payload: Worker payload (legacy ``jobs`` + ``indices`` or ``bucket_jobs``)
+        on_job: Called after each job with ``(job_index, job_result)`` (streaming IPC)
+        should_stop: Checked before each job; True stops the bucket early (cancellation)
+    """
     from ..runner import run_once
     from .job import process_single_job
     from .worker import (
@@ -126,21 +158,14 @@ def _worker_process(payload: dict[str, Any]) -> dict[str, Any]:
         page_cache: dict[tuple[str, str], Any] = {}
 
         try:
-            if bucket_jobs:
-                for entry in bucket_jobs:
-                    try:
-                        j_idx = int(entry.get("index") or 0)
-                    except Exception:
-                        j_idx = 0
-                    job = entry.get("job") or {}
-                    if not isinstance(job, dict) or j_idx <= 0:
-                        continue
-
-                # Process job using extracted helper
-                    job_result = process_single_job(
-                        job=job,
-                        job_index=j_idx,
-                        jobs=(jobs or []),
+            for j_idx, job in _payload_work(jobs, indices, bucket_jobs):
+                if should_stop is not None and should_stop():
+                    break
+
+                job_result = process_single_job(
+                    job=job,
+                    job_index=j_idx,
+                    jobs=(jobs or []),
                     defaults=defaults,
                     out_dir=out_dir,
                     out_pattern=out_pattern,
@@ -153,6 +178,7 @@ def _worker_process(payload: dict[str, Any]) -> dict[str, Any]:
                     run_once_fn=run_once,
                     render_out_filename_fn=render_out_filename,
                     apply_summary_overrides_fn=apply_summary_overrides_from_job,
+                    total_jobs=total_jobs,
                 )
 
                 # Aggregate results
@@ -162,40 +188,8 @@ def _worker_process(payload: dict[str, Any]) -> dict[str, Any]:
                 report["outputs"].extend(job_result["outputs"])
                 if job_result["job_metrics"]:
                     report["metrics"]["jobs"].append(job_result["job_metrics"])
-
-            else:
-                # Legacy mode: indices + full jobs list
-                if not jobs or not indices:
-                    return report
-
-                for j_idx in indices:
-                    job = jobs[j_idx - 1]
-
-                    job_result = process_single_job(
-                        job=job,
-                        job_index=j_idx,
-                        jobs=jobs,
-                        defaults=defaults,
-                        out_dir=out_dir,
-                        out_pattern=out_pattern,
-                        context=context,
-                        page_cache=page_cache,
-                        reuse_page=reuse_page,
-                        fast_mode=fast_mode,
-                        state_file=state_file,
-                        summary=summary,
-                        run_once_fn=run_once,
-                        render_out_filename_fn=render_out_filename,
-                        apply_summary_overrides_fn=apply_summary_overrides_from_job,
-                    )
-
-                    # Aggregate results
-                    report["ok"] += job_result["ok"]
-                    report["fail"] += job_result["fail"]
-                    report["items_total"] += job_result["items_total"]
-                    report["outputs"].extend(job_result["outputs"])
-                    if job_result["job_metrics"]:
-                        report["metrics"]["jobs"].append(job_result["job_metrics"])
+                if on_job is not None:
+                    on_job(j_idx, job_result)
 
         finally:
             cleanup_page_cache(page_cache)
@@ -238,62 +232,11 @@ def _run_fast_async_subprocess(async_input: dict, _log) -> dict:
     """
     Executa o collector async via subprocess (para evitar conflitos de event loop).
 
-    Similar ao padrão usado em eagendas_collect_parallel.
+    Usa o protocolo de streaming (ver async_runner._run_fast_async_subprocess).
     """
-    import tempfile
-
-    try:
-        # Escrever input em arquivo temporário
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-            json.dump(async_input, f, ensure_ascii=False)
-            input_path = f.name
-
-        # Escrever resultado em arquivo temporário
-        result_path = input_path.replace('.json', '_result.json')
-
-        # Encontrar script
-        script_path = Path(__file__).parent.parent.parent / "ui" / "collectors" / "dou_parallel.py"
-        if not script_path.exists():
-            _log(f"[FAST ASYNC SUBPROCESS] Script não encontrado: {script_path}")
-            return {"success": False, "error": f"Script não encontrado: {script_path}"}
-
-        # Executar subprocess
-        env = os.environ.copy()
-        env["INPUT_JSON_PATH"] = input_path
-        env["RESULT_JSON_PATH"] = result_path
-        env["PYTHONIOENCODING"] = "utf-8"
-
-        proc = subprocess.run(
-            [sys.executable, str(script_path)],
-            env=env,
-            capture_output=True,
-            timeout=600,  # 10 min timeout
-            text=True
-        )
-
-        # Ler resultado
-        if Path(result_path).exists():
-            result = json.loads(Path(result_path).read_text(encoding='utf-8'))
-        else:
-            # Tentar parsear stdout
-            try:
-                result = json.loads(proc.stdout)
-            except Exception:
-                result = {"success": False, "error": proc.stderr or "No output"}
-
-        # Cleanup
-        try:
-            Path(input_path).unlink(missing_ok=True)
-            Path(result_path).unlink(missing_ok=True)
-        except Exception:
-            pass
+    from .async_runner import _run_fast_async_subprocess as run_streaming
 
-        return result
-
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "Subprocess timeout (10 min)"}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return run_streaming(async_input, _log) or {"success": False, "error": "Subprocess sem resultado"}
 
 
 def run_batch(playwright, args, summary: SummaryConfig) -> None:
@@ -344,15 +287,38 @@ def run_batch(playwright, args, summary: SummaryConfig) -> None:
     report = {"total_jobs": len(jobs), "ok": 0, "fail": 0, "items_total": 0, "outputs": []}
     defaults = cfg.get("defaults") or {}
 
+    # ============================================================================
+    # RESUME: skip jobs already in the checkpoint journal and reuse their outputs
+    # ============================================================================
+    from .checkpoint import import_run_journal, merge_resumed, split_resumable
+
+    plan_jobs = jobs
+    resume = bool(getattr(args, "resume", False))
+    reused: list[dict[str, Any]] = []
+    if resume:
+        imported = import_run_journal(out_dir, plan_jobs, defaults)
+        jobs, reused = split_resumable(plan_jobs, out_dir, defaults)
+        _log(f"[RESUME] {len(reused)}/{len(plan_jobs)} job(s) já concluídos (+{imported} do journal); pendentes: {len(jobs)}")
+        if not jobs:
+            from .helpers import finalize_with_aggregation, write_report
+
+            report = merge_resumed(report, reused, len(plan_jobs))
+            rep_path = write_report(report, out_dir, cfg)
+            _log(f"\n[REPORT] {rep_path} — jobs={report['total_jobs']} ok={report['ok']} fail={report['fail']} items={report['items_total']}")
+            finalize_with_aggregation(report, out_dir, cfg, rep_path, _log)
+            return
+
     # ============================================================================
     # FAST ASYNC MODE: Try single-browser async collector first (2x faster)
     # ============================================================================
     from .async_runner import try_fast_async_mode
 
     async_report = try_fast_async_mode(jobs, defaults, out_dir, out_pattern, args, cfg, _log)
+    # Jobs concluídos pelo coletor async (mesmo se interrompido) entram no checkpoint
+    import_run_journal(out_dir, plan_jobs, defaults)
     if async_report:
         # Fast async succeeded! Write report and finish
-        report = async_report
+        report = merge_resumed(async_report, reused, len(plan_jobs)) if resume else async_report
         from .helpers import finalize_with_aggregation, write_report
 
         rep_path = write_report(report, out_dir, cfg)
@@ -365,14 +331,12 @@ def run_batch(playwright, args, summary: SummaryConfig) -> None:
     # FALLBACK: Multi-browser approach (slower but robust)
     # ============================================================================
     _log("[FALLBACK] Usando método multi-browser original...")
+    if resume:
+        # O coletor async pode ter concluído parte dos jobs antes de falhar
+        jobs, reused = split_resumable(plan_jobs, out_dir, defaults)
 
     # Import helper functions
-    from .executor import (
-        execute_inline_with_threads,
-        execute_with_process_pool,
-        execute_with_subprocess,
-        execute_with_threads,
-    )
+    from .executor import build_bucket_payload, common_payload, make_executor, run_executor
     from .helpers import (
         aggregate_report_metrics,
         determine_parallelism,
@@ -400,34 +364,21 @@ def run_batch(playwright, args, summary: SummaryConfig) -> None:
     _log(f"[Parent] total_jobs={len(jobs)} parallel={parallel} (effective={effective_parallel}) reuse_page={reuse_page}")
     _log(f"[Parent] buckets={len(buckets)} desired_size={desired_size}")
 
-    # Execute batch with appropriate strategy
-    try:
-        if pool_pref == "subprocess" and parallel > 1:
-            exec_report = execute_with_subprocess(
-                buckets, jobs, defaults, out_dir, out_pattern,
-                args, state_file_path, reuse_page, summary, parallel, _log
-            )
-        elif pool_pref == "thread" and parallel > 1:
-            exec_report = execute_with_threads(
-                buckets, jobs, defaults, out_dir, out_pattern,
-                args, state_file_path, reuse_page, summary, parallel, _log, _worker_process
-            )
-        elif parallel <= 1:
-            exec_report = execute_inline_with_threads(
-                buckets, jobs, defaults, out_dir, out_pattern,
-                args, state_file_path, reuse_page, summary, _log, _worker_process
-            )
-        else:
-            exec_report = execute_with_process_pool(
-                buckets, jobs, defaults, out_dir, out_pattern,
-                args, state_file_path, reuse_page, summary, parallel, _log,
-                _worker_process, _init_worker, log_file
-            )
-
-        # Update report with execution results
-        report.update(exec_report)
-    finally:
-        pass
+    # Execute batch with the backend chosen by DOU_POOL
+    if not jobs:
+        # Resume: nada pendente após o coletor async
+        exec_report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
+    else:
+        common = common_payload(defaults, out_dir, out_pattern, args, state_file_path, reuse_page, summary)
+        payloads = [build_bucket_payload(bucket, jobs, common) for bucket in buckets if bucket]
+        executor = make_executor(pool_pref, parallel, _log, _worker_process, _init_worker, log_file)
+        exec_report = run_executor(executor, payloads, _log)
+
+    # Update report with execution results
+    report.update(exec_report)
+
+    if resume:
+        report = merge_resumed(report, reused, len(plan_jobs))
 
     # Aggregate metrics
     aggregate_report_metrics(report)
@@ -103,6 +103,14 @@ def launch_browser_with_fallback(playwright, prefer_edge: bool, launch_opts: dic
     Returns:
         Browser instance
     """
+    # Shared warm browser (DOU_BROWSER_DAEMON=1); only for plain headless runs
+    if launch_opts.get("headless", True) and not launch_opts.get("slow_mo"):
+        from dou_snaptrack.utils.browser_factory import BrowserFactory
+
+        browser = BrowserFactory.connect_shared(playwright, prefer_edge)
+        if browser is not None:
+            return browser
+
     # Try channels first
     channels = get_browser_channels(prefer_edge)
     browser = None
@@ -133,64 +141,6 @@ def launch_browser_with_fallback(playwright, prefer_edge: bool, launch_opts: dic
         return playwright.chromium.launch(**launch_opts)
 
 
-def create_route_blocker():
-    """Create a route blocking function for heavy resources.
-
-    Returns:
-        Function that can be used with context.route()
-    """
-
-    def _route_block_heavy(route):
-        try:
-            req = route.request
-            rtype = getattr(req, "resource_type", lambda: "")()
-            if rtype in ("image", "media", "font"):
-                return route.abort()
-
-            url = req.url
-            ul = url.lower()
-
-            # Block common static heavy types
-            if any(
-                ul.endswith(ext)
-                for ext in (
-                    ".png",
-                    ".jpg",
-                    ".jpeg",
-                    ".gif",
-                    ".webp",
-                    ".mp4",
-                    ".mp3",
-                    ".avi",
-                    ".mov",
-                    ".woff",
-                    ".woff2",
-                    ".ttf",
-                    ".otf",
-                )
-            ):
-                return route.abort()
-
-            # Block trackers and analytics
-            if any(
-                host in ul
-                for host in (
-                    "googletagmanager.com",
-                    "google-analytics.com",
-                    "doubleclick.net",
-                    "hotjar.com",
-                    "facebook.com/tr",
-                    "stats.g.doubleclick.net",
-                )
-            ):
-                return route.abort()
-        except Exception:
-            pass
-        return route.continue_()
-
-    return _route_block_heavy
-
-
 def setup_browser_context(browser, block_resources: bool = True) -> Any:
     """Set up browser context with resource blocking.
 
@@ -204,10 +154,10 @@ def setup_browser_context(browser, block_resources: bool = True) -> Any:
     context = browser.new_context(ignore_https_errors=True, viewport={"width": 1024, "height": 768})
 
     if block_resources:
-        try:
-            context.route("**/*", create_route_blocker())
-        except Exception:
-            pass
+        # Um único route por context (EditionRunnerService reaproveita o mesmo filtro)
+        from dou_utils.request_filter import install_request_filter
+
+        install_request_filter(context)
 
     return context
 
@@ -246,6 +196,9 @@ def extract_job_parameters(job: dict[str, Any], defaults: dict[str, Any], job_in
         "scroll_pause_ms": int(_get("scroll_pause_ms", "scroll_pause_ms", 150) or 150),
         "stable_rounds": int(_get("stable_rounds", "stable_rounds", 1) or 1),
         "detail_parallel": int(_get("detail_parallel", "detail_parallel", 1) or 1),
+        "detail_backend": _get("detail_backend", "detail_backend", None),
+        "detail_mode": _get("detail_mode", "detail_mode", None),
+        "listing_backend": _get("listing_backend", "listing_backend", None),
         "bulletin": job.get("bulletin") or defaults.get("bulletin"),
         "bulletin_out_pat": job.get("bulletin_out") or defaults.get("bulletin_out") or None,
         "repeat_delay_ms": int(job.get("repeat_delay_ms", defaults.get("repeat_delay_ms", 0))),
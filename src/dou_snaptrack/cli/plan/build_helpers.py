@@ -24,6 +24,14 @@ async def launch_browser_with_fallbacks(p, headful: bool, slowmo: int):
     """
     browser = None
 
+    # Shared warm browser (DOU_BROWSER_DAEMON=1), only for plain headless runs
+    if not headful and not slowmo:
+        from dou_snaptrack.utils.browser_factory import BrowserFactory
+
+        browser = await BrowserFactory.connect_shared_async(p)
+        if browser is not None:
+            return browser
+
     # Try Chrome channel
     try:
         browser = await p.chromium.launch(channel="chrome", headless=not headful, slow_mo=slowmo)
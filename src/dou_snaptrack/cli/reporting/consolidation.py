@@ -11,7 +11,7 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
-from dou_utils.content_fetcher import Fetcher
+from dou_utils.content_fetcher import Fetcher, normalize_enrich_mode
 from dou_utils.log_utils import get_logger
 
 from ...utils.text import sanitize_filename
@@ -96,13 +96,19 @@ def enrich_items(
         f"[ENRICH] deep-mode STRICT: items={len(agg)} parallel={fetch_parallel} timeout={fetch_timeout_sec}s "
         f"overwrite=True force_refresh={bool(fetch_force_refresh)} browser_fallback={bool(fetch_browser_fallback)} short_len_threshold={int(short_len_threshold)}"
     )
-    Fetcher(
+    fetcher = Fetcher(
         timeout_sec=fetch_timeout_sec,
         force_refresh=bool(fetch_force_refresh),
         use_browser_if_short=bool(fetch_browser_fallback),
         short_len_threshold=int(short_len_threshold),
         browser_timeout_sec=max(20, fetch_timeout_sec),
-    ).enrich_items(agg, max_workers=fetch_parallel, overwrite=True, min_len=None)  # type: ignore
+        pool_maxsize=fetch_parallel,
+    )
+    enrich = fetcher.enrich_items_async if normalize_enrich_mode(None) == "async" else fetcher.enrich_items
+    try:
+        enrich(agg, max_workers=fetch_parallel, overwrite=True, min_len=None)  # type: ignore
+    finally:
+        fetcher.close()
 
 
 def log_enrich_skip_reason(summary_lines: int, enrich_missing: bool, agg: list[dict[str, Any]]) -> None:
@@ -253,20 +253,27 @@ def enrich_items_with_fetcher(
         fetch_browser_fallback: Use browser fallback flag
         short_len_threshold: Short length threshold
     """
-    from dou_utils.content_fetcher import Fetcher
+    from dou_utils.content_fetcher import Fetcher, normalize_enrich_mode
 
     logger.info(
         f"[ENRICH] deep-mode STRICT: items={len(items)} parallel={fetch_parallel} timeout={fetch_timeout_sec}s "
         f"overwrite=True force_refresh={bool(fetch_force_refresh)} browser_fallback={bool(fetch_browser_fallback)} short_len_threshold={int(short_len_threshold)}"
     )
 
-    Fetcher(
+    fetcher = Fetcher(
         timeout_sec=fetch_timeout_sec,
         force_refresh=bool(fetch_force_refresh),
         use_browser_if_short=bool(fetch_browser_fallback),
         short_len_threshold=int(short_len_threshold),
         browser_timeout_sec=max(20, fetch_timeout_sec),
-    ).enrich_items(items, max_workers=fetch_parallel, overwrite=True, min_len=None)  # type: ignore
+        pool_maxsize=fetch_parallel,
+    )
+    # DOU_ENRICH_MODE=async: fetch_parallel vira o limite do semáforo do event loop
+    enrich = fetcher.enrich_items_async if normalize_enrich_mode(None) == "async" else fetcher.enrich_items
+    try:
+        enrich(items, max_workers=fetch_parallel, overwrite=True, min_len=None)  # type: ignore
+    finally:
+        fetcher.close()
 
 
 def enrich_groups_with_fetcher(
@@ -287,7 +294,7 @@ def enrich_groups_with_fetcher(
         fetch_browser_fallback: Use browser fallback flag
         short_len_threshold: Short length threshold
     """
-    from dou_utils.content_fetcher import Fetcher
+    from dou_utils.content_fetcher import Fetcher, normalize_enrich_mode
 
     total_items = sum(len(v) for v in groups.values())
     logger.info(
@@ -301,10 +308,15 @@ def enrich_groups_with_fetcher(
         use_browser_if_short=bool(fetch_browser_fallback),
         short_len_threshold=int(short_len_threshold),
         browser_timeout_sec=max(20, fetch_timeout_sec),
+        pool_maxsize=fetch_parallel,
     )
 
-    for items in groups.values():
-        fetcher.enrich_items(items, max_workers=fetch_parallel, overwrite=True, min_len=None)  # type: ignore
+    enrich = fetcher.enrich_items_async if normalize_enrich_mode(None) == "async" else fetcher.enrich_items
+    try:
+        for items in groups.values():
+            enrich(items, max_workers=fetch_parallel, overwrite=True, min_len=None)  # type: ignore
+    finally:
+        fetcher.close()
 
 
 def clean_enriched_items(items: list[dict[str, Any]]) -> None:
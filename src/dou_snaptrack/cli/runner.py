@@ -48,6 +48,10 @@ def run_once(context, date: str, secao: str,
              state_file: str | None, bulletin: str | None, bulletin_out: str | None,
              summary: SummaryConfig,
              detail_parallel: int = 1,
+             detail_backend: str | None = None,
+             detail_mode: str | None = None,
+             listing_backend: str | None = None,
+             snapshot_dir: str | None = None,
              page=None, keep_page_open: bool = False) -> dict[str, Any]:
 
     try:
@@ -57,6 +61,10 @@ def run_once(context, date: str, secao: str,
 
     summarizer = _make_summarizer(summary)
     runner = EditionRunnerService(context)
+    # Detalhes async: mesmo browser compartilhado (daemon) dos demais pontos de entrada
+    from ..utils.browser_factory import BrowserFactory
+
+    runner.connect_shared_browser = BrowserFactory.connect_shared_async
     params = EditionRunParams(
         date=str(date), secao=str(secao),
         key1=str(key1), key1_type=str(key1_type),
@@ -70,6 +78,10 @@ def run_once(context, date: str, secao: str,
         fallback_date_if_missing=bool(fallback_date_if_missing),
         dedup_state_file=state_file,
         detail_parallel=int(detail_parallel or 1),
+        detail_backend=detail_backend,
+        detail_mode=detail_mode,
+        listing_backend=listing_backend,
+        snapshot_dir=snapshot_dir,
         summary=bool(summary.lines and summary.lines > 0),
         summary_lines=int(summary.lines), summary_mode=str(summary.mode), summary_keywords=summary.keywords,
     )
@@ -3,14 +3,60 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import os
 import sys
 from pathlib import Path
 
 
+def _failure_result(payload: dict, error: Exception) -> dict:
+    fail_count = len(payload.get("indices", []) or [])
+    if not fail_count:
+        fail_count = len(payload.get("bucket_jobs", []) or [])
+    return {"ok": 0, "fail": fail_count, "items_total": 0, "outputs": [], "error": str(error)}
+
+
+def main_stream() -> int:
+    """Streaming mode: payload arrives on stdin, each job is reported as it finishes.
+
+    See ``dou_snaptrack.utils.stream_ipc`` for the protocol. A ``cancel`` message
+    (or the parent closing the pipe) stops the bucket before the next job.
+    """
+    from dou_snaptrack.utils.stream_ipc import PROTOCOL, ChildChannel
+
+    channel = ChildChannel()
+    channel.send("hello", protocol=PROTOCOL, pid=os.getpid())
+    msg = channel.receive()
+    if not msg or msg.get("type") != "run":
+        channel.send("error", error="expected 'run' message")
+        return 2
+    payload = msg.get("payload") or {}
+    channel.listen()
+
+    def _on_job(job_index: int, job_result: dict) -> None:
+        channel.send(
+            "job",
+            job_index=job_index,
+            ok=job_result.get("ok", 0),
+            fail=job_result.get("fail", 0),
+            items_total=job_result.get("items_total", 0),
+            outputs=job_result.get("outputs", []),
+        )
+
+    try:
+        from dou_snaptrack.cli.batch.runner import _worker_process  # type: ignore
+        result = _worker_process(payload, on_job=_on_job, should_stop=channel.cancelled.is_set)
+    except Exception as e:
+        print(f"[worker_entry] Execução do worker falhou: {e}", file=sys.stderr)
+        result = _failure_result(payload, e)
+    channel.send("done", result=result)
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run dou_snaptrack worker from payload JSON")
-    parser.add_argument("--payload", required=True, help="Path to payload JSON file")
-    parser.add_argument("--out", required=True, help="Path to write result JSON")
+    parser.add_argument("--payload", help="Path to payload JSON file")
+    parser.add_argument("--out", help="Path to write result JSON")
+    parser.add_argument("--stream", action="store_true", help="Read payload from stdin and stream job events")
     args = parser.parse_args()
 
     # Ensure Windows has proper event loop policy for Playwright
@@ -21,6 +67,11 @@ def main() -> int:
         except Exception:
             pass
 
+    if args.stream:
+        return main_stream()
+    if not args.payload or not args.out:
+        parser.error("--payload and --out are required without --stream")
+
     payload_path = Path(args.payload)
     out_path = Path(args.out)
     try:
@@ -34,10 +85,7 @@ def main() -> int:
         result = _worker_process(payload)
     except Exception as e:
         print(f"[worker_entry] Execução do worker falhou: {e}")
-        fail_count = len(payload.get("indices", []) or [])
-        if not fail_count:
-            fail_count = len(payload.get("bucket_jobs", []) or [])
-        result = {"ok": 0, "fail": fail_count, "items_total": 0, "outputs": [], "error": str(e)}
+        result = _failure_result(payload, e)
 
     try:
         out_path.parent.mkdir(parents=True, exist_ok=True)
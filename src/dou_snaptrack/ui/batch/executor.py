@@ -84,13 +84,19 @@ def _load_plan_config_cached(path_str: str, mtime_ns: int) -> dict[str, Any]:
 
 
 def _run_batch_with_cfg(
-    cfg_path: Path, parallel: int, fast_mode: bool = False, prefer_edge: bool = True
+    cfg_path: Path, parallel: int, fast_mode: bool = False, prefer_edge: bool = True, resume: bool = False
 ) -> dict[str, Any]:
     """Wrapper que delega para o runner livre de Streamlit para permitir uso headless e via UI."""
     try:
         from dou_snaptrack.ui.batch.runner import run_batch_with_cfg as _runner
 
-        return _runner(cfg_path, parallel=int(parallel), fast_mode=bool(fast_mode), prefer_edge=bool(prefer_edge))
+        return _runner(
+            cfg_path,
+            parallel=int(parallel),
+            fast_mode=bool(fast_mode),
+            prefer_edge=bool(prefer_edge),
+            resume=bool(resume),
+        )
     except Exception as e:
         st.error(f"Falha ao executar batch: {e}")
         return {}
@@ -155,11 +161,17 @@ def render_batch_executor() -> None:
     st.caption(f"Paralelismo recomendado: {suggested_workers} (baseado no hardware e plano)")
     st.caption("A captura do plano é sempre 'link-only' (sem detalhes/boletim); gere o boletim na aba correspondente.")
 
+    resume = st.checkbox(
+        "Retomar execução anterior",
+        value=False,
+        help="Pula os jobs já concluídos nesta data (checkpoint em resultados/<data>) e reaproveita seus resultados.",
+    )
+
     if st.button("Pesquisar Agora"):
-        _execute_plan(selected_path, recommend_parallel)
+        _execute_plan(selected_path, recommend_parallel, resume=resume)
 
 
-def _execute_plan(selected_path: Path, recommend_parallel) -> None:
+def _execute_plan(selected_path: Path, recommend_parallel, resume: bool = False) -> None:
     """Execute the selected plan with concurrency management."""
     from .executor_helpers import (
         check_concurrent_execution,
@@ -204,7 +216,7 @@ def _execute_plan(selected_path: Path, recommend_parallel) -> None:
     # Execute
     with st.spinner("Executando…"):
         st.caption(f"Iniciando captura… log em resultados/{override_date}/batch_run.log")
-        rep = _run_batch_with_cfg(pass_cfg_path, parallel, fast_mode=False, prefer_edge=True)
+        rep = _run_batch_with_cfg(pass_cfg_path, parallel, fast_mode=False, prefer_edge=True, resume=resume)
 
     # Show result
     show_execution_result(rep, parallel, st.session_state, st)
@@ -371,9 +371,12 @@ class _UILock:
 
 
 def run_batch_with_cfg(cfg_path: Path, parallel: int, fast_mode: bool = False, prefer_edge: bool = True,
-                       enforce_singleton: bool = True) -> dict[str, Any]:
+                       enforce_singleton: bool = True, resume: bool = False) -> dict[str, Any]:
     """Headless-safe wrapper to execute the batch without importing Streamlit UI.
 
+    With ``resume=True`` jobs already completed in the output directory's
+    checkpoint journal are skipped and their outputs reused.
+
     Returns the loaded report dict or {} if something failed.
     """
     try:
@@ -437,6 +440,7 @@ def run_batch_with_cfg(cfg_path: Path, parallel: int, fast_mode: bool = False, p
                     reuse_page=True,
                     parallel=int(parallel),
                     log_file=str(run_log_path),
+                    resume=bool(resume),
                 )
 
                 run_batch(p, args, SummaryConfig(lines=4, mode="center", keywords=None))
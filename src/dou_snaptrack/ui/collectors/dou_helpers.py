@@ -5,14 +5,17 @@ This module contains extracted functions from main_async to reduce complexity.
 
 from __future__ import annotations
 
+import contextlib
 import json
-import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
 
 async def launch_browser_with_channels(p, prefer_edge: bool, log_fn) -> Any | None:
-    """Launch browser trying different channels.
+    """Launch browser trying the shared daemon, then the system channels.
 
     Args:
         p: Playwright instance
@@ -22,43 +25,10 @@ async def launch_browser_with_channels(p, prefer_edge: bool, log_fn) -> Any | No
     Returns:
         Browser instance or None
     """
-    channels = ("msedge", "chrome") if prefer_edge else ("chrome", "msedge")
-
-    # Defaults: QUIC e HTTP/2 desligados para reduzir erros intermitentes em ambientes com proxy/inspeção SSL.
-    # Override:
-    # - DOU_DISABLE_QUIC=0 para permitir QUIC
-    # - DOU_DISABLE_HTTP2=0 para permitir HTTP/2
-    disable_quic = (os.environ.get("DOU_DISABLE_QUIC", "1").strip() or "1").lower() in ("1", "true", "yes")
-    disable_http2 = (os.environ.get("DOU_DISABLE_HTTP2", "1").strip() or "1").lower() in ("1", "true", "yes")
-
-    base_args = [
-        "--disable-blink-features=AutomationControlled",
-        "--disable-background-timer-throttling",
-        "--disable-renderer-backgrounding",
-    ]
-    if disable_quic:
-        base_args.append("--disable-quic")
-    if disable_http2:
-        base_args.append("--disable-http2")
-
-    if disable_quic or disable_http2:
-        log_fn(
-            f"[DOU] browser flags: disable_quic={int(disable_quic)} disable_http2={int(disable_http2)}"
-        )
-
-    for channel in channels:
-        try:
-            browser = await p.chromium.launch(
-                channel=channel,
-                headless=True,
-                args=base_args,
-            )
-            log_fn(f"✓ Browser {channel} iniciado")
-            return browser
-        except Exception:
-            continue
+    from dou_snaptrack.utils.browser_factory import BrowserFactory
+    from dou_utils.browser_launch import launch_browser_with_channels as launch
 
-    return None
+    return await launch(p, prefer_edge, log_fn, connect_shared=BrowserFactory.connect_shared_async)
 
 
 async def create_worker_contexts(browser, actual_workers: int, goto_timeout: int) -> tuple[list, list]:
@@ -72,6 +42,8 @@ async def create_worker_contexts(browser, actual_workers: int, goto_timeout: int
     Returns:
         Tuple of (contexts, pages)
     """
+    from dou_utils.request_filter import install_request_filter_async
+
     contexts = []
     pages = []
 
@@ -82,10 +54,8 @@ async def create_worker_contexts(browser, actual_workers: int, goto_timeout: int
         )
         ctx.set_default_timeout(goto_timeout)
 
-        # Block heavy resources
-        await ctx.route("**/*.{png,jpg,jpeg,gif,webp,mp4,woff,woff2,ttf,otf}", lambda route: route.abort())
-        await ctx.route("**/*analytics*", lambda route: route.abort())
-        await ctx.route("**/*googletagmanager*", lambda route: route.abort())
+        # Block heavy resources (single route per context)
+        await install_request_filter_async(ctx)
 
         page = await ctx.new_page()
         contexts.append(ctx)
@@ -94,6 +64,79 @@ async def create_worker_contexts(browser, actual_workers: int, goto_timeout: int
     return contexts, pages
 
 
+class EditionPageCache:
+    """Warmed pages of one worker, one per edition (date, secao).
+
+    Jobs of the same edition reuse the page already on ``leiturajornal`` and only
+    re-select the órgão. Pages are created lazily in the worker's context and the
+    least recently used one is reassigned when ``max_pages`` is exceeded.
+
+    A page that was closed (renderer crash) or has served ``max_uses`` jobs is
+    replaced by a fresh one (0 = no use limit), which bounds renderer memory on
+    long runs.
+    """
+
+    def __init__(self, context, first_page, max_pages: int = 2, max_uses: int = 0):
+        self.context = context
+        self.max_pages = max(1, max_pages)
+        self.max_uses = max(0, max_uses)
+        self._spare: list = [first_page] if first_page is not None else []
+        self._pages: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._warm: set[tuple[str, str]] = set()
+        self._uses: dict[int, int] = {}
+        self.stats = {"navigations": 0, "reuses": 0}
+
+    @property
+    def editions(self) -> list[tuple[str, str]]:
+        return list(self._pages)
+
+    async def acquire(self, edition: tuple[str, str]) -> tuple[Any, bool]:
+        """Return (page, warm) for the edition, creating or evicting pages as needed."""
+        page = self._pages.get(edition)
+        if page is not None:
+            self._pages.move_to_end(edition)
+        else:
+            if self._spare:
+                page = self._spare.pop()
+            elif len(self._pages) >= self.max_pages:
+                old_edition, page = self._pages.popitem(last=False)
+                self._warm.discard(old_edition)
+            else:
+                page = await self.context.new_page()
+            self._pages[edition] = page
+
+        page = await self._recycle_if_needed(edition, page)
+        self._uses[id(page)] = self._uses.get(id(page), 0) + 1
+        warm = edition in self._warm
+        self.stats["reuses" if warm else "navigations"] += 1
+        return page, warm
+
+    async def _recycle_if_needed(self, edition: tuple[str, str], page):
+        crashed = False
+        with contextlib.suppress(Exception):
+            crashed = page.is_closed()
+        worn = bool(self.max_uses) and self._uses.get(id(page), 0) >= self.max_uses
+        if not (crashed or worn):
+            return page
+        reason = "crashed" if crashed else "recycled"
+        self.stats[reason] = self.stats.get(reason, 0) + 1
+        self._uses.pop(id(page), None)
+        if not crashed:
+            with contextlib.suppress(Exception):
+                await page.close()
+        fresh = await self.context.new_page()
+        self._pages[edition] = fresh
+        self._warm.discard(edition)
+        return fresh
+
+    def release(self, edition: tuple[str, str], warm: bool) -> None:
+        """Record whether the page is left on the edition and ready for re-selection."""
+        if warm:
+            self._warm.add(edition)
+        else:
+            self._warm.discard(edition)
+
+
 async def cleanup_browser_resources(contexts: list, browser) -> None:
     """Clean up browser contexts and browser.
 
@@ -117,7 +160,7 @@ def calculate_statistics(results: list) -> dict[str, Any]:
     """
     successful = [r for r in results if r.success]
     failed = [r for r in results if not r.success]
-    total_items = sum(len(r.items) for r in successful)
+    total_items = sum(r.item_count for r in successful)
 
     return {
         "successful": successful,
@@ -153,23 +196,22 @@ def log_final_results(stats: dict[str, Any], jobs_count: int, elapsed: float, lo
     if stats['successful']:
         log_fn("Jobs bem sucedidos:")
         for r in stats['successful']:
-            log_fn(f"  - {r.job_id}: {len(r.items)} items em {r.elapsed:.1f}s")
+            log_fn(f"  - {r.job_id}: {r.item_count} items em {r.elapsed:.1f}s")
 
     log_fn(f"{'='*60}")
 
 
-def save_job_outputs(successful_results: list, out_dir: str, out_pattern: str) -> list[str]:
-    """Save individual job outputs to files.
+def write_job_output(r, out_dir: str, out_pattern: str) -> str:
+    """Write one successful job's output file.
 
     Args:
-        successful_results: List of successful JobResult objects
+        r: Successful JobResult
         out_dir: Output directory
         out_pattern: Output filename pattern
 
     Returns:
-        List of output file paths
+        Output file path
     """
-    outputs = []
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
@@ -181,35 +223,156 @@ def save_job_outputs(successful_results: list, out_dir: str, out_pattern: str) -
         def sanitize_filename(s: str) -> str:
             return re.sub(r'[<>:"/\\|?*]', '_', str(s or ''))
 
-    for r in successful_results:
-        # Build filename
-        tokens = {
-            "topic": r.topic or "job",
-            "secao": r.secao or "DO",
-            "date": (r.date or "").replace("/", "-"),
-            "idx": str(r.job_index),
-            "key1": r.key1 or "",
-            "key2": r.key2 or "",
-        }
-        name = out_pattern
-        for k, v in tokens.items():
-            name = name.replace("{" + k + "}", sanitize_filename(str(v)))
-
-        file_path = out_path / name
-        output_data = {
-            "data": r.date,
-            "secao": r.secao,
-            "key1": r.key1,
-            "key2": r.key2,
-            "topic": r.topic,
-            "total": len(r.items),
-            "itens": r.items,
-            "_timings": r.timings
-        }
-        file_path.write_text(json.dumps(output_data, ensure_ascii=False, indent=2), encoding="utf-8")
-        outputs.append(str(file_path))
+    # Build filename
+    tokens = {
+        "topic": r.topic or "job",
+        "secao": r.secao or "DO",
+        "date": (r.date or "").replace("/", "-"),
+        "idx": str(r.job_index),
+        "key1": r.key1 or "",
+        "key2": r.key2 or "",
+    }
+    name = out_pattern
+    for k, v in tokens.items():
+        name = name.replace("{" + k + "}", sanitize_filename(str(v)))
+
+    file_path = out_path / name
+    output_data = {
+        "data": r.date,
+        "secao": r.secao,
+        "key1": r.key1,
+        "key2": r.key2,
+        "topic": r.topic,
+        "total": len(r.items),
+        "itens": r.items,
+        "_timings": r.timings
+    }
+    file_path.write_text(json.dumps(output_data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(file_path)
+
+
+def save_job_outputs(successful_results: list, out_dir: str, out_pattern: str) -> list[str]:
+    """Save individual job outputs to files.
+
+    Args:
+        successful_results: List of successful JobResult objects
+        out_dir: Output directory
+        out_pattern: Output filename pattern
+
+    Returns:
+        List of output file paths
+    """
+    return [write_job_output(r, out_dir, out_pattern) for r in successful_results]
+
+
+# Journal da execução fast-async, gravado dentro de out_dir
+RUN_JOURNAL_NAME = "_run_journal.ndjson"
+
+
+@dataclass
+class JobSummary:
+    """Job result as recorded in the run journal (no items, only their count)."""
+
+    job_id: str
+    job_index: int
+    success: bool
+    item_count: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+    timings: dict = field(default_factory=dict)
+    output: str | None = None
+    date: str = ""
+    secao: str = ""
+    key1: str = ""
+    key2: str = ""
+    topic: str = ""
+
+
+def summarize_job(r, output: str | None = None) -> JobSummary:
+    """Drop the items of a finished JobResult, keeping what the report needs."""
+    return JobSummary(
+        job_id=r.job_id,
+        job_index=r.job_index,
+        success=r.success,
+        item_count=r.item_count,
+        elapsed=r.elapsed,
+        error=r.error,
+        timings=r.timings,
+        output=output,
+        date=r.date,
+        secao=r.secao,
+        key1=r.key1,
+        key2=r.key2,
+        topic=r.topic,
+    )
+
+
+class RunJournal:
+    """Append-only NDJSON journal of a fast-async run.
+
+    One line per finished job, written (and flushed) as soon as the job completes,
+    so a killed run still leaves its finished jobs on disk and the UI can tail the
+    file for progress. The final report is rebuilt from this file.
+
+    Each run appends its own section starting with a ``start`` event, so the
+    journals of earlier runs stay on disk; ``read_journal`` only reads the last
+    section.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+        # Run anterior morto no meio de uma linha: não colar o "start" desta execução nela
+        if self._fh.tell() and not self._ends_with_newline():
+            self._fh.write("\n")
+
+    def _ends_with_newline(self) -> bool:
+        with self.path.open("rb") as fh:
+            fh.seek(-1, 2)
+            return fh.read(1) == b"\n"
+
+    def write(self, event: dict[str, Any]) -> None:
+        self._fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def start(self, total_jobs: int) -> None:
+        self.write({"event": "start", "total_jobs": total_jobs, "ts": time.time()})
+
+    def record_job(self, entry: JobSummary) -> None:
+        self.write({"event": "job", **asdict(entry)})
+
+    def close(self, **summary: Any) -> None:
+        if self._fh.closed:
+            return
+        self.write({"event": "end", "ts": time.time(), **summary})
+        self._fh.close()
 
-    return outputs
+
+def read_journal(path: str | Path) -> list[JobSummary]:
+    """Read the job entries of the last run in a journal, ordered by job index.
+
+    Entries before the last ``start`` event belong to earlier runs and are
+    skipped. A truncated line (process killed mid-write) is ignored.
+    """
+    entries: dict[int, JobSummary] = {}
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    fields = JobSummary.__dataclass_fields__
+    for line in lines:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get("event") == "start":
+            entries.clear()
+        if event.get("event") != "job":
+            continue
+        entry = JobSummary(**{k: v for k, v in event.items() if k in fields})
+        entries[entry.job_index] = entry
+    return [entries[k] for k in sorted(entries)]
 
 
 def build_final_result(stats: dict[str, Any], outputs: list[str], elapsed: float) -> dict[str, Any]:
@@ -245,7 +408,7 @@ def build_final_result(stats: dict[str, Any], outputs: list[str], elapsed: float
                     "secao": r.secao,
                     "key1": r.key1,
                     "key2": r.key2,
-                    "items": len(r.items),
+                    "items": r.item_count,
                     "elapsed_sec": r.elapsed,
                     "timings": r.timings,
                 }
@@ -254,3 +417,20 @@ def build_final_result(stats: dict[str, Any], outputs: list[str], elapsed: float
             "summary": {}
         }
     }
+
+
+def report_from_journal(path: str | Path, elapsed: float = 0.0) -> dict[str, Any] | None:
+    """Build the final result dictionary from a run journal.
+
+    Used at the end of a run and, for partial results, when the collector
+    subprocess was killed (timeout) before writing its result file.
+
+    Returns:
+        Final result dictionary, or None if the journal has no finished jobs.
+    """
+    entries = read_journal(path)
+    if not entries:
+        return None
+    stats = calculate_statistics(entries)
+    outputs = [e.output for e in stats["successful"] if e.output]
+    return build_final_result(stats, outputs, elapsed)
@@ -16,27 +16,98 @@ Recebe via variável de ambiente INPUT_JSON_PATH ou stdin:
     "max_workers": 4,
     "defaults": {...},
     "out_dir": "path",
-    "out_pattern": "{topic}_{secao}_{date}_{idx}.json"
+    "out_pattern": "{topic}_{secao}_{date}_{idx}.json",
+    "cost_hints_path": "logs/_cache/dou_job_costs.json",  (opcional)
+    "max_workers_cap": 8,  (opcional; teto do controle adaptativo)
+    "journal_path": "out_dir/_run_journal.ndjson"  (opcional)
 }
 
+Jobs são consumidos de uma fila compartilhada (ver dou_scheduler.JobScheduler).
+O número de workers ativos parte de ``max_workers`` e é ajustado em tempo real
+(AIMD, ver dou_scheduler.ConcurrencyController); DOU_ADAPTIVE_CONCURRENCY=0 fixa o nível.
+
+Com a listagem HTTP (padrão; DOU_LISTING_BACKEND=browser desliga) a página de
+cada edição é baixada uma vez e os jobs são respondidos filtrando o payload
+``<script id="params">`` em memória (dou_utils.edition_listing); o browser só
+atende jobs que o payload não resolve ou edições cujo download/parse falhou.
+A listagem fica em ``out_dir/_editions`` (dou_utils.edition_snapshot) e é
+reaproveitada por outros processos do mesmo plano.
+
+Cada job é gravado assim que termina (arquivo do out_pattern + uma linha no
+journal NDJSON); o relatório final é montado a partir do journal.
+
 Escreve resultado em RESULT_JSON_PATH.
+
+Com ``--stream`` (ver utils.stream_ipc) o input chega por stdin na mensagem
+``run``; cada job vira um evento ``job`` no stdout assim que termina, o pai
+pode enviar mais jobs (``jobs``) até ``close`` ou cancelar (``cancel``), e o
+resultado final vai no evento ``done``.
 """
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import os
 import sys
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
+from dou_snaptrack.utils.wait_helpers import arm_listing_watch_async, wait_for_listing_stable_async
+
 # Constantes otimizadas baseadas em testes
 DEFAULT_WORKERS = 4  # Ótimo baseado em benchmarks (16 jobs em ~40s)
 GOTO_TIMEOUT = 60000
 SELECT_TIMEOUT = 30000
-REPOP_WAIT_MS = 2000
+REPOP_WAIT_MS = 2000  # teto da espera por repopulação (event-driven)
+REPOP_QUIET_MS = 300  # listagem sem mutações por este tempo = estável
 CONTENT_TIMEOUT = 10000
+CONTENT_TIMEOUT_SETTLED = 2000
+# Páginas aquecidas (uma por edição) mantidas por worker
+EDITION_PAGES_PER_WORKER = int(os.environ.get("DOU_EDITION_PAGES_PER_WORKER", "2") or "2")
+# Jobs por página antes de recriá-la (mesmo knob do pool de páginas de detalhe)
+PAGE_MAX_USES = int(os.environ.get("DOU_PAGE_MAX_USES", "50") or "50")
+# Controle adaptativo de concorrência (AIMD) e seu teto padrão
+ADAPTIVE_CONCURRENCY = (os.environ.get("DOU_ADAPTIVE_CONCURRENCY", "1").strip() or "1").lower() in ("1", "true", "yes")
+MAX_WORKERS_CAP = int(os.environ.get("DOU_MAX_WORKERS_CAP", "8") or "8")
+
+# Reset rápido antes de cada seleção em página reaproveitada: as âncoras atuais
+# viram "antigas" e a espera por conteúdo só aceita âncoras renderizadas após a
+# nova seleção.
+RESET_LISTING_JS = """() => {
+    for (const a of document.querySelectorAll("a[href*='/web/dou/']")) a.dataset.douStale = '1';
+    window.scrollTo(0, 0);
+}"""
+ANCHOR_SELECTOR = "a[href*='/web/dou/']"
+FRESH_ANCHOR_SELECTOR = "a[href*='/web/dou/']:not([data-dou-stale])"
+STALE_ANCHOR_SELECTOR = "a[href*='/web/dou/'][data-dou-stale]"
+COUNT_ANCHORS_JS = "(selector) => document.querySelectorAll(selector).length"
+# Texto da opção selecionada no primeiro dropdown (órgão atual da página)
+SELECTED_LABEL_JS = "(sel) => (sel.options[sel.selectedIndex]?.textContent || '').trim()"
+
+# Links (deduplicados por href) das âncoras que casam com o seletor recebido
+COLLECT_LINKS_JS = """(selector) => {
+    const links = [];
+    const seen = new Set();
+    for (const a of document.querySelectorAll(selector)) {
+        const href = a.href;
+        if (seen.has(href)) continue;
+        seen.add(href);
+
+        // Extrair título
+        const container = a.closest('article, .card, section, div');
+        const titleEl = container?.querySelector('.title, .titulo, h2, h3, h4');
+        const title = titleEl?.textContent?.trim() || a.textContent?.trim() || '';
+
+        links.push({link: href, titulo: title, detail_url: href});
+    }
+    return links;
+}"""
+
+
+def edition_url(date_str: str, secao: str) -> str:
+    return f"https://www.in.gov.br/leiturajornal?data={date_str}&secao={secao}"
 
 
 @dataclass
@@ -49,6 +120,11 @@ class JobResult:
     elapsed: float = 0.0
     error: str | None = None
     timings: dict = field(default_factory=dict)
+    retries: int = 0  # navegações repetidas (timeouts/HTTP2), sinal de throttling
+
+    @property
+    def item_count(self) -> int:
+        return len(self.items)
 
     # Metadata para output file
     date: str = ""
@@ -73,17 +149,163 @@ def _log(msg: str, level: str = "INFO") -> None:
     print(f"[{level}] {msg}", file=sys.stderr, flush=True)
 
 
+async def _goto_edition(page, url: str, prefix: str, job_id: str) -> int:
+    """Navega para a página da edição.
+
+    Returns:
+        Número de tentativas que falharam antes do sucesso.
+    """
+    # Alguns ambientes corporativos/proxies podem causar erros HTTP/2 intermitentes.
+    # Fallback: retry com wait_until alternativo e pequena espera.
+    goto_err: Exception | None = None
+    for attempt in range(3):
+        wait_until = "domcontentloaded" if attempt == 0 else "load"
+        try:
+            await page.goto(url, wait_until=wait_until, timeout=GOTO_TIMEOUT)
+            goto_err = None
+            break
+        except Exception as e:
+            goto_err = e
+            msg = str(e)
+            if "ERR_HTTP2_PROTOCOL_ERROR" in msg:
+                _log(
+                    f"{prefix} [{job_id}] HTTP2 error no goto (tentativa {attempt+1}/3). "
+                    "Dica: setar DOU_DISABLE_HTTP2=1 e/ou DOU_DISABLE_QUIC=1.",
+                    "WARN",
+                )
+            # backoff curto antes de tentar novamente
+            await page.wait_for_timeout(500 * (attempt + 1))
+
+    if goto_err is not None:
+        raise goto_err
+    return attempt
+
+
+async def _reload_edition(page, url: str, prefix: str, job_id: str) -> int:
+    """Recarrega a edição (página volta ao estado cold) e aguarda os dropdowns.
+
+    Returns:
+        Número de tentativas de navegação que falharam.
+    """
+    retries = await _goto_edition(page, url, prefix, job_id)
+    await page.wait_for_selector("select", timeout=SELECT_TIMEOUT)
+    return retries
+
+
+async def _prepare_listing(page, mark_stale: bool = True) -> None:
+    """Reset rápido da listagem + observador de repopulação (antes de cada seleção)."""
+    if mark_stale:
+        await page.evaluate(RESET_LISTING_JS)
+    await arm_listing_watch_async(page)
+
+
+async def _selected_key1(page) -> str:
+    """Órgão atualmente selecionado no primeiro dropdown ("" se não der para ler)."""
+    try:
+        selects = await page.query_selector_all("select")
+        if not selects:
+            return ""
+        return str(await page.evaluate(SELECTED_LABEL_JS, selects[0]) or "")
+    except Exception:
+        return ""
+
+
+async def _select_key1(page, key1: str) -> bool:
+    """Seleciona o órgão no primeiro dropdown (label exato, depois match parcial).
+
+    Returns:
+        False se a opção não existe na edição; exceções indicam página quebrada.
+    """
+    selects = await page.query_selector_all("select")
+    if len(selects) < 1:
+        raise RuntimeError("Nenhum select encontrado")
+
+    try:
+        await page.select_option("select:first-of-type", label=key1, timeout=10000)
+        return True
+    except Exception:
+        # Fallback: procurar match parcial
+        options = await page.evaluate("""(sel) => {
+            return Array.from(sel.options).map(o => ({
+                value: o.value,
+                text: o.textContent.trim()
+            }));
+        }""", selects[0])
+
+    target = None
+    for opt in options:
+        if key1.lower() in opt.get("text", "").lower():
+            target = opt
+            break
+    if not target:
+        return False
+
+    await page.select_option("select:first-of-type", value=target["value"], timeout=10000)
+    return True
+
+
+async def _select_listing(page, key1: str, fresh_only: bool, timings: dict) -> tuple[bool, bool]:
+    """Seleciona o órgão e aguarda a listagem repopular.
+
+    Com ``fresh_only`` as âncoras atuais (do job anterior) são marcadas antes da
+    seleção e só as renderizadas depois dela contam como conteúdo.
+
+    Returns:
+        (opção existe na edição, listagem utilizável). A listagem não é
+        utilizável quando nenhuma âncora nova apareceu mas há âncoras marcadas:
+        a página filtrou os nós existentes ou não reconstruiu a lista, e só
+        recarregando dá para distinguir isso de um órgão sem atos.
+    """
+    t0 = time.perf_counter()
+    await _prepare_listing(page, mark_stale=fresh_only)
+    timings["dom_reset"] = round(time.perf_counter() - t0, 2)
+
+    t0 = time.perf_counter()
+    found = await _select_key1(page, key1)
+    timings["select"] = round(time.perf_counter() - t0, 2)
+    if not found:
+        return False, True
+
+    # Aguardar repopulação: resolve quando a listagem estabiliza (REPOP_WAIT_MS é só o teto)
+    t0 = time.perf_counter()
+    settled = await wait_for_listing_stable_async(page, max_wait_ms=REPOP_WAIT_MS, quiet_ms=REPOP_QUIET_MS)
+    timings["repop_wait"] = round(time.perf_counter() - t0, 2)
+
+    # Aguardar conteúdo carregar (listagem já estável: espera curta, p.ex. órgão sem atos)
+    t0 = time.perf_counter()
+    has_content = True
+    try:
+        await page.wait_for_selector(
+            FRESH_ANCHOR_SELECTOR if fresh_only else ANCHOR_SELECTOR,
+            timeout=CONTENT_TIMEOUT_SETTLED if settled else CONTENT_TIMEOUT,
+        )
+    except Exception:
+        has_content = False
+    timings["wait_content"] = round(time.perf_counter() - t0, 2)
+
+    if fresh_only and not has_content:
+        with contextlib.suppress(Exception):
+            if await page.evaluate(COUNT_ANCHORS_JS, STALE_ANCHOR_SELECTOR):
+                return True, False
+    return True, True
+
+
 async def collect_dou_job(
     page,
     job: dict,
     job_index: int,
     worker_id: int,
-    defaults: dict
+    defaults: dict,
+    warm: bool = False,
 ) -> JobResult:
     """
     Coleta links do DOU para um único job usando seletores hierárquicos.
 
-    Versão simplificada e otimizada para paralelismo.
+    Versão simplificada e otimizada para paralelismo. Com ``warm=True`` a página
+    já está na edição (data, seção) do job: pula a navegação e, se o órgão já
+    está selecionado (jobs seguidos que variam só key2), coleta a listagem atual.
+    Senão faz um reset rápido da listagem e re-seleciona o órgão, recarregando a
+    edição se a seleção falhar ou não produzir âncoras novas.
     """
     job_id = job.get("id") or job.get("topic") or f"job_{job_index}"
     date_str = job.get("data") or job.get("date") or defaults.get("data", "")
@@ -108,118 +330,56 @@ async def collect_dou_job(
     )
 
     try:
-        # Navegar para página do DOU
-        url = f"https://www.in.gov.br/leiturajornal?data={date_str}&secao={secao}"
-        _log(f"{prefix} [{job_id}] Navegando para {url}", "DEBUG")
-
-        t0 = time.perf_counter()
-        # Alguns ambientes corporativos/proxies podem causar erros HTTP/2 intermitentes.
-        # Fallback: retry com wait_until alternativo e pequena espera.
-        goto_err: Exception | None = None
-        for attempt in range(3):
-            wait_until = "domcontentloaded" if attempt == 0 else "load"
+        url = edition_url(date_str, secao)
+        if not warm:
+            t0 = time.perf_counter()
+            _log(f"{prefix} [{job_id}] Navegando para {url}", "DEBUG")
+            result.retries += await _goto_edition(page, url, prefix, job_id)
+            timings["goto"] = round(time.perf_counter() - t0, 2)
+
+            # Aguardar dropdowns carregarem
+            t0 = time.perf_counter()
+            await page.wait_for_selector("select", timeout=SELECT_TIMEOUT)
+            timings["wait_select"] = round(time.perf_counter() - t0, 2)
+
+        # Página reaproveitada: só âncoras renderizadas após esta seleção contam
+        fresh_only = warm
+        if warm and key1 and await _selected_key1(page) == key1:
+            # Mesmo órgão do job anterior nesta página: a listagem já é a dele
+            _log(f"{prefix} [{job_id}] Órgão já selecionado na página reaproveitada", "DEBUG")
+            found, usable, fresh_only = True, True, False
+        else:
             try:
-                await page.goto(url, wait_until=wait_until, timeout=GOTO_TIMEOUT)
-                goto_err = None
-                break
+                found, usable = await _select_listing(page, key1, fresh_only, timings)
             except Exception as e:
-                goto_err = e
-                msg = str(e)
-                if "ERR_HTTP2_PROTOCOL_ERROR" in msg:
-                    _log(
-                        f"{prefix} [{job_id}] HTTP2 error no goto (tentativa {attempt+1}/3). "
-                        "Dica: setar DOU_DISABLE_HTTP2=1 e/ou DOU_DISABLE_QUIC=1.",
-                        "WARN",
-                    )
-                # backoff curto antes de tentar novamente
-                await page.wait_for_timeout(500 * (attempt + 1))
-
-        if goto_err is not None:
-            raise goto_err
-        timings["goto"] = round(time.perf_counter() - t0, 2)
-
-        # Aguardar dropdowns carregarem
-        t0 = time.perf_counter()
-        await page.wait_for_selector("select", timeout=SELECT_TIMEOUT)
-        timings["wait_select"] = round(time.perf_counter() - t0, 2)
-
-        # Encontrar selects
-        selects = await page.query_selector_all("select")
-        if len(selects) < 1:
-            result.error = "Nenhum select encontrado"
-            result.elapsed = time.perf_counter() - start
+                if not warm:
+                    raise
+                # Página reaproveitada em estado inesperado: recarregar a edição e tentar de novo
+                _log(f"{prefix} [{job_id}] Seleção falhou na página reaproveitada ({e}); recarregando", "WARN")
+                found, usable = False, False
+
+            if not usable:
+                if fresh_only and found:
+                    _log(f"{prefix} [{job_id}] Seleção não gerou âncoras novas na página reaproveitada; recarregando", "WARN")
+                t0 = time.perf_counter()
+                result.retries += await _reload_edition(page, url, prefix, job_id)
+                timings["reload"] = round(time.perf_counter() - t0, 2)
+                fresh_only = False
+                found, _ = await _select_listing(page, key1, fresh_only, timings)
+
+        if not found:
+            # Opção não encontrada - retornar sucesso com 0 itens (não é erro fatal)
+            _log(f"{prefix} [{job_id}] Opção não encontrada no dropdown: '{key1}' - retornando 0 itens", "WARN")
+            result.success = True
+            result.items = []
+            result.elapsed = round(time.perf_counter() - start, 2)
+            result.timings = timings
             return result
 
-        # Selecionar ministério/órgão
-        t0 = time.perf_counter()
-        try:
-            await page.select_option("select:first-of-type", label=key1, timeout=10000)
-        except Exception:
-            # Fallback: procurar match parcial
-            select1 = selects[0]
-            options = await page.evaluate("""(sel) => {
-                return Array.from(sel.options).map(o => ({
-                    value: o.value,
-                    text: o.textContent.trim()
-                }));
-            }""", select1)
-
-            target = None
-            for opt in options:
-                if key1.lower() in opt.get("text", "").lower():
-                    target = opt
-                    break
-
-            if not target:
-                # Opção não encontrada - retornar sucesso com 0 itens (não é erro fatal)
-                _log(f"{prefix} [{job_id}] Opção não encontrada no dropdown: '{key1}' - retornando 0 itens", "WARN")
-                result.success = True
-                result.items = []
-                result.elapsed = round(time.perf_counter() - start, 2)
-                result.timings = timings
-                return result
-
-            await page.select_option("select:first-of-type", value=target["value"], timeout=10000)
-        timings["select"] = round(time.perf_counter() - t0, 2)
-
-        # Aguardar repopulação
-        t0 = time.perf_counter()
-        await page.wait_for_timeout(REPOP_WAIT_MS)
-        timings["repop_wait"] = round(time.perf_counter() - t0, 2)
-
-        # Aguardar conteúdo carregar
-        t0 = time.perf_counter()
-        import contextlib
-        with contextlib.suppress(Exception):
-            await page.wait_for_selector("a[href*='/web/dou/']", timeout=CONTENT_TIMEOUT)
-        timings["wait_content"] = round(time.perf_counter() - t0, 2)
-
         # Coletar links
         t0 = time.perf_counter()
-        items = await page.evaluate("""() => {
-            const links = [];
-            const seen = new Set();
-            const anchors = document.querySelectorAll("a[href*='/web/dou/']");
-
-            for (const a of anchors) {
-                const href = a.href;
-                if (seen.has(href)) continue;
-                seen.add(href);
-
-                // Extrair título
-                const container = a.closest('article, .card, section, div');
-                const titleEl = container?.querySelector('.title, .titulo, h2, h3, h4');
-                const title = titleEl?.textContent?.trim() || a.textContent?.trim() || '';
-
-                links.push({
-                    link: href,
-                    titulo: title,
-                    detail_url: href
-                });
-            }
-
-            return links;
-        }""")
+        # Página reaproveitada: as âncoras "antigas" são do job anterior
+        items = await page.evaluate(COLLECT_LINKS_JS, FRESH_ANCHOR_SELECTOR if fresh_only else ANCHOR_SELECTOR)
         timings["collect"] = round(time.perf_counter() - t0, 2)
 
         result.success = True
@@ -239,48 +399,164 @@ async def collect_dou_job(
     return result
 
 
-async def worker_task(
+async def collect_dou_job_http(
+    job: dict,
+    job_index: int,
     worker_id: int,
-    page,
-    jobs_with_indices: list[tuple[int, dict]],
-    results: list[JobResult],
-    lock: asyncio.Lock,
-    defaults: dict
-):
-    """Worker que processa uma lista de jobs sequencialmente."""
-    _log(f"[W{worker_id}] Iniciando com {len(jobs_with_indices)} jobs...")
+    defaults: dict,
+    snapshot_dir: str | None = None,
+) -> JobResult | None:
+    """Responde o job pela listagem HTTP da edição (um GET por edição no processo).
+
+    Filtra só pelo órgão (key1), como collect_dou_job faz no dropdown. Com
+    ``snapshot_dir`` (out_dir do plano) a listagem é compartilhada com outros
+    processos via ``<out_dir>/_editions`` (ver dou_utils.edition_snapshot).
+
+    Returns:
+        JobResult, ou None para seguir pelo browser
+    """
+    try:
+        from dou_utils.edition_listing import LISTING_HTTP, get_edition_listing, normalize_listing_backend
+    except Exception:
+        return None
+    if normalize_listing_backend(job.get("listing_backend") or defaults.get("listing_backend")) != LISTING_HTTP:
+        return None
+
+    date_str, secao = job_edition(job, defaults)
+    key1 = job.get("key1") or ""
+    start = time.perf_counter()
+    listing = await asyncio.to_thread(get_edition_listing, date_str, secao, snapshot_dir)
+    items = listing.filter(key1) if listing is not None else None
+    if items is None:
+        return None
+
+    job_id = job.get("id") or job.get("topic") or f"job_{job_index}"
+    elapsed = round(time.perf_counter() - start, 2)
+    _log(f"[W{worker_id}] [{job_id}] ✓ {len(items)} items via listagem HTTP em {elapsed:.1f}s")
+    return JobResult(
+        job_id=job_id,
+        job_index=job_index,
+        success=True,
+        items=items,
+        elapsed=elapsed,
+        timings={"http_listing": elapsed},
+        date=date_str,
+        secao=secao,
+        key1=key1,
+        key2=job.get("key2") or "Todos",
+        topic=job.get("topic") or key1,
+    )
 
-    for job_index, job in jobs_with_indices:
-        result = await collect_dou_job(page, job, job_index, worker_id, defaults)
-        async with lock:
-            results.append(result)
 
-    _log(f"[W{worker_id}] Finalizado")
+async def _resolved(result: JobResult) -> JobResult:
+    return result
 
 
-def distribute_jobs(jobs_with_indices: list[tuple[int, dict]], num_workers: int) -> list[list[tuple[int, dict]]]:
-    """Distribui jobs entre workers de forma round-robin para balanceamento."""
-    worker_queues: list[list[tuple[int, dict]]] = [[] for _ in range(num_workers)]
+def job_edition(job: dict, defaults: dict) -> tuple[str, str]:
+    """Grupo (data, seção) de um job: jobs do mesmo grupo compartilham a página."""
+    date_str = job.get("data") or job.get("date") or defaults.get("data", "")
+    secao = job.get("secao") or defaults.get("secaoDefault", "DO1")
+    return str(date_str), str(secao)
 
-    for i, item in enumerate(jobs_with_indices):
-        worker_idx = i % num_workers
-        worker_queues[worker_idx].append(item)
 
-    return worker_queues
+async def worker_task(
+    worker_id: int,
+    pages,
+    scheduler,
+    defaults: dict,
+    controller=None,
+    open_pages=None,
+    snapshot_dir: str | None = None,
+):
+    """Worker que consome jobs da fila compartilhada até o plano terminar.
 
+    Prefere jobs da edição em que sua página já está (uma navegação por edição,
+    várias seleções). Quando a fila esvazia, duplica stragglers de outros workers
+    (fase de cauda) em vez de ficar ocioso.
 
-async def main_async(input_data: dict) -> dict:
-    """Função principal assíncrona."""
+    Args:
+        pages: EditionPageCache do worker (None = criado sob demanda via ``open_pages``)
+        controller: ConcurrencyController; o worker fica estacionado enquanto
+            seu id estiver acima do nível atual
+        open_pages: Coroutine function que cria o EditionPageCache na primeira ativação
+        snapshot_dir: out_dir do plano para os snapshots de edição (listagem HTTP)
+    """
+    done = 0
+    current: tuple[str, str] | None = None
+
+    while not scheduler.finished:
+        if controller is not None and not controller.allows(worker_id):
+            await scheduler.wait_for_change(timeout=1.0)
+            continue
+        if done == 0:
+            _log(f"[W{worker_id}] Iniciando...")
+
+        item = scheduler.next_job(prefer=current) or scheduler.pick_straggler(worker_id)
+        if item is None:
+            await scheduler.wait_for_change(timeout=1.0)
+            continue
+
+        job_index, job = item
+        edition = job_edition(job, defaults)
+        listed = await collect_dou_job_http(job, job_index, worker_id, defaults, snapshot_dir)
+        if listed is not None:
+            # Respondido sem página: não entra no controle de concorrência do browser
+            await scheduler.run_attempt(job_index, worker_id, lambda listed=listed: _resolved(listed))
+            done += 1
+            continue
+
+        if pages is None:
+            pages = await open_pages()
+            _log(f"[W{worker_id}] Ativado (nível {controller.level if controller else '-'})")
+        page, warm = await pages.acquire(edition)
+        result = await scheduler.run_attempt(
+            job_index,
+            worker_id,
+            lambda job=job, job_index=job_index, page=page, warm=warm: collect_dou_job(
+                page, job, job_index, worker_id, defaults, warm=warm
+            ),
+        )
+        # Cancelada (outra tentativa venceu) ou falhou: estado da página é incerto
+        pages.release(edition, warm=bool(result is not None and result.success))
+        if controller is not None and result is not None:
+            controller.observe(result.elapsed, result.success, result.error, result.retries)
+        current = edition
+        done += 1
+
+    if pages is not None:
+        _log(f"[W{worker_id}] Finalizado ({done} tentativas, {pages.stats['navigations']} navegações)")
+
+
+async def main_async(input_data: dict, channel=None) -> dict:
+    """Função principal assíncrona.
+
+    Args:
+        input_data: Jobs e configuração (ver docstring do módulo)
+        channel: ChildChannel do modo ``--stream`` (None = modo arquivo)
+    """
     from playwright.async_api import async_playwright
 
     from .dou_helpers import (
+        RUN_JOURNAL_NAME,
+        EditionPageCache,
+        RunJournal,
         build_final_result,
         calculate_statistics,
         cleanup_browser_resources,
         create_worker_contexts,
         launch_browser_with_channels,
         log_final_results,
-        save_job_outputs,
+        read_journal,
+        summarize_job,
+        write_job_output,
+    )
+    from .dou_scheduler import (
+        DEFAULT_COST_HINTS_PATH,
+        ConcurrencyController,
+        JobScheduler,
+        job_cost_key,
+        load_cost_hints,
+        update_cost_hints,
     )
 
     start_time = time.perf_counter()
@@ -290,21 +566,25 @@ async def main_async(input_data: dict) -> dict:
     defaults = input_data.get("defaults", {})
     out_dir = input_data.get("out_dir")
     out_pattern = input_data.get("out_pattern", "{topic}_{secao}_{date}_{idx}.json")
+    cost_hints_path = input_data.get("cost_hints_path", DEFAULT_COST_HINTS_PATH)
+    max_workers_cap = int(input_data.get("max_workers_cap") or max(max_workers, MAX_WORKERS_CAP))
+    journal_path = input_data.get("journal_path") or (str(Path(out_dir) / RUN_JOURNAL_NAME) if out_dir else None)
 
     if not jobs:
         return {"success": False, "error": "Nenhum job fornecido", "ok": 0, "fail": 0}
 
     actual_workers = min(max_workers, len(jobs))
+    # Workers criáveis: acima de actual_workers só entram se o controle AIMD subir o nível
+    worker_slots = min(max_workers_cap, len(jobs)) if ADAPTIVE_CONCURRENCY else actual_workers
+    worker_slots = max(worker_slots, actual_workers)
+    controller = ConcurrencyController(initial=actual_workers, max_level=worker_slots) if ADAPTIVE_CONCURRENCY else None
 
     _log(f"{'='*60}")
     _log("DOU PARALLEL COLLECTOR (Single Browser Async)")
     _log(f"{'='*60}")
-    _log(f"Jobs: {len(jobs)}, Workers: {actual_workers}")
+    _log(f"Jobs: {len(jobs)}, Workers: {actual_workers} (teto adaptativo: {worker_slots})")
     _log(f"{'='*60}")
 
-    results: list[JobResult] = []
-    lock = asyncio.Lock()
-
     async with async_playwright() as p:
         # Launch browser
         prefer_edge = os.environ.get("DOU_PREFER_EDGE", "").lower() in ("1", "true", "yes")
@@ -317,44 +597,139 @@ async def main_async(input_data: dict) -> dict:
         contexts, pages = await create_worker_contexts(browser, actual_workers, GOTO_TIMEOUT)
         _log(f"✓ {actual_workers} contexts criados")
 
-        # Create job list with indices
-        jobs_with_indices = [(i + 1, job) for i, job in enumerate(jobs)]
-        worker_queues = distribute_jobs(jobs_with_indices, actual_workers)
-
-        # Create and execute tasks in parallel
-        tasks = []
-        for i, worker_jobs in enumerate(worker_queues):
-            if worker_jobs:
-                task = asyncio.create_task(
-                    worker_task(
-                        worker_id=i + 1,
-                        page=pages[i],
-                        jobs_with_indices=worker_jobs,
-                        results=results,
-                        lock=lock,
-                        defaults=defaults
-                    )
+        # Fila compartilhada (longest-expected-first) consumida por todos os workers
+        # _plan_index: execução retomada (--resume) mantém a numeração do plano completo
+        jobs_with_indices = [(int(job.get("_plan_index") or i + 1), job) for i, job in enumerate(jobs)]
+
+        def _cost_of(job: dict) -> str:
+            return job_cost_key(
+                job.get("secao") or defaults.get("secaoDefault", "DO1"),
+                job.get("key1") or "",
+                job.get("key2") or "Todos",
+            )
+
+        journal = RunJournal(journal_path) if journal_path else None
+        if journal:
+            journal.start(len(jobs))
+
+        def _on_result(r: JobResult):
+            # Grava o job assim que termina e mantém em memória só o resumo (sem itens)
+            output = None
+            if r.success and out_dir:
+                try:
+                    output = write_job_output(r, out_dir, out_pattern)
+                except Exception as e:
+                    _log(f"[{r.job_id}] Falha ao gravar output: {e}", "ERROR")
+            entry = summarize_job(r, output)
+            if journal:
+                journal.record_job(entry)
+            if channel is not None:
+                channel.send("job", entry=asdict(entry), done=len(scheduler.results) + 1, total=scheduler.total)
+            return entry
+
+        scheduler = JobScheduler(
+            jobs_with_indices,
+            _cost_of,
+            load_cost_hints(cost_hints_path),
+            group_of=lambda job: job_edition(job, defaults),
+            on_result=_on_result,
+        )
+        _log(
+            f"Scheduler: {scheduler.groups} edição(ões), "
+            f"{scheduler.stats['cost_hints']} jobs com hint de custo"
+        )
+
+        page_caches = [
+            EditionPageCache(contexts[i], pages[i], EDITION_PAGES_PER_WORKER, PAGE_MAX_USES)
+            for i in range(actual_workers)
+        ]
+
+        async def _open_pages() -> EditionPageCache:
+            # Context extra criado só quando o controle adaptativo ativa o worker
+            new_contexts, new_pages = await create_worker_contexts(browser, 1, GOTO_TIMEOUT)
+            contexts.extend(new_contexts)
+            cache = EditionPageCache(new_contexts[0], new_pages[0], EDITION_PAGES_PER_WORKER, PAGE_MAX_USES)
+            page_caches.append(cache)
+            return cache
+
+        cancelled = False
+        if channel is not None:
+            # Pai pode mandar mais jobs até "close"; "cancel" encerra os workers
+            loop = asyncio.get_running_loop()
+            scheduler.accepting = True
+
+            def _on_message(msg: dict) -> None:
+                nonlocal cancelled
+                kind = msg.get("type")
+                if kind == "jobs":
+                    added = scheduler.add_jobs([(int(j["_plan_index"]), j) for j in msg.get("jobs") or []])
+                    _log(f"+{added} jobs recebidos do pai")
+                elif kind == "close":
+                    scheduler.close_input()
+                elif kind == "cancel":
+                    cancelled = True
+                    scheduler.close_input()
+                    _log(f"Cancelamento pedido pelo pai ({msg.get('reason', 'cancel')})", "WARN")
+                    for t in tasks:
+                        t.cancel()
+
+            channel.listen(lambda msg: loop.call_soon_threadsafe(_on_message, msg))
+
+        tasks = [
+            asyncio.create_task(
+                worker_task(
+                    worker_id=i + 1,
+                    pages=page_caches[i] if i < actual_workers else None,
+                    scheduler=scheduler,
+                    defaults=defaults,
+                    controller=controller,
+                    open_pages=_open_pages,
+                    snapshot_dir=out_dir,
                 )
-                tasks.append(task)
+            )
+            for i in range(worker_slots)
+        ]
 
-        await asyncio.gather(*tasks)
+        try:
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException) and not isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
+        finally:
+            if journal:
+                journal.close(ok=sum(1 for r in scheduler.results.values() if r.success), done=len(scheduler.results))
 
         # Cleanup
         await cleanup_browser_resources(contexts, browser)
 
     elapsed = time.perf_counter() - start_time
 
-    # Calculate statistics and log results
-    stats = calculate_statistics(results)
-    log_final_results(stats, len(jobs), elapsed, _log)
-
-    # Save outputs if directory provided
-    outputs = []
-    if out_dir:
-        outputs = save_job_outputs(stats["successful"], out_dir, out_pattern)
-
-    # Build and return final result
-    return build_final_result(stats, outputs, elapsed)
+    # Relatório a partir do journal (sem journal: resumos em memória)
+    entries = read_journal(journal_path) if journal_path else []
+    entries = entries or [scheduler.results[k] for k in sorted(scheduler.results)]
+    stats = calculate_statistics(entries)
+    log_final_results(stats, scheduler.total, elapsed, _log)
+
+    # Build final result and feed cost hints for the next run
+    final = build_final_result(stats, [e.output for e in stats["successful"] if e.output], elapsed)
+    if journal_path:
+        final["journal"] = journal_path
+    if cancelled:
+        final["partial"] = True
+        final["all_success"] = False
+        final["fail"] = max(final.get("fail", 0), scheduler.total - final.get("ok", 0))
+    final["metrics"]["scheduler"] = scheduler.stats
+    final["metrics"]["concurrency"] = (
+        controller.stats if controller else {"mode": "fixed", "initial": actual_workers, "final": actual_workers}
+    )
+    final["metrics"]["edition_pages"] = {
+        "navigations": sum(c.stats["navigations"] for c in page_caches),
+        "reuses": sum(c.stats["reuses"] for c in page_caches),
+        "recycled": sum(c.stats.get("recycled", 0) for c in page_caches),
+        "crashed": sum(c.stats.get("crashed", 0) for c in page_caches),
+    }
+    update_cost_hints(cost_hints_path, final["metrics"]["jobs"])
+    return final
 
 
 def run_parallel_batch(input_data: dict) -> dict:
@@ -406,10 +781,40 @@ def run_parallel_batch(input_data: dict) -> dict:
         }
 
 
+def main_stream() -> int:
+    """Entry point do modo ``--stream`` (protocolo de utils.stream_ipc)."""
+    from dou_snaptrack.utils.stream_ipc import PROTOCOL, ChildChannel
+
+    channel = ChildChannel()
+    channel.send("hello", protocol=PROTOCOL, pid=os.getpid())
+    try:
+        msg = channel.receive()
+        if not msg or msg.get("type") != "run":
+            channel.send("error", error=f"esperava 'run', recebeu {msg.get('type') if msg else 'EOF'}")
+            return 2
+        result = asyncio.run(main_async(msg.get("input") or {}, channel=channel))
+        channel.send("done", result=result)
+        return 0 if (result.get("success") or result.get("ok", 0) > 0) else 1
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        channel.send("done", result={
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "ok": 0,
+            "fail": 0
+        })
+        return 1
+
+
 def main():
     """Entry point para execução via subprocess."""
     import io
 
+    if "--stream" in sys.argv[1:]:
+        return main_stream()
+
     # Garantir encoding UTF-8
     if sys.stdin.encoding != 'utf-8':
         sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
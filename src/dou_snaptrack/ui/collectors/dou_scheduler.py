@@ -0,0 +1,369 @@
+"""Work-stealing job scheduler for the fast-async DOU collector.
+
+Substitui a antiga distribuição round-robin estática dos jobs entre workers:
+
+- Todos os workers consomem de uma fila compartilhada, então
+  um worker preso em um órgão lento não deixa os demais ociosos no fim do plano.
+- A fila é ordenada pelo custo esperado de cada job (maior primeiro), aprendido
+  de ``metrics.jobs`` de execuções anteriores.
+- Fase de cauda: quando a fila esvazia, workers ociosos duplicam jobs ainda em
+  andamento há muito tempo ("stragglers"). A primeira tentativa bem-sucedida
+  vence e as demais são canceladas.
+- Afinidade por edição: a fila é dividida por grupo (data, seção). Cada worker continua
+  no grupo da sua página aquecida e só "rouba" de outro grupo quando o seu esvazia.
+- Concorrência adaptativa: ``ConcurrencyController`` ajusta o número de workers
+  ativos (AIMD) pela latência p50 dos jobs e por timeouts/erros HTTP2.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Jobs rodando há menos que isso nunca são duplicados na fase de cauda
+STRAGGLER_MIN_SEC = float(os.environ.get("DOU_STRAGGLER_MIN_SEC", "8") or "8")
+# Tentativa original + no máximo uma duplicata
+MAX_ATTEMPTS_PER_JOB = 2
+# Peso das execuções novas na média móvel dos custos
+COST_EMA_ALPHA = 0.5
+DEFAULT_COST_HINTS_PATH = os.environ.get("DOU_JOB_COSTS_PATH", "logs/_cache/dou_job_costs.json")
+
+
+def job_cost_key(secao: str, key1: str, key2: str) -> str:
+    """Chave estável (independente da data) usada para os hints de custo."""
+    return f"{secao or ''}|{key1 or ''}|{key2 or 'Todos'}"
+
+
+def load_cost_hints(path: str | Path | None) -> dict[str, float]:
+    """Carrega hints de custo (segundos por job) salvos por execuções anteriores.
+
+    Returns:
+        Dicionário ``job_cost_key -> segundos``; vazio se o arquivo não existir.
+    """
+    if not path:
+        return {}
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    hints: dict[str, float] = {}
+    for k, v in (data.get("jobs") or {}).items():
+        try:
+            hints[str(k)] = float(v)
+        except (TypeError, ValueError):
+            continue
+    return hints
+
+
+def update_cost_hints(path: str | Path | None, metrics_jobs: list[dict[str, Any]]) -> None:
+    """Atualiza o arquivo de hints com os tempos de ``metrics.jobs`` desta execução (média móvel)."""
+    if not path or not metrics_jobs:
+        return
+    hints = load_cost_hints(path)
+    for m in metrics_jobs:
+        try:
+            elapsed = float(m.get("elapsed_sec") or 0)
+        except (TypeError, ValueError):
+            continue
+        if elapsed <= 0:
+            continue
+        key = job_cost_key(m.get("secao") or "", m.get("key1") or "", m.get("key2") or "")
+        prev = hints.get(key)
+        hints[key] = round(elapsed if prev is None else (COST_EMA_ALPHA * elapsed + (1 - COST_EMA_ALPHA) * prev), 2)
+    try:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps({"jobs": hints}, ensure_ascii=False, indent=2), encoding="utf-8")
+    except Exception:
+        pass
+
+
+@dataclass
+class _Attempt:
+    task: asyncio.Task
+    worker_id: int
+    started: float
+    duplicate: bool = False
+    superseded: bool = False
+
+
+class JobScheduler:
+    """Fila compartilhada com ordenação por custo e duplicação de stragglers.
+
+    Args:
+        jobs_with_indices: Lista de ``(job_index, job)``
+        cost_of: Função que retorna a chave de custo de um job
+        cost_hints: Hints de custo (``job_cost_key -> segundos``)
+        straggler_min_sec: Tempo mínimo em execução para um job ser duplicado
+        group_of: Função que retorna o grupo (edição) de um job; None = grupo único
+        on_result: Chamada uma vez por job com o resultado final; o valor
+            retornado é o que fica em ``results`` (p.ex. um resumo sem os itens)
+    """
+
+    def __init__(
+        self,
+        jobs_with_indices: list[tuple[int, dict]],
+        cost_of: Callable[[dict], str],
+        cost_hints: dict[str, float] | None = None,
+        straggler_min_sec: float = STRAGGLER_MIN_SEC,
+        group_of: Callable[[dict], Hashable] | None = None,
+        on_result: Callable[[Any], Any] | None = None,
+    ):
+        self._jobs = dict(jobs_with_indices)
+        self._attempts: dict[int, list[_Attempt]] = {}
+        self._started: dict[int, int] = {}
+        self._changed = asyncio.Event()
+        self.straggler_min_sec = straggler_min_sec
+        self._on_result = on_result
+        self._group_of = group_of
+        self.results: dict[int, Any] = {}
+        # True enquanto o pai ainda pode enviar jobs (modo streaming)
+        self.accepting = False
+
+        self._hints = cost_hints or {}
+        self._cost_of = cost_of
+        known = {idx: self._hints[cost_of(job)] for idx, job in jobs_with_indices if cost_of(job) in self._hints}
+        self._fallback = statistics.median(known.values()) if known else 0.0
+        self._expected = {idx: known.get(idx, self._fallback) for idx, _ in jobs_with_indices}
+
+        # Longest-expected-first (sort estável: sem hints mantém a ordem do plano)
+        ordered = sorted(jobs_with_indices, key=lambda it: self._expected[it[0]], reverse=True)
+        # Tudo roda no mesmo event loop: deques simples bastam (sem awaits na fila)
+        self._queues: dict[Hashable, deque[tuple[int, dict]]] = {}
+        for item in ordered:
+            group = group_of(item[1]) if group_of else None
+            self._queues.setdefault(group, deque()).append(item)
+
+        self.stats: dict[str, Any] = {
+            "mode": "work_stealing",
+            "cost_hints": len(known),
+            "duplicated": 0,
+            "duplicate_wins": 0,
+        }
+
+    @property
+    def finished(self) -> bool:
+        return not self.accepting and len(self.results) >= len(self._jobs)
+
+    @property
+    def total(self) -> int:
+        """Jobs conhecidos até agora (inclui os recebidos em streaming)."""
+        return len(self._jobs)
+
+    def add_jobs(self, jobs_with_indices: list[tuple[int, dict]]) -> int:
+        """Enfileira jobs recebidos durante a execução (índices já vistos são ignorados).
+
+        Returns:
+            Número de jobs adicionados.
+        """
+        added = 0
+        for idx, job in jobs_with_indices:
+            if idx in self._jobs:
+                continue
+            self._jobs[idx] = job
+            self._expected[idx] = self._hints.get(self._cost_of(job), self._fallback)
+            group = self._group_of(job) if self._group_of else None
+            queue = self._queues.setdefault(group, deque())
+            queue.append((idx, job))
+            # Mantém a fila do grupo em longest-expected-first
+            self._queues[group] = deque(sorted(queue, key=lambda it: self._expected[it[0]], reverse=True))
+            added += 1
+        self._changed.set()
+        return added
+
+    def close_input(self) -> None:
+        """Sem mais jobs: workers encerram quando a fila e as tentativas acabarem."""
+        self.accepting = False
+        self._changed.set()
+
+    @property
+    def groups(self) -> int:
+        return len(self._queues)
+
+    def next_job(self, prefer: Hashable | None = None) -> tuple[int, dict] | None:
+        """Próximo job, preferindo o grupo ``prefer``; senão rouba do grupo cujo
+        próximo job tem maior custo esperado. None se todas as filas estiverem vazias.
+        """
+        queue = self._queues.get(prefer)
+        if not queue:
+            candidates = [q for q in self._queues.values() if q]
+            if not candidates:
+                return None
+            queue = max(candidates, key=lambda q: self._expected[q[0][0]])
+        return queue.popleft()
+
+    def pick_straggler(self, worker_id: int) -> tuple[int, dict] | None:
+        """Escolhe o job em andamento há mais tempo para duplicar neste worker."""
+        now = time.perf_counter()
+        best: tuple[float, int] | None = None
+        for idx, attempts in self._attempts.items():
+            if idx in self.results or not attempts or self._started.get(idx, 0) >= MAX_ATTEMPTS_PER_JOB:
+                continue
+            if any(a.worker_id == worker_id for a in attempts):
+                continue
+            running = now - min(a.started for a in attempts)
+            if running < self.straggler_min_sec:
+                continue
+            if best is None or running > best[0]:
+                best = (running, idx)
+        if best is None:
+            return None
+        idx = best[1]
+        return idx, self._jobs[idx]
+
+    async def wait_for_change(self, timeout: float) -> None:
+        """Espera algum job terminar (ou o timeout, para reavaliar stragglers)."""
+        self._changed.clear()
+        with contextlib.suppress(asyncio.TimeoutError):  # builtin TimeoutError só é alias no 3.11+
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+
+    async def run_attempt(self, job_index: int, worker_id: int, runner: Callable[[], Awaitable[Any]]) -> Any | None:
+        """Executa uma tentativa do job e registra o resultado (primeiro sucesso vence).
+
+        Returns:
+            Resultado desta tentativa, ou None se ela foi cancelada por outra que venceu.
+        """
+        duplicate = self._started.get(job_index, 0) > 0
+        self._started[job_index] = self._started.get(job_index, 0) + 1
+        if duplicate:
+            self.stats["duplicated"] += 1
+
+        attempt = _Attempt(
+            task=asyncio.create_task(runner()),
+            worker_id=worker_id,
+            started=time.perf_counter(),
+            duplicate=duplicate,
+        )
+        self._attempts.setdefault(job_index, []).append(attempt)
+        try:
+            result = await attempt.task
+        except asyncio.CancelledError:
+            if attempt.superseded:
+                return None
+            raise
+        finally:
+            attempts = self._attempts.get(job_index, [])
+            if attempt in attempts:
+                attempts.remove(attempt)
+            self._changed.set()
+
+        self._complete(job_index, attempt, result)
+        return result
+
+    def _complete(self, job_index: int, attempt: _Attempt, result: Any) -> None:
+        if job_index in self.results:
+            return
+        others = self._attempts.get(job_index, [])
+        if not getattr(result, "success", False) and others:
+            # Outra tentativa ainda pode ter sucesso; aguardar por ela
+            return
+        self.results[job_index] = self._on_result(result) if self._on_result else result
+        if attempt.duplicate and getattr(result, "success", False):
+            self.stats["duplicate_wins"] += 1
+        for other in list(others):
+            other.superseded = True
+            other.task.cancel()
+
+
+# Erros que indicam sobrecarga/throttling do in.gov.br (backoff multiplicativo)
+CONGESTION_MARKERS = ("timeout", "err_http2", "err_connection", "err_timed_out", "429", "503")
+
+
+def is_congestion_error(error: str | None) -> bool:
+    """True se a mensagem de erro indica timeout/HTTP2/throttling do servidor."""
+    msg = (error or "").lower()
+    return any(m in msg for m in CONGESTION_MARKERS)
+
+
+class ConcurrencyController:
+    """Controle AIMD do número de workers (contexts) ativos.
+
+    - Aumento aditivo (+1) a cada janela de ``window`` jobs cuja latência p50
+      fica dentro de ``latency_tolerance`` x a melhor p50 observada.
+    - Redução multiplicativa (/2) em timeouts/erros HTTP2; -1 se a p50 degradar.
+
+    Workers com id acima do nível atual ficam estacionados (terminam o job em
+    andamento e não pegam outro até o nível voltar a subir).
+
+    Args:
+        initial: Nível inicial (DOU_MAX_WORKERS)
+        max_level: Teto (número de workers criáveis)
+        min_level: Piso
+        window: Jobs por decisão de aumento/redução por latência
+        latency_tolerance: Razão p50/baseline acima da qual a latência é considerada degradada
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        max_level: int,
+        min_level: int = 1,
+        window: int = 4,
+        latency_tolerance: float = 1.5,
+    ):
+        self.min_level = max(1, min_level)
+        self.max_level = max(self.min_level, max_level)
+        self.level = min(max(initial, self.min_level), self.max_level)
+        self.window = max(1, window)
+        self.latency_tolerance = latency_tolerance
+        self._samples: list[float] = []
+        self._baseline: float | None = None
+        self._start = time.perf_counter()
+        self.stats: dict[str, Any] = {
+            "mode": "aimd",
+            "initial": self.level,
+            "max_level": self.max_level,
+            "final": self.level,
+            "peak": self.level,
+            "increases": 0,
+            "decreases": 0,
+            "congestion_events": 0,
+            "history": [],
+        }
+
+    def allows(self, worker_id: int) -> bool:
+        """True se o worker (1-based) está dentro do nível atual."""
+        return worker_id <= self.level
+
+    def observe(self, elapsed: float, success: bool, error: str | None = None, retries: int = 0) -> None:
+        """Registra o resultado de um job e ajusta o nível."""
+        if retries or (not success and is_congestion_error(error)):
+            self.stats["congestion_events"] += 1
+            self._samples.clear()
+            self._set_level(self.level // 2, "congestion")
+            return
+        if not success:
+            return
+
+        self._samples.append(elapsed)
+        if len(self._samples) < self.window:
+            return
+        p50 = statistics.median(self._samples)
+        self._samples.clear()
+        if self._baseline is None or p50 < self._baseline:
+            self._baseline = p50
+        if p50 <= self._baseline * self.latency_tolerance:
+            self._set_level(self.level + 1, "latency_flat")
+        else:
+            self._set_level(self.level - 1, "latency_up")
+
+    def _set_level(self, level: int, reason: str) -> None:
+        level = min(max(level, self.min_level), self.max_level)
+        if level == self.level:
+            return
+        self.stats["increases" if level > self.level else "decreases"] += 1
+        self.level = level
+        self.stats["final"] = level
+        self.stats["peak"] = max(self.stats["peak"], level)
+        self.stats["history"].append(
+            {"t": round(time.perf_counter() - self._start, 2), "level": level, "reason": reason}
+        )
@@ -742,9 +742,13 @@ async def main_async():
     lock = asyncio.Lock()
 
     async with async_playwright() as p:
-        # Lançar UM ÚNICO browser
-        browser = None
-        for channel in ['chrome', 'msedge']:
+        # Lançar UM ÚNICO browser (ou conectar ao compartilhado, se habilitado)
+        from dou_snaptrack.utils.browser_factory import BrowserFactory
+
+        browser = await BrowserFactory.connect_shared_async(p)
+        if browser:
+            print("[MAIN] ✓ Browser compartilhado (daemon) conectado", file=sys.stderr)
+        for channel in ([] if browser else ['chrome', 'msedge']):
             try:
                 browser = await p.chromium.launch(channel=channel, headless=True, args=LAUNCH_ARGS)
                 print(f"[MAIN] ✓ Browser {channel} iniciado (único para todos workers)", file=sys.stderr)
@@ -136,6 +136,7 @@ if src_root not in sys.path:
 
 from dou_snaptrack.cli.plan.live import _collect_dropdown_roots, _read_dropdown_options, _select_roots
 from dou_snaptrack.utils.browser import build_dou_url, goto, try_visualizar_em_lista
+from dou_snaptrack.utils.browser_factory import BrowserFactory
 from dou_snaptrack.utils.dom import find_best_frame
 from playwright.sync_api import sync_playwright, TimeoutError
 
@@ -173,10 +174,12 @@ def _pick_ready_frame(context, timeout_s: float = 12.0):
 
 try:
     with sync_playwright() as p:
-        browser = None
+        # Browser compartilhado (DOU_BROWSER_DAEMON=1), senão launch próprio
+        browser = BrowserFactory.connect_shared(p)
         # Estratégia de fallback: channel=chrome -> channel=msedge -> executable_path -> default
         try:
-            browser = p.chromium.launch(channel='chrome', headless=True)
+            if not browser:
+                browser = p.chromium.launch(channel='chrome', headless=True)
         except Exception as e1:
             try:
                 browser = p.chromium.launch(channel='msedge', headless=True)
@@ -386,6 +389,7 @@ if src_root not in sys.path:
 
 from dou_snaptrack.cli.plan.live import _collect_dropdown_roots, _read_dropdown_options, _select_by_text, _select_roots
 from dou_snaptrack.utils.browser import build_dou_url, goto, try_visualizar_em_lista
+from dou_snaptrack.utils.browser_factory import BrowserFactory
 from dou_snaptrack.utils.dom import find_best_frame, is_select, read_select_options
 from playwright.sync_api import sync_playwright, TimeoutError
 
@@ -460,9 +464,10 @@ def _wait_n2_ready(frame, r2, timeout_ms: int = 15_000):
 
 try:
     with sync_playwright() as p:
-        browser = None
+        browser = BrowserFactory.connect_shared(p)
         try:
-            browser = p.chromium.launch(channel='chrome', headless=True)
+            if not browser:
+                browser = p.chromium.launch(channel='chrome', headless=True)
         except Exception:
             try:
                 browser = p.chromium.launch(channel='msedge', headless=True)
@@ -15,10 +15,12 @@ try:
         goto as _page_goto,
         try_visualizar_em_lista as _page_try_visualizar_em_lista,
     )
+    from dou_utils.readiness import wait_for_list_stable_async as _wait_for_list_stable_async
 except Exception:
     _page_goto = None
     _page_close_cookies = None
     _page_try_visualizar_em_lista = None
+    _wait_for_list_stable_async = None
 
 COOKIE_BUTTON_TEXTS = ["ACEITO", "ACEITAR", "OK", "ENTENDI", "CONCORDO", "FECHAR", "ACEITO TODOS"]
 
@@ -60,7 +62,11 @@ async def try_visualizar_em_lista_async(page) -> bool:
             first = btn.first
             if await first.is_visible():
                 await first.click()
-                await page.wait_for_load_state("networkidle", timeout=60_000)
+                if _wait_for_list_stable_async:
+                    # Lista de links estável em vez de networkidle (beacons mantêm a rede ocupada)
+                    await _wait_for_list_stable_async(page, step="view")
+                else:
+                    await page.wait_for_load_state("networkidle", timeout=60_000)
                 return True
     except Exception:
         pass
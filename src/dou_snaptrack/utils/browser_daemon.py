@@ -0,0 +1,354 @@
+"""
+Browser compartilhado de longa duração (daemon CDP) para evitar cold start.
+
+Cada ponto de entrada (batch, coletor async, plan building, UI) lançava o seu
+próprio Chromium (2-5s por chamada). Com ``DOU_BROWSER_DAEMON=1`` um único
+Chromium headless fica vivo com ``--remote-debugging-port`` e os chamadores se
+conectam via ``connect_over_cdp`` e criam seus próprios contexts.
+
+Estado compartilhado entre processos em ``logs/_cache/browser_daemon.json``:
+pid, porta, executável e número de leases. Após ``DOU_BROWSER_DAEMON_RECYCLE``
+leases o daemon é reciclado: um novo é lançado numa porta livre e o antigo é
+encerrado depois de ``DOU_BROWSER_DAEMON_GRACE_SEC``, e só quando não tem mais
+páginas abertas (para não derrubar um lote longo ainda conectado). Leitura e
+escrita do estado acontecem sob um lock de arquivo entre processos.
+
+Uso (via BrowserFactory):
+    >>> with sync_playwright() as p:
+    ...     browser = BrowserFactory.connect_shared(p) or p.chromium.launch()
+
+CLI:
+    python -m dou_snaptrack.utils.browser_daemon status|start|stop
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from dou_snaptrack.utils.browser_factory import find_system_browser
+from dou_utils.browser_launch import chromium_launch_args
+from dou_utils.file_lock import FileLock
+
+DAEMON_ENV = "DOU_BROWSER_DAEMON"
+DAEMON_STATE_PATH = Path(os.environ.get("DOU_BROWSER_DAEMON_STATE", "logs/_cache/browser_daemon.json"))
+DAEMON_BASE_PORT = int(os.environ.get("DOU_BROWSER_DAEMON_PORT", "9333") or "9333")
+DAEMON_RECYCLE_AFTER = int(os.environ.get("DOU_BROWSER_DAEMON_RECYCLE", "200") or "200")
+DAEMON_GRACE_SEC = int(os.environ.get("DOU_BROWSER_DAEMON_GRACE_SEC", "1200") or "1200")
+DAEMON_STARTUP_TIMEOUT_SEC = 15.0
+# Portas candidatas: DAEMON_BASE_PORT .. DAEMON_BASE_PORT + DAEMON_PORT_SPAN - 1
+DAEMON_PORT_SPAN = int(os.environ.get("DOU_BROWSER_DAEMON_PORT_SPAN", "16") or "16")
+# O lock cobre o startup do Chromium; acima disso é de um processo morto
+DAEMON_LOCK_TIMEOUT_SEC = DAEMON_STARTUP_TIMEOUT_SEC * 2
+DAEMON_LOCK_STALE_SEC = DAEMON_STARTUP_TIMEOUT_SEC * 4
+
+# Executáveis comuns fora do Windows (CHROME_PATHS/EDGE_PATHS cobrem o Windows)
+_POSIX_BROWSER_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "microsoft-edge")
+
+
+def daemon_enabled() -> bool:
+    """True se o uso do browser compartilhado foi habilitado por ambiente."""
+    return (os.environ.get(DAEMON_ENV, "").strip() or "0").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class DaemonState:
+    """Estado persistido do daemon (compartilhado entre processos)."""
+
+    pid: int = 0
+    port: int = 0
+    executable: str = ""
+    started_at: float = 0.0
+    leases: int = 0
+    retired: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+def _read_state(path: Path | None = None) -> DaemonState:
+    try:
+        data = json.loads((path or DAEMON_STATE_PATH).read_text(encoding="utf-8"))
+        return DaemonState(**{k: v for k, v in data.items() if k in DaemonState.__dataclass_fields__})
+    except Exception:
+        return DaemonState()
+
+
+def _write_state(state: DaemonState, path: Path | None = None) -> None:
+    path = path or DAEMON_STATE_PATH
+    with contextlib.suppress(Exception):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(state), ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+
+def is_healthy(port: int, timeout_sec: float = 1.0) -> bool:
+    """Health check: o endpoint CDP responde em /json/version."""
+    if not port:
+        return False
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout_sec) as resp:
+            data = json.loads(resp.read().decode("utf-8", errors="ignore") or "{}")
+        return bool(data.get("webSocketDebuggerUrl"))
+    except Exception:
+        return False
+
+
+def _open_pages(port: int, timeout_sec: float = 1.0) -> int:
+    """Número de páginas abertas no daemon (0 se inacessível)."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=timeout_sec) as resp:
+            targets = json.loads(resp.read().decode("utf-8", errors="ignore") or "[]")
+        return sum(1 for t in targets if t.get("type") == "page")
+    except Exception:
+        return 0
+
+
+def has_live_connections(port: int) -> bool:
+    """True se algum cliente ainda tem páginas abertas no daemon.
+
+    Contexts criados via ``connect_over_cdp`` são descartados quando o cliente
+    desconecta; além da página inicial (about:blank) não deve sobrar nenhuma.
+    """
+    return _open_pages(port) > 1
+
+
+def _port_in_use(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            return True
+    return False
+
+
+def _pick_port(busy: set[int]) -> int | None:
+    """Primeira porta da faixa que não é de um daemon (ativo ou aposentado) nem está ocupada."""
+    for port in range(DAEMON_BASE_PORT, DAEMON_BASE_PORT + max(2, DAEMON_PORT_SPAN)):
+        if port not in busy and not _port_in_use(port):
+            return port
+    return None
+
+
+def find_daemon_executable(prefer_edge: bool = False) -> str | None:
+    """Executável Chromium para o daemon: env, caminhos do Windows, PATH."""
+    for env_var in ("PLAYWRIGHT_CHROME_PATH", "CHROME_PATH"):
+        exe = os.environ.get(env_var)
+        if exe and Path(exe).exists():
+            return exe
+    exe = find_system_browser(prefer_edge)
+    if exe:
+        return exe
+    for name in _POSIX_BROWSER_NAMES:
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+
+def _daemon_args(port: int, profile_dir: str) -> list[str]:
+    args = [
+        "--headless=new",
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={profile_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-blink-features=AutomationControlled",
+        "--disable-background-timer-throttling",
+        "--disable-renderer-backgrounding",
+        "--disable-backgrounding-occluded-windows",
+    ]
+    # Mesmos defaults do launch normal (ver dou_utils.browser_launch)
+    _, disable_quic, disable_http2 = chromium_launch_args()
+    if disable_quic:
+        args.append("--disable-quic")
+    if disable_http2:
+        args.append("--disable-http2")
+    args.append("about:blank")
+    return args
+
+
+def _spawn(executable: str, port: int) -> int:
+    profile_dir = str(Path(tempfile.gettempdir()) / f"dou_browser_daemon_{port}")
+    kwargs: dict[str, Any] = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "stdin": subprocess.DEVNULL}
+    if sys.platform.startswith("win"):
+        kwargs["creationflags"] = getattr(subprocess, "DETACHED_PROCESS", 0) | getattr(
+            subprocess, "CREATE_NEW_PROCESS_GROUP", 0
+        )
+    else:
+        kwargs["start_new_session"] = True
+    proc = subprocess.Popen([executable, *_daemon_args(port, profile_dir)], **kwargs)
+    return proc.pid
+
+
+def _kill(pid: int) -> None:
+    if not pid:
+        return
+    with contextlib.suppress(Exception):
+        if sys.platform.startswith("win"):
+            subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True, timeout=5)
+        else:
+            import signal
+
+            os.kill(pid, signal.SIGTERM)
+
+
+def _reap_retired(state: DaemonState) -> None:
+    now = time.time()
+    keep = []
+    for r in state.retired:
+        port = int(r.get("port") or 0)
+        expired = now - float(r.get("retired_at") or 0) >= DAEMON_GRACE_SEC
+        if not is_healthy(port):
+            # Já morreu (ou nunca respondeu): só limpa o registro
+            _kill(int(r.get("pid") or 0))
+        elif expired and not has_live_connections(port):
+            _kill(int(r.get("pid") or 0))
+        else:
+            keep.append(r)
+    state.retired = keep
+
+
+def ensure_daemon(prefer_edge: bool = False) -> DaemonState | None:
+    """Garante um daemon saudável (lança, reutiliza ou recicla) e registra um lease.
+
+    Serializado entre processos por um lock ao lado do arquivo de estado: sem
+    ele, dois workers podem lançar daemons na mesma porta ou perder leases.
+
+    Returns:
+        Estado do daemon em uso, ou None se não foi possível iniciá-lo.
+    """
+    lock = FileLock(
+        DAEMON_STATE_PATH.with_suffix(".lock"), timeout_sec=DAEMON_LOCK_TIMEOUT_SEC, stale_sec=DAEMON_LOCK_STALE_SEC
+    )
+    try:
+        with lock:
+            return _ensure_daemon_locked(prefer_edge)
+    except TimeoutError:
+        return None
+
+
+def _ensure_daemon_locked(prefer_edge: bool) -> DaemonState | None:
+    state = _read_state()
+    _reap_retired(state)
+
+    healthy = is_healthy(state.port)
+    if healthy and state.leases < DAEMON_RECYCLE_AFTER:
+        state.leases += 1
+        _write_state(state)
+        return state
+
+    if healthy:
+        # Reciclar: o antigo continua servindo conexões em andamento até o grace period
+        state.retired.append({"pid": state.pid, "port": state.port, "retired_at": time.time()})
+    elif state.pid:
+        _kill(state.pid)
+
+    executable = state.executable if state.executable and Path(state.executable).exists() else None
+    executable = executable or find_daemon_executable(prefer_edge)
+    if not executable:
+        return None
+
+    # Daemon atual (se reciclado) já está em retired
+    busy = {int(r.get("port") or 0) for r in state.retired}
+    port = _pick_port(busy)
+    if port is None:
+        _write_state(state)
+        return None
+    try:
+        pid = _spawn(executable, port)
+    except Exception:
+        return None
+
+    deadline = time.monotonic() + DAEMON_STARTUP_TIMEOUT_SEC
+    while time.monotonic() < deadline:
+        if is_healthy(port, timeout_sec=0.5):
+            new_state = DaemonState(
+                pid=pid, port=port, executable=executable, started_at=time.time(), leases=1, retired=state.retired
+            )
+            _write_state(new_state)
+            return new_state
+        time.sleep(0.2)
+
+    _kill(pid)
+    return None
+
+
+def stop_daemon() -> bool:
+    """Encerra o daemon atual e os aposentados."""
+    state = _read_state()
+    for r in state.retired:
+        _kill(int(r.get("pid") or 0))
+    _kill(state.pid)
+    with contextlib.suppress(Exception):
+        DAEMON_STATE_PATH.unlink(missing_ok=True)
+    return bool(state.pid)
+
+
+def connect_daemon_browser(playwright, prefer_edge: bool = False):
+    """Conecta (sync) ao browser compartilhado. Retorna None se desabilitado/indisponível.
+
+    ``browser.close()`` no objeto retornado apenas desconecta; o daemon continua vivo.
+    """
+    if not daemon_enabled():
+        return None
+    state = ensure_daemon(prefer_edge)
+    if state is None:
+        return None
+    try:
+        return playwright.chromium.connect_over_cdp(state.endpoint)
+    except Exception:
+        return None
+
+
+async def connect_daemon_browser_async(playwright, prefer_edge: bool = False):
+    """Versão async de connect_daemon_browser."""
+    if not daemon_enabled():
+        return None
+    import asyncio
+
+    state = await asyncio.to_thread(ensure_daemon, prefer_edge)
+    if state is None:
+        return None
+    try:
+        return await playwright.chromium.connect_over_cdp(state.endpoint)
+    except Exception:
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Browser compartilhado (daemon CDP) do DOU SnapTrack")
+    ap.add_argument("command", choices=["status", "start", "stop"])
+    args = ap.parse_args(argv)
+
+    if args.command == "stop":
+        print("stopped" if stop_daemon() else "not running")
+        return 0
+    if args.command == "start":
+        state = ensure_daemon()
+        if state is None:
+            print("failed to start browser daemon", file=sys.stderr)
+            return 1
+    state = _read_state()
+    print(json.dumps({**asdict(state), "healthy": is_healthy(state.port)}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -209,8 +209,12 @@ class BrowserFactory:
         context: SyncBrowserContext | None = None
 
         try:
+            # Browser compartilhado (daemon), se habilitado
+            if config.headless and not config.slow_mo:
+                browser = BrowserFactory.connect_shared(p, prefer_edge)
+
             # Tentar channels do sistema
-            channels = get_browser_channels(prefer_edge)
+            channels = [] if browser else get_browser_channels(prefer_edge)
             launch_args = {"headless": config.headless, "slow_mo": config.slow_mo}
 
             for channel in channels:
@@ -303,8 +307,12 @@ class BrowserFactory:
         context: AsyncBrowserContext | None = None
 
         try:
+            # Browser compartilhado (daemon), se habilitado
+            if config.headless and not config.slow_mo:
+                browser = await BrowserFactory.connect_shared_async(p, prefer_edge)
+
             # Tentar channels do sistema
-            channels = get_browser_channels(prefer_edge)
+            channels = [] if browser else get_browser_channels(prefer_edge)
             launch_args = {"headless": config.headless, "slow_mo": config.slow_mo}
 
             for channel in channels:
@@ -362,6 +370,29 @@ class BrowserFactory:
             except Exception:
                 pass
 
+    @staticmethod
+    def connect_shared(p: SyncPlaywright, prefer_edge: bool = False) -> SyncBrowser | None:
+        """
+        Conecta ao browser compartilhado (daemon CDP) se ``DOU_BROWSER_DAEMON=1``.
+
+        O daemon é lançado sob demanda, verificado (health check) e reciclado
+        após N leases. ``browser.close()`` apenas desconecta.
+
+        Returns:
+            Browser conectado, ou None se desabilitado/indisponível (o chamador
+            deve seguir com o launch normal).
+        """
+        from dou_snaptrack.utils.browser_daemon import connect_daemon_browser
+
+        return connect_daemon_browser(p, prefer_edge)
+
+    @staticmethod
+    async def connect_shared_async(p: AsyncPlaywright, prefer_edge: bool = False) -> AsyncBrowser | None:
+        """Versão async de connect_shared."""
+        from dou_snaptrack.utils.browser_daemon import connect_daemon_browser_async
+
+        return await connect_daemon_browser_async(p, prefer_edge)
+
     @staticmethod
     def create_page(
         config: BrowserConfig | None = None,
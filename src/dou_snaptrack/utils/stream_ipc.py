@@ -0,0 +1,273 @@
+"""
+Protocolo de streaming pai <-> filho sobre stdin/stdout (NDJSON com prefixo de tamanho).
+
+Substitui o IPC "JSON temporário de entrada + JSON de resultado no fim": o pai
+envia o trabalho por stdin, o filho devolve eventos (resultado por job,
+progresso, fim) à medida que acontecem e o pai pode cancelar ou enviar mais
+jobs a qualquer momento.
+
+Frame (bytes):
+    <tamanho do JSON em bytes, decimal ASCII>\\n<JSON UTF-8>\\n
+
+Mensagens são dicts com ``type``:
+    pai -> filho: ``run``, ``jobs`` (mais trabalho), ``close`` (sem mais trabalho), ``cancel``
+    filho -> pai: ``hello``, ``job``, ``progress``, ``log``, ``done``, ``error``
+
+No filho, ``ChildChannel`` reserva o stdout original para os frames e redireciona
+o fd 1 para o stderr: ``print`` de qualquer biblioteca vira log, sem corromper o protocolo.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import IO, Any
+
+PROTOCOL = "ndjson-lp/1"
+# Sem nenhum evento do filho por este tempo = filho travado (substitui o timeout global)
+STREAM_IDLE_TIMEOUT_SEC = float(os.environ.get("DOU_STREAM_IDLE_TIMEOUT", "300") or "300")
+# Espera pelo "done" após um cancel antes de matar o filho
+CANCEL_GRACE_SEC = 20.0
+_MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+class ProtocolError(RuntimeError):
+    """Frame inválido no canal de streaming."""
+
+
+def write_frame(fh: IO[bytes], msg: dict[str, Any]) -> None:
+    """Escreve uma mensagem como frame e faz flush."""
+    data = json.dumps(msg, ensure_ascii=False).encode("utf-8")
+    fh.write(str(len(data)).encode("ascii") + b"\n" + data + b"\n")
+    fh.flush()
+
+
+def read_frame(fh: IO[bytes]) -> dict[str, Any] | None:
+    """Lê o próximo frame. Retorna None no EOF.
+
+    Raises:
+        ProtocolError: Cabeçalho de tamanho inválido ou frame truncado.
+    """
+    header = fh.readline()
+    if not header:
+        return None
+    header = header.strip()
+    if not header.isdigit():
+        raise ProtocolError(f"cabeçalho inválido: {header[:80]!r}")
+    size = int(header)
+    if size > _MAX_FRAME_BYTES:
+        raise ProtocolError(f"frame grande demais: {size} bytes")
+    data = fh.read(size)
+    if len(data) < size:
+        raise ProtocolError("frame truncado")
+    fh.read(1)  # \n final
+    msg = json.loads(data.decode("utf-8"))
+    if not isinstance(msg, dict):
+        raise ProtocolError("frame não é um objeto JSON")
+    return msg
+
+
+# =============================================================================
+# LADO DO FILHO
+# =============================================================================
+
+
+class ChildChannel:
+    """Canal do processo filho (``--stream``).
+
+    Args:
+        stdin: Stream binário de entrada (padrão: ``sys.stdin.buffer``)
+        stdout: Stream binário reservado para frames (padrão: cópia do fd 1,
+            que passa a apontar para o stderr)
+    """
+
+    def __init__(self, stdin: IO[bytes] | None = None, stdout: IO[bytes] | None = None):
+        if stdout is None:
+            with contextlib.suppress(Exception):
+                sys.stdout.flush()
+            stdout = os.fdopen(os.dup(1), "wb")
+            os.dup2(2, 1)
+        self._in = stdin if stdin is not None else sys.stdin.buffer
+        self._out = stdout
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+        self.cancelled = threading.Event()
+
+    def send(self, type_: str, **fields: Any) -> None:
+        """Envia um evento ao pai (thread-safe). Pai já encerrado é ignorado."""
+        with self._lock, contextlib.suppress(OSError, ValueError):
+            write_frame(self._out, {"type": type_, **fields})
+
+    def receive(self) -> dict[str, Any] | None:
+        """Lê uma mensagem do pai (bloqueante). None se o stdin fechou."""
+        return read_frame(self._in)
+
+    def listen(self, on_message: Callable[[dict[str, Any]], None] | None = None) -> None:
+        """Lê mensagens do pai em background.
+
+        ``cancel`` (ou EOF inesperado) sinaliza ``cancelled``; demais mensagens
+        vão para ``on_message``.
+        """
+
+        def _run() -> None:
+            while True:
+                try:
+                    msg = self.receive()
+                except Exception:
+                    msg = None
+                if msg is None:
+                    # Pai morreu/fechou o stdin sem "close": não há a quem entregar resultados
+                    self.cancelled.set()
+                    if on_message:
+                        on_message({"type": "cancel", "reason": "eof"})
+                    return
+                if msg.get("type") == "cancel":
+                    self.cancelled.set()
+                if on_message:
+                    on_message(msg)
+                if msg.get("type") == "close":
+                    return
+
+        self._listener = threading.Thread(target=_run, name="stream-ipc-listener", daemon=True)
+        self._listener.start()
+
+
+# =============================================================================
+# LADO DO PAI
+# =============================================================================
+
+
+class StreamingChild:
+    """Processo filho falando o protocolo de streaming.
+
+    Eventos do stdout do filho vão para ``sink`` como tuplas ``(child, msg)``;
+    vários filhos podem compartilhar o mesmo ``sink``. Quando o filho termina,
+    é entregue ``{"type": "exit", "returncode": ...}``.
+
+    Args:
+        cmd: Comando do filho (deve aceitar ``--stream``)
+        env: Ambiente do filho
+        cwd: Diretório de trabalho
+        name: Nome usado nos logs
+        on_stderr: Callback por linha de stderr (logs do filho em tempo real)
+        sink: Fila compartilhada de eventos (padrão: fila própria)
+    """
+
+    def __init__(
+        self,
+        cmd: list[str],
+        env: dict[str, str] | None = None,
+        cwd: str | None = None,
+        name: str = "child",
+        on_stderr: Callable[[str], None] | None = None,
+        sink: queue.Queue | None = None,
+    ):
+        self.name = name
+        self.sink: queue.Queue = sink if sink is not None else queue.Queue()
+        self.stderr_tail: deque[str] = deque(maxlen=50)
+        self.returncode: int | None = None
+        self._on_stderr = on_stderr
+        self._lock = threading.Lock()
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, cwd=cwd
+        )
+        self._threads = [
+            threading.Thread(target=self._read_stdout, name=f"{name}-stdout", daemon=True),
+            threading.Thread(target=self._read_stderr, name=f"{name}-stderr", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _read_stdout(self) -> None:
+        assert self.proc.stdout is not None
+        try:
+            while True:
+                msg = read_frame(self.proc.stdout)
+                if msg is None:
+                    break
+                self.sink.put((self, msg))
+        except Exception as e:
+            self.sink.put((self, {"type": "error", "error": f"protocolo: {e}"}))
+        self._threads[1].join(timeout=5)
+        self.returncode = self.proc.wait()
+        self.sink.put((self, {"type": "exit", "returncode": self.returncode}))
+
+    def _read_stderr(self) -> None:
+        assert self.proc.stderr is not None
+        for raw in self.proc.stderr:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            self.stderr_tail.append(line)
+            if self._on_stderr:
+                with contextlib.suppress(Exception):
+                    self._on_stderr(line)
+
+    def send(self, type_: str, **fields: Any) -> bool:
+        """Envia uma mensagem ao filho. False se o filho já fechou o stdin."""
+        with self._lock:
+            try:
+                assert self.proc.stdin is not None
+                write_frame(self.proc.stdin, {"type": type_, **fields})
+                return True
+            except (OSError, ValueError):
+                return False
+
+    def close_input(self) -> None:
+        """Avisa que não haverá mais trabalho e fecha o stdin."""
+        self.send("close")
+        with self._lock, contextlib.suppress(Exception):
+            self.proc.stdin.close()  # type: ignore[union-attr]
+
+    def cancel(self) -> None:
+        """Pede cancelamento cooperativo (o filho ainda envia ``done`` parcial)."""
+        self.send("cancel")
+
+    def kill(self) -> None:
+        with contextlib.suppress(Exception):
+            self.proc.kill()
+
+    def messages(self, idle_timeout: float = STREAM_IDLE_TIMEOUT_SEC) -> Iterator[dict[str, Any]]:
+        """Itera eventos deste filho (fila própria) até ele terminar.
+
+        Raises:
+            TimeoutError: Nenhum evento por ``idle_timeout`` segundos.
+        """
+        while True:
+            try:
+                _, msg = self.sink.get(timeout=idle_timeout)
+            except queue.Empty:
+                raise TimeoutError(f"{self.name}: sem eventos há {idle_timeout:.0f}s") from None
+            yield msg
+            if msg.get("type") == "exit":
+                return
+
+    def finish(self, grace_sec: float = CANCEL_GRACE_SEC) -> dict[str, Any] | None:
+        """Cancela e espera o ``done`` parcial por até ``grace_sec``; depois mata o filho.
+
+        Só para filhos com fila própria (não consome eventos de outros filhos).
+
+        Returns:
+            Resultado do ``done`` se chegou a tempo, senão None.
+        """
+        self.cancel()
+        deadline = time.monotonic() + grace_sec
+        result = None
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                _, msg = self.sink.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if msg.get("type") == "done":
+                result = msg.get("result")
+                break
+            if msg.get("type") == "exit":
+                break
+        self.kill()
+        return result
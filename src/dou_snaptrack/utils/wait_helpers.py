@@ -18,6 +18,7 @@ from dou_snaptrack.constants import (
     TIMEOUT_ELEMENT_NORMAL,
     TIMEOUT_ELEMENT_SLOW,
     WAIT_ANGULAR_INIT,
+    WAIT_DROPDOWN_REPOPULATE,
     WAIT_SHORT,
 )
 
@@ -216,6 +217,94 @@ async def wait_for_network_idle_async(
         return False
 
 
+# =============================================================================
+# PRONTIDÃO DA LISTAGEM (event-driven)
+# =============================================================================
+
+# Instala (uma vez por documento) um MutationObserver e um contador de XHR/fetch
+# pendentes; cada chamada "rearma" os contadores antes de uma ação que repopula a lista.
+LISTING_WATCH_ARM_JS = """(rootSelector) => {
+    let w = window.__douListingWatch;
+    if (!w) {
+        w = window.__douListingWatch = { pending: 0, mutations: 0, last: 0, observer: null };
+        const origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function(...args) {
+            w.pending++;
+            this.addEventListener('loadend', () => { w.pending = Math.max(0, w.pending - 1); w.last = performance.now(); });
+            return origSend.apply(this, args);
+        };
+        if (window.fetch) {
+            const origFetch = window.fetch;
+            window.fetch = function(...args) {
+                w.pending++;
+                return origFetch.apply(this, args).finally(() => { w.pending = Math.max(0, w.pending - 1); w.last = performance.now(); });
+            };
+        }
+    }
+    const root = (rootSelector && document.querySelector(rootSelector)) || document.body;
+    if (w.observer) w.observer.disconnect();
+    w.observer = new MutationObserver((records) => {
+        w.mutations += records.length;
+        w.last = performance.now();
+    });
+    w.observer.observe(root, { childList: true, subtree: true });
+    w.mutations = 0;
+    w.last = performance.now();
+    return true;
+}"""
+
+# Estável = houve mutação na listagem, nenhuma requisição pendente e silêncio por quiet_ms
+LISTING_STABLE_JS = """(quietMs) => {
+    const w = window.__douListingWatch;
+    if (!w) return true;
+    return w.mutations > 0 && w.pending === 0 && (performance.now() - w.last) >= quietMs;
+}"""
+
+
+async def arm_listing_watch_async(page: AsyncPage, root_selector: str | None = None) -> bool:
+    """
+    Prepara a detecção de repopulação da listagem (chamar ANTES da ação).
+
+    Args:
+        page: Página Playwright async.
+        root_selector: Contêiner da listagem; usa document.body se ausente.
+
+    Returns:
+        True se o observador foi instalado.
+    """
+    try:
+        return bool(await page.evaluate(LISTING_WATCH_ARM_JS, root_selector))
+    except Exception:
+        return False
+
+
+async def wait_for_listing_stable_async(
+    page: AsyncPage,
+    max_wait_ms: int = WAIT_DROPDOWN_REPOPULATE,
+    quiet_ms: int = 300,
+) -> bool:
+    """
+    Aguarda a listagem repopular e estabilizar após ``arm_listing_watch_async``.
+
+    Resolve assim que houver mutações na listagem, nenhuma XHR/fetch pendente e
+    ``quiet_ms`` sem novas mutações. ``max_wait_ms`` é apenas o teto (equivalente
+    ao antigo sleep fixo). Cancelamento não é engolido: o chamador pode abortar.
+
+    Args:
+        page: Página Playwright async.
+        max_wait_ms: Teto em milissegundos.
+        quiet_ms: Janela sem mutações para considerar estável.
+
+    Returns:
+        True se estabilizou antes do teto, False caso contrário.
+    """
+    try:
+        await page.wait_for_function(LISTING_STABLE_JS, arg=quiet_ms, timeout=max_wait_ms, polling=50)
+        return True
+    except Exception:
+        return False
+
+
 # =============================================================================
 # VERSÕES SYNC
 # =============================================================================
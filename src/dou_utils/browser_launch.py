@@ -0,0 +1,80 @@
+"""
+browser_launch.py
+Launch async do Chromium com os canais e flags padrão do projeto.
+
+O browser compartilhado (daemon CDP) vive no app (dou_snaptrack.utils.browser_daemon);
+quem quiser usá-lo passa ``connect_shared`` (p.ex. BrowserFactory.connect_shared_async),
+tentado antes dos canais do sistema.
+
+Defaults: QUIC e HTTP/2 desligados para reduzir erros intermitentes em ambientes
+com proxy/inspeção SSL. Override:
+- DOU_DISABLE_QUIC=0 para permitir QUIC
+- DOU_DISABLE_HTTP2=0 para permitir HTTP/2
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+BASE_LAUNCH_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+)
+
+
+def _env_flag(name: str) -> bool:
+    return (os.environ.get(name, "1").strip() or "1").lower() in ("1", "true", "yes")
+
+
+def chromium_launch_args() -> tuple[list[str], bool, bool]:
+    """Argumentos de launch e se QUIC / HTTP/2 foram desligados."""
+    disable_quic = _env_flag("DOU_DISABLE_QUIC")
+    disable_http2 = _env_flag("DOU_DISABLE_HTTP2")
+    args = list(BASE_LAUNCH_ARGS)
+    if disable_quic:
+        args.append("--disable-quic")
+    if disable_http2:
+        args.append("--disable-http2")
+    return args, disable_quic, disable_http2
+
+
+async def launch_browser_with_channels(
+    p,
+    prefer_edge: bool,
+    log_fn: Callable[[str], None],
+    connect_shared: Callable[[Any, bool], Awaitable[Any]] | None = None,
+) -> Any | None:
+    """Browser compartilhado (se ``connect_shared``) ou Chrome/Edge do sistema.
+
+    Args:
+        p: Instância async_playwright
+        prefer_edge: Tentar Edge antes do Chrome
+        log_fn: Função de log
+        connect_shared: ``(playwright, prefer_edge) -> browser | None`` do daemon
+
+    Returns:
+        Browser, ou None se nenhum canal abriu
+    """
+    if connect_shared is not None:
+        browser = await connect_shared(p, prefer_edge)
+        if browser is not None:
+            log_fn("✓ Browser compartilhado (daemon) conectado")
+            return browser
+
+    channels = ("msedge", "chrome") if prefer_edge else ("chrome", "msedge")
+    args, disable_quic, disable_http2 = chromium_launch_args()
+    if disable_quic or disable_http2:
+        log_fn(f"[DOU] browser flags: disable_quic={int(disable_quic)} disable_http2={int(disable_http2)}")
+
+    for channel in channels:
+        try:
+            browser = await p.chromium.launch(channel=channel, headless=True, args=args)
+            log_fn(f"✓ Browser {channel} iniciado")
+            return browser
+        except Exception:
+            continue
+
+    return None
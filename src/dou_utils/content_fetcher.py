@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import gzip
 import hashlib
+import json
+import os
+import random
 import re
-import urllib.error
-import urllib.request
+import threading
+import time
+import weakref
 from collections import OrderedDict
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlsplit
 
+from .http_client import decode_body
 from .log_utils import get_logger
+from .readiness import DETAIL_READY_MS
 
 logger = get_logger(__name__)
 
@@ -26,9 +35,116 @@ _RE_PARAGRAPH = re.compile(r"<p[^>]*>([\s\S]*?)</p>", re.I)
 _RE_TAG = re.compile(r"<[^>]+>")
 _RE_WHITESPACE = re.compile(r"\s+")
 
+# Texto visível dos contêineres do ato (inclui shadow DOM), usado pelo fallback via navegador
+BROWSER_TEXT_JS = r"""
+(() => {
+    const selectors = [
+        'article', 'main article', '.texto-dou', '.publicacao-conteudo', '.single-full', '#materia', '.materia'
+    ];
+    function collectFrom(root, sel) {
+        try {
+            return Array.from(root.querySelectorAll(sel)).map(e => (e.innerText||'').trim()).filter(Boolean).join('\n');
+        } catch(e) { return ''; }
+    }
+    const seen = new Set();
+    function walk(node, acc) {
+        for (const sel of selectors) {
+            const txt = collectFrom(node, sel);
+            if (txt) acc.push(txt);
+        }
+        const walker = document.createTreeWalker(node, NodeFilter.SHOW_ELEMENT);
+        let n;
+        while (n = walker.nextNode()) {
+            if (n.shadowRoot && !seen.has(n.shadowRoot)) {
+                seen.add(n.shadowRoot);
+                walk(n.shadowRoot, acc);
+            }
+        }
+    }
+    const acc = [];
+    walk(document, acc);
+    let out = acc.join('\n').trim();
+    if (!out) {
+        const a = document.querySelector('article');
+        if (a && a.innerText) out = a.innerText.trim();
+    }
+    if (!out) {
+        const m = document.querySelector('main');
+        if (m && m.innerText) out = m.innerText.trim();
+    }
+    if (!out && document.body) {
+        out = (document.body.innerText||'').trim();
+    }
+    return out || '';
+})()
+"""
+
+# Cache em disco: páginas de ato publicado não mudam; demais URLs são revalidadas após o TTL
+IMMUTABLE_URL_MARKERS = ("/web/dou/-/",)
+CACHE_TTL_SEC = float(os.environ.get("DOU_FETCH_CACHE_TTL_SEC", "86400") or "86400")
+
+# Cache de texto extraído (<cache_dir>/_text/<digest do HTML>-<EXTRACTOR_KEY>.txt).
+# Incrementar EXTRACTOR_VERSION ao mudar a lógica de extract_text_from_html; mudanças
+# nas regex acima já trocam a chave sozinhas.
+TEXT_CACHE_DIRNAME = "_text"
+EXTRACTOR_VERSION = 1
+EXTRACTOR_KEY = hashlib.sha256(
+    "\n".join(
+        [str(EXTRACTOR_VERSION)]
+        + [r.pattern for r in (_RE_SCRIPT, _RE_STYLE, _RE_ARTICLE, _RE_MAIN, _RE_BODY, _RE_DOU_CLASS,
+                               _RE_DOU_ID, _RE_PARAGRAPH, _RE_TAG, _RE_WHITESPACE)]
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+def html_digest(html: str) -> str:
+    """SHA-256 do HTML (chave do cache de texto)."""
+    return hashlib.sha256(html.encode("utf-8", errors="ignore")).hexdigest()
+
+
+# Modo async de enriquecimento (Fetcher.enrich_items_async)
+ENRICH_MODES = ("thread", "async")
+ENRICH_CONCURRENCY = int(os.environ.get("DOU_ENRICH_CONCURRENCY", "16") or "16")
+# Requisições de rede por segundo por host (0 = sem limite)
+ENRICH_HOST_RPS = float(os.environ.get("DOU_ENRICH_HOST_RPS", "20") or "20")
+ENRICH_RETRIES = int(os.environ.get("DOU_ENRICH_RETRIES", "2") or "2")
+ENRICH_BACKOFF_SEC = 0.5
+
+
+def normalize_enrich_mode(value: str | None) -> str:
+    """Modo de enriquecimento (vazio = DOU_ENRICH_MODE ou "thread")."""
+    name = (value or os.environ.get("DOU_ENRICH_MODE") or "thread").strip().lower()
+    if name not in ENRICH_MODES:
+        logger.warning(f"enrich mode desconhecido '{name}', usando 'thread'")
+        return "thread"
+    return name
+
+
+class _HostRateLimiter:
+    """Espaça as requisições de cada host em ``1/rate`` segundos (rate <= 0 desativa)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next: dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next.get(host, now))
+        self._next[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
 
 class Fetcher:
-    """Pequeno utilitário para buscar HTML com cache em disco, com opção de forçar atualização e fallback via navegador."""
+    """Pequeno utilitário para buscar HTML com cache em disco, com opção de forçar atualização e fallback via navegador.
+
+    Cada entrada do cache guarda ao lado do ``.html.gz`` um ``.meta.json`` (ETag,
+    Last-Modified, hora do download). ``force_refresh`` e entradas fora do TTL
+    (``cache_ttl_sec``, padrão DOU_FETCH_CACHE_TTL_SEC; páginas de ato não expiram)
+    são revalidadas com GET condicional.
+    """
 
     def __init__(
         self,
@@ -38,6 +154,9 @@ class Fetcher:
         use_browser_if_short: bool = False,
         short_len_threshold: int = 800,
         browser_timeout_sec: int = 20,
+        http_client=None,
+        pool_maxsize: int = 8,
+        cache_ttl_sec: float | None = None,
     ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -49,6 +168,76 @@ class Fetcher:
         # LRU de processo para reduzir I/O repetido (até 512 páginas)
         self._mem_cache: OrderedDict[str, str] = OrderedDict()
         self._mem_cache_max = 512
+        # Política do cache em disco: TTL (0 = sem expiração) e URLs revalidadas nesta instância
+        self.cache_ttl_sec = CACHE_TTL_SEC if cache_ttl_sec is None else cache_ttl_sec
+        self._validated: set[str] = set()
+        self.cache_stats = {"downloaded": 0, "not_modified": 0, "stale_served": 0, "text_hits": 0, "text_extracted": 0}
+        # Sessão keep-alive própria (http_client.PooledHttpClient), criada no primeiro GET.
+        # ``http_client`` injetado segue a interface de PooledHttpClient.get(url, timeout_sec=, headers=)
+        # e devolve uma resposta no estilo requests (status_code, headers, content, raise_for_status());
+        # não é fechado aqui
+        self._http = http_client
+        self._owns_http = http_client is None
+        # Sessão própria sem retry interno do modo async (lá ``retries`` do enrich é o único retry)
+        self._http_once = None
+        self._pool_maxsize = max(1, int(pool_maxsize))
+        self._http_lock = threading.Lock()
+        # Browser do fallback (shared_browser.SharedBrowser), iniciado na primeira URL curta
+        self._browser = None
+        self._browser_lock = threading.Lock()
+
+    def _client(self, single_shot: bool = False):
+        """Sessão HTTP; ``single_shot`` = uma requisição por GET (sem o Retry do urllib3).
+
+        Um ``http_client`` injetado é usado como está nos dois casos.
+        """
+        with self._http_lock:
+            if single_shot and self._owns_http:
+                if self._http_once is None:
+                    from .http_client import POOL_MAXSIZE, PooledHttpClient
+
+                    self._http_once = PooledHttpClient(
+                        pool_maxsize=max(POOL_MAXSIZE, self._pool_maxsize), timeout_sec=self.timeout_sec, retries=0
+                    )
+                return self._http_once
+            if self._http is None:
+                from .http_client import POOL_MAXSIZE, PooledHttpClient
+
+                self._http = PooledHttpClient(
+                    pool_maxsize=max(POOL_MAXSIZE, self._pool_maxsize), timeout_sec=self.timeout_sec
+                )
+            return self._http
+
+    def _close_own_sessions(self) -> None:
+        # Chamado com _http_lock
+        if not self._owns_http:
+            return
+        for client in (self._http, self._http_once):
+            if client is not None:
+                with contextlib.suppress(Exception):
+                    client.close()
+        self._http = self._http_once = None
+
+    def _ensure_pool(self, max_workers: int) -> None:
+        """Garante conexões keep-alive por host para ``max_workers`` threads.
+
+        Com o pool menor que o paralelismo o urllib3 descarta as conexões excedentes
+        a cada resposta e as threads voltam a pagar o handshake TCP+TLS.
+        """
+        with self._http_lock:
+            if max_workers <= self._pool_maxsize:
+                return
+            self._pool_maxsize = max_workers
+            self._close_own_sessions()
+
+    def close(self) -> None:
+        """Fecha a sessão HTTP própria (conexões keep-alive) e o browser do fallback."""
+        with self._http_lock:
+            self._close_own_sessions()
+        with self._browser_lock:
+            browser, self._browser = self._browser, None
+        if browser is not None:
+            browser.close()
 
     def _cache_path(self, url: str) -> Path:
         h = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
@@ -76,166 +265,255 @@ class Fetcher:
         except Exception as e:
             logger.debug(f"Cache write failed for {p}: {e}")
 
+    def _meta_path(self, url: str) -> Path:
+        # Metadados da entrada: validadores HTTP e hora do download
+        cp = self._cache_path(url)
+        return cp.with_name(cp.name.replace(".html.gz", ".meta.json"))
+
+    def _read_meta(self, url: str) -> dict:
+        mp = self._meta_path(url)
+        try:
+            if mp.exists():
+                return json.loads(mp.read_text(encoding="utf-8"))
+            # Entrada sem metadados (cache antigo): idade pelo mtime, sem validadores
+            cp = self._cache_path(url)
+            for p in (cp, cp.with_suffix("")):
+                if p.exists():
+                    return {"fetched_at": p.stat().st_mtime}
+        except Exception as e:
+            logger.debug(f"Cache meta read failed for {mp}: {e}")
+        return {}
+
+    def _write_meta(self, url: str, meta: dict) -> None:
+        try:
+            self._meta_path(url).write_text(json.dumps(meta), encoding="utf-8")
+        except Exception as e:
+            logger.debug(f"Cache meta write failed for {url}: {e}")
+
+    def _is_fresh(self, url: str, meta: dict) -> bool:
+        """Entrada utilizável sem rede (atos publicados são imutáveis; demais URLs expiram em ``cache_ttl_sec``)."""
+        if any(marker in url for marker in IMMUTABLE_URL_MARKERS):
+            return True
+        if self.cache_ttl_sec <= 0:
+            return True
+        return time.time() - float(meta.get("fetched_at") or 0) < self.cache_ttl_sec
+
+    def _remember(self, url: str, html: str) -> None:
+        try:
+            self._mem_cache[url] = html
+            self._mem_cache.move_to_end(url)
+            if len(self._mem_cache) > self._mem_cache_max:
+                self._mem_cache.popitem(last=False)
+        except Exception as e:
+            logger.debug(f"Memory cache update failed: {e}")
+
+    def _cached_html(self, url: str) -> str:
+        """HTML utilizável sem rede: LRU ou disco dentro da política ("" se ausente ou a revalidar).
+
+        Com ``force_refresh`` só vale o que já foi revalidado por este Fetcher.
+        """
+        if self.force_refresh and url not in self._validated:
+            return ""
+        # Cache em memória
+        try:
+            if url in self._mem_cache:
+                html = self._mem_cache.pop(url)
+                # move para o fim (mais recente)
+                self._mem_cache[url] = html
+                return html
+        except Exception as e:
+            logger.debug(f"Memory cache access failed for {url}: {e}")
+        # Se existir no disco e estiver dentro do TTL, ler e popular LRU
+        cp = self._cache_path(url)
+        if (cp.exists() or cp.with_suffix("").exists()) and self._is_fresh(url, self._read_meta(url)):
+            html = self._read_cache_file(cp)
+            if html:
+                self._remember(url, html)
+                return html
+        return ""
+
     def fetch_html(self, url: str) -> str:
+        """HTML da URL pelo cache (memória/disco) ou pela rede.
+
+        Entradas a revalidar (``force_refresh`` ou fora do TTL) usam GET condicional
+        com o ETag/Last-Modified gravados: 304 mantém o HTML em cache sem baixá-lo.
+        Se a rede falhar, a entrada antiga é devolvida.
+        """
+        return self._fetch_html(url, single_shot=False)
+
+    def _fetch_html(self, url: str, single_shot: bool) -> str:
         if not url or not url.startswith("http"):
             return ""
+        html = self._cached_html(url)
+        if html:
+            return html
         cp = self._cache_path(url)
-        # Cache em memória
-        if not self.force_refresh:
-            try:
-                if url in self._mem_cache:
-                    html = self._mem_cache.pop(url)
-                    # move para o fim (mais recente)
-                    self._mem_cache[url] = html
-                    return html
-            except Exception as e:
-                logger.debug(f"Memory cache access failed for {url}: {e}")
-            # Se existir no disco, ler e popular LRU
-            if cp.exists():
-                html = self._read_cache_file(cp)
-                if html:
-                    try:
-                        self._mem_cache[url] = html
-                        if len(self._mem_cache) > self._mem_cache_max:
-                            self._mem_cache.popitem(last=False)
-                    except Exception as e:
-                        logger.debug(f"Memory cache update failed: {e}")
-                    return html
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Connection": "close",
-            },
-        )
+        stale = self._read_cache_file(cp) if (cp.exists() or cp.with_suffix("").exists()) else ""
+        meta = self._read_meta(url) if stale else {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        # GET pela sessão com pool (keep-alive; gzip/deflate/br decodificados pelo requests)
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_sec) as resp:
-                raw = resp.read()
-                try:
-                    html = raw.decode("utf-8", errors="ignore")
-                except Exception:
-                    try:
-                        html = raw.decode("latin-1", errors="ignore")
-                    except Exception:
-                        html = ""
-        except (urllib.error.URLError, Exception):
+            resp = self._client(single_shot).get(url, timeout_sec=self.timeout_sec, headers=headers or None)
+            if resp.status_code == 304 and stale:
+                self.cache_stats["not_modified"] += 1
+                self._write_meta(url, {**meta, "fetched_at": time.time(), "digest": html_digest(stale)})
+                self._validated.add(url)
+                self._remember(url, stale)
+                return stale
+            resp.raise_for_status()
+            html = decode_body(resp.content, resp.headers.get("Content-Type"))
+        except Exception as e:
+            logger.debug(f"Fetch failed for {url}: {e}")
+            if stale:
+                self.cache_stats["stale_served"] += 1
+            return stale
+        self.cache_stats["downloaded"] += 1
+        self._write_cache_file(cp, html)
+        self._write_meta(url, {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "digest": html_digest(html),
+        })
+        self._validated.add(url)
+        self._remember(url, html)
+        return html
+
+    def _text_path(self, digest: str) -> Path:
+        return self.cache_dir / TEXT_CACHE_DIRNAME / f"{digest[:32]}-{EXTRACTOR_KEY}.txt"
+
+    def _read_text(self, digest: str) -> str | None:
+        try:
+            return self._text_path(digest).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Text cache read failed for {digest}: {e}")
+            return None
+
+    def _write_text(self, digest: str, text: str) -> None:
+        p = self._text_path(digest)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, p)
+        except Exception as e:
+            logger.debug(f"Text cache write failed for {digest}: {e}")
+
+    def extract_text_cached(self, html: str) -> str:
+        """``extract_text_from_html`` memorizado em disco pelo digest do HTML + versão do extrator."""
+        if not html:
             return ""
+        digest = html_digest(html)
+        text = self._read_text(digest)
+        if text is not None:
+            self.cache_stats["text_hits"] += 1
+            return text
+        text = self.extract_text_from_html(html)
+        self.cache_stats["text_extracted"] += 1
+        self._write_text(digest, text)
+        return text
+
+    def _cached_text(self, url: str) -> str | None:
+        """Texto extraído da URL sem ler o HTML (None se for preciso HTML: sem digest, a revalidar ou ausente)."""
+        if self.force_refresh and url not in self._validated:
+            return None
+        meta = self._read_meta(url)
+        digest = meta.get("digest")
+        if not digest or not self._is_fresh(url, meta) or not self._cache_path(url).exists():
+            return None
+        text = self._read_text(digest)
+        if text is not None:
+            self.cache_stats["text_hits"] += 1
+        return text
+
+    def fetch_text(self, url: str) -> str:
+        """Corpo de texto da URL: cache de texto pelo digest gravado ou HTML (cache/rede) + extração."""
+        if not url or not url.startswith("http"):
+            return ""
+        text = self._cached_text(url)
+        if text is not None:
+            return text
+        return self._text_for(url, self.fetch_html(url))
+
+    def _text_for(self, url: str, html: str) -> str:
+        if html:
+            meta = self._read_meta(url)
+            # Entrada gravada antes do cache de texto: anota o digest para dispensar o HTML nas próximas
+            if meta and not meta.get("digest") and self._cache_path(url).exists():
+                self._write_meta(url, {**meta, "digest": html_digest(html)})
+        return self.extract_text_cached(html)
+
+    def _shared_browser(self):
+        with self._browser_lock:
+            if self._browser is None:
+                from .shared_browser import SHARED_BROWSER_PAGES, SharedBrowser
+
+                self._browser = SharedBrowser(
+                    pool_size=min(SHARED_BROWSER_PAGES, self._pool_maxsize), name="fetcher-browser"
+                )
+                # Fetcher descartado sem close(): encerra o browser junto
+                weakref.finalize(self, self._browser.close)
+            return self._browser
+
+    def _browser_visit(self, url: str, want_html: bool) -> tuple[str, str]:
+        """Uma navegação no browser compartilhado: (texto visível, HTML se pedido ou texto vazio)."""
+        timeout_ms = self.browser_timeout_sec * 1000
+
+        async def _visit(page) -> tuple[str, str]:
+            from .readiness import wait_for_detail_ready_async
+
+            page.set_default_timeout(timeout_ms)
+            await page.goto(url, wait_until="domcontentloaded")
+            await wait_for_detail_ready_async(page, budget_ms=min(timeout_ms, DETAIL_READY_MS))
+            try:
+                text = await page.evaluate(BROWSER_TEXT_JS)
+            except Exception:
+                text = ""
+            # Limitar tamanho extremo
+            text = (text or "")[:200000]
+            html = await page.content() if want_html or not text else ""
+            return text, html or ""
+
         try:
-            if not self.force_refresh:
-                self._write_cache_file(cp, html)
-                # Popular LRU
-                try:
-                    self._mem_cache[url] = html
-                    if len(self._mem_cache) > self._mem_cache_max:
-                        self._mem_cache.popitem(last=False)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        return html
+            # Folga sobre o timeout da página para espera por página livre no pool
+            return self._shared_browser().run(_visit, timeout_sec=self.browser_timeout_sec * 2 + 5)
+        except Exception as e:
+            logger.debug(f"Browser fetch failed for {url}: {e}")
+            return "", ""
 
     def fetch_html_browser(self, url: str) -> str:
-        """Tenta carregar a pagina com um navegador (Playwright) para capturar conteudo dinamico.
+        """Carrega a pagina no browser compartilhado do Fetcher para capturar conteudo dinamico.
 
         Retorna HTML ou vazio se indisponivel.
         """
-        try:
-            from playwright.sync_api import sync_playwright  # type: ignore
-        except Exception:
-            return ""
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                try:
-                    page = browser.new_page()
-                    page.set_default_timeout(self.browser_timeout_sec * 1000)
-                    page.goto(url, wait_until="networkidle")
-                    with contextlib.suppress(Exception):
-                        page.wait_for_timeout(500)
-                    html = page.content()
-                finally:
-                    browser.close()
-        except Exception:
-            # Silenciar erros de asyncio/Playwright em contexto Streamlit
-            return ""
-        return html or ""
+        return self._browser_visit(url, want_html=True)[1]
 
     def fetch_text_browser(self, url: str) -> str:
-        """Carrega a pagina com navegador e tenta extrair texto visivel dos principais conteineres,
+        """Carrega a pagina no browser compartilhado e extrai texto visivel dos principais conteineres,
         incluindo shadow DOM quando possivel. Retorna texto plano.
         """
-        try:
-            from playwright.sync_api import sync_playwright  # type: ignore
-        except Exception:
-            return ""
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                try:
-                    page = browser.new_page()
-                    page.set_default_timeout(self.browser_timeout_sec * 1000)
-                    page.goto(url, wait_until="domcontentloaded")
-                    # Pequeno atraso para render estavel
-                    with contextlib.suppress(Exception):
-                        page.wait_for_timeout(500)
-
-                    js = r"""
-                    (() => {
-                        const selectors = [
-                            'article', 'main article', '.texto-dou', '.publicacao-conteudo', '.single-full', '#materia', '.materia'
-                        ];
-                        function collectFrom(root, sel) {
-                            try {
-                                return Array.from(root.querySelectorAll(sel)).map(e => (e.innerText||'').trim()).filter(Boolean).join('\n');
-                            } catch(e) { return ''; }
-                        }
-                        const seen = new Set();
-                        function walk(node, acc) {
-                            for (const sel of selectors) {
-                                const txt = collectFrom(node, sel);
-                                if (txt) acc.push(txt);
-                            }
-                            const walker = document.createTreeWalker(node, NodeFilter.SHOW_ELEMENT);
-                            let n;
-                            while (n = walker.nextNode()) {
-                                if (n.shadowRoot && !seen.has(n.shadowRoot)) {
-                                    seen.add(n.shadowRoot);
-                                    walk(n.shadowRoot, acc);
-                                }
-                            }
-                        }
-                        const acc = [];
-                        walk(document, acc);
-                        let out = acc.join('\n').trim();
-                        if (!out) {
-                            const a = document.querySelector('article');
-                            if (a && a.innerText) out = a.innerText.trim();
-                        }
-                        if (!out) {
-                            const m = document.querySelector('main');
-                            if (m && m.innerText) out = m.innerText.trim();
-                        }
-                        if (!out && document.body) {
-                            out = (document.body.innerText||'').trim();
-                        }
-                        return out || '';
-                    })()
-                    """
-                    try:
-                        text = page.evaluate(js)
-                    except Exception:
-                        text = ""
-                    # Limitar tamanho extremo
-                    if text and len(text) > 200000:
-                        text = text[:200000]
-                finally:
-                    browser.close()
-        except Exception:
-            # Silenciar erros de asyncio/Playwright em contexto Streamlit
-            return ""
-        return text or ""
+        return self._browser_visit(url, want_html=False)[0]
+
+    def _browser_fallback(self, url: str, body: str) -> str:
+        """Corpo pelo navegador quando o HTTP voltou curto (mantém ``body`` se não melhorar).
+
+        Uma única navegação por URL: texto visível e, se vier vazio, o HTML da mesma página.
+        """
+        text_b, html_b = self._browser_visit(url, want_html=False)
+        if text_b and len(text_b) > len(body):
+            return text_b
+        if html_b:
+            body_b = self.extract_text_from_html(html_b)
+            if len(body_b) > len(body):
+                return body_b
+        return body
 
     @staticmethod
     def extract_text_from_html(html: str) -> str:
@@ -299,30 +577,19 @@ class Fetcher:
 
         urls = list(url_to_items.keys())
         filled = 0
+        self._ensure_pool(max_workers)
 
         def _work_url(url: str) -> tuple[str, str]:
-            html = self.fetch_html(url)
-            body = self.extract_text_from_html(html)
+            body = self.fetch_text(url)
 
             # Small retry for transient network issues
             if not body:
-                html2 = self.fetch_html(url)
-                body2 = self.extract_text_from_html(html2)
+                body2 = self.fetch_text(url)
                 if body2 and len(body2) > len(body):
                     body = body2
 
             if self.use_browser_if_short and (not body or len(body) < self.short_len_threshold):
-                # Tentar texto direto via navegador (mais robusto para conteúdo dinâmico)
-                fetch_text = getattr(self, "fetch_text_browser", None)
-                text_b = str(fetch_text(url)) if callable(fetch_text) else ""
-                if text_b and len(text_b) > len(body):
-                    body = text_b
-                else:
-                    html_b = self.fetch_html_browser(url)
-                    if html_b:
-                        body_b = self.extract_text_from_html(html_b)
-                        if len(body_b) > len(body):
-                            body = body_b
+                body = self._browser_fallback(url, body)
 
             return url, body
 
@@ -344,21 +611,11 @@ class Fetcher:
         logger.info(f"[ENRICH] filled {filled}/{sum(len(v) for v in url_to_items.values())} missing texts")
         return filled
 
-    def enrich_items(
-        self,
-        items: list[dict],
-        max_workers: int = 8,
-        overwrite: bool = False,
-        min_len: int | None = None,
-    ) -> int:
-        """Busca HTML e extrai corpo para um conjunto de itens.
-
-        - overwrite=True: sempre sobrescreve `texto` com o extraído, quando possível.
-        - overwrite=False: somente preenche quando faltar `texto`.
-        - min_len: se informado, itens com `texto` menor que esse valor também serão alvo.
-
-        Retorna quantidade de itens que tiveram `texto` atualizado/preenchido.
-        """
+    @staticmethod
+    def _enrich_targets(
+        items: list[dict], overwrite: bool, min_len: int | None
+    ) -> tuple[dict[str, list[dict]], int]:
+        """Itens a enriquecer agrupados por URL absoluta (URL repetida = um fetch)."""
         url_to_items: dict[str, list[dict]] = {}
         total_targets = 0
         for it in items:
@@ -375,34 +632,41 @@ class Fetcher:
                 continue
             url_to_items.setdefault(url, []).append(it)
             total_targets += 1
+        return url_to_items, total_targets
+
+    def enrich_items(
+        self,
+        items: list[dict],
+        max_workers: int = 8,
+        overwrite: bool = False,
+        min_len: int | None = None,
+    ) -> int:
+        """Busca HTML e extrai corpo para um conjunto de itens.
+
+        - overwrite=True: sempre sobrescreve `texto` com o extraído, quando possível.
+        - overwrite=False: somente preenche quando faltar `texto`.
+        - min_len: se informado, itens com `texto` menor que esse valor também serão alvo.
 
+        Retorna quantidade de itens que tiveram `texto` atualizado/preenchido.
+        """
+        url_to_items, total_targets = self._enrich_targets(items, overwrite, min_len)
         if not url_to_items:
             return 0
 
         urls = list(url_to_items.keys())
         updated = 0
+        self._ensure_pool(max_workers)
 
         def _work_url(url: str) -> tuple[str, str]:
-            html = self.fetch_html(url)
-            body = self.extract_text_from_html(html)
+            body = self.fetch_text(url)
 
             if not body:
-                html2 = self.fetch_html(url)
-                body2 = self.extract_text_from_html(html2)
+                body2 = self.fetch_text(url)
                 if body2 and len(body2) > len(body):
                     body = body2
 
             if self.use_browser_if_short and (not body or len(body) < self.short_len_threshold):
-                fetch_text = getattr(self, "fetch_text_browser", None)
-                text_b = str(fetch_text(url)) if callable(fetch_text) else ""
-                if text_b and len(text_b) > len(body):
-                    body = text_b
-                else:
-                    html_b = self.fetch_html_browser(url)
-                    if html_b:
-                        body_b = self.extract_text_from_html(html_b)
-                        if len(body_b) > len(body):
-                            body = body_b
+                body = self._browser_fallback(url, body)
 
             return url, body
 
@@ -423,5 +687,106 @@ class Fetcher:
                 except Exception:
                     continue
 
-        logger.info(f"[ENRICH] updated {updated}/{total_targets} items (overwrite={overwrite}, min_len={min_len})")
+        logger.info(
+            f"[ENRICH] updated {updated}/{total_targets} items (overwrite={overwrite}, min_len={min_len}) "
+            f"cache={self.cache_stats}"
+        )
+        return updated
+
+    async def _enrich_all(
+        self,
+        url_to_items: dict[str, list[dict]],
+        concurrency: int,
+        host_rps: float,
+        retries: int,
+        on_result: Callable[[str, str], None] | None,
+    ) -> int:
+        sem = asyncio.Semaphore(concurrency)
+        limiter = _HostRateLimiter(host_rps)
+        loop = asyncio.get_running_loop()
+        updated = 0
+        # Não há cliente HTTP assíncrono nas dependências: GET, leitura de cache e regex
+        # são bloqueantes e vão para um executor do tamanho da concorrência
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="enrich-io") as io:
+
+            async def _run(fn, *args):
+                return await loop.run_in_executor(io, fn, *args)
+
+            async def _one(url: str) -> tuple[str, str]:
+                async with sem:
+                    body = await _run(self._cached_text, url)
+                    if body is None:
+                        html = await _run(self._cached_html, url)
+                        attempt = 0
+                        while not html and attempt <= retries:
+                            if attempt:
+                                await asyncio.sleep(ENRICH_BACKOFF_SEC * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+                            await limiter.wait(urlsplit(url).netloc)
+                            html = await _run(self._fetch_html, url, True)
+                            attempt += 1
+                        body = await _run(self._text_for, url, html) if html else ""
+                    if self.use_browser_if_short and (not body or len(body) < self.short_len_threshold):
+                        body = await _run(self._browser_fallback, url, body)
+                    return url, body
+
+            for fut in asyncio.as_completed([_one(u) for u in url_to_items]):
+                try:
+                    url, body = await fut
+                except Exception as e:
+                    logger.debug(f"[ENRICH] async item failed: {e}")
+                    continue
+                if not body:
+                    continue
+                # Resultado entra nos itens assim que chega (não espera o lote)
+                for it in url_to_items[url]:
+                    it["texto"] = body
+                    updated += 1
+                if on_result is not None:
+                    with contextlib.suppress(Exception):
+                        on_result(url, body)
+        return updated
+
+    def enrich_items_async(
+        self,
+        items: list[dict],
+        max_workers: int = ENRICH_CONCURRENCY,
+        overwrite: bool = False,
+        min_len: int | None = None,
+        host_rps: float = ENRICH_HOST_RPS,
+        retries: int = ENRICH_RETRIES,
+        on_result: Callable[[str, str], None] | None = None,
+    ) -> int:
+        """Mesmo contrato de ``enrich_items`` em um event loop (bloqueante para quem chama).
+
+        - max_workers: URLs em andamento ao mesmo tempo (semáforo do loop)
+        - host_rps: requisições de rede por segundo por host (0 = sem limite); hits de cache não contam
+        - retries: novas tentativas quando o GET falha, com backoff exponencial e jitter
+        - on_result: chamado com (url, texto) a cada URL concluída
+
+        Roda em uma thread própria para não colidir com um loop já ativo na thread chamadora.
+        O agendamento (semáforo, ritmo por host, retry) é do loop, mas o trabalho bloqueante
+        (GET via requests, cache em disco, extração) roda em ``max_workers`` threads: o ganho
+        sobre ``enrich_items`` é o controle de taxa e o streaming, não dispensar threads.
+        Cada tentativa faz um único GET (sessão sem o Retry do urllib3), então ``retries``
+        e ``host_rps`` contam requisições reais.
+
+        Retorna quantidade de itens que tiveram `texto` atualizado/preenchido.
+        """
+        url_to_items, total_targets = self._enrich_targets(items, overwrite, min_len)
+        if not url_to_items:
+            return 0
+        concurrency = max(1, int(max_workers))
+        self._ensure_pool(concurrency)
+        logger.info(
+            f"[ENRICH] async targets={total_targets} unique_urls={len(url_to_items)} concurrency={concurrency} "
+            f"host_rps={host_rps} (overwrite={overwrite}, min_len={min_len})"
+        )
+        coro = self._enrich_all(url_to_items, concurrency, host_rps, max(0, int(retries)), on_result)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="enrich-async") as pool:
+            updated = pool.submit(asyncio.run, coro).result()
+        logger.info(
+            f"[ENRICH] async updated {updated}/{total_targets} items (overwrite={overwrite}, min_len={min_len}) "
+            f"cache={self.cache_stats}"
+        )
         return updated
+
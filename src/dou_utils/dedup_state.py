@@ -1,12 +1,44 @@
 """
 Persistent deduplication state (JSONL of hashes).
 Used to avoid reprocessing same items across runs.
+
+Two keys per item:
+- ``hash``: stable_sha1(url, titulo), only known after scraping the detail page
+- ``url``: cheap key derived from the detail URL (see ``url_key``), checked
+  before any navigation so items seen in previous runs are never fetched again
+
+Lines written before the URL key existed (``{"hash": ...}`` only) stay valid.
 """
 
 from __future__ import annotations
 
 import json
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .hash_utils import stable_sha1
+
+# Query params that do not change the act being shown
+_IGNORED_QUERY_PARAMS = frozenset({"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "fbclid"})
+
+
+def url_key(url: str | None) -> str | None:
+    """Cheap dedup key for a detail URL (None for empty URLs).
+
+    DOU detail links look like ``/web/dou/-/<slug-with-id>``; the slug after
+    ``/-/`` identifies the act regardless of host, locale prefix (``/en/``),
+    trailing slash or fragment. Other URLs use host + path + sorted query.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    if "/-/" in path:
+        ident = path.rsplit("/-/", 1)[1].lower()
+    else:
+        query = sorted((k, v) for k, v in parse_qsl(parts.query) if k not in _IGNORED_QUERY_PARAMS)
+        ident = f"{parts.netloc.lower()}{path}?{urlencode(query)}"
+    return stable_sha1("url", ident)
 
 
 class DedupState:
@@ -14,6 +46,7 @@ class DedupState:
         self.path = Path(path)
         self._loaded = False
         self._seen: set[str] = set()
+        self._seen_urls: set[str] = set()
 
     def load(self):
         if self._loaded:
@@ -26,6 +59,9 @@ class DedupState:
                         h = obj.get("hash")
                         if h:
                             self._seen.add(h)
+                        u = obj.get("url")
+                        if u:
+                            self._seen_urls.add(u)
                     except Exception:
                         continue
             except Exception:
@@ -36,15 +72,28 @@ class DedupState:
         self.load()
         return h in self._seen
 
-    def add(self, h: str):
+    def has_url(self, key: str | None) -> bool:
+        """True if an item with this ``url_key`` was already recorded."""
+        if not key:
+            return False
+        self.load()
+        return key in self._seen_urls
+
+    def add(self, h: str, url: str | None = None):
+        """Record a hash and, optionally, the item's ``url_key``."""
         self.load()
-        if h in self._seen:
+        new_url = bool(url) and url not in self._seen_urls
+        if h in self._seen and not new_url:
             return
         self._seen.add(h)
+        entry = {"hash": h}
+        if url:
+            self._seen_urls.add(url)
+            entry["url"] = url
         try:
             self.path.parent.mkdir(parents=True, exist_ok=True)
             with self.path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps({"hash": h}, ensure_ascii=False) + "\n")
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
         except Exception:
             pass
 
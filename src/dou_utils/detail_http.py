@@ -0,0 +1,222 @@
+"""
+detail_http.py
+Backend de detalhe sem browser.
+
+Baixa o HTML da página de detalhe com o cliente HTTP com pool
+(http_client) e extrai os mesmos campos brutos de DETAIL_EXTRACT_JS, com as
+mesmas regras, sobre o DOM estático de html_lite. O DetailData sai de
+detail_utils.fill_detail, igual ao backend browser.
+
+Backends (CascadeParams.detail_backend / DOU_DETAIL_BACKEND):
+ - "browser": scrape_detail_structured (Playwright; padrão)
+ - "http": só HTTP
+ - "http-then-browser-if-short": HTTP; repete no browser quando o download
+   falha ou o texto vem curto demais (conteúdo montado por JS)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Any
+
+from .detail_utils import META_KEYS, RE_LABEL_ORGAO, RE_LABEL_TIPO, RE_ORGAO_TIPO, RE_PDF_CERTIFICADA, fill_detail
+from .hash_utils import stable_sha1
+from .html_lite import Node, parse_html
+from .log_utils import get_logger
+from .models import DetailData
+
+logger = get_logger(__name__)
+
+BACKEND_BROWSER = "browser"
+BACKEND_HTTP = "http"
+BACKEND_HTTP_THEN_BROWSER = "http-then-browser-if-short"
+DETAIL_BACKENDS = (BACKEND_BROWSER, BACKEND_HTTP, BACKEND_HTTP_THEN_BROWSER)
+# Texto abaixo disso no modo http-then-browser-if-short = página depende de JS
+SHORT_TEXT_CHARS = int(os.environ.get("DOU_DETAIL_SHORT_CHARS", "200") or "200")
+
+_RE_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_detail_backend(value: str | None) -> str:
+    """Valida o nome do backend (vazio = DOU_DETAIL_BACKEND ou "browser")."""
+    name = (value or os.environ.get("DOU_DETAIL_BACKEND") or BACKEND_BROWSER).strip().lower()
+    if name not in DETAIL_BACKENDS:
+        logger.warning(f"detail_backend desconhecido '{name}', usando '{BACKEND_BROWSER}'")
+        return BACKEND_BROWSER
+    return name
+
+
+def is_short_detail(detail: DetailData, min_chars: int = SHORT_TEXT_CHARS) -> bool:
+    return len((detail.texto or "").strip()) < min_chars
+
+
+# ---------------- Extração (espelha DETAIL_EXTRACT_JS) ----------------
+def _ws(s: str | None) -> str:
+    return _RE_WHITESPACE.sub(" ", s or "").strip()
+
+
+def _text_of(doc: Node, sel: str) -> str:
+    el = doc.select_one(sel)
+    return _ws(el.text()) if el is not None and el.is_visible() else ""
+
+
+def _meta(doc: Node, sel: str) -> str | None:
+    el = doc.select_one(sel)
+    if el is None:
+        return None
+    return (el.get("content") or "").strip() or None
+
+
+def _first_meta(doc: Node, sels: list[str]) -> str | None:
+    for sel in sels:
+        val = _meta(doc, sel)
+        if val:
+            return val
+    return None
+
+
+def _first_text(doc: Node, sels: list[str]) -> str | None:
+    for sel in sels:
+        val = _text_of(doc, sel)
+        if val:
+            return val
+    return None
+
+
+def _dt_dd(doc: Node, source: str) -> str | None:
+    pat = re.compile(source, re.I)
+    for dt in doc.select("dl dt")[:400]:
+        t = dt.text().strip()
+        if not t or not pat.search(t) or not dt.is_visible():
+            continue
+        dd = dt.next_element_sibling()
+        while dd is not None and dd.tag != "dd":
+            dd = dd.next_element_sibling()
+        if dd is not None and dd.is_visible():
+            val = _ws(dd.text())
+            if val:
+                return val
+    for cand in doc.select("strong, b, label, span")[:600]:
+        t = cand.text().strip()
+        if not t or not pat.search(t) or not cand.is_visible():
+            continue
+        parent = cand.parent
+        if parent is not None and parent.tag != "#document" and parent.is_visible():
+            val = RE_ORGAO_TIPO.sub("", _ws(parent.text())).strip()
+            if val:
+                return val
+    return None
+
+
+def _paragraphs(doc: Node) -> list[str]:
+    for sel in ("article", "main article", "div[class*=materia]", "main"):
+        root = doc.select_one(sel)
+        if root is None or not root.is_visible():
+            continue
+        paragraphs = [_ws(p.text()) for p in doc.select(f"{sel} p")[:300] if p.text().strip()]
+        if paragraphs:
+            return paragraphs
+    return []
+
+
+def _pdf_links(doc: Node, advanced: bool) -> dict[str, str | None]:
+    pdf = None
+    for a in doc.select("a[href$='.pdf'], a[href*='.pdf?']")[:30]:
+        href = a.get("href")
+        low = (href or "").lower()
+        if href and (low.endswith(".pdf") or ".pdf?" in low):
+            pdf = href
+            break
+    certificada = None
+    if not pdf and advanced:
+        for a in doc.select("a[href], [role='link']"):
+            if RE_PDF_CERTIFICADA.search(a.get("aria-label") or a.text() or ""):
+                if a.is_visible():
+                    certificada = a.get("href")
+                break
+    return {"pdf": pdf, "pdfCertificada": certificada}
+
+
+def extract_raw_from_html(html: str, advanced: bool = False) -> dict[str, Any]:
+    """Campos brutos no mesmo formato de DETAIL_EXTRACT_JS, a partir do HTML estático."""
+    doc = parse_html(html)
+
+    title_el = doc.select_one("title")
+    title = (
+        _first_meta(doc, ["meta[property='og:title']", "meta[name='dc.title']"])
+        or _first_text(doc, ["article h1", "main article h1", "h1"])
+        or (title_el.text().strip() if title_el is not None else "")
+        or None
+    )
+    if not title and advanced:
+        title = _first_text(doc, ["article h2", "main article h2", "h2", "[class*=titulo] h1",
+                                  "[class*=title] h1", "[class*=titulo]", "[class*=title]"])
+
+    pub = _first_meta(doc, ["meta[property='article:published_time']", "meta[name='publicationDate']",
+                            "meta[name='dc.date']"])
+    if not pub:
+        t = doc.select_one("time[datetime]")
+        pub = (t.get("datetime") or None) if t is not None else None
+
+    body = doc.select_one("body")
+    meta_map = {sel: val for sel in META_KEYS if (val := _meta(doc, sel))}
+
+    return {
+        "title": title,
+        "pub": pub,
+        "orgao": _dt_dd(doc, RE_LABEL_ORGAO),
+        "tipo": _dt_dd(doc, RE_LABEL_TIPO),
+        "secaoLink": _text_of(doc, 'a[href*="secao=DO"]') or None,
+        "ementa": _first_text(doc, ["article .texto p", "article p", "main article p",
+                                    "div[class*=materia] p", "main p"]),
+        "paragraphs": _paragraphs(doc),
+        **_pdf_links(doc, advanced),
+        "bodyText": _text_of(doc, "article") or _text_of(doc, "main")
+        or (body.inner_text() if body is not None else ""),
+        "meta": meta_map,
+    }
+
+
+def parse_detail_html(
+    html: str,
+    url: str,
+    page_url: str | None = None,
+    capture_meta: bool = True,
+    advanced: bool = False,
+    fallback_date: str | None = None,
+    compute_hash: bool = True,
+) -> DetailData:
+    """DetailData a partir do HTML (mesmo resultado de scrape_detail_structured para páginas estáticas)."""
+    detail = DetailData(detail_url=url)
+    raw = extract_raw_from_html(html, advanced)
+    fill_detail(detail, raw, page_url or url, advanced, capture_meta, fallback_date)
+    if compute_hash:
+        detail.meta["hash"] = stable_sha1(url, detail.titulo or "")
+    return detail
+
+
+def scrape_detail_http(
+    client,
+    url: str,
+    timeout_ms: int = 60_000,
+    capture_meta: bool = True,
+    advanced: bool = False,
+    fallback_date: str | None = None,
+    compute_hash: bool = True,
+) -> DetailData:
+    """Equivalente HTTP de scrape_detail_structured.
+
+    Args:
+        client: PooledHttpClient (ou objeto com ``get_text(url, timeout_sec)``)
+
+    Raises:
+        Exception: Falha de rede/HTTP (quem chama decide se cai para o browser)
+    """
+    final_url, html = client.get_text(url, timeout_sec=max(1.0, timeout_ms / 1000))
+    detail = parse_detail_html(
+        html, url, page_url=final_url, capture_meta=capture_meta, advanced=advanced,
+        fallback_date=fallback_date, compute_hash=compute_hash,
+    )
+    logger.debug("Detail http ok", extra={"url": url, "title": detail.titulo})
+    return detail
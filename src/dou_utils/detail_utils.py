@@ -13,6 +13,19 @@ Recursos (advanced=True):
  - Texto completo (até 8000 chars, preservando corte em frase)
 
 Saída via DetailData (models.DetailData) - espera-se que esse dataclass já exista.
+
+Extração em um único round trip: DETAIL_EXTRACT_JS roda no browser e devolve
+todos os campos brutos (mesmas regras dos helpers de locator abaixo) em um só
+``page.evaluate``. Os helpers de locator continuam como fallback se o
+evaluate falhar (CSP, página em navegação, etc.).
+
+Páginas vêm do pool do context (page_pool) em vez de new_page/close por URL
+(DOU_PAGE_POOL=0 volta ao comportamento antigo). Com o pool cheio por mais de
+DOU_PAGE_ACQUIRE_TIMEOUT_SEC, a URL usa uma página avulsa.
+
+Após o goto espera-se o texto do artigo (readiness.wait_for_detail_ready, com
+orçamento DOU_READY_DETAIL_MS), não networkidle: beacons de analytics mantêm a
+rede ocupada e faziam cada detalhe esperar o timeout inteiro.
 """
 
 from __future__ import annotations
@@ -26,6 +39,8 @@ from urllib.parse import urljoin
 from .hash_utils import stable_sha1
 from .log_utils import get_logger
 from .models import DetailData
+from .page_pool import PAGE_ACQUIRE_TIMEOUT_SEC, PAGE_POOL_ENABLED, get_page_pool, is_crash_error
+from .readiness import DETAIL_READY_MS, ReadyTimings, wait_for_detail_ready
 
 logger = get_logger(__name__)
 
@@ -33,11 +48,126 @@ logger = get_logger(__name__)
 _RE_WHITESPACE = re.compile(r"\s+")
 _RE_DATE_ISO = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
 _RE_DATE_BR = re.compile(r"(\d{2})/(\d{2})/(\d{4})")
-_RE_ORGAO_TIPO = re.compile(r"^\s*(Órgão|Orgao|Tipo|Tipo do Ato)\s*:\s*", re.I)
+RE_ORGAO_TIPO = re.compile(r"^\s*(Órgão|Orgao|Tipo|Tipo do Ato)\s*:\s*", re.I)
 _RE_EDICAO = re.compile(r"Edi[cç][aã]o\s*:\s*(\d+)", re.I)
 _RE_PAGINA = re.compile(r"P[aá]gina\s*:\s*(\d+)", re.I)
 _RE_SECAO = re.compile(r"DO[123]")
-_RE_PDF_CERTIFICADA = re.compile(r"VERS[ÃA]O CERTIFICADA", re.I)
+RE_PDF_CERTIFICADA = re.compile(r"VERS[ÃA]O CERTIFICADA", re.I)
+RE_LABEL_ORGAO = r"(Órgão|Orgao)"
+RE_LABEL_TIPO = r"(Tipo|Tipo do Ato)"
+
+META_KEYS = [
+    "meta[name='dc.title']",
+    "meta[name='dc.date']",
+    "meta[property='og:title']",
+    "meta[property='article:published_time']",
+    "meta[name='dc.subject']",
+]
+
+# Extrator completo em um único evaluate. Espelha os helpers de locator:
+# "visível" e "texto" seguem is_visible()/text_content() do Playwright.
+DETAIL_EXTRACT_JS = r"""(opts) => {
+    const ws = (s) => (s || '').replace(/\s+/g, ' ').trim();
+    const visible = (el) => {
+        if (!el) return false;
+        const st = getComputedStyle(el);
+        if (st.visibility === 'hidden') return false;
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0;
+    };
+    const textOf = (sel) => {
+        const el = document.querySelector(sel);
+        return el && visible(el) ? ws(el.textContent) : '';
+    };
+    const meta = (sel) => {
+        const el = document.querySelector(sel);
+        const v = el ? (el.getAttribute('content') || '').trim() : '';
+        return v || null;
+    };
+    const firstMeta = (sels) => { for (const s of sels) { const v = meta(s); if (v) return v; } return null; };
+    const firstText = (sels) => { for (const s of sels) { const v = textOf(s); if (v) return v; } return null; };
+
+    let title = firstMeta(["meta[property='og:title']", "meta[name='dc.title']"])
+        || firstText(['article h1', 'main article h1', 'h1'])
+        || (document.title || '').trim() || null;
+    if (!title && opts.advanced) {
+        title = firstText(['article h2', 'main article h2', 'h2', '[class*=titulo] h1',
+                           '[class*=title] h1', '[class*=titulo]', '[class*=title]']);
+    }
+
+    let pub = firstMeta(["meta[property='article:published_time']", "meta[name='publicationDate']",
+                         "meta[name='dc.date']"]);
+    if (!pub) {
+        const t = document.querySelector('time[datetime]');
+        pub = t ? (t.getAttribute('datetime') || null) : null;
+    }
+
+    const labelPrefix = /^\s*(Órgão|Orgao|Tipo|Tipo do Ato)\s*:\s*/i;
+    const dtdd = (source) => {
+        const pat = new RegExp(source, 'i');
+        const dts = Array.from(document.querySelectorAll('dl dt')).slice(0, 400);
+        for (const dt of dts) {
+            if (!visible(dt)) continue;
+            const t = (dt.textContent || '').trim();
+            if (!t || !pat.test(t)) continue;
+            let dd = dt.nextElementSibling;
+            while (dd && dd.tagName !== 'DD') dd = dd.nextElementSibling;
+            if (dd && visible(dd)) { const v = ws(dd.textContent); if (v) return v; }
+        }
+        const cands = Array.from(document.querySelectorAll('strong, b, label, span')).slice(0, 600);
+        for (const c of cands) {
+            if (!visible(c)) continue;
+            const t = (c.textContent || '').trim();
+            if (!t || !pat.test(t)) continue;
+            const parent = c.parentElement;
+            if (parent && visible(parent)) {
+                const v = ws(parent.textContent).replace(labelPrefix, '').trim();
+                if (v) return v;
+            }
+        }
+        return null;
+    };
+
+    let paragraphs = [];
+    for (const sel of ['article', 'main article', 'div[class*=materia]', 'main']) {
+        const root = document.querySelector(sel);
+        if (!root || !visible(root)) continue;
+        paragraphs = Array.from(document.querySelectorAll(sel + ' p')).slice(0, 300)
+            .map((p) => (p.textContent || '').trim()).filter(Boolean).map(ws);
+        if (paragraphs.length) break;
+    }
+
+    let pdf = null;
+    for (const a of Array.from(document.querySelectorAll("a[href$='.pdf'], a[href*='.pdf?']")).slice(0, 30)) {
+        const href = a.getAttribute('href');
+        const low = (href || '').toLowerCase();
+        if (href && (low.endsWith('.pdf') || low.includes('.pdf?'))) { pdf = href; break; }
+    }
+    let pdfCertificada = null;
+    if (!pdf && opts.advanced) {
+        const re = /VERS[ÃA]O CERTIFICADA/i;
+        const link = Array.from(document.querySelectorAll("a[href], [role='link']"))
+            .find((a) => re.test(a.getAttribute('aria-label') || a.textContent || ''));
+        if (link && visible(link)) pdfCertificada = link.getAttribute('href');
+    }
+
+    const metaMap = {};
+    for (const sel of opts.metaKeys) { const v = meta(sel); if (v) metaMap[sel] = v; }
+
+    return {
+        title,
+        pub,
+        orgao: dtdd(opts.orgaoRe),
+        tipo: dtdd(opts.tipoRe),
+        secaoLink: textOf('a[href*="secao=DO"]') || null,
+        ementa: firstText(['article .texto p', 'article p', 'main article p', 'div[class*=materia] p', 'main p']),
+        paragraphs,
+        pdf,
+        pdfCertificada,
+        bodyText: textOf('article') || textOf('main') || (document.body ? document.body.innerText : '') || '',
+        meta: metaMap,
+    };
+}"""
 
 
 # ---------------- Helpers básicos ----------------
@@ -174,7 +304,7 @@ def find_dt_dd_value(page, labels_regex: str, max_scan: int = 400) -> str | None
             parent = c.locator("xpath=..")
             val = text_of(parent)
             if val:
-                val2 = _RE_ORGAO_TIPO.sub("", val).strip()
+                val2 = RE_ORGAO_TIPO.sub("", val).strip()
                 if val2:
                     return val2
         except Exception:
@@ -190,7 +320,7 @@ def _extract_ementa(page) -> str | None:
     return None
 
 
-def _collect_article_text(page, max_chars: int = 8000) -> str | None:
+def _article_paragraphs(page) -> list[str]:
     selectors = ["article", "main article", "div[class*=materia]", "main"]
     buf: list[str] = []
     for sel in selectors:
@@ -207,9 +337,13 @@ def _collect_article_text(page, max_chars: int = 8000) -> str | None:
                     break
         except Exception:
             continue
-    if not buf:
+    return buf
+
+
+def _join_article_text(paragraphs: list[str], max_chars: int = 8000) -> str | None:
+    if not paragraphs:
         return None
-    text = " ".join(buf)
+    text = " ".join(paragraphs)
     text = _RE_WHITESPACE.sub(" ", text).strip()
     if len(text) > max_chars:
         trunc = text[:max_chars]
@@ -219,8 +353,18 @@ def _collect_article_text(page, max_chars: int = 8000) -> str | None:
     return text
 
 
+def _collect_article_text(page, max_chars: int = 8000) -> str | None:
+    return _join_article_text(_article_paragraphs(page), max_chars=max_chars)
+
+
 def _extract_pdf(page, advanced: bool) -> str | None:
-    pdf = None
+    raw = _pdf_hrefs(page, advanced)
+    href = raw["pdf"] or raw["pdfCertificada"]
+    return abs_url(page.url, href) if href else None
+
+
+def _pdf_hrefs(page, advanced: bool) -> dict[str, str | None]:
+    result: dict[str, str | None] = {"pdf": None, "pdfCertificada": None}
     try:
         pdfs = page.locator("a[href$='.pdf'], a[href*='.pdf?']")
         kk = pdfs.count()
@@ -231,37 +375,140 @@ def _extract_pdf(page, advanced: bool) -> str | None:
         try:
             href = a.get_attribute("href")
             if href and (href.lower().endswith(".pdf") or ".pdf?" in href.lower()):
-                pdf = abs_url(page.url, href)
+                result["pdf"] = href
                 break
         except Exception:
             continue
-    if not pdf and advanced:
+    if not result["pdf"] and advanced:
         try:
-            vc = page.get_by_role("link", name=_RE_PDF_CERTIFICADA).first
+            vc = page.get_by_role("link", name=RE_PDF_CERTIFICADA).first
             if vc and vc.count() > 0 and vc.is_visible():
-                hv = vc.get_attribute("href")
-                if hv:
-                    pdf = abs_url(page.url, hv)
+                result["pdfCertificada"] = vc.get_attribute("href") or None
         except Exception:
             pass
-    return pdf
+    return result
 
 
-def _extract_edicao_pagina(page) -> dict[str, str | None]:
-    result: dict[str, str | None] = {"edicao": None, "pagina": None}
+def _body_text(page) -> str:
     try:
-        body_text = text_of(page.locator("article")) or text_of(page.locator("main")) or (page.inner_text("body") or "")
-        m_ed = _RE_EDICAO.search(body_text)
-        m_pg = _RE_PAGINA.search(body_text)
-        if m_ed:
-            result["edicao"] = m_ed.group(1)
-        if m_pg:
-            result["pagina"] = m_pg.group(1)
+        return text_of(page.locator("article")) or text_of(page.locator("main")) or (page.inner_text("body") or "")
     except Exception:
-        pass
+        return ""
+
+
+def _edicao_pagina_from_text(body_text: str) -> dict[str, str | None]:
+    result: dict[str, str | None] = {"edicao": None, "pagina": None}
+    m_ed = _RE_EDICAO.search(body_text or "")
+    m_pg = _RE_PAGINA.search(body_text or "")
+    if m_ed:
+        result["edicao"] = m_ed.group(1)
+    if m_pg:
+        result["pagina"] = m_pg.group(1)
     return result
 
 
+def _extract_edicao_pagina(page) -> dict[str, str | None]:
+    return _edicao_pagina_from_text(_body_text(page))
+
+
+# ---------------- Extração completa ----------------
+def detail_extract_opts(advanced: bool) -> dict[str, Any]:
+    """Argumento de DETAIL_EXTRACT_JS (vale para page.evaluate sync e async)."""
+    return {"advanced": advanced, "metaKeys": META_KEYS, "orgaoRe": RE_LABEL_ORGAO, "tipoRe": RE_LABEL_TIPO}
+
+
+def _raw_with_evaluate(page, advanced: bool) -> dict[str, Any] | None:
+    """Todos os campos brutos em um único round trip (None = usar locators)."""
+    try:
+        raw = page.evaluate(DETAIL_EXTRACT_JS, detail_extract_opts(advanced))
+    except Exception as e:
+        logger.debug("Detail evaluate failed, using locators", extra={"err": str(e)})
+        return None
+    return raw if isinstance(raw, dict) else None
+
+
+def _raw_with_locators(page, advanced: bool, capture_meta: bool) -> dict[str, Any]:
+    """Mesmos campos de DETAIL_EXTRACT_JS via locators (um round trip por chamada)."""
+    secao_link = None
+    with contextlib.suppress(Exception):
+        secao_link = text_of(page.locator('a[href*="secao=DO"]').first) or None
+    meta_map: dict[str, str] = {}
+    if capture_meta or advanced:
+        for sel in META_KEYS:
+            val = meta_content(page, sel)
+            if val:
+                meta_map[sel] = val
+    return {
+        "title": _extract_title_advanced(page) if advanced else _extract_title_basic(page),
+        "pub": _extract_publication_date(page),
+        "orgao": find_dt_dd_value(page, RE_LABEL_ORGAO),
+        "tipo": find_dt_dd_value(page, RE_LABEL_TIPO),
+        "secaoLink": secao_link,
+        "ementa": _extract_ementa(page),
+        "paragraphs": _article_paragraphs(page),
+        **_pdf_hrefs(page, advanced),
+        "bodyText": _body_text(page),
+        "meta": meta_map,
+    }
+
+
+def fill_detail(
+    detail: DetailData,
+    raw: dict[str, Any],
+    page_url: str,
+    advanced: bool,
+    capture_meta: bool,
+    fallback_date: str | None,
+) -> None:
+    """Preenche DetailData a partir dos campos brutos (evaluate ou locators)."""
+    meta_raw = raw.get("meta") or {}
+
+    # Título
+    detail.titulo = raw.get("title") or None
+
+    # Data publicação
+    used_fallback = False
+    raw_pub = raw.get("pub") or None
+    norm = _normalize_date(raw_pub)
+    if not norm and fallback_date:
+        norm = fallback_date
+        used_fallback = True
+    detail.data_publicacao_raw = raw_pub
+    if norm:
+        with contextlib.suppress(Exception):
+            detail.data_publicacao = datetime.strptime(norm, "%Y-%m-%d")
+
+    # Órgão / Tipo
+    detail.orgao = raw.get("orgao") or None
+    detail.tipo_ato = raw.get("tipo") or None
+
+    # Seção
+    detail.secao = raw.get("secaoLink") or None
+    if advanced and not detail.secao:
+        alt = meta_raw.get("meta[name='dc.subject']")
+        if alt and _RE_SECAO.search(alt):
+            detail.secao = alt
+
+    # Ementa / texto
+    detail.ementa = raw.get("ementa") or None
+    detail.texto = _join_article_text(raw.get("paragraphs") or [], max_chars=8000) or detail.ementa
+
+    # PDF
+    href = raw.get("pdf") or raw.get("pdfCertificada")
+    detail.pdf_url = abs_url(page_url, href) if href else None
+
+    # Edição / Página
+    ep = _edicao_pagina_from_text(raw.get("bodyText") or "")
+    detail.edicao = ep.get("edicao")
+    detail.pagina = ep.get("pagina")
+
+    # Meta
+    if capture_meta:
+        meta_map: dict[str, Any] = {sel: meta_raw[sel] for sel in META_KEYS if meta_raw.get(sel)}
+        meta_map["data_publicacao_fallback"] = used_fallback
+        detail.meta = meta_map
+
+
 def scrape_detail_structured(
     context,
     url: str,
@@ -269,79 +516,35 @@ def scrape_detail_structured(
     capture_meta: bool = True,
     advanced: bool = False,
     fallback_date: str | None = None,
-    compute_hash: bool = True
+    compute_hash: bool = True,
+    ready_timings: ReadyTimings | None = None,
 ) -> DetailData:
-    page = context.new_page()
+    pool = get_page_pool(context) if PAGE_POOL_ENABLED else None
+    page = None
+    if pool:
+        try:
+            page = pool.acquire(PAGE_ACQUIRE_TIMEOUT_SEC)
+        except TimeoutError:
+            # Pool esgotado: página avulsa (fechada no fim) em vez de bloquear a thread
+            logger.debug("Page pool exhausted, using a standalone page", extra={"url": url})
+            pool = None
+    if page is None:
+        page = context.new_page()
+    broken = False
     detail = DetailData(detail_url=url)
     logger.debug("Starting detail scrape", extra={"url": url, "advanced": advanced})
     try:
         page.set_default_timeout(timeout_ms)
         page.goto(url, wait_until="domcontentloaded")
-        page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        wait_for_detail_ready(page, min(timeout_ms, DETAIL_READY_MS), ready_timings)
     except Exception as e:
         logger.warning("Navigation issue", extra={"url": url, "err": str(e)})
 
     try:
-        # Título
-        detail.titulo = _extract_title_advanced(page) if advanced else _extract_title_basic(page)
-
-        # Data publicação
-        used_fallback = False
-        raw_pub = _extract_publication_date(page)
-        norm = _normalize_date(raw_pub)
-        if not norm and fallback_date:
-            norm = fallback_date
-            used_fallback = True
-        detail.data_publicacao_raw = raw_pub
-        if norm:
-            with contextlib.suppress(Exception):
-                detail.data_publicacao = datetime.strptime(norm, "%Y-%m-%d")
-
-        # Órgão / Tipo
-        detail.orgao = find_dt_dd_value(page, r"(Órgão|Orgao)")
-        detail.tipo_ato = find_dt_dd_value(page, r"(Tipo|Tipo do Ato)")
-
-        # Seção
-        try:
-            sec_link = page.locator('a[href*="secao=DO"]').first
-            stext = text_of(sec_link)
-            if stext:
-                detail.secao = stext
-        except Exception:
-            pass
-        if advanced and not detail.secao:
-            alt = meta_content(page, 'meta[name="dc.subject"]')
-            if alt and _RE_SECAO.search(alt):
-                detail.secao = alt
-
-        # Ementa / texto
-        detail.ementa = _extract_ementa(page)
-        detail.texto = _collect_article_text(page, max_chars=8000) or detail.ementa
-
-        # PDF
-        detail.pdf_url = _extract_pdf(page, advanced=advanced)
-
-        # Edição / Página
-        ep = _extract_edicao_pagina(page)
-        detail.edicao = ep.get("edicao")
-        detail.pagina = ep.get("pagina")
-
-        # Meta
-        if capture_meta:
-            meta_keys = [
-                "meta[name='dc.title']",
-                "meta[name='dc.date']",
-                "meta[property='og:title']",
-                "meta[property='article:published_time']",
-                "meta[name='dc.subject']"
-            ]
-            meta_map = {}
-            for sel in meta_keys:
-                val = meta_content(page, sel)
-                if val:
-                    meta_map[sel] = val
-            meta_map["data_publicacao_fallback"] = used_fallback
-            detail.meta = meta_map
+        raw = _raw_with_evaluate(page, advanced)
+        if raw is None:
+            raw = _raw_with_locators(page, advanced, capture_meta)
+        fill_detail(detail, raw, page.url, advanced, capture_meta, fallback_date)
 
         # Hash
         if compute_hash:
@@ -350,10 +553,14 @@ def scrape_detail_structured(
 
         logger.info("Detail scrape ok", extra={"url": url, "title": detail.titulo})
     except Exception as e:
+        broken = is_crash_error(e)
         logger.error("Detail scrape error", extra={"url": url, "err": str(e)})
     finally:
-        with contextlib.suppress(Exception):
-            page.close()
+        if pool:
+            pool.release(page, broken=broken)
+        else:
+            with contextlib.suppress(Exception):
+                page.close()
     return detail
 
 
@@ -0,0 +1,256 @@
+"""
+edition_listing.py
+Listagem de uma edição (data, seção) via HTTP, sem browser.
+
+A página ``leiturajornal?data=...&secao=...`` traz todos os atos da edição em
+``<script id="params">`` (JSON com ``jsonArray``: título, urlTitle, tipo,
+página e a hierarquia do órgão em ``hierarchyList``). Basta um GET por edição;
+cada job (key1/key2/key3) é respondido filtrando essa lista em memória, como
+os dropdowns N1/N2/N3 da página filtram a listagem.
+
+``EditionListing.filter`` devolve None quando não consegue responder (key_type
+diferente de "text"); o chamador então segue pelo caminho do browser, que
+também é usado quando o download ou o parse falham (ver ``get_edition_listing``).
+
+Com ``snapshot_dir`` a listagem também vai para o snapshot em disco do plano
+(edition_snapshot), lido pelos jobs de outros processos sem novo download.
+
+DOU_LISTING_BACKEND: "http" (padrão; browser como fallback) ou "browser".
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Any
+
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+BASE_URL = "https://www.in.gov.br"
+LISTING_HTTP = "http"
+LISTING_BROWSER = "browser"
+LISTING_BACKENDS = (LISTING_HTTP, LISTING_BROWSER)
+# Valor do dropdown que não filtra o nível
+ALL_OPTION = "todos"
+
+_RE_PARAMS_SCRIPT = re.compile(r"<script[^>]*\bid=[\"']params[\"'][^>]*>(.*?)</script>", re.S | re.I)
+_RE_WS = re.compile(r"\s+")
+
+
+def normalize_listing_backend(value: str | None) -> str:
+    """Backend da listagem (``value`` > DOU_LISTING_BACKEND > "http")."""
+    name = (value or os.environ.get("DOU_LISTING_BACKEND") or LISTING_HTTP).strip().lower()
+    if name not in LISTING_BACKENDS:
+        logger.warning(f"listing backend desconhecido '{name}', usando '{LISTING_HTTP}'")
+        return LISTING_HTTP
+    return name
+
+
+def edition_listing_url(date: str, secao: str) -> str:
+    return f"{BASE_URL}/leiturajornal?data={date}&secao={secao}"
+
+
+def _norm(s: str | None) -> str:
+    nf = unicodedata.normalize("NFKD", s or "")
+    return _RE_WS.sub(" ", "".join(ch for ch in nf if not unicodedata.combining(ch))).strip().lower()
+
+
+def _act_item(act: dict[str, Any]) -> dict[str, Any] | None:
+    slug = (act.get("urlTitle") or "").strip()
+    if not slug:
+        return None
+    hierarchy = [str(h).strip() for h in (act.get("hierarchyList") or []) if str(h).strip()]
+    if not hierarchy and act.get("hierarchyStr"):
+        hierarchy = [h.strip() for h in str(act["hierarchyStr"]).split("/") if h.strip()]
+    link = f"{BASE_URL}/web/dou/-/{slug}"
+    return {
+        "titulo": (act.get("title") or act.get("titulo") or "").strip(),
+        "link": link,
+        "detail_url": link,
+        "tipo": act.get("artType") or None,
+        "pagina": str(act["numberPage"]) if act.get("numberPage") not in (None, "") else None,
+        "edicao": str(act["editionNumber"]) if act.get("editionNumber") not in (None, "") else None,
+        "hierarquia": hierarchy,
+    }
+
+
+class EditionListing:
+    """Atos de uma edição (itens no formato da coleta de links).
+
+    Args:
+        date: Data da edição (DD-MM-AAAA)
+        secao: Seção (DO1, DO2, ...)
+        items: Itens com titulo/link/detail_url/tipo/pagina/edicao/hierarquia
+    """
+
+    def __init__(self, date: str, secao: str, items: list[dict[str, Any]]):
+        self.date = date
+        self.secao = secao
+        self.items = items
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"date": self.date, "secao": self.secao, "items": self.items}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EditionListing:
+        return cls(str(data["date"]), str(data["secao"]), list(data.get("items") or []))
+
+    def options(self, level: int) -> list[str]:
+        """Rótulos distintos do nível ``level`` (1 = órgão), na ordem da edição."""
+        seen: dict[str, None] = {}
+        for it in self.items:
+            hierarchy = it["hierarquia"]
+            if len(hierarchy) >= level:
+                seen.setdefault(hierarchy[level - 1], None)
+        return list(seen)
+
+    def _resolve(self, level: int, key: str, candidates: list[dict[str, Any]]) -> str | None:
+        # Mesmo critério da seleção no dropdown: rótulo exato, depois o primeiro que contém
+        # a chave, na ordem das opções (ordem da edição, como em options())
+        labels = list(dict.fromkeys(it["hierarquia"][level - 1] for it in candidates if len(it["hierarquia"]) >= level))
+        target = _norm(key)
+        exact = [lb for lb in labels if _norm(lb) == target]
+        if exact:
+            return exact[0]
+        partial = [lb for lb in labels if target in _norm(lb)]
+        return partial[0] if partial else None
+
+    def filter(
+        self,
+        key1: str,
+        key1_type: str | None = "text",
+        key2: str | None = None,
+        key2_type: str | None = "text",
+        key3: str | None = None,
+        key3_type: str | None = None,
+        max_links: int | None = None,
+    ) -> list[dict[str, Any]] | None:
+        """Itens do órgão key1 (e key2/key3, se informados e diferentes de "Todos").
+
+        Returns:
+            Lista (vazia se a opção não existe na edição) ou None se algum nível
+            usa key_type que o payload não resolve (value/dataValue/dataIndex).
+        """
+        items = self.items
+        for level, (key, key_type) in enumerate(((key1, key1_type), (key2, key2_type), (key3, key3_type)), start=1):
+            if not key or _norm(key) == ALL_OPTION:
+                continue
+            if (key_type or "text") != "text":
+                return None
+            label = self._resolve(level, key, items)
+            if label is None:
+                return []
+            items = [it for it in items if len(it["hierarquia"]) >= level and it["hierarquia"][level - 1] == label]
+        out = []
+        for it in items[:max_links] if max_links else items:
+            row = {k: v for k, v in it.items() if k != "hierarquia"}
+            row["orgao"] = "/".join(it["hierarquia"]) or None
+            out.append(row)
+        return out
+
+
+def parse_edition_html(html: str, date: str, secao: str) -> EditionListing:
+    """Lê o ``jsonArray`` de ``<script id="params">`` da página da edição.
+
+    Raises:
+        ValueError: Payload ausente, em formato inesperado ou sem atos (edição
+            ainda não publicada ou página vazia transitória: quem chama usa o browser)
+    """
+    m = _RE_PARAMS_SCRIPT.search(html or "")
+    if not m:
+        raise ValueError("leiturajornal: <script id='params'> não encontrado")
+    try:
+        payload = json.loads(m.group(1))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"leiturajornal: JSON inválido em params: {e}") from e
+    acts = payload.get("jsonArray") if isinstance(payload, dict) else None
+    if not isinstance(acts, list):
+        raise ValueError("leiturajornal: params sem jsonArray")
+    items = [it for it in (_act_item(a) for a in acts if isinstance(a, dict)) if it]
+    if not items:
+        raise ValueError("leiturajornal: edição sem atos no jsonArray")
+    return EditionListing(date, secao, items)
+
+
+def fetch_edition_listing(date: str, secao: str, client=None, timeout_sec: float | None = None) -> EditionListing:
+    """Baixa e interpreta a página da edição (um GET)."""
+    if client is None:
+        from .http_client import get_shared_client
+
+        client = get_shared_client()
+    _, html = client.get_text(edition_listing_url(date, secao), timeout_sec=timeout_sec)
+    return parse_edition_html(html, date, secao)
+
+
+class EditionListingCache:
+    """Uma listagem por (data, seção) no processo; falhas ficam memorizadas como None.
+
+    Threads pedindo a mesma edição esperam o primeiro download (um GET por edição).
+    Com ``snapshot_dir`` a listagem é lida/gravada no snapshot do plano
+    (edition_snapshot.EditionSnapshotStore), compartilhado entre processos.
+    """
+
+    def __init__(self, client=None, snapshot_dir: str | None = None):
+        self._client = client
+        self._store = None
+        if snapshot_dir:
+            from .edition_snapshot import EditionSnapshotStore
+
+            self._store = EditionSnapshotStore(snapshot_dir)
+        self._lock = threading.Lock()
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._listings: dict[tuple[str, str], EditionListing | None] = {}
+        self.stats = {"fetched": 0, "hits": 0, "snapshot_hits": 0, "failed": 0}
+
+    def _load(self, date: str, secao: str) -> EditionListing:
+        def _fetch() -> EditionListing:
+            listing = fetch_edition_listing(date, secao, client=self._client)
+            self.stats["fetched"] += 1
+            return listing
+
+        if self._store is None:
+            return _fetch()
+        listing, built = self._store.get_or_build(date, secao, _fetch)
+        if not built:
+            self.stats["snapshot_hits"] += 1
+        return listing
+
+    def get(self, date: str, secao: str) -> EditionListing | None:
+        key = (str(date), str(secao))
+        with self._lock:
+            edition_lock = self._locks.setdefault(key, threading.Lock())
+        with edition_lock:
+            if key in self._listings:
+                self.stats["hits"] += 1
+                return self._listings[key]
+            try:
+                listing = self._load(key[0], key[1])
+            except Exception as e:
+                logger.warning(f"listagem HTTP falhou para {key[0]} {key[1]}, usando browser: {e}")
+                listing = None
+                self.stats["failed"] += 1
+            self._listings[key] = listing
+            return listing
+
+
+_shared_caches: dict[str | None, EditionListingCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_edition_listing(date: str, secao: str, snapshot_dir: str | None = None) -> EditionListing | None:
+    """Listagem da edição pelo cache do processo (None = usar o browser).
+
+    Args:
+        snapshot_dir: out_dir do plano; ativa o snapshot em ``<snapshot_dir>/_editions``
+    """
+    key = str(snapshot_dir) if snapshot_dir else None
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = EditionListingCache(snapshot_dir=key)
+    return cache.get(date, secao)
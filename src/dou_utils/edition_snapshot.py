@@ -0,0 +1,119 @@
+"""
+edition_snapshot.py
+Snapshot em disco da listagem de cada edição, compartilhado pelos jobs de um plano.
+
+O primeiro job (de qualquer processo) que carrega a edição grava a lista
+completa de atos (link, título, hierarquia do órgão) em
+``out_dir/_editions/<data>_<secao>.json.gz``; os demais filtram o snapshot em
+memória (edition_listing.EditionListing.filter) em vez de baixar a página ou
+dirigir os dropdowns.
+
+Processos concorrentes se coordenam por um lock de arquivo ao lado do
+snapshot (file_lock.FileLock): quem perde a corrida espera o vencedor gravar e lê
+o arquivo pronto. Locks abandonados (processo morto) expiram após
+``SNAPSHOT_LOCK_STALE_SEC``.
+
+DOU_EDITION_SNAPSHOT_GZIP=0 grava ``.json`` sem compressão (leitura aceita ambos).
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+from .edition_listing import EditionListing
+from .file_lock import FileLock
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_DIRNAME = "_editions"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_GZIP = os.environ.get("DOU_EDITION_SNAPSHOT_GZIP", "1").strip().lower() not in ("0", "false", "no")
+# Espera máxima pelo lock e idade a partir da qual um lock é considerado abandonado
+SNAPSHOT_LOCK_TIMEOUT_SEC = 120.0
+SNAPSHOT_LOCK_STALE_SEC = 300.0
+
+
+class EditionSnapshotStore:
+    """Snapshots de edições em ``<out_dir>/_editions``.
+
+    Args:
+        out_dir: Diretório de saída do plano
+        compress: Gravar ``.json.gz`` (padrão: DOU_EDITION_SNAPSHOT_GZIP)
+    """
+
+    def __init__(self, out_dir: str | Path, compress: bool = SNAPSHOT_GZIP):
+        self.root = Path(out_dir) / SNAPSHOT_DIRNAME
+        self.compress = compress
+
+    def path_for(self, date: str, secao: str) -> Path:
+        name = f"{date}_{secao}.json" + (".gz" if self.compress else "")
+        return self.root / name
+
+    def _candidates(self, date: str, secao: str) -> list[Path]:
+        base = self.root / f"{date}_{secao}.json"
+        return [Path(str(base) + ".gz"), base]
+
+    def load(self, date: str, secao: str) -> EditionListing | None:
+        """Snapshot gravado da edição (None se ausente, ilegível ou sem atos)."""
+        for path in self._candidates(date, secao):
+            if not path.exists():
+                continue
+            try:
+                opener = gzip.open if path.suffix == ".gz" else open
+                with opener(path, "rt", encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if data.get("version") != SNAPSHOT_VERSION:
+                    continue
+                listing = EditionListing.from_dict(data)
+                if listing.items:
+                    return listing
+            except Exception as e:
+                logger.warning(f"edition snapshot ilegível {path.name}: {e}")
+        return None
+
+    def save(self, listing: EditionListing) -> Path:
+        """Grava o snapshot (escrita atômica: tmp + replace)."""
+        path = self.path_for(listing.date, listing.secao)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": SNAPSHOT_VERSION, "created": datetime.now().isoformat(timespec="seconds"),
+                **listing.to_dict()}
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        opener = gzip.open if self.compress else open
+        with opener(tmp, "wt", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
+
+    def get_or_build(self, date: str, secao: str,
+                     build: Callable[[], EditionListing]) -> tuple[EditionListing, bool]:
+        """Snapshot existente ou construído por ``build`` (um construtor por edição entre processos).
+
+        Returns:
+            Tupla (listagem, True se foi construída por este processo)
+
+        Raises:
+            ValueError: ``build`` devolveu uma edição sem atos (não é gravada)
+        """
+        listing = self.load(date, secao)
+        if listing is not None:
+            return listing, False
+        lock = FileLock(
+            self.root / f".{date}_{secao}.lock", timeout_sec=SNAPSHOT_LOCK_TIMEOUT_SEC, stale_sec=SNAPSHOT_LOCK_STALE_SEC
+        )
+        with lock:
+            # Outro processo pode ter gravado enquanto esperávamos o lock
+            listing = self.load(date, secao)
+            if listing is not None:
+                return listing, False
+            listing = build()
+            if not listing.items:
+                # Edição ainda não publicada ou página vazia: não congelar 0 atos para o plano
+                raise ValueError(f"edição {date} {secao} sem atos; snapshot não gravado")
+            self.save(listing)
+            return listing, True
@@ -0,0 +1,95 @@
+"""
+file_lock.py
+Lock de arquivo entre processos (bloqueante, com timeout).
+
+Mesmo esquema do _UILock da UI: msvcrt no Windows, arquivo sidecar criado
+com "x" nos demais. Locks abandonados (processo morto) expiram após
+``stale_sec``. Usado pelos snapshots de edição e pelo estado do browser daemon.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Espera máxima pelo lock e idade a partir da qual um lock é considerado abandonado
+FILE_LOCK_TIMEOUT_SEC = 120.0
+FILE_LOCK_STALE_SEC = 300.0
+_LOCK_POLL_SEC = 0.1
+
+
+class FileLock:
+    """Lock de arquivo entre processos (bloqueante, com timeout).
+
+    Raises:
+        TimeoutError: Lock não obtido em ``timeout_sec``
+    """
+
+    def __init__(self, path: Path, timeout_sec: float = FILE_LOCK_TIMEOUT_SEC,
+                 stale_sec: float = FILE_LOCK_STALE_SEC):
+        self.path = path
+        self.timeout_sec = timeout_sec
+        self.stale_sec = stale_sec
+        self._fp = None
+
+    def _try_acquire(self) -> bool:
+        if sys.platform.startswith("win"):
+            import msvcrt  # type: ignore
+
+            fp = open(self.path, "a+b")  # noqa: SIM115
+            try:
+                msvcrt.locking(fp.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                fp.close()
+                return False
+            self._fp = fp
+            return True
+        try:
+            self._fp = open(self.path, "x", encoding="utf-8")  # noqa: SIM115
+        except FileExistsError:
+            return False
+        with contextlib.suppress(Exception):
+            self._fp.write(json.dumps({"pid": os.getpid(), "started": datetime.now().isoformat(timespec="seconds")}))
+            self._fp.flush()
+        return True
+
+    def _break_if_stale(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            if time.time() - self.path.stat().st_mtime > self.stale_sec:
+                logger.warning(f"file lock: removendo lock abandonado {self.path.name}")
+                self.path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout_sec
+        while not self._try_acquire():
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"file lock: {self.path.name} ocupado há mais de {self.timeout_sec}s")
+            if not sys.platform.startswith("win"):
+                self._break_if_stale()
+            time.sleep(_LOCK_POLL_SEC)
+        return self
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        if self._fp is not None:
+            if sys.platform.startswith("win"):
+                import msvcrt  # type: ignore
+
+                with contextlib.suppress(Exception):
+                    msvcrt.locking(self._fp.fileno(), msvcrt.LK_UNLCK, 1)
+            with contextlib.suppress(Exception):
+                self._fp.close()
+            self._fp = None
+            if not sys.platform.startswith("win"):
+                with contextlib.suppress(Exception):
+                    self.path.unlink(missing_ok=True)
+        return False
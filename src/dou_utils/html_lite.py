@@ -0,0 +1,259 @@
+"""
+html_lite.py
+DOM estático mínimo (html.parser da stdlib) para extrair campos sem browser.
+
+Suporta o subconjunto de seletores CSS usado pelos extratores do projeto:
+tag, ``*``, ``.classe``, ``#id``, ``[attr]`` e ``[attr<op>valor]`` com
+``=``, ``*=``, ``^=``, ``$=``, ``~=``; combinador de descendente (espaço) e
+listas separadas por vírgula. Resultados em ordem de documento, como
+``querySelectorAll``.
+
+"Visível" aqui é uma aproximação estática: fora de <head>/<script>/<style>/
+<template>, sem atributo ``hidden`` e sem ``display:none``/``visibility:hidden``
+inline no elemento ou em um ancestral.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from html.parser import HTMLParser
+
+_VOID = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+)
+_INVISIBLE_TAGS = frozenset({"head", "script", "style", "template", "noscript", "title", "meta", "link"})
+# Abertura destes elementos fecha um <p> implícito (regras de "optional end tag" do HTML)
+_CLOSES_P = frozenset({
+    "address", "article", "aside", "blockquote", "div", "dl", "fieldset", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre",
+    "section", "table", "ul",
+})
+_IMPLIED_SIBLINGS = {"li": ("li",), "dt": ("dt", "dd"), "dd": ("dt", "dd"), "option": ("option",), "tr": ("tr",)}
+_RE_HIDDEN_STYLE = re.compile(r"(display\s*:\s*none|visibility\s*:\s*hidden)", re.I)
+_RE_WHITESPACE = re.compile(r"\s+")
+
+
+class Node:
+    """Elemento do DOM estático (``tag`` "#document" na raiz)."""
+
+    __slots__ = ("attrs", "children", "parent", "tag")
+
+    def __init__(self, tag: str, attrs: dict[str, str] | None = None, parent: Node | None = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children: list[Node | str] = []
+        self.parent = parent
+
+    def __repr__(self) -> str:
+        return f"<Node {self.tag} {self.attrs!r}>"
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        return self.attrs.get(name, default)
+
+    def iter(self) -> Iterator[Node]:
+        """Descendentes (elementos) em ordem de documento, sem incluir self."""
+        stack = [c for c in reversed(self.children) if isinstance(c, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, Node))
+
+    def text(self) -> str:
+        """Equivalente a ``textContent`` (todo texto descendente, sem normalizar)."""
+        parts: list[str] = []
+        stack: list[Node | str] = [self]
+        while stack:
+            cur = stack.pop()
+            if isinstance(cur, str):
+                parts.append(cur)
+            else:
+                stack.extend(reversed(cur.children))
+        return "".join(parts)
+
+    def inner_text(self) -> str:
+        """Aproximação de ``innerText``: só texto visível, blocos separados por espaço."""
+        parts: list[str] = []
+        stack: list[Node | str] = [self]
+        while stack:
+            cur = stack.pop()
+            if isinstance(cur, str):
+                parts.append(cur)
+            elif cur is self or _visible_self(cur):
+                parts.append(" ")
+                stack.extend(reversed(cur.children))
+        return _RE_WHITESPACE.sub(" ", "".join(parts)).strip()
+
+    def next_element_sibling(self) -> Node | None:
+        if self.parent is None:
+            return None
+        siblings = self.parent.children
+        found = False
+        for sib in siblings:
+            if sib is self:
+                found = True
+            elif found and isinstance(sib, Node):
+                return sib
+        return None
+
+    def is_visible(self) -> bool:
+        node: Node | None = self
+        while node is not None and node.tag != "#document":
+            if not _visible_self(node):
+                return False
+            node = node.parent
+        return True
+
+    def select(self, selector: str) -> list[Node]:
+        groups = _parse_selector(selector)
+        return [n for n in self.iter() if any(_matches(n, g) for g in groups)]
+
+    def select_one(self, selector: str) -> Node | None:
+        groups = _parse_selector(selector)
+        for n in self.iter():
+            if any(_matches(n, g) for g in groups):
+                return n
+        return None
+
+
+def _visible_self(node: Node) -> bool:
+    if node.tag in _INVISIBLE_TAGS or "hidden" in node.attrs:
+        return False
+    style = node.attrs.get("style")
+    return not (style and _RE_HIDDEN_STYLE.search(style))
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self._stack = [self.root]
+
+    def _close(self, tags: tuple[str, ...] | frozenset[str], stop_at: tuple[str, ...] = ()) -> None:
+        for i in range(len(self._stack) - 1, 0, -1):
+            tag = self._stack[i].tag
+            if tag in tags:
+                del self._stack[i:]
+                return
+            if tag in stop_at:
+                return
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _CLOSES_P:
+            self._close(("p",), stop_at=("div", "article", "section", "main", "td", "li", "dd"))
+        if tag in _IMPLIED_SIBLINGS:
+            self._close(_IMPLIED_SIBLINGS[tag], stop_at=("ul", "ol", "dl", "select", "table"))
+        parent = self._stack[-1]
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, parent)
+        parent.children.append(node)
+        if tag not in _VOID:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID and self._stack[-1].tag == tag:
+            self._stack.pop()
+
+    def handle_endtag(self, tag: str) -> None:
+        # Fecha até o elemento aberto correspondente; tag de fechamento órfã é ignorada
+        self._close((tag,))
+
+    def handle_data(self, data: str) -> None:
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """Monta o DOM estático de um documento HTML (tolerante a HTML malformado)."""
+    builder = _TreeBuilder()
+    builder.feed(html or "")
+    builder.close()
+    return builder.root
+
+
+# ---------------- Seletores ----------------
+_RE_COMPOUND_PART = re.compile(
+    r"""
+    (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \.(?P<cls>[\w-]+)
+    | \#(?P<id>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~]?=)\s*(?P<val>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+    """,
+    re.X,
+)
+
+# Compound = lista de testes (tipo, nome, op, valor); seletor = lista de compounds (descendentes)
+_Compound = list[tuple[str, str, str | None, str | None]]
+_SELECTOR_CACHE: dict[str, list[list[_Compound]]] = {}
+
+
+def _parse_compound(text: str) -> _Compound:
+    tests: _Compound = []
+    pos = 0
+    while pos < len(text):
+        m = _RE_COMPOUND_PART.match(text, pos)
+        if not m:
+            raise ValueError(f"seletor não suportado: {text!r}")
+        if m.group("tag"):
+            if m.group("tag") != "*":
+                tests.append(("tag", m.group("tag").lower(), None, None))
+        elif m.group("cls"):
+            tests.append(("attr", "class", "~=", m.group("cls")))
+        elif m.group("id"):
+            tests.append(("attr", "id", "=", m.group("id")))
+        else:
+            val = m.group("val")
+            if val and val[0] in "\"'":
+                val = val[1:-1]
+            tests.append(("attr", m.group("attr").lower(), m.group("op"), val))
+        pos = m.end()
+    return tests
+
+
+def _parse_selector(selector: str) -> list[list[_Compound]]:
+    cached = _SELECTOR_CACHE.get(selector)
+    if cached is None:
+        cached = [
+            [_parse_compound(part) for part in group.split()]
+            for group in selector.split(",")
+            if group.strip()
+        ]
+        _SELECTOR_CACHE[selector] = cached
+    return cached
+
+
+def _test(node: Node, compound: _Compound) -> bool:
+    for kind, name, op, val in compound:
+        if kind == "tag":
+            if node.tag != name:
+                return False
+            continue
+        actual = node.attrs.get(name)
+        if actual is None:
+            return False
+        if op is None:
+            continue
+        if op == "=" and actual != val:
+            return False
+        if op == "*=" and val not in actual:
+            return False
+        if op == "^=" and not actual.startswith(val or ""):
+            return False
+        if op == "$=" and not actual.endswith(val or ""):
+            return False
+        if op == "~=" and val not in actual.split():
+            return False
+    return True
+
+
+def _matches(node: Node, compounds: list[_Compound]) -> bool:
+    if not _test(node, compounds[-1]):
+        return False
+    # Ancestrais casam da direita para a esquerda (combinador de descendente); como no
+    # querySelectorAll, ancestrais fora do escopo da busca também contam
+    idx = len(compounds) - 2
+    anc = node.parent
+    while idx >= 0 and anc is not None:
+        if anc.tag != "#document" and _test(anc, compounds[idx]):
+            idx -= 1
+        anc = anc.parent
+    return idx < 0
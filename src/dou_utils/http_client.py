@@ -0,0 +1,106 @@
+"""
+http_client.py
+Cliente HTTP com pool de conexões keep-alive (requests.Session + HTTPAdapter).
+
+Um cliente compartilhado por processo (``get_shared_client``): conexões TLS ao
+in.gov.br são reaproveitadas entre páginas e entre jobs, em vez de um
+handshake por requisição. GETs simultâneos de várias threads são seguros (o
+pool do urllib3 é thread-safe).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from typing import Any
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+# Conexões mantidas por host (>= maior paralelismo de detalhe esperado)
+POOL_MAXSIZE = int(os.environ.get("DOU_HTTP_POOL_SIZE", "16") or "16")
+DEFAULT_TIMEOUT_SEC = 20.0
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+_RE_CHARSET = re.compile(r"charset=([\w-]+)", re.I)
+
+
+def decode_body(content: bytes, content_type: str | None) -> str:
+    """Decodifica o corpo pelo charset do Content-Type (padrão UTF-8, tolerante)."""
+    m = _RE_CHARSET.search(content_type or "")
+    encoding = m.group(1) if m else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+class PooledHttpClient:
+    """Sessão HTTP com pool de conexões e retry com backoff para falhas transitórias.
+
+    Args:
+        pool_maxsize: Conexões keep-alive mantidas por host
+        timeout_sec: Timeout padrão por requisição
+        retries: Novas tentativas em erro de conexão ou status 429/5xx
+        headers: Cabeçalhos padrão (mesclados com DEFAULT_HEADERS)
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = POOL_MAXSIZE,
+        timeout_sec: float = DEFAULT_TIMEOUT_SEC,
+        retries: int = 2,
+        headers: dict[str, str] | None = None,
+    ):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout_sec = timeout_sec
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=_RETRY_STATUS,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_maxsize), max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, timeout_sec: float | None = None, headers: dict[str, str] | None = None) -> Any:
+        """GET cru (``requests.Response``); não levanta para status HTTP de erro."""
+        return self.session.get(url, timeout=timeout_sec or self.timeout_sec, headers=headers)
+
+    def get_text(self, url: str, timeout_sec: float | None = None) -> tuple[str, str]:
+        """GET de uma página HTML.
+
+        Returns:
+            Tupla (URL final após redirects, corpo decodificado)
+
+        Raises:
+            requests.RequestException: Falha de rede ou status HTTP >= 400
+        """
+        resp = self.get(url, timeout_sec)
+        resp.raise_for_status()
+        return resp.url, decode_body(resp.content, resp.headers.get("Content-Type"))
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_shared: PooledHttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client() -> PooledHttpClient:
+    """Cliente do processo, criado na primeira chamada."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PooledHttpClient()
+        return _shared
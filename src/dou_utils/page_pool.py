@@ -0,0 +1,304 @@
+"""
+page_pool.py
+Pool de páginas Playwright reaproveitadas entre itens de detalhe.
+
+Em vez de ``context.new_page()`` + ``page.close()`` por URL, as páginas ficam
+no pool do context:
+- até ``size`` páginas (pré-criadas com ``prewarm`` ou sob demanda)
+- entre usos a página volta para ``about:blank`` (descarta DOM/JS da anterior)
+- reciclada (fechada e recriada) após ``max_uses`` usos, se o reset falhar
+  ou se a página fechou/crashou durante o uso
+
+``get_page_pool(context)`` devolve o pool sync anexado ao context (um por
+context, criado no primeiro uso). ``AsyncPagePool`` é a versão async usada
+pelo pipeline de async_detail_service.
+
+Páginas do pool nunca são a "página principal": ``is_pooled_page`` permite que
+find_best_frame as ignore.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import threading
+import weakref
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+PAGE_POOL_ENABLED = os.environ.get("DOU_PAGE_POOL", "1").strip().lower() not in ("0", "false", "no")
+PAGE_POOL_SIZE = int(os.environ.get("DOU_PAGE_POOL_SIZE", "4") or "4")
+# Usos por página antes de reciclar (limita crescimento de memória do renderer)
+PAGE_MAX_USES = int(os.environ.get("DOU_PAGE_MAX_USES", "50") or "50")
+RESET_URL = "about:blank"
+# Espera máxima por uma página livre antes de abrir uma página avulsa
+PAGE_ACQUIRE_TIMEOUT_SEC = float(os.environ.get("DOU_PAGE_ACQUIRE_TIMEOUT_SEC", "30") or "30")
+
+_pooled_pages: weakref.WeakSet = weakref.WeakSet()
+_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+
+
+def is_pooled_page(page) -> bool:
+    try:
+        return page in _pooled_pages
+    except TypeError:
+        return False
+
+
+def _is_closed(page) -> bool:
+    with contextlib.suppress(Exception):
+        return bool(page.is_closed())
+    return False
+
+
+def _new_stats() -> dict[str, int]:
+    return {"created": 0, "reused": 0, "recycled": 0, "crashed": 0}
+
+
+class PagePool:
+    """Pool sync de páginas de um BrowserContext.
+
+    Args:
+        context: BrowserContext sync (qualquer objeto com ``new_page()``)
+        size: Máximo de páginas abertas pelo pool
+        max_uses: Usos antes de reciclar a página
+        reset_url: URL de reset entre usos
+        weak_context: Guardar o context por referência fraca (pools registrados
+            em ``_pools``, cuja chave fraca é o próprio context)
+    """
+
+    def __init__(self, context, size: int = PAGE_POOL_SIZE, max_uses: int = PAGE_MAX_USES,
+                 reset_url: str = RESET_URL, weak_context: bool = False):
+        self._context_ref = weakref.ref(context) if weak_context else (lambda: context)
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.reset_url = reset_url
+        self.stats = _new_stats()
+        self._cond = threading.Condition()
+        self._idle: list[Any] = []
+        self._uses: dict[int, int] = {}
+        self._open = 0
+
+    @property
+    def context(self):
+        return self._context_ref()
+
+    def _create(self):
+        # Fora do lock: new_page é uma ida e volta ao browser
+        page = self.context.new_page()
+        with contextlib.suppress(TypeError):
+            _pooled_pages.add(page)
+        with self._cond:
+            self._uses[id(page)] = 0
+            self.stats["created"] += 1
+        return page
+
+    def _forget(self, page, reason: str) -> None:
+        # Chamar com self._cond; o close fica a cargo de quem chamou
+        self._uses.pop(id(page), None)
+        self._open -= 1
+        self.stats[reason] += 1
+
+    def _discard(self, page, reason: str) -> None:
+        self._forget(page, reason)
+        with contextlib.suppress(Exception):
+            page.close()
+
+    def prewarm(self, count: int | None = None) -> None:
+        """Cria páginas ociosas até ``count`` (padrão: ``size``)."""
+        with self._cond:
+            while self._open < min(count or self.size, self.size):
+                self._open += 1
+                try:
+                    self._idle.append(self._create())
+                except Exception:
+                    self._open -= 1
+                    raise
+
+    def acquire(self, timeout: float | None = None):
+        """Página ociosa (ou nova, se houver vaga). Espera até ``timeout`` se o pool estiver cheio.
+
+        Raises:
+            TimeoutError: Nenhuma página liberada a tempo
+        """
+        with self._cond:
+            while True:
+                while self._idle:
+                    page = self._idle.pop()
+                    if _is_closed(page):
+                        self._discard(page, "crashed")
+                        continue
+                    self.stats["reused"] += 1
+                    return page
+                if self._open < self.size:
+                    # Vaga reservada; a página é criada fora do lock
+                    self._open += 1
+                    break
+                if not self._cond.wait(timeout):
+                    raise TimeoutError(f"page pool: nenhuma página livre em {timeout}s")
+        try:
+            return self._create()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, page, broken: bool = False) -> None:
+        """Devolve a página; fecha/recria se quebrada, crashada ou no limite de usos.
+
+        O reset (``goto(reset_url)``) e o close rodam fora do lock: outras
+        threads continuam pegando e devolvendo páginas enquanto isso.
+        """
+        with self._cond:
+            uses = self._uses.get(id(page), 0) + 1
+            self._uses[id(page)] = uses
+        if broken or _is_closed(page):
+            reason: str | None = "crashed"
+        elif uses >= self.max_uses:
+            reason = "recycled"
+        else:
+            reason = None
+            try:
+                page.goto(self.reset_url)
+            except Exception as e:
+                logger.debug(f"page pool: reset falhou, reciclando página: {e}")
+                reason = "crashed"
+        with self._cond:
+            if reason is None:
+                self._idle.append(page)
+            else:
+                self._forget(page, reason)
+            self._cond.notify()
+        if reason is not None:
+            with contextlib.suppress(Exception):
+                page.close()
+
+    @contextlib.contextmanager
+    def page(self, timeout: float | None = None) -> Iterator[Any]:
+        """``with pool.page() as page:`` — acquire/release com detecção de crash."""
+        page = self.acquire(timeout)
+        broken = False
+        try:
+            yield page
+        except Exception as e:
+            broken = is_crash_error(e)
+            raise
+        finally:
+            self.release(page, broken=broken)
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            for page in idle:
+                self._forget(page, "recycled")
+        for page in idle:
+            with contextlib.suppress(Exception):
+                page.close()
+
+
+def is_crash_error(exc: BaseException) -> bool:
+    """Erro indica página/renderer morto (a página não deve voltar ao pool)."""
+    msg = str(exc).lower()
+    return "crash" in msg or "target closed" in msg or "has been closed" in msg
+
+
+def get_page_pool(context, size: int = PAGE_POOL_SIZE) -> PagePool:
+    """Pool anexado ao context (criado no primeiro uso; vive enquanto o context viver)."""
+    with _pools_lock:
+        try:
+            pool = _pools.get(context)
+        except TypeError:
+            return PagePool(context, size=size)
+        if pool is None:
+            pool = PagePool(context, size=size, weak_context=True)
+            _pools[context] = pool
+        elif size > pool.size:
+            pool.size = size
+        return pool
+
+
+class AsyncPagePool:
+    """Versão async do pool (mesmas regras de reset/reciclagem).
+
+    Args:
+        new_page: Corrotina que cria uma página (context.new_page)
+        size: Máximo de páginas abertas
+        max_uses: Usos antes de reciclar a página
+        reset_url: URL de reset entre usos
+    """
+
+    def __init__(self, new_page: Callable[[], Any], size: int = PAGE_POOL_SIZE,
+                 max_uses: int = PAGE_MAX_USES, reset_url: str = RESET_URL):
+        self._new_page = new_page
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.reset_url = reset_url
+        self.stats = _new_stats()
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._uses: dict[int, int] = {}
+        self._open = 0
+        self._lock = asyncio.Lock()
+
+    async def _discard(self, page, reason: str) -> None:
+        self._uses.pop(id(page), None)
+        self._open -= 1
+        self.stats[reason] += 1
+        with contextlib.suppress(Exception):
+            await page.close()
+
+    async def acquire(self):
+        while True:
+            async with self._lock:
+                if self._idle.empty() and self._open < self.size:
+                    self._open += 1
+                    try:
+                        page = await self._new_page()
+                    except Exception:
+                        self._open -= 1
+                        raise
+                    with contextlib.suppress(TypeError):
+                        _pooled_pages.add(page)
+                    self._uses[id(page)] = 0
+                    self.stats["created"] += 1
+                    return page
+            page = await self._idle.get()
+            if page is None:
+                # Vaga liberada por uma página descartada: tenta criar de novo
+                continue
+            if _is_closed(page):
+                await self._discard(page, "crashed")
+                continue
+            self.stats["reused"] += 1
+            return page
+
+    async def release(self, page, broken: bool = False) -> None:
+        uses = self._uses.get(id(page), 0) + 1
+        self._uses[id(page)] = uses
+        if broken or _is_closed(page):
+            await self._discard(page, "crashed")
+        elif uses >= self.max_uses:
+            await self._discard(page, "recycled")
+        else:
+            try:
+                await page.goto(self.reset_url)
+            except Exception as e:
+                logger.debug(f"page pool: reset falhou, reciclando página: {e}")
+                await self._discard(page, "crashed")
+            else:
+                self._idle.put_nowait(page)
+                return
+        # Acorda quem espera no pool cheio: a vaga da página descartada está livre
+        self._idle.put_nowait(None)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            page = self._idle.get_nowait()
+            if page is not None:
+                await self._discard(page, "recycled")
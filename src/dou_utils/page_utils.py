@@ -4,6 +4,9 @@
 import contextlib
 import re
 
+from .page_pool import is_pooled_page
+from .readiness import LIST_READY_MS, ReadyTimings, wait_for_list_stable
+
 
 def goto(page, url):
     print(f"\n[Abrindo] {url}")
@@ -25,18 +28,22 @@ def close_cookies(page):
         except Exception:
             pass
 
-def try_visualizar_em_lista(page):
-    """Tenta alternar para a visão mais “simples” (lista ou sumário)."""
+def try_visualizar_em_lista(page, timings: ReadyTimings | None = None):
+    """Tenta alternar para a visão mais “simples” (lista ou sumário).
+
+    Após o clique espera a lista de links estabilizar (readiness), não networkidle.
+    """
     with contextlib.suppress(Exception):
         btn = page.get_by_role("button", name=re.compile(r"(lista|sum[aá]rio)", re.I))
         if btn.count() > 0 and btn.first.is_visible():
             btn.first.click()
-            page.wait_for_load_state("networkidle", timeout=60000)
+            wait_for_list_stable(page, LIST_READY_MS, timings, step="view")
             return True
     return False
 
 def find_best_frame(context):
-    page = context.pages[0]
+    # Páginas do pool de detalhes (about:blank) nunca são a página principal
+    page = next((p for p in context.pages if not is_pooled_page(p)), context.pages[0])
     best = page.main_frame
     best_score = -1
     for fr in page.frames:
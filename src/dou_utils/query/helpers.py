@@ -2,6 +2,70 @@
 
 import contextlib
 import re
+import time
+
+from ..readiness import LOAD_MORE_READY_MS, ReadyTimings, count_list_links, wait_for_list_stable
+
+# Coleta completa da listagem em um único round trip: clica "carregar mais"
+# enquanto houver crescimento, rola até estabilizar (ou esgotar o orçamento)
+# e devolve os links deduplicados por href, na ordem do DOM.
+HARVEST_LINKS_JS = r"""async (opts) => {
+    const sel = "a[href*='/web/dou/']";
+    const deadline = Date.now() + opts.budgetMs;
+    const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+    const count = () => document.querySelectorAll(sel).length;
+    const loadMoreRe = /(carregar|ver).*(mais|resultados)/i;
+    const loadMore = () => {
+        for (const b of document.querySelectorAll("button, [role=button]")) {
+            const r = b.getBoundingClientRect();
+            if (r.width > 0 && r.height > 0 && !b.disabled && loadMoreRe.test(b.textContent || '')) return b;
+        }
+        return null;
+    };
+    const waitGrowth = async (from, ms) => {
+        const end = Math.min(Date.now() + ms, deadline);
+        while (Date.now() < end) {
+            await sleep(50);
+            if (count() > from) return true;
+        }
+        return count() > from;
+    };
+
+    let clicks = 0;
+    while (clicks < opts.maxClicks && count() < opts.maxLinks && Date.now() < deadline) {
+        const btn = loadMore();
+        if (!btn) break;
+        const before = count();
+        btn.click();
+        clicks++;
+        if (!(await waitGrowth(before, opts.loadMoreMs))) break;
+    }
+
+    let scrolls = 0, stable = 0;
+    while (scrolls < opts.maxScrolls && count() < opts.maxLinks && Date.now() < deadline) {
+        const before = count();
+        const h = document.body.scrollHeight;
+        window.scrollTo(0, h);
+        scrolls++;
+        if (await waitGrowth(before, opts.pauseMs)) {
+            stable = 0;
+        } else if (++stable >= opts.stableRounds || document.body.scrollHeight === h) {
+            break;
+        }
+    }
+
+    const seen = new Set();
+    const items = [];
+    for (const a of document.querySelectorAll(sel)) {
+        if (items.length >= opts.maxLinks) break;
+        const href = a.getAttribute('href') || '';
+        const text = (a.textContent || '').trim();
+        if (!href || !text || seen.has(href)) continue;
+        seen.add(href);
+        items.push({titulo: text, link: href});
+    }
+    return {items, clicks, scrolls, timedOut: Date.now() >= deadline};
+}"""
 
 
 def find_search_box(frame, query: str):
@@ -106,15 +170,54 @@ def find_best_frame_and_locator(page, frame):
     return anchors, best_frame
 
 
-def try_load_more_button(active_frame, page, max_attempts=5):
-    """Try clicking 'load more' button if available."""
+def pick_links_frame(page, frame):
+    """Frame with most DOU links (one evaluate per frame; ``frame`` wins ties)."""
+    best, best_cnt = frame, count_list_links(frame)
+    for fr in page.frames:
+        if fr is frame:
+            continue
+        cnt = count_list_links(fr)
+        if cnt > best_cnt:
+            best, best_cnt = fr, cnt
+    return best
+
+
+def harvest_links(active_frame, max_links, max_scrolls, scroll_pause_ms, stable_rounds,
+                  budget_ms, timings: ReadyTimings | None = None, max_clicks=5):
+    """Load and extract all links with HARVEST_LINKS_JS in a single evaluate.
+
+    Returns:
+        Deduped ``{titulo, link}`` list, or None if the evaluate failed (caller falls back)
+    """
+    opts = {
+        "maxLinks": max_links, "maxScrolls": max_scrolls, "pauseMs": scroll_pause_ms,
+        "stableRounds": max(1, stable_rounds), "budgetMs": budget_ms,
+        "loadMoreMs": LOAD_MORE_READY_MS, "maxClicks": max_clicks,
+    }
+    started = time.perf_counter()
+    try:
+        res = active_frame.evaluate(HARVEST_LINKS_JS, opts)
+    except Exception:
+        return None
+    if not isinstance(res, dict) or not isinstance(res.get("items"), list):
+        return None
+    if timings is not None:
+        timings.record("harvest", time.perf_counter() - started, not res.get("timedOut"), budget_ms)
+    return res["items"]
+
+
+def try_load_more_button(active_frame, page, max_attempts=5, timings: ReadyTimings | None = None):
+    """Try clicking 'load more' button if available.
+
+    After each click waits for the link count to grow and settle instead of networkidle.
+    """
     for _ in range(max_attempts):
         try:
             btn = active_frame.get_by_role("button", name=re.compile(r"(carregar|ver).*(mais|resultados)", re.I)).first
             if btn and btn.count() > 0 and btn.is_visible():
+                before = count_list_links(active_frame)
                 btn.click()
-                page.wait_for_load_state("networkidle", timeout=20000)
-                active_frame.wait_for_timeout(200)
+                wait_for_list_stable(active_frame, LOAD_MORE_READY_MS, timings, step="load_more", grow_from=before)
             else:
                 break
         except Exception:
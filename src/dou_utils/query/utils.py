@@ -10,17 +10,35 @@ def apply_query(frame, query: str):
     """Apply search query to frame."""
     find_search_box(frame, query)
 
-def collect_links(frame, max_links: int = 100, max_scrolls: int = 30, scroll_pause_ms: int = 250, stable_rounds: int = 2):
-    """Collect DOU links from frame with scrolling and load-more handling."""
+def collect_links(frame, max_links: int = 100, max_scrolls: int = 30, scroll_pause_ms: int = 250, stable_rounds: int = 2,
+                  ready_timings=None):
+    """Collect DOU links from frame with scrolling and load-more handling.
+
+    Scrolling, "carregar mais" clicks and extraction run inside the page in a
+    single evaluate (harvest_links, bounded by DOU_HARVEST_BUDGET_MS); the
+    Python-driven scroll loop is kept as fallback if that evaluate fails.
+    ``ready_timings`` (readiness.ReadyTimings) records the harvest and load-more waits.
+    """
+    from ..readiness import HARVEST_BUDGET_MS
     from .helpers import (
         extract_links_fallback,
         extract_links_vectorized,
         find_best_frame_and_locator,
+        harvest_links,
+        pick_links_frame,
         scroll_to_load_links,
         try_load_more_button,
     )
 
     page = frame.page
+
+    items = harvest_links(
+        pick_links_frame(page, frame), max_links, max_scrolls, scroll_pause_ms, stable_rounds,
+        HARVEST_BUDGET_MS, timings=ready_timings,
+    )
+    if items is not None:
+        return items
+
     # Wait for brief stabilization
     with contextlib.suppress(Exception):
         page.wait_for_timeout(250)
@@ -29,7 +47,7 @@ def collect_links(frame, max_links: int = 100, max_scrolls: int = 30, scroll_pau
     anchors, active_frame = find_best_frame_and_locator(page, frame)
 
     # Try "load more" button
-    try_load_more_button(active_frame, page)
+    try_load_more_button(active_frame, page, timings=ready_timings)
 
     # Scroll incrementally to load more links
     scroll_to_load_links(active_frame, page, anchors, max_links, max_scrolls, scroll_pause_ms, stable_rounds)
@@ -0,0 +1,189 @@
+"""
+readiness.py
+Esperas por condições de DOM específicas no lugar de ``networkidle``.
+
+Beacons de analytics do in.gov.br mantêm a rede ocupada, então
+``wait_for_load_state("networkidle")`` costuma esgotar o timeout inteiro.
+Cada etapa espera só o que precisa, com orçamento próprio:
+- detalhe: texto do artigo presente (ou documento carregado sem artigo)
+- listagem: contagem de links ``/web/dou/`` positiva e estável entre polls
+- "carregar mais": contagem de links cresceu e estabilizou
+
+Esgotar o orçamento não é erro: a etapa segue com o DOM que houver.
+``ReadyTimings`` acumula tempo/estouros por etapa para ``_timings`` e stats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any
+
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Orçamentos por etapa (ms)
+DETAIL_READY_MS = int(os.environ.get("DOU_READY_DETAIL_MS", "15000") or "15000")
+LIST_READY_MS = int(os.environ.get("DOU_READY_LIST_MS", "15000") or "15000")
+LOAD_MORE_READY_MS = int(os.environ.get("DOU_READY_LOAD_MORE_MS", "8000") or "8000")
+# Coleta da listagem inteira (scroll + "carregar mais" + extração) em um evaluate
+HARVEST_BUDGET_MS = int(os.environ.get("DOU_HARVEST_BUDGET_MS", "30000") or "30000")
+# Intervalo entre leituras da contagem de links e leituras iguais para considerar estável
+LIST_POLL_MS = 250
+LIST_STABLE_POLLS = 2
+
+# Artigo com texto (mesmos roots de DETAIL_EXTRACT_JS) ou documento já carregado sem artigo
+DETAIL_READY_JS = r"""() => {
+    for (const sel of ['article', 'div[class*=materia]', 'main']) {
+        const root = document.querySelector(sel);
+        if (!root) continue;
+        for (const p of root.querySelectorAll('p')) {
+            if ((p.textContent || '').trim()) return true;
+        }
+    }
+    return document.readyState === 'complete';
+}"""
+
+LIST_COUNT_JS = "() => document.querySelectorAll(\"a[href*='/web/dou/']\").length"
+
+
+class ReadyTimings:
+    """Tempo gasto por etapa de espera (thread-safe; compartilhável entre workers)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps: dict[str, dict[str, Any]] = {}
+
+    def record(self, step: str, elapsed_sec: float, ok: bool, budget_ms: int) -> None:
+        with self._lock:
+            st = self._steps.setdefault(
+                step, {"count": 0, "total_sec": 0.0, "max_sec": 0.0, "timeouts": 0, "budget_ms": budget_ms}
+            )
+            st["count"] += 1
+            st["total_sec"] += elapsed_sec
+            st["max_sec"] = max(st["max_sec"], elapsed_sec)
+            st["timeouts"] += 0 if ok else 1
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                step: {**st, "total_sec": round(st["total_sec"], 3), "max_sec": round(st["max_sec"], 3)}
+                for step, st in self._steps.items()
+            }
+
+
+def _record(timings: ReadyTimings | None, step: str, started: float, ok: bool, budget_ms: int) -> None:
+    if timings is not None:
+        timings.record(step, time.perf_counter() - started, ok, budget_ms)
+
+
+def count_list_links(frame) -> int:
+    """Links ``/web/dou/`` no frame (0 se o evaluate falhar)."""
+    try:
+        return int(frame.evaluate(LIST_COUNT_JS) or 0)
+    except Exception:
+        return 0
+
+
+async def count_list_links_async(frame) -> int:
+    """Versão async de count_list_links."""
+    try:
+        return int(await frame.evaluate(LIST_COUNT_JS) or 0)
+    except Exception:
+        return 0
+
+
+def _is_stable(count: int, last: int, grow_from: int | None) -> bool:
+    return count > 0 and count == last and (grow_from is None or count > grow_from)
+
+
+def wait_for_detail_ready(page, budget_ms: int = DETAIL_READY_MS, timings: ReadyTimings | None = None) -> bool:
+    """Espera o texto do ato na página de detalhe (até ``budget_ms``)."""
+    started = time.perf_counter()
+    ok = True
+    try:
+        page.wait_for_function(DETAIL_READY_JS, timeout=budget_ms)
+    except Exception as e:
+        ok = False
+        logger.debug(f"readiness: detalhe não ficou pronto em {budget_ms}ms: {e}")
+    _record(timings, "detail", started, ok, budget_ms)
+    return ok
+
+
+async def wait_for_detail_ready_async(page, budget_ms: int = DETAIL_READY_MS,
+                                      timings: ReadyTimings | None = None) -> bool:
+    """Versão async de wait_for_detail_ready."""
+    started = time.perf_counter()
+    ok = True
+    try:
+        await page.wait_for_function(DETAIL_READY_JS, timeout=budget_ms)
+    except Exception as e:
+        ok = False
+        logger.debug(f"readiness: detalhe não ficou pronto em {budget_ms}ms: {e}")
+    _record(timings, "detail", started, ok, budget_ms)
+    return ok
+
+
+def wait_for_list_stable(
+    frame,
+    budget_ms: int = LIST_READY_MS,
+    timings: ReadyTimings | None = None,
+    step: str = "list",
+    grow_from: int | None = None,
+) -> bool:
+    """Espera a contagem de links da listagem ficar positiva e estável.
+
+    Args:
+        frame: Page ou Frame (sync) com ``evaluate``/``wait_for_timeout``
+        budget_ms: Orçamento total da etapa
+        timings: Acumulador opcional
+        step: Nome da etapa em ``timings``
+        grow_from: Se informado, exige contagem maior que este valor
+
+    Returns:
+        True se estabilizou dentro do orçamento
+    """
+    started = time.perf_counter()
+    deadline = started + budget_ms / 1000
+    last, stable = -1, 0
+    ok = False
+    while time.perf_counter() < deadline:
+        count = count_list_links(frame)
+        stable = stable + 1 if _is_stable(count, last, grow_from) else 0
+        if stable >= LIST_STABLE_POLLS:
+            ok = True
+            break
+        last = count
+        try:
+            frame.wait_for_timeout(LIST_POLL_MS)
+        except Exception:
+            time.sleep(LIST_POLL_MS / 1000)
+    _record(timings, step, started, ok, budget_ms)
+    return ok
+
+
+async def wait_for_list_stable_async(
+    frame,
+    budget_ms: int = LIST_READY_MS,
+    timings: ReadyTimings | None = None,
+    step: str = "list",
+    grow_from: int | None = None,
+) -> bool:
+    """Versão async de wait_for_list_stable."""
+    started = time.perf_counter()
+    deadline = started + budget_ms / 1000
+    last, stable = -1, 0
+    ok = False
+    while time.perf_counter() < deadline:
+        count = await count_list_links_async(frame)
+        stable = stable + 1 if _is_stable(count, last, grow_from) else 0
+        if stable >= LIST_STABLE_POLLS:
+            ok = True
+            break
+        last = count
+        await asyncio.sleep(LIST_POLL_MS / 1000)
+    _record(timings, step, started, ok, budget_ms)
+    return ok
@@ -0,0 +1,199 @@
+"""
+request_filter.py
+Filtro de requisições pesadas instalado uma vez por context do Playwright.
+
+Cada ``context.route`` acrescenta um handler Python que toda requisição
+atravessa; instalar o bloqueio a cada job (EditionRunnerService é criado por
+job em contexts reaproveitados) empilha handlers. ``install_request_filter``
+registra um único ``route("**/*")`` por context e devolve o mesmo
+``RequestFilter`` nas chamadas seguintes.
+
+Bloqueia por tipo de recurso, extensão da URL e domínio de analytics/trackers.
+Stylesheets não são bloqueados (quebram dropdowns/renderização dinâmica).
+
+Listas configuráveis (separadas por vírgula; vazio desativa o critério):
+- DOU_BLOCK_RESOURCE_TYPES (padrão: image,media,font)
+- DOU_BLOCK_EXTENSIONS (padrão: imagens, vídeo/áudio e fontes)
+- DOU_BLOCK_DOMAINS (padrão: googletagmanager, google-analytics, doubleclick, hotjar, facebook/tr)
+
+Requisições abortadas não têm tamanho conhecido: ``blocked_bytes_est`` soma
+um tamanho típico por tipo de recurso (``EST_BYTES_BY_TYPE``).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from typing import Any
+
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BLOCK_RESOURCE_TYPES = ("image", "media", "font")
+DEFAULT_BLOCK_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico",
+    ".mp4", ".mp3", ".avi", ".mov",
+    ".woff", ".woff2", ".ttf", ".otf",
+)
+DEFAULT_BLOCK_DOMAINS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "facebook.com/tr",
+)
+# Tamanho típico (bytes) de uma resposta por tipo, para estimar o tráfego evitado
+EST_BYTES_BY_TYPE = {"image": 30_000, "media": 500_000, "font": 40_000, "script": 60_000}
+EST_BYTES_DEFAULT = 10_000
+
+
+def _env_list(name: str, default: tuple[str, ...]) -> tuple[str, ...]:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    return tuple(p.strip().lower() for p in raw.split(",") if p.strip())
+
+
+class RequestFilter:
+    """Decide e conta o bloqueio de requisições de um context.
+
+    Args:
+        resource_types: Tipos de recurso bloqueados (padrão: DOU_BLOCK_RESOURCE_TYPES)
+        extensions: Extensões de URL bloqueadas (padrão: DOU_BLOCK_EXTENSIONS)
+        domains: Trechos de host/URL bloqueados (padrão: DOU_BLOCK_DOMAINS)
+    """
+
+    def __init__(
+        self,
+        resource_types: tuple[str, ...] | None = None,
+        extensions: tuple[str, ...] | None = None,
+        domains: tuple[str, ...] | None = None,
+    ):
+        self.resource_types = frozenset(
+            resource_types if resource_types is not None
+            else _env_list("DOU_BLOCK_RESOURCE_TYPES", DEFAULT_BLOCK_RESOURCE_TYPES)
+        )
+        self.extensions = tuple(
+            extensions if extensions is not None else _env_list("DOU_BLOCK_EXTENSIONS", DEFAULT_BLOCK_EXTENSIONS)
+        )
+        self.domains = tuple(
+            domains if domains is not None else _env_list("DOU_BLOCK_DOMAINS", DEFAULT_BLOCK_DOMAINS)
+        )
+        self._lock = threading.Lock()
+        self.stats = {"allowed": 0, "blocked": 0, "blocked_bytes_est": 0}
+        self.blocked_by_reason = {"type": 0, "extension": 0, "domain": 0}
+
+    def reason(self, resource_type: str | None, url: str) -> str | None:
+        """Motivo do bloqueio ("type", "extension", "domain") ou None se a requisição segue."""
+        if resource_type and resource_type in self.resource_types:
+            return "type"
+        ul = (url or "").lower()
+        if self.domains and any(d in ul for d in self.domains):
+            return "domain"
+        path = ul.split("#", 1)[0].split("?", 1)[0]
+        if self.extensions and path.endswith(self.extensions):
+            return "extension"
+        return None
+
+    def _check(self, route) -> bool:
+        try:
+            req = route.request
+            rtype = req.resource_type
+            reason = self.reason(rtype, req.url)
+        except Exception:
+            reason = None
+            rtype = None
+        with self._lock:
+            if reason is None:
+                self.stats["allowed"] += 1
+                return False
+            self.stats["blocked"] += 1
+            self.stats["blocked_bytes_est"] += EST_BYTES_BY_TYPE.get(rtype or "", EST_BYTES_DEFAULT)
+            self.blocked_by_reason[reason] += 1
+        return True
+
+    def handle(self, route) -> None:
+        """Handler de ``context.route`` (API sync)."""
+        if self._check(route):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route) -> None:
+        """Handler de ``context.route`` (API async)."""
+        if self._check(route):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "by_reason": dict(self.blocked_by_reason)}
+
+
+_filters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_filters_lock = threading.Lock()
+
+
+def get_request_filter(context) -> RequestFilter | None:
+    """Filtro já instalado no context (None se não houver)."""
+    with _filters_lock:
+        try:
+            return _filters.get(context)
+        except TypeError:
+            return None
+
+
+def _claim(context, request_filter: RequestFilter | None) -> tuple[RequestFilter, bool]:
+    # (filtro do context, True se quem chamou deve registrar a rota)
+    with _filters_lock:
+        try:
+            existing = _filters.get(context)
+        except TypeError:
+            return request_filter or RequestFilter(), True
+        if existing is not None:
+            return existing, False
+        rf = request_filter or RequestFilter()
+        _filters[context] = rf
+        return rf, True
+
+
+def _release(context, rf: RequestFilter) -> None:
+    with _filters_lock:
+        try:
+            if _filters.get(context) is rf:
+                del _filters[context]
+        except TypeError:
+            pass
+
+
+def install_request_filter(context, request_filter: RequestFilter | None = None) -> RequestFilter | None:
+    """Registra o filtro no context uma única vez (chamadas seguintes devolvem o mesmo).
+
+    Returns:
+        O filtro do context, ou None se ``context.route`` falhou
+    """
+    rf, install = _claim(context, request_filter)
+    if install:
+        try:
+            context.route("**/*", rf.handle)
+        except Exception as e:
+            _release(context, rf)
+            logger.debug(f"request filter não instalado: {e}")
+            return None
+    return rf
+
+
+async def install_request_filter_async(context, request_filter: RequestFilter | None = None) -> RequestFilter | None:
+    """Versão async de ``install_request_filter`` (context do async_playwright)."""
+    rf, install = _claim(context, request_filter)
+    if install:
+        try:
+            await context.route("**/*", rf.handle_async)
+        except Exception as e:
+            _release(context, rf)
+            logger.debug(f"request filter não instalado: {e}")
+            return None
+    return rf
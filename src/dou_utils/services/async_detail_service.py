@@ -0,0 +1,329 @@
+"""
+async_detail_service.py
+Pipeline assíncrono de detalhes para CascadeService (``detail_mode="async"``).
+
+O modo "thread" envia scrape_detail_structured(context, ...) a um
+ThreadPoolExecutor que compartilha um BrowserContext sync; a API sync do
+Playwright não suporta uso entre threads (as chamadas serializam ou falham),
+então ``detail_parallel > 1`` não dava ganho real. Aqui uma thread dedicada
+roda seu próprio event loop com async_playwright:
+
+- um browser (``connect_shared`` ou browser_launch.launch_browser_with_channels) + um context,
+  lançados só se algum item precisar de browser
+- pool de páginas reaproveitadas entre itens (page_pool.AsyncPagePool:
+  reset em about:blank, reciclagem após K usos ou crash)
+- concorrência limitada por ThroughputController, que ajusta o nível pela
+  vazão medida (itens/s) em vez do teto fixo de 8/10 workers
+
+O detail_backend é respeitado: "http" não abre browser, e
+"http-then-browser-if-short" só usa páginas para os itens que voltarem curtos.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from ..browser_launch import launch_browser_with_channels
+from ..detail_http import BACKEND_BROWSER, BACKEND_HTTP, extract_raw_from_html, is_short_detail, scrape_detail_http
+from ..detail_utils import DETAIL_EXTRACT_JS, detail_extract_opts, fill_detail
+from ..hash_utils import stable_sha1
+from ..log_utils import get_logger
+from ..models import DetailData
+from ..page_pool import AsyncPagePool, is_crash_error
+from ..readiness import DETAIL_READY_MS, ReadyTimings, wait_for_detail_ready_async
+from ..request_filter import install_request_filter_async
+
+logger = get_logger(__name__)
+
+# Teto do nível de concorrência no modo async (o controlador decide abaixo disso)
+ASYNC_MAX_PARALLEL = int(os.environ.get("DOU_DETAIL_MAX_PARALLEL", "16") or "16")
+# Nível inicial antes da primeira medição de vazão
+ASYNC_INITIAL_PARALLEL = int(os.environ.get("DOU_DETAIL_INITIAL_PARALLEL", "4") or "4")
+DETAIL_MODES = ("thread", "async")
+
+
+def normalize_detail_mode(value: str | None) -> str:
+    """Valida o modo paralelo de detalhes (vazio = DOU_DETAIL_MODE ou "thread")."""
+    name = (value or os.environ.get("DOU_DETAIL_MODE") or "thread").strip().lower()
+    if name not in DETAIL_MODES:
+        logger.warning(f"detail_mode desconhecido '{name}', usando 'thread'")
+        return "thread"
+    return name
+
+
+class ThroughputController:
+    """Ajuste do nível de concorrência por subida de encosta na vazão.
+
+    A cada janela de ``max(window, nível)`` itens concluídos mede itens/s:
+    - primeira janela: sonda +1
+    - vazão subiu mais que ``tolerance``: continua na mesma direção
+    - vazão caiu mais que ``tolerance``: inverte a direção (+1 <-> -1)
+    - platô: mantém o nível
+    - mais da metade da janela com erro: nível / 2
+
+    Args:
+        initial: Nível inicial
+        max_level: Teto (detail_parallel pedido, limitado por DOU_DETAIL_MAX_PARALLEL)
+        min_level: Piso
+        window: Itens mínimos por decisão
+        tolerance: Variação relativa de vazão considerada ruído
+        clock: Relógio monotônico (injetável nos testes)
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        max_level: int,
+        min_level: int = 1,
+        window: int = 4,
+        tolerance: float = 0.1,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.min_level = max(1, min_level)
+        self.max_level = max(self.min_level, max_level)
+        self.level = min(max(initial, self.min_level), self.max_level)
+        self.window = max(1, window)
+        self.tolerance = tolerance
+        self._clock = clock
+        self._start = clock()
+        self._window_start = self._start
+        self._done = 0
+        self._errors = 0
+        self._direction = 1
+        self._last_tput: float | None = None
+        self.stats: dict[str, Any] = {
+            "mode": "throughput",
+            "initial": self.level,
+            "max_level": self.max_level,
+            "final": self.level,
+            "peak": self.level,
+            "increases": 0,
+            "decreases": 0,
+            "history": [],
+        }
+
+    def observe(self, success: bool) -> None:
+        """Registra a conclusão de um item e, ao fechar a janela, ajusta o nível."""
+        self._done += 1
+        if not success:
+            self._errors += 1
+        if self._done < max(self.window, self.level):
+            return
+        now = self._clock()
+        tput = self._done / max(now - self._window_start, 1e-6)
+        errors, done = self._errors, self._done
+        self._done = self._errors = 0
+        self._window_start = now
+        prev, self._last_tput = self._last_tput, tput
+
+        if errors * 2 > done:
+            self._direction = -1
+            self._set_level(self.level // 2, "errors", tput)
+        elif prev is None:
+            self._set_level(self.level + 1, "probe", tput)
+        elif tput >= prev * (1 + self.tolerance):
+            self._set_level(self.level + self._direction, "throughput_up", tput)
+        elif tput <= prev * (1 - self.tolerance):
+            self._direction = -self._direction
+            self._set_level(self.level + self._direction, "throughput_down", tput)
+
+    def _set_level(self, level: int, reason: str, tput: float) -> None:
+        level = min(max(level, self.min_level), self.max_level)
+        if level == self.level:
+            return
+        self.stats["increases" if level > self.level else "decreases"] += 1
+        self.level = level
+        self.stats["final"] = level
+        self.stats["peak"] = max(self.stats["peak"], level)
+        self.stats["history"].append(
+            {"t": round(self._clock() - self._start, 2), "level": level, "reason": reason, "items_per_sec": round(tput, 2)}
+        )
+
+
+async def scrape_detail_on_page(
+    page,
+    url: str,
+    timeout_ms: int = 60_000,
+    capture_meta: bool = True,
+    advanced: bool = False,
+    fallback_date: str | None = None,
+    compute_hash: bool = True,
+    ready_timings: ReadyTimings | None = None,
+) -> DetailData:
+    """Versão async de scrape_detail_structured sobre uma página do pool.
+
+    Se o evaluate falhar, os campos saem do HTML renderizado (page.content())
+    pelo extrator estático de detail_http, com as mesmas regras.
+    """
+    detail = DetailData(detail_url=url)
+    try:
+        page.set_default_timeout(timeout_ms)
+        await page.goto(url, wait_until="domcontentloaded")
+        await wait_for_detail_ready_async(page, min(timeout_ms, DETAIL_READY_MS), ready_timings)
+    except Exception as e:
+        logger.warning("Navigation issue", extra={"url": url, "err": str(e)})
+
+    try:
+        raw = await page.evaluate(DETAIL_EXTRACT_JS, detail_extract_opts(advanced))
+    except Exception as e:
+        logger.debug("Detail evaluate failed, parsing page content", extra={"url": url, "err": str(e)})
+        raw = None
+    if not isinstance(raw, dict):
+        raw = extract_raw_from_html(await page.content(), advanced)
+    fill_detail(detail, raw, page.url, advanced, capture_meta, fallback_date)
+    if compute_hash:
+        detail.meta["hash"] = stable_sha1(url, detail.titulo or "")
+    return detail
+
+
+async def _launch_browser(p, connect_shared=None):
+    """Browser compartilhado (``connect_shared``) ou lançado com os canais/flags padrão."""
+    prefer_edge = os.environ.get("DOU_PREFER_EDGE", "").lower() in ("1", "true", "yes")
+    browser = await launch_browser_with_channels(p, prefer_edge, logger.info, connect_shared=connect_shared)
+    if browser is None:
+        raise RuntimeError("Nenhum browser disponível")
+    return browser
+
+
+class _LazyBrowser:
+    """async_playwright + browser + context iniciados no primeiro uso de página."""
+
+    def __init__(self, pool_size: int, connect_shared=None):
+        self._pool_size = pool_size
+        self._connect_shared = connect_shared
+        self._lock = asyncio.Lock()
+        self._pw_cm = None
+        self._browser = None
+        self._context = None
+        self.pool: AsyncPagePool | None = None
+
+    async def get_pool(self) -> AsyncPagePool:
+        async with self._lock:
+            if self.pool is None:
+                from playwright.async_api import async_playwright
+
+                self._pw_cm = async_playwright()
+                pw = await self._pw_cm.__aenter__()
+                self._browser = await _launch_browser(pw, self._connect_shared)
+                self._context = await self._browser.new_context(ignore_https_errors=True)
+                await install_request_filter_async(self._context)
+                self.pool = AsyncPagePool(self._context.new_page, self._pool_size)
+            return self.pool
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+        for closer in (self._context, self._browser):
+            if closer is not None:
+                with contextlib.suppress(Exception):
+                    await closer.close()
+        if self._pw_cm is not None:
+            with contextlib.suppress(Exception):
+                await self._pw_cm.__aexit__(None, None, None)
+
+
+async def _scrape_all(
+    urls: list[str],
+    backend: str,
+    max_parallel: int,
+    http_client,
+    scrape_kwargs: dict[str, Any],
+    fallback_date: str | None,
+    ready_timings: ReadyTimings | None = None,
+    connect_shared=None,
+) -> tuple[list[DetailData | BaseException], dict[str, Any]]:
+    controller = ThroughputController(initial=min(ASYNC_INITIAL_PARALLEL, max_parallel), max_level=max_parallel)
+    browser = _LazyBrowser(pool_size=max_parallel, connect_shared=connect_shared)
+    counts = {"http": 0, "browser": 0, "browser_fallback": 0}
+
+    async def _with_page(url: str) -> DetailData:
+        pool = await browser.get_pool()
+        page = await pool.acquire()
+        broken = False
+        try:
+            return await scrape_detail_on_page(
+                page, url, fallback_date=fallback_date, ready_timings=ready_timings, **scrape_kwargs
+            )
+        except Exception as e:
+            broken = is_crash_error(e)
+            raise
+        finally:
+            await pool.release(page, broken=broken)
+
+    async def _one(url: str) -> DetailData:
+        if backend == BACKEND_BROWSER:
+            counts["browser"] += 1
+            return await _with_page(url)
+        detail = None
+        try:
+            detail = await asyncio.to_thread(
+                scrape_detail_http, http_client, url, fallback_date=fallback_date, **scrape_kwargs
+            )
+        except Exception as e:
+            if backend == BACKEND_HTTP:
+                raise
+            logger.debug("Detalhe via HTTP falhou, usando browser", extra={"url": url, "err": str(e)})
+        if backend == BACKEND_HTTP or (detail is not None and not is_short_detail(detail)):
+            counts["http"] += 1
+            return detail
+        counts["browser_fallback"] += 1
+        return await _with_page(url)
+
+    results: list[DetailData | BaseException] = [RuntimeError("não executado")] * len(urls)
+    pending = list(enumerate(urls))
+    pending.reverse()
+    active: dict[asyncio.Task, int] = {}
+    try:
+        while pending or active:
+            while pending and len(active) < controller.level:
+                idx, url = pending.pop()
+                active[asyncio.create_task(_one(url))] = idx
+            done, _ = await asyncio.wait(active, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                idx = active.pop(task)
+                exc = task.exception()
+                results[idx] = exc if exc is not None else task.result()
+                controller.observe(exc is None)
+    finally:
+        for task in active:
+            task.cancel()
+        await browser.close()
+    page_stats = browser.pool.stats if browser.pool is not None else None
+    return results, {"concurrency": controller.stats, "backendCounts": counts, "pagePool": page_stats}
+
+
+def scrape_details_async(
+    urls: list[str],
+    backend: str = BACKEND_BROWSER,
+    max_parallel: int = ASYNC_MAX_PARALLEL,
+    http_client=None,
+    timeout_ms: int = 60_000,
+    advanced: bool = False,
+    fallback_date: str | None = None,
+    ready_timings: ReadyTimings | None = None,
+    connect_shared=None,
+) -> tuple[list[DetailData | BaseException], dict[str, Any]]:
+    """Raspa os detalhes de ``urls`` no pipeline async (bloqueante para quem chama).
+
+    Roda em uma thread própria para não colidir com o loop da API sync do
+    Playwright na thread chamadora. ``connect_shared`` (``(playwright, prefer_edge)
+    -> browser | None``, p.ex. BrowserFactory.connect_shared_async) é tentado antes
+    de lançar um browser próprio.
+
+    Returns:
+        Tupla (um DetailData ou a exceção por URL, na ordem de ``urls``; stats)
+    """
+    if not urls:
+        return [], {}
+    scrape_kwargs = {"timeout_ms": timeout_ms, "advanced": advanced}
+    coro = _scrape_all(
+        urls, backend, max(1, max_parallel), http_client, scrape_kwargs, fallback_date, ready_timings, connect_shared
+    )
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="detail-async") as pool:
+        return pool.submit(asyncio.run, coro).result()
@@ -11,16 +11,23 @@ Melhorias:
 
 from __future__ import annotations
 
+import contextlib
+import threading
 import time
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Any, Protocol
 
-from ..dedup_state import DedupState
+from ..dedup_state import DedupState, url_key
+from ..detail_http import BACKEND_BROWSER, BACKEND_HTTP, is_short_detail, normalize_detail_backend, scrape_detail_http
 from ..detail_utils import abs_url, scrape_detail_structured
 from ..hash_utils import stable_sha1
+from ..http_client import get_shared_client
 from ..log_utils import get_logger
+from ..page_pool import PAGE_POOL_ENABLED, get_page_pool
+from ..readiness import ReadyTimings
+from .async_detail_service import ASYNC_MAX_PARALLEL, normalize_detail_mode, scrape_details_async
 
 logger = get_logger(__name__)
 
@@ -49,15 +56,30 @@ class CascadeParams:
     fallback_date_if_missing: bool = True
     dedup_state_file: str | None = None
     summary_keywords: list[str] | None = None
+    # "browser" | "http" | "http-then-browser-if-short" (ver detail_http)
+    detail_backend: str = BACKEND_BROWSER
+    # "thread" (ThreadPoolExecutor) | "async" (async_detail_service) quando parallel > 1
+    detail_mode: str = "thread"
 
 
 class CascadeService:
     def __init__(self, context: BrowserContext, page, frame,
-                 summarize_fn: Callable | None = None):
+                 summarize_fn: Callable | None = None, http_client=None,
+                 ready_timings: ReadyTimings | None = None, connect_shared=None):
         self.context = context
         self.page = page
         self.frame = frame
         self.summarize_fn = summarize_fn
+        self._http_client = http_client
+        # Detalhes resolvidos por backend (http / browser / browser após http curto ou falho)
+        self._backend_counts = {"http": 0, "browser": 0, "browser_fallback": 0}
+        self._counts_lock = threading.Lock()
+        self._concurrency_stats: dict[str, Any] | None = None
+        self._page_pool_stats: dict[str, Any] | None = None
+        # Esperas de readiness dos detalhes via browser (compartilhável com o EditionRunner)
+        self.ready_timings = ready_timings or ReadyTimings()
+        # Conector do browser compartilhado para o modo async (ver async_detail_service)
+        self.connect_shared = connect_shared
 
     def run(self, raw_items: list[dict[str, Any]], params: CascadeParams) -> dict[str, Any]:
         """
@@ -71,12 +93,22 @@ class CascadeService:
             Dicionário com estatísticas e itens processados
         """
         t0 = time.time()
+        params.detail_backend = normalize_detail_backend(params.detail_backend)
+        params.detail_mode = normalize_detail_mode(params.detail_mode)
 
         # Inicializa estado de deduplicação se necessário
         dedup = DedupState(params.dedup_state_file) if params.dedup_state_file else None
-
-        # Determina o modo de scraping (paralelo ou sequencial)
-        if params.scrape_detail and params.parallel > 1:
+        # Itens já vistos (pela URL) não chegam a ser navegados
+        skipped_seen = 0
+        if params.scrape_detail and dedup:
+            raw_items, skipped_seen = self._skip_seen_urls(raw_items, dedup)
+
+        # Determina o modo de scraping (async, paralelo ou sequencial)
+        if params.scrape_detail and params.parallel > 1 and params.detail_mode == "async":
+            # Teto de concorrência decidido pela vazão medida (ThroughputController)
+            params.parallel = min(params.parallel, ASYNC_MAX_PARALLEL)
+            detail_items, failures = self._scrape_async(raw_items, params, dedup)
+        elif params.scrape_detail and params.parallel > 1:
             # Cap workers to avoid oversubscription that slows down Playwright+CPU
             if params.parallel > 8:
                 params.parallel = 8
@@ -95,13 +127,66 @@ class CascadeService:
             "stats": {
                 "total": len(detail_items),
                 "detailFailures": failures,
+                "dedupSkippedBeforeFetch": skipped_seen,
                 "scrapedDetails": bool(params.scrape_detail),
                 "parallel": params.parallel,
+                "detailMode": params.detail_mode if params.parallel > 1 else "sequential",
+                "detailConcurrency": self._concurrency_stats,
+                "detailPagePool": self._page_pool_stats,
+                "detailBackend": params.detail_backend,
+                "detailBackendCounts": dict(self._backend_counts),
+                "detailReady": self.ready_timings.as_dict().get("detail"),
                 "durationSec": duration,
             },
             "itens": detail_items
         }
 
+    def _detail_url(self, item: dict[str, Any]) -> str:
+        raw_link = item.get("link") or ""
+        # page None: itens da listagem HTTP já trazem links absolutos
+        return abs_url(getattr(self.page, "url", "") or "", raw_link) if raw_link else ""
+
+    def _skip_seen_urls(self, raw_items: list[dict[str, Any]],
+                        dedup: DedupState) -> tuple[list[dict[str, Any]], int]:
+        """Remove itens cuja URL já está no estado de dedup (ou repetida nesta execução)"""
+        pending = []
+        run_keys: set[str] = set()
+        for item in raw_items:
+            key = url_key(self._detail_url(item))
+            if key and (key in run_keys or dedup.has_url(key)):
+                continue
+            if key:
+                run_keys.add(key)
+            pending.append(item)
+        skipped = len(raw_items) - len(pending)
+        if skipped:
+            logger.info(f"Dedup: {skipped} item(s) já vistos ignorados antes do fetch")
+        return pending, skipped
+
+    def _build_record(self, item: dict[str, Any], detail_url: str, detail) -> dict[str, Any]:
+        """Mescla item original com detalhes e calcula o hash de deduplicação"""
+        record = {**item, **detail.to_dict()}
+        # Garantir detail_url absoluto no item final
+        if detail_url:
+            record["detail_url"] = detail_url
+        record["hash"] = record.get("meta", {}).get("hash") or stable_sha1(detail_url)
+        record["data_publicacao_fallback"] = (record.get("meta") or {}).get("data_publicacao_fallback", False)
+        return record
+
+    def _keep_record(self, record: dict[str, Any], dedup: DedupState | None) -> bool:
+        """Registra o item no estado de dedup; False se já tinha sido visto"""
+        item_hash = record.get("hash")
+        if not dedup or not item_hash:
+            return True
+        key = url_key(record.get("detail_url"))
+        if dedup.has(item_hash):
+            logger.debug("Item duplicado ignorado", extra={"url": record.get("detail_url"), "hash": item_hash})
+            # Estado antigo (só hash): grava a chave de URL para pular o fetch na próxima execução
+            dedup.add(item_hash, url=key)
+            return False
+        dedup.add(item_hash, url=key)
+        return True
+
     def _add_summaries(self, items: list[dict[str, Any]], params: CascadeParams) -> None:
         """Adiciona resumos aos itens"""
         for item in items:
@@ -139,34 +224,15 @@ class CascadeService:
         failures = 0
 
         for item in raw_items:
-            raw_link = item.get("link") or ""
-            detail_url = abs_url(self.page.url, raw_link) if raw_link else ""
+            detail_url = self._detail_url(item)
             fallback_date = params.date if params.fallback_date_if_missing else None
 
             try:
                 # Coleta detalhes estruturados da página
                 detail = self._fetch_detail(detail_url, params, fallback_date)
-
-                # Mescla item original com detalhes
-                record = {**item, **detail.to_dict()}
-                # Garantir detail_url absoluto no item final
-                if detail_url:
-                    record["detail_url"] = detail_url
-
-                # Calcula hash para deduplicação
-                item_hash = record.get("meta", {}).get("hash") or stable_sha1(detail_url)
-                record["hash"] = item_hash
-                record["data_publicacao_fallback"] = (record.get("meta") or {}).get("data_publicacao_fallback", False)
-
-                # Verifica duplicação se habilitado
-                if dedup and dedup.has(item_hash):
-                    logger.debug("Item duplicado ignorado", extra={"url": detail_url, "hash": item_hash})
-                    continue
-
-                if dedup:
-                    dedup.add(item_hash)
-
-                out.append(record)
+                record = self._build_record(item, detail_url, detail)
+                if self._keep_record(record, dedup):
+                    out.append(record)
             except Exception as e:
                 failures += 1
                 logger.warning("Falha no scrape de detalhes", extra={"url": detail_url, "err": str(e)})
@@ -174,14 +240,50 @@ class CascadeService:
         return out, failures
 
     def _fetch_detail(self, url: str, params: CascadeParams, fallback_date: str | None = None):
-        """Abstrai o processo de fetch de detalhes para reuso"""
+        """Abstrai o processo de fetch de detalhes para reuso (despacha pelo detail_backend)"""
+        if params.detail_backend == BACKEND_BROWSER:
+            self._count("browser")
+            return self._fetch_detail_browser(url, params, fallback_date)
+
+        try:
+            detail = scrape_detail_http(
+                self._http(),
+                url,
+                timeout_ms=params.detail_timeout,
+                advanced=params.advanced_detail,
+                fallback_date=fallback_date,
+                compute_hash=True
+            )
+        except Exception as e:
+            if params.detail_backend == BACKEND_HTTP:
+                raise
+            logger.debug("Detalhe via HTTP falhou, usando browser", extra={"url": url, "err": str(e)})
+            detail = None
+
+        if params.detail_backend == BACKEND_HTTP or (detail is not None and not is_short_detail(detail)):
+            self._count("http")
+            return detail
+        self._count("browser_fallback")
+        return self._fetch_detail_browser(url, params, fallback_date)
+
+    def _http(self):
+        if self._http_client is None:
+            self._http_client = get_shared_client()
+        return self._http_client
+
+    def _count(self, key: str) -> None:
+        with self._counts_lock:
+            self._backend_counts[key] += 1
+
+    def _fetch_detail_browser(self, url: str, params: CascadeParams, fallback_date: str | None = None):
         return scrape_detail_structured(
             self.context,
             url,
             timeout_ms=params.detail_timeout,
             advanced=params.advanced_detail,
             fallback_date=fallback_date,
-            compute_hash=True
+            compute_hash=True,
+            ready_timings=self.ready_timings,
         )
 
     def _scrape_parallel(self, raw_items: list[dict[str, Any]], params: CascadeParams,
@@ -190,6 +292,8 @@ class CascadeService:
         out = []
         failures = 0
         item_count = len(raw_items)
+        if not item_count:
+            return out, failures
 
         # Reduz workers para não sobrecarregar o browser
         effective_workers = min(params.parallel, item_count, 10)
@@ -197,21 +301,19 @@ class CascadeService:
         if effective_workers < params.parallel:
             logger.info(f"Ajustando workers para {effective_workers} (original: {params.parallel})")
 
+        if params.detail_backend == BACKEND_BROWSER and PAGE_POOL_ENABLED and self.context is not None:
+            # Uma página pronta por worker no pool do context
+            with contextlib.suppress(Exception):
+                pool = get_page_pool(self.context, size=effective_workers)
+                pool.prewarm(effective_workers)
+                self._page_pool_stats = pool.stats
+
         def _job(item):
-            raw_link = item.get("link") or ""
-            detail_url = abs_url(self.page.url, raw_link) if raw_link else ""
+            detail_url = self._detail_url(item)
             fallback_date = params.date if params.fallback_date_if_missing else None
 
             detail = self._fetch_detail(detail_url, params, fallback_date)
-            record = {**item, **detail.to_dict()}
-            if detail_url:
-                record["detail_url"] = detail_url
-
-            h = record.get("meta", {}).get("hash") or stable_sha1(detail_url)
-            record["hash"] = h
-            record["data_publicacao_fallback"] = (record.get("meta") or {}).get("data_publicacao_fallback", False)
-
-            return record
+            return self._build_record(item, detail_url, detail)
 
         with ThreadPoolExecutor(max_workers=effective_workers) as pool:
             futures = [pool.submit(_job, item) for item in raw_items]
@@ -219,17 +321,44 @@ class CascadeService:
             for fut in as_completed(futures):
                 try:
                     rec = fut.result()
-                    item_hash = rec.get("hash")
-
-                    if dedup and item_hash and dedup.has(item_hash):
-                        continue
-
-                    if dedup and item_hash:
-                        dedup.add(item_hash)
-
-                    out.append(rec)
+                    if self._keep_record(rec, dedup):
+                        out.append(rec)
                 except Exception as e:
                     failures += 1
                     logger.warning("Falha em detalhes paralelos", extra={"err": str(e)})
 
         return out, failures
+
+    def _scrape_async(self, raw_items: list[dict[str, Any]], params: CascadeParams,
+                      dedup: DedupState | None) -> tuple[list, int]:
+        """Scraping de detalhes no pipeline async (pool de páginas, concorrência pela vazão)"""
+        out = []
+        failures = 0
+        urls = [self._detail_url(item) for item in raw_items]
+        details, stats = scrape_details_async(
+            urls,
+            backend=params.detail_backend,
+            max_parallel=params.parallel,
+            http_client=self._http() if params.detail_backend != BACKEND_BROWSER else None,
+            timeout_ms=params.detail_timeout,
+            advanced=params.advanced_detail,
+            fallback_date=params.date if params.fallback_date_if_missing else None,
+            ready_timings=self.ready_timings,
+            connect_shared=self.connect_shared,
+        )
+        with self._counts_lock:
+            for key, n in (stats.get("backendCounts") or {}).items():
+                self._backend_counts[key] += n
+        self._concurrency_stats = stats.get("concurrency")
+        self._page_pool_stats = stats.get("pagePool")
+
+        for item, detail_url, detail in zip(raw_items, urls, details, strict=True):
+            if isinstance(detail, BaseException):
+                failures += 1
+                logger.warning("Falha em detalhes async", extra={"url": detail_url, "err": str(detail)})
+                continue
+            record = self._build_record(item, detail_url, detail)
+            if self._keep_record(record, dedup):
+                out.append(record)
+
+        return out, failures
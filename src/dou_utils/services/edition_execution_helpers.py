@@ -10,10 +10,13 @@ import time
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
+from ..detail_http import normalize_detail_backend
 from ..detail_utils import abs_url as _abs_url
+from ..edition_listing import LISTING_HTTP, get_edition_listing, normalize_listing_backend
 from ..enrich_utils import enrich_items_friendly_titles as _enrich_titles
 from ..page_utils import find_best_frame, goto as _goto, try_visualizar_em_lista
 from ..query.utils import apply_query as _apply_query, collect_links as _collect_links
+from ..services.async_detail_service import normalize_detail_mode
 from ..services.cascade_service import CascadeParams, CascadeService
 from ..services.multi_level_cascade_service import MultiLevelCascadeSelector
 
@@ -58,7 +61,7 @@ def should_reuse_inpage(page, allow_inpage_reuse: bool, date: str, secao: str) -
         return False
 
 
-def navigate_to_edition(page, url: str, do_nav: bool, inpage: bool) -> dict[str, float]:
+def navigate_to_edition(page, url: str, do_nav: bool, inpage: bool, ready=None) -> dict[str, float]:
     """Navigate to edition and prepare view.
 
     Args:
@@ -66,6 +69,7 @@ def navigate_to_edition(page, url: str, do_nav: bool, inpage: bool) -> dict[str,
         url: Edition URL
         do_nav: Whether to navigate
         inpage: Whether reusing in-page
+        ready: Optional ReadyTimings for the list view wait
 
     Returns:
         Dict with timing info: {'t0', 't_after_nav'}
@@ -82,7 +86,7 @@ def navigate_to_edition(page, url: str, do_nav: bool, inpage: bool) -> dict[str,
     t_after_nav = time.time()
 
     # Ensure list view (idempotent even for in-page reuse)
-    try_visualizar_em_lista(page)
+    try_visualizar_em_lista(page, timings=ready)
 
     return {'t0': t0, 't_after_nav': t_after_nav}
 
@@ -107,7 +111,7 @@ def run_multilevel_selection(frame, params) -> dict[str, Any]:
     )
 
 
-def retry_selection_with_reload(page, context, params, inpage: bool) -> dict[str, Any]:
+def retry_selection_with_reload(page, context, params, inpage: bool, ready=None) -> dict[str, Any]:
     """Retry selection after hard refresh if in-page reuse failed.
 
     Args:
@@ -115,6 +119,7 @@ def retry_selection_with_reload(page, context, params, inpage: bool) -> dict[str
         context: Browser context
         params: EditionRunParams
         inpage: Whether was using in-page reuse
+        ready: Optional ReadyTimings for the list view wait
 
     Returns:
         Selection result dict
@@ -124,7 +129,7 @@ def retry_selection_with_reload(page, context, params, inpage: bool) -> dict[str
 
     try:
         page.reload(wait_until="domcontentloaded", timeout=60_000)
-        try_visualizar_em_lista(page)
+        try_visualizar_em_lista(page, timings=ready)
         frame = find_best_frame(context)
         return run_multilevel_selection(frame, params)
     except Exception:
@@ -157,12 +162,13 @@ def build_error_result(params, selres: dict) -> dict[str, Any]:
     }
 
 
-def collect_edition_links(frame, params) -> list[dict]:
+def collect_edition_links(frame, params, ready=None) -> list[dict]:
     """Collect links from edition after query application.
 
     Args:
         frame: Playwright frame
         params: EditionRunParams
+        ready: Optional ReadyTimings for the load-more waits
 
     Returns:
         List of collected items
@@ -175,6 +181,31 @@ def collect_edition_links(frame, params) -> list[dict]:
         max_scrolls=params.max_scrolls,
         scroll_pause_ms=params.scroll_pause_ms,
         stable_rounds=params.stable_rounds,
+        ready_timings=ready,
+    )
+
+
+def collect_edition_links_http(params) -> list[dict] | None:
+    """Answer the job from the edition's HTTP listing (no browser).
+
+    Args:
+        params: EditionRunParams
+
+    Returns:
+        Items for key1/key2/key3, or None when the browser path must be used
+        (listing disabled, download/parse failed, non-text key types or a query)
+    """
+    if normalize_listing_backend(getattr(params, "listing_backend", None)) != LISTING_HTTP:
+        return None
+    # Busca textual depende do campo de pesquisa da página
+    if params.query:
+        return None
+    listing = get_edition_listing(params.date, params.secao, getattr(params, "snapshot_dir", None))
+    if listing is None:
+        return None
+    return listing.filter(
+        params.key1, params.key1_type, params.key2, params.key2_type,
+        params.key3, params.key3_type, max_links=params.max_links,
     )
 
 
@@ -202,7 +233,8 @@ def build_base_result(params) -> dict[str, Any]:
     }
 
 
-def enrich_items_with_detail(context, page, frame, url: str, items: list, params, summarizer_fn) -> tuple[list, bool]:
+def enrich_items_with_detail(context, page, frame, url: str, items: list, params, summarizer_fn,
+                             ready=None, connect_shared=None) -> tuple[list, bool]:
     """Enrich items with detailed information.
 
     Args:
@@ -213,11 +245,15 @@ def enrich_items_with_detail(context, page, frame, url: str, items: list, params
         items: Items to enrich
         params: EditionRunParams
         summarizer_fn: Summarizer function
+        ready: Optional ReadyTimings for the detail page waits
+        connect_shared: Optional shared-browser connector for the async detail mode
 
     Returns:
         Tuple of (enriched_items, enriched_flag)
     """
-    svc = CascadeService(context, page, frame, summarize_fn=summarizer_fn)
+    svc = CascadeService(
+        context, page, frame, summarize_fn=summarizer_fn, ready_timings=ready, connect_shared=connect_shared
+    )
     out = svc.run(
         items,
         CascadeParams(
@@ -236,6 +272,8 @@ def enrich_items_with_detail(context, page, frame, url: str, items: list, params
             advanced_detail=False,
             fallback_date_if_missing=params.fallback_date_if_missing,
             dedup_state_file=params.dedup_state_file,
+            detail_backend=normalize_detail_backend(getattr(params, "detail_backend", None)),
+            detail_mode=normalize_detail_mode(getattr(params, "detail_mode", None)),
         )
     )
 
@@ -254,7 +292,7 @@ def normalize_items_without_detail(page, items: list, params) -> tuple[list, boo
     """Normalize items without detail scraping.
 
     Args:
-        page: Playwright page
+        page: Playwright page (None for HTTP listing items, whose links are absolute)
         items: Items to normalize
         params: EditionRunParams
 
@@ -265,7 +303,7 @@ def normalize_items_without_detail(page, items: list, params) -> tuple[list, boo
     for it in items:
         try:
             link = it.get("link") or ""
-            durl = _abs_url(page.url, link) if link else ""
+            durl = _abs_url(getattr(page, "url", "") or "", link) if link else ""
             if durl:
                 it = {**it, "detail_url": durl}
 
@@ -284,7 +322,8 @@ def normalize_items_without_detail(page, items: list, params) -> tuple[list, boo
 
 
 def build_timings(t0: float, t_after_nav: float, t_after_view: float,
-                  t_after_select: float, t_after_collect: float, inpage: bool) -> dict[str, Any]:
+                  t_after_select: float, t_after_collect: float, inpage: bool,
+                  ready=None) -> dict[str, Any]:
     """Build timing metrics.
 
     Args:
@@ -294,12 +333,13 @@ def build_timings(t0: float, t_after_nav: float, t_after_view: float,
         t_after_select: Time after selection
         t_after_collect: Time after collection
         inpage: Whether in-page reuse was used
+        ready: Optional ReadyTimings (per-step readiness waits and budgets)
 
     Returns:
         Timing metrics dict
     """
     total_elapsed = time.time() - t0
-    return {
+    timings = {
         "nav_sec": round(t_after_nav - t0, 3),
         "view_sec": round(t_after_view - t_after_nav, 3),
         "select_sec": round(t_after_select - t_after_view, 3),
@@ -307,6 +347,9 @@ def build_timings(t0: float, t_after_nav: float, t_after_view: float,
         "total_sec": round(total_elapsed, 3),
         "inpage_reuse": bool(inpage),
     }
+    if ready is not None:
+        timings["ready"] = ready.as_dict()
+    return timings
 
 
 def log_execution_summary(params, timings: dict):
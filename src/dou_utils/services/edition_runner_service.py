@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from typing import Any
 
 from ..page_utils import find_best_frame
+from ..readiness import ReadyTimings
+from ..request_filter import install_request_filter
 
 
 @dataclass
@@ -33,6 +35,14 @@ class EditionRunParams:
     fallback_date_if_missing: bool = True
     dedup_state_file: str | None = None
     detail_parallel: int = 1
+    # "browser" | "http" | "http-then-browser-if-short" (None = DOU_DETAIL_BACKEND ou "browser")
+    detail_backend: str | None = None
+    # "thread" | "async" com detail_parallel > 1 (None = DOU_DETAIL_MODE ou "thread")
+    detail_mode: str | None = None
+    # "http" (listagem da edição via GET, browser como fallback) | "browser" (None = DOU_LISTING_BACKEND ou "http")
+    listing_backend: str | None = None
+    # out_dir do plano: listagens ficam em <snapshot_dir>/_editions para os demais jobs/processos
+    snapshot_dir: str | None = None
 
     # Summary is usually applied at bulletin generation; keep disabled here by default
     summary: bool = False
@@ -49,24 +59,10 @@ class EditionRunnerService:
         self._keep_page_open = False
         # When True and a precreated page is provided, avoid navigation if already on same edition
         self._allow_inpage_reuse = False
-        # Install a global route on the context to block heavy resources (images, media, fonts)
-        try:
-            def _route_block_heavy(route):
-                try:
-                    req = route.request
-                    rtype = getattr(req, "resource_type", lambda: "")()
-                    # Não bloquear stylesheet para evitar quebra de dropdown/renderização dinâmica
-                    if rtype in ("image", "media", "font"):
-                        return route.abort()
-                    url = req.url
-                    if any(url.lower().endswith(ext) for ext in (".png", ".jpg", ".jpeg", ".gif", ".webp", ".mp4", ".woff", ".woff2")):
-                        return route.abort()
-                except Exception:
-                    pass
-                return route.continue_()
-            self.context.route("**/*", _route_block_heavy)
-        except Exception:
-            pass
+        # Conector do browser compartilhado (daemon) para detail_mode="async"; None = launch próprio
+        self.connect_shared_browser = None
+        # Bloqueio de recursos pesados: um único route por context, mesmo com um runner por job
+        self.request_filter = install_request_filter(context)
 
     def run(self, params: EditionRunParams, summarizer_fn: Callable | None = None) -> dict[str, Any]:
         import time
@@ -77,6 +73,7 @@ class EditionRunnerService:
             build_error_result,
             build_timings,
             collect_edition_links,
+            collect_edition_links_http,
             enrich_items_with_detail,
             log_execution_summary,
             navigate_to_edition,
@@ -86,13 +83,21 @@ class EditionRunnerService:
             should_reuse_inpage,
         )
 
+        url = build_edition_url(params.date, params.secao)
+        ready = ReadyTimings()
+
+        # Listagem pela página da edição baixada via HTTP: sem navegação nem seleção
+        t0 = time.time()
+        items = collect_edition_links_http(params)
+        if items is not None:
+            return self._run_http_listing(params, items, url, t0, ready, summarizer_fn)
+
         # Setup page
         page = self._precreated_page or self.context.new_page()
         page.set_default_timeout(60_000)
         page.set_default_navigation_timeout(60_000)
 
         # Determine navigation strategy
-        url = build_edition_url(params.date, params.secao)
         inpage = should_reuse_inpage(
             self._precreated_page,
             self._allow_inpage_reuse,
@@ -102,14 +107,14 @@ class EditionRunnerService:
         do_nav = not inpage
 
         # Navigate and prepare view
-        nav_times = navigate_to_edition(page, url, do_nav, inpage)
+        nav_times = navigate_to_edition(page, url, do_nav, inpage, ready)
         frame = find_best_frame(self.context)
         t_after_view = time.time()
 
         # Run selection with retry on failure
         selres = run_multilevel_selection(frame, params)
         if not selres.get("ok") and inpage:
-            selres = retry_selection_with_reload(page, self.context, params, inpage)
+            selres = retry_selection_with_reload(page, self.context, params, inpage, ready)
 
         if not selres.get("ok"):
             with contextlib.suppress(Exception):
@@ -118,7 +123,7 @@ class EditionRunnerService:
 
         # Collect links
         t_after_select = time.time()
-        items = collect_edition_links(frame, params)
+        items = collect_edition_links(frame, params, ready)
         t_after_collect = time.time()
 
         # Build result
@@ -126,7 +131,8 @@ class EditionRunnerService:
 
         if params.scrape_detail:
             enriched_items, enriched = enrich_items_with_detail(
-                self.context, page, frame, url, items, params, summarizer_fn
+                self.context, page, frame, url, items, params, summarizer_fn, ready,
+                connect_shared=self.connect_shared_browser,
             )
             result["itens"] = enriched_items
             result["total"] = len(enriched_items)
@@ -145,10 +151,43 @@ class EditionRunnerService:
         # Add timings and log
         timings = build_timings(
             nav_times['t0'], nav_times['t_after_nav'], t_after_view,
-            t_after_select, t_after_collect, inpage
+            t_after_select, t_after_collect, inpage, ready
         )
+        if self.request_filter is not None:
+            # Acumulado do context (todos os jobs que o reaproveitaram)
+            timings["blocked"] = self.request_filter.as_dict()
         with contextlib.suppress(Exception):
             result["_timings"] = timings
 
         log_execution_summary(params, timings)
         return result
+
+    def _run_http_listing(self, params: EditionRunParams, items: list[dict], url: str, t0: float,
+                          ready: ReadyTimings, summarizer_fn: Callable | None) -> dict[str, Any]:
+        """Resultado a partir dos itens da listagem HTTP (detalhes pelo detail_backend, se pedidos)."""
+        import time
+
+        from .edition_execution_helpers import (
+            build_base_result,
+            build_timings,
+            enrich_items_with_detail,
+            log_execution_summary,
+            normalize_items_without_detail,
+        )
+
+        t_after_collect = time.time()
+        result = build_base_result(params)
+        if params.scrape_detail:
+            result["itens"], result["enriquecido"] = enrich_items_with_detail(
+                self.context, self._precreated_page, None, url, items, params, summarizer_fn, ready,
+                connect_shared=self.connect_shared_browser,
+            )
+        else:
+            result["itens"], result["enriquecido"] = normalize_items_without_detail(None, items, params)
+        result["total"] = len(result["itens"])
+
+        timings = build_timings(t0, t0, t0, t0, t_after_collect, False, ready)
+        timings["listing"] = "http"
+        result["_timings"] = timings
+        log_execution_summary(params, timings)
+        return result
@@ -0,0 +1,150 @@
+"""
+shared_browser.py
+Browser compartilhado para chamadores sync de qualquer thread.
+
+Objetos da API sync do Playwright ficam presos à thread que os criou, e abrir
+``sync_playwright()`` + ``chromium.launch()`` por URL custa segundos por item.
+``SharedBrowser`` sobe, no primeiro uso, uma thread dedicada com seu próprio
+event loop rodando async_playwright (um browser + um context com
+request_filter); cada chamada empresta uma página do pool
+(page_pool.AsyncPagePool) e executa uma corrotina nela nessa thread:
+
+    browser = SharedBrowser(pool_size=4)
+    html = browser.run(lambda page: page.content(), timeout_sec=30)
+    browser.close()
+
+Chamadas simultâneas de várias threads usam até ``pool_size`` páginas em
+paralelo; as demais esperam uma página livre. Falha ao iniciar o browser
+(Playwright ausente, sem executável) fica memorizada: as chamadas seguintes
+falham na hora em vez de tentar de novo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from .log_utils import get_logger
+from .page_pool import AsyncPagePool, is_crash_error
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Páginas abertas ao mesmo tempo no browser compartilhado
+SHARED_BROWSER_PAGES = int(os.environ.get("DOU_SHARED_BROWSER_PAGES", "4") or "4")
+_START_TIMEOUT_SEC = 60.0
+
+
+class SharedBrowser:
+    """Browser async_playwright iniciado sob demanda em uma thread própria.
+
+    Args:
+        pool_size: Páginas simultâneas (padrão: DOU_SHARED_BROWSER_PAGES)
+        name: Nome da thread do loop (logs/depuração)
+    """
+
+    def __init__(self, pool_size: int = SHARED_BROWSER_PAGES, name: str = "shared-browser"):
+        self.pool_size = max(1, pool_size)
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_error: BaseException | None = None
+        self._pw_cm = None
+        self._browser = None
+        self._context = None
+        self.pool: AsyncPagePool | None = None
+        self.stats = {"calls": 0, "failed": 0}
+
+    async def _start(self) -> None:
+        from playwright.async_api import async_playwright
+
+        from .request_filter import install_request_filter_async
+
+        self._pw_cm = async_playwright()
+        pw = await self._pw_cm.__aenter__()
+        self._browser = await pw.chromium.launch(headless=True)
+        self._context = await self._browser.new_context(ignore_https_errors=True)
+        await install_request_filter_async(self._context)
+        self.pool = AsyncPagePool(self._context.new_page, self.pool_size)
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._start_error is not None:
+                raise RuntimeError(f"{self.name}: browser indisponível: {self._start_error}")
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result(_START_TIMEOUT_SEC)
+            except BaseException as e:
+                self._start_error = e
+                logger.warning(f"{self.name}: falha ao iniciar o browser: {e}")
+                self._shutdown(loop, thread)
+                raise RuntimeError(f"{self.name}: browser indisponível: {e}") from e
+            self._loop, self._thread = loop, thread
+            logger.info(f"{self.name}: browser iniciado (pages={self.pool_size})")
+            return loop
+
+    async def _with_page(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        page = await self.pool.acquire()
+        broken = False
+        try:
+            return await fn(page)
+        except Exception as e:
+            broken = is_crash_error(e)
+            raise
+        finally:
+            await self.pool.release(page, broken=broken)
+
+    def run(self, fn: Callable[[Any], Awaitable[T]], timeout_sec: float | None = None) -> T:
+        """Executa ``fn(page)`` em uma página emprestada (bloqueia a thread chamadora).
+
+        Raises:
+            RuntimeError: Browser não pôde ser iniciado
+            TimeoutError: ``fn`` não terminou em ``timeout_sec``
+        """
+        loop = self._ensure_started()
+        fut = asyncio.run_coroutine_threadsafe(self._with_page(fn), loop)
+        self.stats["calls"] += 1
+        try:
+            return fut.result(timeout_sec)
+        except BaseException:
+            fut.cancel()
+            self.stats["failed"] += 1
+            raise
+
+    async def _aclose(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+        for closer in (self._context, self._browser):
+            if closer is not None:
+                with contextlib.suppress(Exception):
+                    await closer.close()
+        if self._pw_cm is not None:
+            with contextlib.suppress(Exception):
+                await self._pw_cm.__aexit__(None, None, None)
+        self.pool = self._context = self._browser = self._pw_cm = None
+
+    def _shutdown(self, loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+        with contextlib.suppress(Exception):
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(_START_TIMEOUT_SEC)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=_START_TIMEOUT_SEC)
+        with contextlib.suppress(Exception):
+            loop.close()
+
+    def close(self) -> None:
+        """Fecha páginas, browser e a thread do loop (um novo ``run`` reinicia o browser)."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None:
+            self._shutdown(loop, thread)
@@ -0,0 +1,193 @@
+"""Unit tests for dou_utils.services.async_detail_service module.
+
+Tests for the async detail pipeline: throughput-driven concurrency, the page
+pool and backend handling, with fake async pages instead of a browser.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.page_pool import AsyncPagePool
+from dou_utils.services import async_detail_service as ads
+from dou_utils.services.async_detail_service import ThroughputController, scrape_details_async
+from dou_utils.services.cascade_service import CascadeParams, CascadeService
+
+RAW = {
+    "title": "PORTARIA Nº 1", "pub": "2025-01-02", "orgao": "Ministério da Fazenda", "tipo": "Portaria",
+    "secaoLink": None, "ementa": "Dispõe.", "paragraphs": ["Dispõe sobre algo. " * 20], "pdf": None,
+    "pdfCertificada": None, "bodyText": "", "meta": {},
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestThroughputController:
+    """Tests for the hill-climbing concurrency level."""
+
+    def _feed(self, ctl, clock, n, secs, success=True):
+        for _ in range(n):
+            clock.now += secs / n
+            ctl.observe(success)
+
+    def test_climbs_while_throughput_improves_and_backs_off(self):
+        """Test probe, climb on better throughput and reversal on worse."""
+        clock = FakeClock()
+        ctl = ThroughputController(initial=2, max_level=8, window=4, clock=clock)
+
+        self._feed(ctl, clock, 4, 4.0)  # 1 item/s -> probe
+        assert ctl.level == 3
+        self._feed(ctl, clock, 4, 2.0)  # 2 items/s -> continua subindo
+        assert ctl.level == 4
+        self._feed(ctl, clock, 4, 4.0)  # caiu -> inverte
+        assert ctl.level == 3
+        assert [h["reason"] for h in ctl.stats["history"]] == ["probe", "throughput_up", "throughput_down"]
+        assert ctl.stats["peak"] == 4
+
+    def test_errors_halve_level_within_bounds(self):
+        """Test that a window dominated by errors halves the level."""
+        clock = FakeClock()
+        ctl = ThroughputController(initial=8, max_level=8, window=4, clock=clock)
+
+        self._feed(ctl, clock, 8, 1.0, success=False)
+        assert ctl.level == 4
+        assert ThroughputController(initial=50, max_level=6).level == 6
+
+
+class FakePage:
+    def __init__(self, delay):
+        self.delay = delay
+        self.url = ""
+        self.visits = 0
+
+    def set_default_timeout(self, _ms):
+        pass
+
+    async def goto(self, url, wait_until=None):
+        self.url = url
+        if url != "about:blank":
+            self.visits += 1
+            await asyncio.sleep(self.delay)
+
+    async def wait_for_function(self, _script, timeout=None):
+        pass
+
+    async def evaluate(self, _script, _opts):
+        return dict(RAW, title=self.url)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    pages = []
+
+    async def new_page():
+        page = FakePage(delay=0.05)
+        pages.append(page)
+        return page
+
+    async def get_pool(self):
+        if self.pool is None:
+            self.pool = AsyncPagePool(new_page, self._pool_size)
+        return self.pool
+
+    monkeypatch.setattr(ads._LazyBrowser, "get_pool", get_pool)
+    return pages
+
+
+class TestScrapeDetailsAsync:
+    """Tests for scrape_details_async."""
+
+    def test_pages_run_concurrently_and_results_keep_order(self, fake_browser):
+        """Test that N pages overlap and results come back in URL order."""
+        urls = [f"https://www.in.gov.br/web/dou/-/ato-{i}" for i in range(12)]
+        started = time.perf_counter()
+        details, stats = scrape_details_async(urls, backend="browser", max_parallel=4)
+        elapsed = time.perf_counter() - started
+
+        assert [d.titulo for d in details] == urls
+        assert elapsed < 12 * 0.05
+        assert 1 < len(fake_browser) <= 4
+        assert sum(p.visits for p in fake_browser) == 12
+        assert stats["backendCounts"]["browser"] == 12
+        assert stats["concurrency"]["max_level"] == 4
+        assert stats["pagePool"]["reused"] == 12 - len(fake_browser)
+
+    def test_http_backend_does_not_start_browser(self, fake_browser):
+        """Test that http-only runs never create pages and report errors per URL."""
+        class Client:
+            def get_text(self, url, timeout_sec=None):
+                if url.endswith("bad"):
+                    raise OSError("reset")
+                return url, "<html><body><article><h1>Ato</h1><p>Texto.</p></article></body></html>"
+
+        details, stats = scrape_details_async(["https://x/ok", "https://x/bad"], backend="http", http_client=Client())
+
+        assert details[0].titulo == "Ato"
+        assert isinstance(details[1], OSError)
+        assert fake_browser == []
+        assert stats["backendCounts"]["http"] == 1
+
+    def test_cascade_async_mode(self, fake_browser):
+        """Test that CascadeService routes parallel runs through the async pipeline."""
+        page = type("ListPage", (), {"url": "https://www.in.gov.br/leiturajornal"})()
+        params = CascadeParams(
+            url=page.url, date="2025-01-02", secao="DO1", query=None, max_links=10, scrape_detail=True,
+            detail_timeout=5_000, parallel=40, detail_mode="async",
+        )
+        out = CascadeService(None, page, None).run([{"link": f"/web/dou/-/ato-{i}"} for i in range(3)], params)
+
+        assert out["stats"]["detailMode"] == "async"
+        assert out["stats"]["parallel"] == ads.ASYNC_MAX_PARALLEL
+        assert out["stats"]["detailConcurrency"]["max_level"] == ads.ASYNC_MAX_PARALLEL
+        assert [it["orgao"] for it in out["itens"]] == ["Ministério da Fazenda"] * 3
+
+
+class FakeChromium:
+    def __init__(self, fail_channels=()):
+        self.fail_channels = fail_channels
+        self.launches = []
+
+    async def launch(self, channel=None, **kw):
+        self.launches.append((channel, kw.get("args")))
+        if channel in self.fail_channels:
+            raise RuntimeError(f"{channel} not installed")
+        return f"browser-{channel}"
+
+
+class TestLaunchBrowser:
+    """Tests for the lazily launched browser of the async pipeline."""
+
+    def test_shared_browser_is_tried_first(self):
+        """Test that the injected connect_shared browser is used without launching anything."""
+        p = SimpleNamespace(chromium=FakeChromium())
+
+        async def connect_shared(_p, _prefer_edge):
+            return "daemon"
+
+        assert asyncio.run(ads._launch_browser(p, connect_shared)) == "daemon"
+        assert p.chromium.launches == []
+
+    def test_launches_system_channels_with_flags(self, monkeypatch):
+        """Test the channel fallback and the standard launch flags; no browser at all is an error."""
+        monkeypatch.delenv("DOU_PREFER_EDGE", raising=False)
+        monkeypatch.delenv("DOU_DISABLE_QUIC", raising=False)
+        p = SimpleNamespace(chromium=FakeChromium(fail_channels=("chrome",)))
+
+        assert asyncio.run(ads._launch_browser(p)) == "browser-msedge"
+        assert [c for c, _ in p.chromium.launches] == ["chrome", "msedge"]
+        assert "--disable-quic" in p.chromium.launches[-1][1]
+        broken = SimpleNamespace(chromium=FakeChromium(fail_channels=("chrome", "msedge")))
+        with pytest.raises(RuntimeError):
+            asyncio.run(ads._launch_browser(broken))
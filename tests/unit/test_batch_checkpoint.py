@@ -0,0 +1,106 @@
+"""Unit tests for dou_snaptrack.cli.batch.checkpoint module.
+
+Tests for the checkpoint journal used by resumable batch runs.
+"""
+from types import SimpleNamespace
+
+from dou_snaptrack.cli.batch import async_runner
+from dou_snaptrack.cli.batch.checkpoint import (
+    import_run_journal,
+    job_signature,
+    merge_resumed,
+    record_job_done,
+    split_resumable,
+)
+from dou_snaptrack.cli.batch.helpers import finalize_with_aggregation, write_report
+from dou_snaptrack.ui.collectors.dou_helpers import RUN_JOURNAL_NAME, JobSummary, RunJournal
+
+DEFAULTS = {"secaoDefault": "DO1"}
+
+
+def _plan():
+    return [
+        {"data": "01-02-2025", "key1": "Ministério A", "key2": "Todos", "topic": "a"},
+        {"data": "01-02-2025", "key1": "Ministério B", "key2": "Todos", "topic": "b"},
+        {"data": "01-02-2025", "key1": "Ministério C", "key2": "Todos", "topic": "c"},
+    ]
+
+
+class TestJobSignature:
+    """Tests for job signatures."""
+
+    def test_defaults_fill_missing_secao(self):
+        """Test that the default section is part of the signature."""
+        job = {"data": "01-02-2025", "key1": "X", "key2": "Y"}
+        assert job_signature(job, DEFAULTS) == job_signature({**job, "secao": "DO1"})
+        assert job_signature(job, DEFAULTS) != job_signature({**job, "secao": "DO2"})
+
+    def test_ignores_bookkeeping_fields(self):
+        """Test that topic and _plan_index do not change the signature."""
+        job = _plan()[0]
+        assert job_signature(job) == job_signature({**job, "topic": "other", "_plan_index": 7})
+
+
+class TestResume:
+    """Tests for splitting a plan into pending and reused jobs."""
+
+    def test_skips_completed_jobs_with_existing_output(self, tmp_path):
+        """Test that finished jobs are reused and pending ones keep their plan index."""
+        plan = _plan()
+        out_a = tmp_path / "a.json"
+        out_a.write_text("{}", encoding="utf-8")
+        record_job_done(tmp_path, plan[0], DEFAULTS, str(out_a), 5, 1)
+        # Output deleted (e.g. aggregated): must be executed again
+        record_job_done(tmp_path, plan[1], DEFAULTS, str(tmp_path / "gone.json"), 3, 2)
+
+        pending, reused = split_resumable(plan, tmp_path, DEFAULTS)
+
+        assert [j["topic"] for j in pending] == ["b", "c"]
+        assert [j["_plan_index"] for j in pending] == [2, 3]
+        assert [e["output"] for e in reused] == [str(out_a)]
+
+    def test_merge_resumed_report(self):
+        """Test that reused jobs are counted and their outputs come first."""
+        report = {"total_jobs": 2, "ok": 1, "fail": 1, "items_total": 4, "outputs": ["new.json"]}
+        reused = [{"output": "old.json", "items": 6}]
+
+        merged = merge_resumed(report, reused, total_jobs=3)
+
+        assert (merged["total_jobs"], merged["ok"], merged["fail"], merged["items_total"]) == (3, 2, 1, 10)
+        assert merged["outputs"] == ["old.json", "new.json"]
+        assert merged["resumed"] == {"reused": 1, "executed": 2}
+
+
+class TestPartialFastAsync:
+    """Tests for a partial fast-async result going through finalize and resume."""
+
+    def test_partial_result_keeps_outputs_for_resume(self, tmp_path, monkeypatch):
+        """Test that a killed fast-async run is not aggregated and its unfinished jobs stay pending."""
+        plan = _plan()
+        out_a = tmp_path / "a.json"
+        out_a.write_text("{}", encoding="utf-8")
+        journal = RunJournal(tmp_path / RUN_JOURNAL_NAME)
+        journal.record_job(JobSummary(job_id="a", job_index=1, success=True, item_count=5, output=str(out_a),
+                                      date="01-02-2025", key1="Ministério A", key2="Todos"))
+        journal.close()
+        async_input = {"jobs": plan, "out_dir": str(tmp_path)}
+        partial = async_runner.partial_from_journal(async_input, "Subprocess travado (sem eventos)")
+        monkeypatch.setattr(async_runner, "_try_direct_async", lambda *_a: partial)
+        logs = []
+        cfg = {"plan_name": "plano"}
+
+        report = async_runner.try_fast_async_mode(
+            plan, DEFAULTS, tmp_path, "{topic}.json", SimpleNamespace(no_fast_async=False), cfg, logs.append
+        )
+        rep_path = write_report(report, tmp_path, cfg)
+        finalize_with_aggregation(report, tmp_path, cfg, rep_path, logs.append)
+        import_run_journal(tmp_path, plan, DEFAULTS)
+        pending, reused = split_resumable(plan, tmp_path, DEFAULTS)
+
+        assert report["partial"] is True
+        assert report["error"] == "Subprocess travado (sem eventos)"
+        assert report["fail"] == 2
+        assert out_a.exists()
+        assert [e["output"] for e in reused] == [str(out_a)]
+        assert [j["topic"] for j in pending] == ["b", "c"]
+        assert any("PARCIAL" in line for line in logs)
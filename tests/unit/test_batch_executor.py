@@ -0,0 +1,165 @@
+"""Unit tests for dou_snaptrack.cli.batch.executor module.
+
+Tests for the worker payloads shipped to batch executors and for the
+executor backends (streaming aggregation, per-job timeouts, cancellation).
+"""
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from dou_snaptrack.cli.batch import executor as executor_mod
+from dou_snaptrack.cli.batch.executor import (
+    InlineExecutor,
+    ProcessExecutor,
+    SubprocessExecutor,
+    ThreadExecutor,
+    build_bucket_payload,
+    common_payload,
+    make_executor,
+    run_executor,
+)
+from dou_snaptrack.cli.batch.runner import _payload_work
+from dou_snaptrack.cli.batch.summary_config import SummaryConfig
+
+
+def _common():
+    args = SimpleNamespace(headful=False, slowmo=0, log_file=None)
+    return common_payload({"secaoDefault": "DO1"}, Path("out"), "{idx}.json", args, None, True, SummaryConfig())
+
+
+class TestBucketPayload:
+    """Tests for the compact bucket_jobs_v1 payload."""
+
+    def test_payload_carries_only_bucket_jobs(self):
+        """Test that a worker receives its own jobs, not the whole plan."""
+        jobs = [{"key1": f"K{i}"} for i in range(1, 101)]
+        payload = build_bucket_payload([3, 50], jobs, _common())
+
+        assert "jobs" not in payload
+        assert payload["payload_schema"] == "bucket_jobs_v1"
+        assert payload["total_jobs"] == 100
+        assert payload["bucket_jobs"] == [{"index": 3, "job": {"key1": "K3"}}, {"index": 50, "job": {"key1": "K50"}}]
+        assert payload["out_dir"] == "out"
+
+    def test_worker_reads_both_payload_formats(self):
+        """Test that compact and legacy payloads yield the same (index, job) pairs."""
+        jobs = [{"key1": "A"}, {"key1": "B"}, {"key1": "C"}]
+        compact = build_bucket_payload([1, 3], jobs, _common())
+
+        assert _payload_work(None, None, compact["bucket_jobs"]) == [(1, jobs[0]), (3, jobs[2])]
+        assert _payload_work(jobs, [1, 3], None) == [(1, jobs[0]), (3, jobs[2])]
+
+
+def _fake_worker(delays):
+    """Worker that 'runs' each job for delays[job_index] seconds."""
+    def worker(payload, on_job=None, should_stop=None):
+        report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
+        for entry in payload["bucket_jobs"]:
+            if should_stop and should_stop():
+                break
+            time.sleep(delays.get(entry["index"], 0))
+            r = {"ok": 1, "fail": 0, "items_total": 2, "outputs": [f"out{entry['index']}.json"]}
+            for k in ("ok", "fail", "items_total"):
+                report[k] += r[k]
+            report["outputs"].extend(r["outputs"])
+            if on_job:
+                on_job(entry["index"], r)
+        return report
+    return worker
+
+
+def _sleepy_worker(payload, on_job=None, should_stop=None):
+    """Module-level (picklable) worker for the process backend: each job sleeps job['sleep'] seconds."""
+    report = {"ok": 0, "fail": 0, "items_total": 0, "outputs": []}
+    for entry in payload["bucket_jobs"]:
+        if should_stop and should_stop():
+            break
+        time.sleep(entry["job"].get("sleep", 0))
+        r = {"ok": 1, "fail": 0, "items_total": 1, "outputs": [f"out{entry['index']}.json"]}
+        for k in ("ok", "fail", "items_total"):
+            report[k] += r[k]
+        report["outputs"].extend(r["outputs"])
+        if on_job:
+            on_job(entry["index"], r)
+    return report
+
+
+def _payloads(jobs, *buckets):
+    return [build_bucket_payload(list(b), jobs, _common()) for b in buckets]
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(executor_mod, "POLL_SEC", 0.02)
+    monkeypatch.setattr(executor_mod, "WORKER_STARTUP_SEC", 0.0)
+
+
+class TestExecutors:
+    """Tests for executor backends with an in-process fake worker."""
+
+    @pytest.mark.parametrize("cls", [InlineExecutor, ThreadExecutor])
+    def test_results_are_merged_once(self, cls, fast_polling):
+        """Test that every bucket is aggregated through run_executor."""
+        jobs = [{"key1": str(i)} for i in range(1, 5)]
+        ex = cls(2, lambda _msg: None, _fake_worker({}))
+        report = run_executor(ex, _payloads(jobs, [1, 2], [3, 4]), lambda _msg: None)
+
+        assert (report["ok"], report["fail"], report["items_total"]) == (4, 0, 8)
+        assert sorted(report["outputs"]) == [f"out{i}.json" for i in range(1, 5)]
+        assert report["executor"]["backend"] == cls.name
+        assert report["executor"]["timed_out"] == 0
+
+    def test_stuck_job_times_out_and_keeps_finished_jobs(self, fast_polling):
+        """Test that a job without progress fails its bucket but keeps earlier jobs."""
+        jobs = [{"key1": str(i)} for i in range(1, 4)]
+        ex = ThreadExecutor(2, lambda _msg: None, _fake_worker({2: 1.0}), job_timeout_sec=0.2)
+        report = run_executor(ex, _payloads(jobs, [1, 2], [3]), lambda _msg: None)
+
+        assert (report["ok"], report["fail"]) == (2, 1)
+        assert sorted(report["outputs"]) == ["out1.json", "out3.json"]
+        assert report["executor"]["timed_out"] == 1
+
+    def test_cancel_stops_before_next_job(self, fast_polling):
+        """Test that cancel() fails the remaining jobs without waiting for them."""
+        jobs = [{"key1": str(i)} for i in range(1, 4)]
+        ex = ThreadExecutor(1, lambda _msg: None, _fake_worker({1: 0.3, 2: 5, 3: 5}))
+        threading.Timer(0.1, ex.cancel).start()
+        started = time.monotonic()
+        report = run_executor(ex, _payloads(jobs, [1, 2, 3]), lambda _msg: None)
+
+        assert time.monotonic() - started < 2
+        assert report["executor"]["cancelled"] is True
+        assert report["ok"] + report["fail"] == 3
+
+    def test_hung_process_buckets_are_killed_and_queued_buckets_still_run(self, monkeypatch):
+        """Test more buckets than workers where some hang: timeouts are reported as they happen."""
+        monkeypatch.setattr(executor_mod, "POLL_SEC", 0.05)
+        monkeypatch.setattr(executor_mod, "WORKER_STARTUP_SEC", 5.0)
+        jobs = [{"key1": "1", "sleep": 60}, {"key1": "2", "sleep": 60}, {"key1": "3"}, {"key1": "4"}]
+        ex = ProcessExecutor(2, lambda _msg: None, _sleepy_worker, job_timeout_sec=1.0)
+        started = time.monotonic()
+
+        outcomes = list(ex.run(_payloads(jobs, [1], [2], [3, 4])))
+
+        assert time.monotonic() - started < 30
+        assert [o.bucket_id for o in outcomes] == [1, 2, 3]
+        by_id = {o.bucket_id: o for o in outcomes}
+        assert by_id[1].error == by_id[2].error == "job timeout (1s)"
+        assert by_id[3].error is None
+        assert by_id[3].result["outputs"] == ["out3.json", "out4.json"]
+        assert ex.timed_out == 2
+        assert multiprocessing.active_children() == []
+
+    def test_make_executor_backends(self):
+        """Test DOU_POOL values map to backends (inline when parallel <= 1)."""
+        def log(_msg):
+            return None
+
+        assert isinstance(make_executor("process", 1, log, _fake_worker({})), InlineExecutor)
+        assert isinstance(make_executor("thread", 4, log, _fake_worker({})), ThreadExecutor)
+        assert isinstance(make_executor("subprocess", 4, log, _fake_worker({})), SubprocessExecutor)
+        assert isinstance(make_executor("process", 4, log, _fake_worker({})), ProcessExecutor)
@@ -0,0 +1,139 @@
+"""Unit tests for dou_snaptrack.utils.browser_daemon module.
+
+Tests for the shared browser daemon state, leasing and recycling logic.
+"""
+import threading
+import time
+
+from dou_snaptrack.utils import browser_daemon
+from dou_snaptrack.utils.browser_daemon import DaemonState, _read_state, _write_state, ensure_daemon
+
+
+class TestDaemonLeases:
+    """Tests for ensure_daemon lease accounting and recycling."""
+
+    def _setup(self, monkeypatch, tmp_path, healthy_ports):
+        monkeypatch.setattr(browser_daemon, "DAEMON_STATE_PATH", tmp_path / "daemon.json")
+        monkeypatch.setattr(browser_daemon, "DAEMON_RECYCLE_AFTER", 3)
+        monkeypatch.setattr(browser_daemon, "is_healthy", lambda port, **_: port in healthy_ports)
+        monkeypatch.setattr(browser_daemon, "find_daemon_executable", lambda *_: "/usr/bin/chromium")
+        spawned = []
+
+        def fake_spawn(executable, port):
+            spawned.append(port)
+            healthy_ports.add(port)
+            return 1000 + len(spawned)
+
+        monkeypatch.setattr(browser_daemon, "_spawn", fake_spawn)
+        monkeypatch.setattr(browser_daemon, "_kill", lambda _pid: None)
+        monkeypatch.setattr(browser_daemon, "_port_in_use", lambda _port: False)
+        return spawned
+
+    def test_reuses_healthy_daemon(self, monkeypatch, tmp_path):
+        """Test that a healthy daemon is reused and leases are counted."""
+        spawned = self._setup(monkeypatch, tmp_path, set())
+
+        first = ensure_daemon()
+        second = ensure_daemon()
+
+        assert spawned == [browser_daemon.DAEMON_BASE_PORT]
+        assert first.pid == second.pid
+        assert _read_state().leases == 2
+
+    def test_recycles_after_n_leases(self, monkeypatch, tmp_path):
+        """Test that the daemon is replaced on the alternate port after N leases."""
+        spawned = self._setup(monkeypatch, tmp_path, set())
+
+        for _ in range(3):
+            ensure_daemon()
+        state = ensure_daemon()
+
+        base = browser_daemon.DAEMON_BASE_PORT
+        assert spawned == [base, base + 1]
+        assert state.port == base + 1
+        assert state.leases == 1
+        assert [r["port"] for r in state.retired] == [base]
+
+    def test_restarts_unhealthy_daemon(self, monkeypatch, tmp_path):
+        """Test that a dead daemon recorded in the state file is replaced."""
+        spawned = self._setup(monkeypatch, tmp_path, set())
+        _write_state(DaemonState(pid=42, port=9999, executable="", leases=1))
+
+        state = ensure_daemon()
+
+        assert spawned == [browser_daemon.DAEMON_BASE_PORT]
+        assert state.pid != 42
+        assert state.retired == []
+
+    def test_skips_ports_of_retired_daemons(self, monkeypatch, tmp_path):
+        """Test that a new daemon never reuses a port still held by a retired one."""
+        base = browser_daemon.DAEMON_BASE_PORT
+        spawned = self._setup(monkeypatch, tmp_path, {base, base + 1, base + 2})
+        now = time.time()
+        _write_state(DaemonState(
+            pid=1, port=base + 1, executable="", leases=3,
+            retired=[{"pid": 2, "port": base, "retired_at": now}, {"pid": 3, "port": base + 2, "retired_at": now}],
+        ))
+
+        state = ensure_daemon()
+
+        assert spawned == [base + 3]
+        assert sorted(r["port"] for r in state.retired) == [base, base + 1, base + 2]
+
+    def test_concurrent_callers_spawn_once(self, monkeypatch, tmp_path):
+        """Test that the file lock serializes callers: one spawn and every lease counted."""
+        healthy = set()
+        spawned = self._setup(monkeypatch, tmp_path, healthy)
+
+        def slow_health(port, **_):
+            time.sleep(0.01)
+            return port in healthy
+
+        monkeypatch.setattr(browser_daemon, "is_healthy", slow_health)
+        threads = [threading.Thread(target=ensure_daemon) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert spawned == [browser_daemon.DAEMON_BASE_PORT]
+        assert _read_state().leases == 3
+
+
+class TestReapRetired:
+    """Tests for killing retired daemons after the grace period."""
+
+    def _retired(self, monkeypatch, pages):
+        killed = []
+        monkeypatch.setattr(browser_daemon, "_kill", killed.append)
+        monkeypatch.setattr(browser_daemon, "is_healthy", lambda _port, **_: True)
+        monkeypatch.setattr(browser_daemon, "_open_pages", lambda _port, **_: pages)
+        old = time.time() - browser_daemon.DAEMON_GRACE_SEC - 1
+        return DaemonState(retired=[{"pid": 7, "port": 9400, "retired_at": old}]), killed
+
+    def test_keeps_daemon_with_open_pages(self, monkeypatch):
+        """Test that a retired daemon past the grace period survives while a batch still has pages open."""
+        state, killed = self._retired(monkeypatch, pages=3)
+
+        browser_daemon._reap_retired(state)
+
+        assert killed == []
+        assert len(state.retired) == 1
+
+    def test_kills_idle_daemon(self, monkeypatch):
+        """Test that a retired daemon with only its initial page is killed after the grace period."""
+        state, killed = self._retired(monkeypatch, pages=1)
+
+        browser_daemon._reap_retired(state)
+
+        assert killed == [7]
+        assert state.retired == []
+
+
+class TestDaemonDisabled:
+    """Tests for the opt-in switch."""
+
+    def test_connect_returns_none_when_disabled(self, monkeypatch):
+        """Test that callers fall back to their own launch when the daemon is off."""
+        monkeypatch.delenv("DOU_BROWSER_DAEMON", raising=False)
+        assert browser_daemon.connect_daemon_browser(object()) is None
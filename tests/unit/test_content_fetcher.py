@@ -0,0 +1,239 @@
+"""Unit tests for dou_utils.content_fetcher module.
+
+Tests for Fetcher.fetch_html over the pooled HTTP session: memory/disk cache
+semantics, force_refresh, HTTP errors and pool sizing for enrichment threads.
+"""
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.content_fetcher import Fetcher
+
+HTML = "<html><body><article><p>Texto do ato publicado.</p></article></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, text, status=200, headers=None):
+        self.content = text.encode("utf-8")
+        self.status_code = status
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeClient:
+    def __init__(self, text=HTML, status=200, etag=None):
+        self.text = text
+        self.status = status
+        self.etag = etag
+        self.calls = []
+        self.sent_headers = []
+
+    def get(self, url, timeout_sec=None, headers=None):
+        self.calls.append(url)
+        self.sent_headers.append(headers or {})
+        if self.etag and (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse("", 304)
+        return FakeResponse(self.text, self.status, {"ETag": self.etag} if self.etag else None)
+
+
+URL = "https://www.in.gov.br/web/dou/-/portaria-n-1-1"
+
+
+class TestFetchHtml:
+    """Tests for Fetcher.fetch_html."""
+
+    def test_cache_avoids_second_get(self, tmp_path):
+        """Test that a fetched page is served from memory and then from disk by a new Fetcher."""
+        client = FakeClient()
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client)
+
+        assert f.fetch_html(URL) == HTML
+        assert f.fetch_html(URL) == HTML
+        assert Fetcher(cache_dir=str(tmp_path), http_client=client).fetch_html(URL) == HTML
+        assert len(client.calls) == 1
+
+    def test_force_refresh_revalidates_with_etag(self, tmp_path):
+        """Test that force_refresh sends a conditional GET once per Fetcher and a 304 keeps the cached page."""
+        client = FakeClient(etag='"v1"')
+        Fetcher(cache_dir=str(tmp_path), http_client=client).fetch_html(URL)
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client, force_refresh=True)
+
+        assert f.fetch_html(URL) == HTML
+        assert f.fetch_html(URL) == HTML
+        assert len(client.calls) == 2
+        assert client.sent_headers[1] == {"If-None-Match": '"v1"'}
+        assert f.cache_stats["not_modified"] == 1
+
+    def test_ttl_expires_mutable_urls_only(self, tmp_path):
+        """Test that entries past the TTL are refetched, except immutable act pages."""
+        client = FakeClient()
+        other = "https://www.in.gov.br/leiturajornal?data=02-01-2025"
+        Fetcher(cache_dir=str(tmp_path), http_client=client).fetch_html(URL)
+        Fetcher(cache_dir=str(tmp_path), http_client=client).fetch_html(other)
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client, cache_ttl_sec=1e-9)
+        f.fetch_html(URL)
+        f.fetch_html(other)
+
+        assert client.calls == [URL, other, other]
+
+    def test_network_error_serves_stale_entry(self, tmp_path):
+        """Test that a failed revalidation returns the cached page instead of ""."""
+        Fetcher(cache_dir=str(tmp_path), http_client=FakeClient()).fetch_html(URL)
+        f = Fetcher(cache_dir=str(tmp_path), http_client=FakeClient(status=503), force_refresh=True)
+
+        assert f.fetch_html(URL) == HTML
+        assert f.cache_stats["stale_served"] == 1
+
+    def test_http_error_returns_empty(self, tmp_path):
+        """Test that an HTTP error status without a cached page yields "" and nothing is cached."""
+        f = Fetcher(cache_dir=str(tmp_path), http_client=FakeClient(status=404))
+
+        assert f.fetch_html(URL) == ""
+        assert not list(tmp_path.iterdir())
+
+
+class TestPoolSizing:
+    """Tests for the per-Fetcher session sizing."""
+
+    def test_pool_grows_with_max_workers(self, tmp_path, monkeypatch):
+        """Test that enrich_items recreates the own session when max_workers exceeds the pool."""
+        created = []
+
+        class Pooled(FakeClient):
+            def __init__(self, pool_maxsize, timeout_sec):
+                super().__init__()
+                created.append(pool_maxsize)
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr("dou_utils.http_client.PooledHttpClient", Pooled)
+        monkeypatch.setattr("dou_utils.http_client.POOL_MAXSIZE", 4)
+        f = Fetcher(cache_dir=str(tmp_path), pool_maxsize=2)
+        f.fetch_html(URL)
+        items = [{"link": f"/web/dou/-/ato-{i}"} for i in range(3)]
+
+        assert f.enrich_items(items, max_workers=12) == 3
+        assert created == [4, 12]
+        assert items[0]["texto"] == "Texto do ato publicado."
+
+
+class FlakyClient(FakeClient):
+    """Fails the first ``failures`` GETs of each URL."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def get(self, url, timeout_sec=None, headers=None):
+        self.calls.append(url)
+        if self.calls.count(url) <= self.failures:
+            return FakeResponse("", status=503)
+        return FakeResponse(self.text)
+
+
+class TestEnrichItemsAsync:
+    """Tests for Fetcher.enrich_items_async."""
+
+    def test_fills_items_and_streams_results(self, tmp_path):
+        """Test that duplicate URLs are fetched once and each result is reported as it completes."""
+        client = FakeClient()
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client)
+        items = [{"link": f"/web/dou/-/ato-{i % 3}"} for i in range(6)] + [{"link": "x", "texto": "ok"}]
+        seen = []
+
+        updated = f.enrich_items_async(items, max_workers=4, host_rps=0, on_result=lambda u, _t: seen.append(u))
+
+        assert updated == 6
+        assert len(client.calls) == 3
+        assert sorted(seen) == sorted(set(client.calls))
+        assert items[5]["texto"] == "Texto do ato publicado."
+
+    def test_retries_failed_gets(self, tmp_path, monkeypatch):
+        """Test that a failed GET is retried (with backoff) up to ``retries`` times."""
+        monkeypatch.setattr("dou_utils.content_fetcher.ENRICH_BACKOFF_SEC", 0.0)
+        client = FlakyClient(failures=2)
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client)
+
+        assert f.enrich_items_async([{"link": URL}], host_rps=0, retries=1) == 0
+        assert f.enrich_items_async([{"link": URL}], host_rps=0, retries=2) == 1
+
+    def test_own_session_has_no_inner_retry(self, tmp_path, monkeypatch):
+        """Test that async mode GETs through a session without urllib3 retries (one request per attempt)."""
+        created = []
+
+        class Pooled(FlakyClient):
+            def __init__(self, pool_maxsize, timeout_sec, retries=2):
+                super().__init__(failures=1)
+                created.append(retries)
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr("dou_utils.http_client.PooledHttpClient", Pooled)
+        monkeypatch.setattr("dou_utils.content_fetcher.ENRICH_BACKOFF_SEC", 0.0)
+        f = Fetcher(cache_dir=str(tmp_path))
+
+        assert f.enrich_items_async([{"link": URL}], host_rps=0, retries=1) == 1
+        assert created == [0]
+
+    def test_cache_hits_skip_rate_limit(self, tmp_path):
+        """Test that cached pages are served without touching the network or the host limiter."""
+        client = FakeClient()
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client)
+        f.fetch_html(URL)
+
+        assert f.enrich_items_async([{"link": URL}], host_rps=0.001) == 1
+        assert len(client.calls) == 1
+
+
+class TestBrowserFallback:
+    """Tests for the Fetcher browser fallback."""
+
+    def test_one_visit_per_short_url(self, tmp_path, monkeypatch):
+        """Test that a short HTTP body triggers a single browser visit per URL."""
+        visits = []
+
+        def _visit(self, url, want_html):
+            visits.append(url)
+            return "", "<html><body><article><p>" + "Texto longo. " * 100 + "</p></article></body></html>"
+
+        monkeypatch.setattr(Fetcher, "_browser_visit", _visit)
+        f = Fetcher(cache_dir=str(tmp_path), http_client=FakeClient(), use_browser_if_short=True)
+        items = [{"link": URL}]
+
+        assert f.enrich_items(items, max_workers=2) == 1
+        assert visits == [URL]
+        assert items[0]["texto"].startswith("Texto longo.")
+
+
+class TestTextCache:
+    """Tests for the extracted-text cache tier."""
+
+    def test_warm_cache_skips_html(self, tmp_path, monkeypatch):
+        """Test that a warm entry returns text without reading or parsing the HTML."""
+        Fetcher(cache_dir=str(tmp_path), http_client=FakeClient()).fetch_text(URL)
+
+        def _fail(*_a):
+            raise AssertionError("HTML read or parsed")
+
+        monkeypatch.setattr(Fetcher, "_read_cache_file", _fail)
+        monkeypatch.setattr(Fetcher, "extract_text_from_html", staticmethod(_fail))
+        f = Fetcher(cache_dir=str(tmp_path), http_client=FakeClient())
+
+        assert f.fetch_text(URL) == "Texto do ato publicado."
+        assert f.cache_stats["text_hits"] == 1
+
+    def test_extractor_change_invalidates(self, tmp_path, monkeypatch):
+        """Test that a different extractor key re-extracts from the cached HTML."""
+        client = FakeClient()
+        Fetcher(cache_dir=str(tmp_path), http_client=client).fetch_text(URL)
+        monkeypatch.setattr("dou_utils.content_fetcher.EXTRACTOR_KEY", "changed")
+        f = Fetcher(cache_dir=str(tmp_path), http_client=client)
+
+        assert f.fetch_text(URL) == "Texto do ato publicado."
+        assert f.cache_stats["text_extracted"] == 1
+        assert len(client.calls) == 1
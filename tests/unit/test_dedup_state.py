@@ -0,0 +1,90 @@
+"""Unit tests for dou_utils.dedup_state module.
+
+Tests for the URL-level dedup key that lets CascadeService skip items seen
+in previous runs before fetching their detail pages.
+"""
+import json
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.dedup_state import DedupState, url_key
+from dou_utils.models import DetailData
+from dou_utils.services import cascade_service
+from dou_utils.services.cascade_service import CascadeParams, CascadeService
+
+LIST_URL = "https://www.in.gov.br/leiturajornal?data=02-01-2025&secao=do1"
+
+
+class TestUrlKey:
+    """Tests for url_key."""
+
+    def test_dou_slug_ignores_host_locale_and_fragment(self):
+        """Test that the same act under different URL spellings shares one key."""
+        base = url_key("https://www.in.gov.br/web/dou/-/portaria-n-1-de-2025-123")
+
+        assert url_key("https://in.gov.br/en/web/dou/-/Portaria-n-1-de-2025-123/#top") == base
+        assert url_key("https://www.in.gov.br/web/dou/-/portaria-n-2-de-2025-124") != base
+        assert url_key("") is None
+
+    def test_other_urls_use_sorted_query(self):
+        """Test that query order and tracking params do not change the key."""
+        assert url_key("https://x.gov.br/a?b=2&a=1&utm_source=mail") == url_key("https://x.gov.br/a?a=1&b=2")
+
+
+class TestDedupState:
+    """Tests for persisted hash + URL keys."""
+
+    def test_url_keys_persist_and_legacy_lines_load(self, tmp_path):
+        """Test that URL keys survive a reload next to hash-only legacy lines."""
+        path = tmp_path / "state.jsonl"
+        path.write_text(json.dumps({"hash": "old"}) + "\n", encoding="utf-8")
+        state = DedupState(path)
+        state.add("new", url="u1")
+        # Hash já conhecido + URL nova: grava só para completar a chave de URL
+        state.add("old", url="u0")
+        state.add("old", url="u0")
+
+        reloaded = DedupState(path)
+        assert reloaded.has("old") and reloaded.has("new")
+        assert reloaded.has_url("u0") and reloaded.has_url("u1")
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+class FakePage:
+    url = LIST_URL
+
+
+def _params(state_file, parallel):
+    return CascadeParams(
+        url=LIST_URL, date="2025-01-02", secao="DO1", query=None, max_links=10, scrape_detail=True,
+        detail_timeout=5_000, parallel=parallel, dedup_state_file=state_file,
+    )
+
+
+class TestDedupBeforeFetch:
+    """Tests for CascadeService skipping seen URLs before navigation."""
+
+    @pytest.mark.parametrize("parallel", [1, 2])
+    def test_second_run_does_not_fetch_seen_items(self, tmp_path, monkeypatch, parallel):
+        """Test that a re-run of the same items opens no detail page."""
+        fetched = []
+
+        def fake_browser(_context, url, **_kw):
+            fetched.append(url)
+            return DetailData(detail_url=url, titulo=url.rsplit("-", 1)[-1], meta={"hash": "h" + url})
+
+        monkeypatch.setattr(cascade_service, "scrape_detail_structured", fake_browser)
+        items = [{"link": "/web/dou/-/ato-1"}, {"link": "/web/dou/-/ato-2"}, {"link": "/web/dou/-/ato-1"}]
+        state_file = str(tmp_path / "state.jsonl")
+
+        first = CascadeService(None, FakePage(), None).run(list(items), _params(state_file, parallel))
+        assert len(fetched) == 2
+        assert first["stats"]["dedupSkippedBeforeFetch"] == 1
+        assert len(first["itens"]) == 2
+
+        second = CascadeService(None, FakePage(), None).run(list(items), _params(state_file, parallel))
+        assert len(fetched) == 2
+        assert second["stats"]["dedupSkippedBeforeFetch"] == 3
+        assert second["itens"] == []
@@ -0,0 +1,149 @@
+"""Unit tests for dou_utils.detail_http and dou_utils.html_lite modules.
+
+Tests for the browserless detail backend: static DOM selectors, field
+extraction parity with DETAIL_EXTRACT_JS and backend selection in
+CascadeService.
+"""
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.detail_http import extract_raw_from_html, parse_detail_html
+from dou_utils.html_lite import parse_html
+from dou_utils.models import DetailData
+from dou_utils.services import cascade_service
+from dou_utils.services.cascade_service import CascadeParams, CascadeService
+
+URL = "https://www.in.gov.br/web/dou/-/portaria-1"
+
+DETAIL_HTML = """<!DOCTYPE html><html><head><title>Fallback</title>
+<meta property="og:title" content="PORTARIA Nº 1, DE 2 DE JANEIRO DE 2025">
+<meta name="dc.subject" content="DO1">
+<meta property="article:published_time" content="2025-01-02">
+<script>var tpl = "<p>não é parágrafo</p>";</script></head>
+<body><nav><a href="/leiturajornal?secao=DO1">DO1</a></nav>
+<article>
+  <dl><dt>Órgão:</dt><dd> Ministério da Fazenda </dd><dt>Tipo do Ato</dt><dd>Portaria</dd></dl>
+  <div class="texto"><p>Dispõe sobre algo.<p>Art. 1º Fica &amp; estabelecido.</p></div>
+  <span>Edição: 1 | Seção: 1 | Página: 23</span>
+  <a href="/pdf/ato.pdf">PDF</a>
+</article></body></html>"""
+
+
+class TestHtmlLite:
+    """Tests for the static DOM."""
+
+    def test_selectors_and_implied_end_tags(self):
+        """Test descendant/attribute selectors and unclosed <li>/<p> handling."""
+        doc = parse_html("<ul class='a b'><li>1<li>2</ul><p>x<div id=d><a href='/f.pdf?x=1'>y</a></div>")
+
+        assert [n.text() for n in doc.select("ul.b li")] == ["1", "2"]
+        assert doc.select_one("#d a[href*='.pdf?']").get("href") == "/f.pdf?x=1"
+        assert doc.select_one("p").text() == "x"
+
+    def test_hidden_ancestors_are_not_visible(self):
+        """Test that hidden attributes and inline display:none hide descendants."""
+        doc = parse_html("<div style='display: none'><span>a</span></div><div hidden><b>b</b></div><i>c</i>")
+
+        assert [n.is_visible() for n in doc.select("span, b, i")] == [False, False, True]
+
+
+class TestHttpExtraction:
+    """Tests for extract_raw_from_html / parse_detail_html."""
+
+    def test_raw_fields_match_browser_extractor_shape(self):
+        """Test that the static extractor returns the DETAIL_EXTRACT_JS fields."""
+        raw = extract_raw_from_html(DETAIL_HTML, advanced=True)
+
+        assert raw["title"] == "PORTARIA Nº 1, DE 2 DE JANEIRO DE 2025"
+        assert (raw["orgao"], raw["tipo"], raw["secaoLink"]) == ("Ministério da Fazenda", "Portaria", "DO1")
+        assert raw["paragraphs"] == ["Dispõe sobre algo.", "Art. 1º Fica & estabelecido."]
+        assert raw["pdf"] == "/pdf/ato.pdf"
+        assert raw["meta"]["meta[name='dc.subject']"] == "DO1"
+
+    def test_detail_data_is_filled_like_browser_backend(self):
+        """Test that the HTML backend goes through the same fill_detail."""
+        detail = parse_detail_html(DETAIL_HTML, URL, fallback_date="2025-01-03")
+
+        assert detail.data_publicacao.date().isoformat() == "2025-01-02"
+        assert detail.texto == "Dispõe sobre algo. Art. 1º Fica & estabelecido."
+        assert detail.pdf_url == "https://www.in.gov.br/pdf/ato.pdf"
+        assert (detail.edicao, detail.pagina) == ("1", "23")
+        assert detail.meta["data_publicacao_fallback"] is False
+        assert "hash" in detail.meta
+
+
+class FakeClient:
+    def __init__(self, html=DETAIL_HTML, fail=False):
+        self.html = html
+        self.fail = fail
+        self.urls = []
+
+    def get_text(self, url, timeout_sec=None):
+        self.urls.append(url)
+        if self.fail:
+            raise OSError("connection reset")
+        return url, self.html
+
+
+class FakePage:
+    url = "https://www.in.gov.br/leiturajornal?data=02-01-2025&secao=do1"
+
+
+def _params(backend, parallel=1):
+    return CascadeParams(
+        url=FakePage.url, date="2025-01-02", secao="DO1", query=None, max_links=10,
+        scrape_detail=True, detail_timeout=5_000, parallel=parallel, detail_backend=backend,
+    )
+
+
+@pytest.fixture
+def browser_calls(monkeypatch):
+    calls = []
+
+    def fake_browser(_context, url, **_kw):
+        calls.append(url)
+        return DetailData(detail_url=url, titulo="via browser", texto="x" * 500, meta={"hash": "b" + url})
+
+    monkeypatch.setattr(cascade_service, "scrape_detail_structured", fake_browser)
+    return calls
+
+
+class TestDetailBackends:
+    """Tests for CascadeService backend selection."""
+
+    ITEMS = [{"link": "/web/dou/-/portaria-1"}, {"link": "/web/dou/-/portaria-2"}]
+
+    @pytest.mark.parametrize("parallel", [1, 2])
+    def test_http_backend_never_opens_pages(self, browser_calls, parallel):
+        """Test that the http backend parses every item without the browser."""
+        client = FakeClient()
+        svc = CascadeService(None, FakePage(), None, http_client=client)
+        out = svc.run(list(self.ITEMS), _params("http", parallel))
+
+        assert browser_calls == []
+        assert len(client.urls) == 2
+        assert {it["orgao"] for it in out["itens"]} == {"Ministério da Fazenda"}
+        assert out["stats"]["detailBackendCounts"]["http"] == 2
+
+    def test_short_or_failed_http_falls_back_to_browser(self, browser_calls):
+        """Test that http-then-browser-if-short retries short texts in the browser."""
+        short = FakeClient(html="<html><body><article><p>curto</p></article></body></html>")
+        svc = CascadeService(None, FakePage(), None, http_client=short)
+        out = svc.run(list(self.ITEMS), _params("http-then-browser-if-short"))
+
+        assert len(browser_calls) == 2
+        assert {it["titulo"] for it in out["itens"]} == {"via browser"}
+        assert out["stats"]["detailBackendCounts"]["browser_fallback"] == 2
+
+        failing = CascadeService(None, FakePage(), None, http_client=FakeClient(fail=True))
+        out = failing.run(list(self.ITEMS), _params("http"))
+        assert out["stats"]["detailFailures"] == 2
+
+    def test_unknown_backend_uses_browser(self, browser_calls):
+        """Test that an invalid backend name keeps the default browser path."""
+        svc = CascadeService(None, FakePage(), None, http_client=FakeClient())
+        out = svc.run(list(self.ITEMS), _params("chromium"))
+
+        assert out["stats"]["detailBackend"] == "browser"
+        assert len(browser_calls) == 2
@@ -0,0 +1,122 @@
+"""Unit tests for dou_utils.detail_utils module.
+
+Tests for the single-evaluate detail extractor and its locator fallback.
+"""
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils import detail_utils
+from dou_utils.detail_utils import DETAIL_EXTRACT_JS, scrape_detail_structured
+from dou_utils.page_pool import get_page_pool
+
+RAW = {
+    "title": "PORTARIA Nº 1, DE 2 DE JANEIRO DE 2025",
+    "pub": "02/01/2025",
+    "orgao": "Ministério da Fazenda",
+    "tipo": "Portaria",
+    "secaoLink": None,
+    "ementa": "Dispõe sobre algo.",
+    "paragraphs": ["Dispõe sobre algo.", "Art. 1º Fica estabelecido."],
+    "pdf": "/pdf/ato.pdf",
+    "pdfCertificada": None,
+    "bodyText": "Edição: 1 | Seção: 1 | Página: 23",
+    "meta": {"meta[name='dc.subject']": "DO1", "meta[property='og:title']": "PORTARIA Nº 1"},
+}
+
+
+class FakePage:
+    url = "https://www.in.gov.br/web/dou/-/portaria-1"
+
+    def __init__(self, raw=None, fail=False):
+        self.raw = raw
+        self.fail = fail
+        self.evaluations = 0
+        self.closed = False
+
+    def set_default_timeout(self, _ms):
+        pass
+
+    def goto(self, _url, wait_until=None):
+        pass
+
+    def wait_for_function(self, _script, timeout=None):
+        pass
+
+    def evaluate(self, script, arg=None):
+        assert script == DETAIL_EXTRACT_JS
+        self.evaluations += 1
+        if self.fail:
+            raise RuntimeError("evaluate blocked")
+        return self.raw
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.page = page
+
+    def new_page(self):
+        return self.page
+
+
+class TestDetailExtraction:
+    """Tests for scrape_detail_structured."""
+
+    def test_single_evaluate_fills_detail(self):
+        """Test that one evaluate call produces the whole DetailData."""
+        page = FakePage(RAW)
+        detail = scrape_detail_structured(FakeContext(page), page.url, advanced=True)
+
+        assert page.evaluations == 1
+        assert detail.titulo == RAW["title"]
+        assert detail.data_publicacao.date().isoformat() == "2025-01-02"
+        assert (detail.orgao, detail.tipo_ato, detail.secao) == ("Ministério da Fazenda", "Portaria", "DO1")
+        assert detail.texto == "Dispõe sobre algo. Art. 1º Fica estabelecido."
+        assert detail.pdf_url == "https://www.in.gov.br/pdf/ato.pdf"
+        assert (detail.edicao, detail.pagina) == ("1", "23")
+        assert detail.meta["data_publicacao_fallback"] is False
+        assert "hash" in detail.meta
+
+    def test_locator_fallback_when_evaluate_fails(self, monkeypatch):
+        """Test that the locator path is used when the evaluate round trip fails."""
+        calls = []
+
+        def fake_locators(page, advanced, capture_meta):
+            calls.append((advanced, capture_meta))
+            return {**RAW, "pub": None}
+
+        monkeypatch.setattr(detail_utils, "_raw_with_locators", fake_locators)
+        page = FakePage(fail=True)
+        detail = scrape_detail_structured(FakeContext(page), page.url, fallback_date="2025-01-03")
+
+        assert calls == [(False, True)]
+        assert detail.data_publicacao.date().isoformat() == "2025-01-03"
+        assert detail.meta["data_publicacao_fallback"] is True
+        # dc.subject only fills the seção in advanced mode
+        assert detail.secao is None
+
+    def test_exhausted_pool_falls_back_to_standalone_page(self, monkeypatch):
+        """Test that a full page pool yields a standalone page (closed afterwards) instead of blocking."""
+        class PagesContext:
+            def __init__(self):
+                self.pages = []
+
+            def new_page(self):
+                self.pages.append(FakePage(RAW))
+                return self.pages[-1]
+
+        ctx = PagesContext()
+        pool = get_page_pool(ctx)
+        held = [pool.acquire() for _ in range(pool.size)]
+        monkeypatch.setattr(detail_utils, "PAGE_ACQUIRE_TIMEOUT_SEC", 0.05)
+
+        detail = scrape_detail_structured(ctx, FakePage.url)
+
+        assert detail.titulo == RAW["title"]
+        standalone = ctx.pages[-1]
+        assert standalone not in held
+        assert standalone.closed
+        assert pool.stats["created"] == len(held)
@@ -0,0 +1,142 @@
+"""Unit tests for dou_snaptrack.ui.collectors.dou_helpers module.
+
+Tests for streaming job outputs, the NDJSON run journal and the per-worker
+edition page cache.
+"""
+import asyncio
+import json
+from dataclasses import dataclass, field
+
+from dou_snaptrack.ui.collectors.dou_helpers import (
+    EditionPageCache,
+    RunJournal,
+    read_journal,
+    report_from_journal,
+    summarize_job,
+    write_job_output,
+)
+
+
+@dataclass
+class FakeJobResult:
+    job_id: str
+    job_index: int
+    success: bool
+    items: list = field(default_factory=list)
+    elapsed: float = 1.0
+    error: str | None = None
+    timings: dict = field(default_factory=dict)
+    date: str = "01/02/2025"
+    secao: str = "DO1"
+    key1: str = "Ministério X"
+    key2: str = "Todos"
+    topic: str = "mx"
+
+    @property
+    def item_count(self):
+        return len(self.items)
+
+
+class TestRunJournal:
+    """Tests for the append-only run journal."""
+
+    def test_report_built_from_journal(self, tmp_path):
+        """Test that outputs are written per job and the report comes from the journal."""
+        ok = FakeJobResult("a", 1, True, items=[{"link": "x"}, {"link": "y"}])
+        fail = FakeJobResult("b", 2, False, error="boom")
+        journal = RunJournal(tmp_path / "journal.ndjson")
+        journal.start(3)
+        output = write_job_output(ok, str(tmp_path), "{topic}_{secao}_{date}_{idx}.json")
+        journal.record_job(summarize_job(ok, output))
+        journal.record_job(summarize_job(fail))
+        journal.close(ok=1)
+
+        assert json.loads((tmp_path / "mx_DO1_01-02-2025_1.json").read_text(encoding="utf-8"))["total"] == 2
+
+        report = report_from_journal(journal.path, elapsed=3.0)
+        assert (report["ok"], report["fail"], report["items_total"]) == (1, 1, 2)
+        assert report["outputs"] == [output]
+        assert report["metrics"]["jobs"][0]["items"] == 2
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        """Test that a journal cut mid-write (killed process) still yields finished jobs."""
+        journal = RunJournal(tmp_path / "journal.ndjson")
+        journal.record_job(summarize_job(FakeJobResult("a", 1, True, items=[{}])))
+        journal._fh.write('{"event": "job", "job_id": "b", "job_in')
+        journal._fh.flush()
+
+        entries = read_journal(journal.path)
+        assert [e.job_id for e in entries] == ["a"]
+        assert entries[0].item_count == 1
+
+    def test_new_run_appends_and_readers_see_only_it(self, tmp_path):
+        """Test that a new run keeps the previous journal on disk but reads only its own section."""
+        path = tmp_path / "journal.ndjson"
+        first = RunJournal(path)
+        first.start(2)
+        first.record_job(summarize_job(FakeJobResult("a", 1, True, items=[{}])))
+        first._fh.write('{"event": "job", "job_id": "b", "job_in')
+        first._fh.close()
+
+        second = RunJournal(path)
+        second.start(1)
+        second.record_job(summarize_job(FakeJobResult("c", 2, True, items=[{}, {}])))
+        second.close()
+
+        assert [e.job_id for e in read_journal(path)] == ["c"]
+        text = path.read_text(encoding="utf-8")
+        assert '"job_id": "a"' in text
+        assert text.count('"event": "start"') == 2
+
+    def test_missing_journal(self, tmp_path):
+        """Test that a missing journal yields no report."""
+        assert report_from_journal(tmp_path / "nope.ndjson") is None
+
+
+class FakeAsyncPage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncContext:
+    def __init__(self):
+        self.created = []
+
+    async def new_page(self):
+        self.created.append(FakeAsyncPage())
+        return self.created[-1]
+
+
+class TestEditionPageCache:
+    """Tests for page recycling in EditionPageCache."""
+
+    def test_page_recycled_after_max_uses_and_on_crash(self):
+        """Test that worn-out or crashed pages are replaced and lose their warm state."""
+        ctx = FakeAsyncContext()
+        cache = EditionPageCache(ctx, FakeAsyncPage(), max_pages=1, max_uses=2)
+        edition = ("01-02-2025", "DO1")
+
+        async def scenario():
+            first, warm = await cache.acquire(edition)
+            cache.release(edition, True)
+            again, warm_again = await cache.acquire(edition)
+            cache.release(edition, True)
+            assert (again, warm, warm_again) == (first, False, True)
+
+            fresh, warm = await cache.acquire(edition)
+            assert fresh is not first and first.closed and not warm
+            cache.release(edition, True)
+
+            fresh.closed = True  # renderer crash
+            replaced, warm = await cache.acquire(edition)
+            assert replaced is not fresh and not warm
+
+        asyncio.run(scenario())
+        assert (cache.stats["recycled"], cache.stats["crashed"]) == (1, 1)
+        assert len(ctx.created) == 2
@@ -0,0 +1,146 @@
+"""Unit tests for dou_snaptrack.ui.collectors.dou_parallel module.
+
+Tests for collect_dou_job on warm (reused) edition pages: links left over from
+the previous job's selection must not be collected for the next job, and pages
+that filter their listing in place must not turn into empty results.
+"""
+import asyncio
+
+import pytest
+
+from dou_snaptrack.ui.collectors import dou_parallel
+from dou_snaptrack.ui.collectors.dou_parallel import (
+    ANCHOR_SELECTOR,
+    COLLECT_LINKS_JS,
+    COUNT_ANCHORS_JS,
+    FRESH_ANCHOR_SELECTOR,
+    RESET_LISTING_JS,
+    SELECTED_LABEL_JS,
+    STALE_ANCHOR_SELECTOR,
+    collect_dou_job,
+)
+
+ATO_A = "https://www.in.gov.br/web/dou/-/ato-a"
+ATO_B = "https://www.in.gov.br/web/dou/-/ato-b"
+
+
+class FakeListingPage:
+    """Edition page whose listing gets new anchors appended by ``select_option`` per órgão."""
+
+    def __init__(self, acts_by_key1):
+        self.acts_by_key1 = acts_by_key1
+        # [href, stale, key1]
+        self.anchors: list[list] = []
+        self.selected = ""
+        self.gotos = 0
+
+    async def goto(self, _url, **_kw):
+        self.gotos += 1
+        self.anchors = []
+        self.selected = ""
+
+    async def query_selector_all(self, _selector):
+        return ["select"]
+
+    async def select_option(self, _selector, label=None, **_kw):
+        self.selected = label
+        for href in self.acts_by_key1.get(label, []):
+            self.anchors.append([href, False, label])
+
+    def visible(self):
+        return self.anchors
+
+    def matching(self, selector):
+        if selector == FRESH_ANCHOR_SELECTOR:
+            return [a for a in self.visible() if not a[1]]
+        if selector == STALE_ANCHOR_SELECTOR:
+            return [a for a in self.anchors if a[1]]
+        assert selector == ANCHOR_SELECTOR
+        return self.visible()
+
+    async def wait_for_selector(self, selector, timeout=None):
+        if selector != "select" and not self.matching(selector):
+            raise TimeoutError(f"{selector} not found in {timeout}ms")
+
+    async def evaluate(self, script, arg=None):
+        if script == RESET_LISTING_JS:
+            for anchor in self.anchors:
+                anchor[1] = True
+            return None
+        if script == SELECTED_LABEL_JS:
+            return self.selected
+        if script == COUNT_ANCHORS_JS:
+            return len(self.matching(arg))
+        assert script == COLLECT_LINKS_JS
+        return [{"link": href, "titulo": href, "detail_url": href} for href, _, _ in self.matching(arg)]
+
+
+class FakeFilteringPage(FakeListingPage):
+    """Edition page that renders every act on load and filters the existing nodes on ``select_option``."""
+
+    async def goto(self, url, **kw):
+        await super().goto(url, **kw)
+        self.anchors = [[href, False, k1] for k1, hrefs in self.acts_by_key1.items() for href in hrefs]
+
+    async def select_option(self, _selector, label=None, **_kw):
+        self.selected = label
+
+    def visible(self):
+        return [a for a in self.anchors if not self.selected or a[2] == self.selected]
+
+
+def _run_jobs(page, *key1s):
+    """Run one cold job and then warm jobs on the same page, one per key1."""
+    job = {"data": "02-01-2025", "secao": "DO1", "key2": "Todos"}
+
+    async def _run():
+        results = []
+        for i, key1 in enumerate(key1s):
+            results.append(await collect_dou_job(page, {**job, "key1": key1}, i + 1, 0, {}, warm=i > 0))
+        return results
+
+    return asyncio.run(_run())
+
+
+@pytest.fixture(autouse=True)
+def _no_listing_watch(monkeypatch):
+    async def _noop(*_a, **_kw):
+        return True
+
+    monkeypatch.setattr(dou_parallel, "arm_listing_watch_async", _noop)
+    monkeypatch.setattr(dou_parallel, "wait_for_listing_stable_async", _noop)
+
+
+class TestCollectDouJobWarmPage:
+    """Tests for collect_dou_job reusing a page already on the edition."""
+
+    def test_stale_links_are_not_collected(self):
+        """Test that a second órgão with no acts yields no items instead of the previous job's links."""
+        page = FakeListingPage({"Ministério A": [ATO_A]})
+
+        first, second = _run_jobs(page, "Ministério A", "Ministério B")
+
+        assert [it["link"] for it in first.items] == [ATO_A]
+        assert second.success is True
+        assert second.items == []
+
+    def test_same_key1_in_a_row_keeps_the_listing(self):
+        """Test that consecutive jobs for the same órgão collect its acts without re-selecting or reloading."""
+        page = FakeFilteringPage({"Ministério A": [ATO_A], "Ministério B": [ATO_B]})
+
+        results = _run_jobs(page, "Ministério A", "Ministério A", "Ministério A")
+
+        assert [[it["link"] for it in r.items] for r in results] == [[ATO_A]] * 3
+        assert page.gotos == 1
+
+    def test_page_filtering_in_place_reloads_instead_of_returning_empty(self):
+        """Test that a selection showing only pre-existing nodes reloads the edition and collects them."""
+        page = FakeFilteringPage({"Ministério A": [ATO_A], "Ministério B": [ATO_B]})
+
+        first, second = _run_jobs(page, "Ministério A", "Ministério B")
+
+        assert [it["link"] for it in first.items] == [ATO_A]
+        assert second.success is True
+        assert [it["link"] for it in second.items] == [ATO_B]
+        assert page.gotos == 2
+        assert "reload" in second.timings
@@ -0,0 +1,274 @@
+"""Unit tests for dou_snaptrack.ui.collectors.dou_scheduler module.
+
+Tests for the work-stealing JobScheduler used by the fast-async collector.
+"""
+import asyncio
+from dataclasses import dataclass
+
+from dou_snaptrack.ui.collectors.dou_scheduler import (
+    ConcurrencyController,
+    JobScheduler,
+    is_congestion_error,
+    job_cost_key,
+    load_cost_hints,
+    update_cost_hints,
+)
+
+
+@dataclass
+class FakeResult:
+    job_index: int
+    success: bool = True
+    worker_id: int = 0
+
+
+def _cost_of(job):
+    return job_cost_key(job.get("secao", "DO1"), job.get("key1", ""), job.get("key2", "Todos"))
+
+
+def _jobs(*keys):
+    return [(i + 1, {"secao": "DO1", "key1": k}) for i, k in enumerate(keys)]
+
+
+async def _drain_order(scheduler):
+    order = []
+    while (item := scheduler.next_job()) is not None:
+        order.append(item[0])
+    return order
+
+
+class TestOrdering:
+    """Tests for longest-expected-first ordering."""
+
+    def test_without_hints_keeps_plan_order(self):
+        """Test that jobs without cost hints keep their original order."""
+        async def run():
+            return await _drain_order(JobScheduler(_jobs("A", "B", "C"), _cost_of))
+
+        assert asyncio.run(run()) == [1, 2, 3]
+
+    def test_hints_put_slowest_first(self):
+        """Test that jobs with larger expected cost are dequeued first."""
+        hints = {_cost_of({"key1": "A"}): 5.0, _cost_of({"key1": "C"}): 60.0}
+
+        async def run():
+            scheduler = JobScheduler(_jobs("A", "B", "C"), _cost_of, hints)
+            return scheduler.stats["cost_hints"], await _drain_order(scheduler)
+
+        known, order = asyncio.run(run())
+        assert known == 2
+        # B has no hint and falls back to the median (32.5s)
+        assert order == [3, 2, 1]
+
+
+class TestWorkStealing:
+    """Tests for shared-queue execution and tail-phase duplication."""
+
+    def test_idle_worker_duplicates_straggler(self):
+        """Test that an idle worker duplicates a slow job and the first success wins."""
+        async def run():
+            scheduler = JobScheduler(_jobs("slow", "fast"), _cost_of, straggler_min_sec=0.05)
+            cancelled = []
+
+            async def job(idx, worker_id):
+                delay = 10 if (idx == 1 and worker_id == 1) else 0.01
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    cancelled.append((idx, worker_id))
+                    raise
+                return FakeResult(idx, worker_id=worker_id)
+
+            async def worker(worker_id):
+                while not scheduler.finished:
+                    item = scheduler.next_job() or scheduler.pick_straggler(worker_id)
+                    if item is None:
+                        await scheduler.wait_for_change(timeout=0.02)
+                        continue
+                    idx, _ = item
+                    await scheduler.run_attempt(idx, worker_id, lambda idx=idx: job(idx, worker_id))
+
+            await asyncio.wait_for(asyncio.gather(worker(1), worker(2)), timeout=5)
+            return scheduler, cancelled
+
+        scheduler, cancelled = asyncio.run(run())
+        assert sorted(scheduler.results) == [1, 2]
+        assert scheduler.results[1].worker_id == 2
+        assert scheduler.stats["duplicated"] == 1
+        assert scheduler.stats["duplicate_wins"] == 1
+        assert cancelled == [(1, 1)]
+
+    def test_failure_recorded_when_no_other_attempt(self):
+        """Test that a failed attempt is recorded when nothing else is running."""
+        async def run():
+            scheduler = JobScheduler(_jobs("A"), _cost_of)
+            idx, _ = scheduler.next_job()
+
+            async def failing():
+                return FakeResult(idx, success=False)
+
+            await scheduler.run_attempt(idx, 1, failing)
+            return scheduler
+
+        scheduler = asyncio.run(run())
+        assert scheduler.finished
+        assert scheduler.results[1].success is False
+
+    def test_on_result_replaces_stored_result(self):
+        """Test that on_result runs once per job and its return value is kept."""
+        async def run():
+            seen = []
+            scheduler = JobScheduler(_jobs("A"), _cost_of, on_result=lambda r: seen.append(r) or "summary")
+            idx, _ = scheduler.next_job()
+
+            async def ok():
+                return FakeResult(idx)
+
+            returned = await scheduler.run_attempt(idx, 1, ok)
+            return scheduler, seen, returned
+
+        scheduler, seen, returned = asyncio.run(run())
+        assert scheduler.results == {1: "summary"}
+        assert seen == [returned]
+
+
+class TestCostHints:
+    """Tests for cost hints persistence."""
+
+    def test_update_and_load_roundtrip(self, tmp_path):
+        """Test that metrics.jobs are folded into the hints file with a moving average."""
+        path = tmp_path / "costs.json"
+        jobs = [{"secao": "DO1", "key1": "Ministério X", "key2": "Todos", "elapsed_sec": 10.0}]
+
+        update_cost_hints(path, jobs)
+        update_cost_hints(path, [{**jobs[0], "elapsed_sec": 20.0}])
+
+        hints = load_cost_hints(path)
+        assert hints == {job_cost_key("DO1", "Ministério X", "Todos"): 15.0}
+
+    def test_load_missing_file(self, tmp_path):
+        """Test that a missing hints file yields no hints."""
+        assert load_cost_hints(tmp_path / "nope.json") == {}
+
+
+class TestEditionAffinity:
+    """Tests for per-edition grouping and warmed page reuse."""
+
+    def test_worker_stays_on_its_edition(self):
+        """Test that next_job prefers the worker's current edition before stealing."""
+        jobs = [
+            (1, {"key1": "A", "data": "01-01-2025"}),
+            (2, {"key1": "B", "data": "02-01-2025"}),
+            (3, {"key1": "C", "data": "01-01-2025"}),
+        ]
+
+        async def run():
+            scheduler = JobScheduler(jobs, _cost_of, group_of=lambda j: j["data"])
+            first = scheduler.next_job()
+            second = scheduler.next_job(prefer=first[1]["data"])
+            third = scheduler.next_job(prefer=first[1]["data"])
+            return scheduler.groups, [first[0], second[0], third[0]]
+
+        groups, order = asyncio.run(run())
+        assert groups == 2
+        assert order == [1, 3, 2]
+
+    def test_edition_page_cache_reuse_and_eviction(self):
+        """Test that pages are warm only after a successful job and LRU-evicted."""
+        from dou_snaptrack.ui.collectors.dou_helpers import EditionPageCache
+
+        class FakeContext:
+            created = 0
+
+            async def new_page(self):
+                FakeContext.created += 1
+                return f"page{FakeContext.created}"
+
+        async def run():
+            cache = EditionPageCache(FakeContext(), "page0", max_pages=2)
+            ed_a, ed_b, ed_c = ("d1", "DO1"), ("d2", "DO1"), ("d3", "DO1")
+
+            page_a, warm = await cache.acquire(ed_a)
+            assert (page_a, warm) == ("page0", False)
+            cache.release(ed_a, warm=True)
+            assert await cache.acquire(ed_a) == ("page0", True)
+
+            page_b, _ = await cache.acquire(ed_b)
+            cache.release(ed_b, warm=False)
+            assert await cache.acquire(ed_b) == (page_b, False)
+
+            # ed_a is least recently used: its page is recycled (cold) for ed_c
+            assert await cache.acquire(ed_c) == ("page0", False)
+            return cache
+
+        cache = asyncio.run(run())
+        assert FakeContext.created == 1
+        assert cache.stats == {"navigations": 4, "reuses": 1}
+        assert cache.editions == [("d2", "DO1"), ("d3", "DO1")]
+
+
+class TestConcurrencyController:
+    """Tests for the AIMD concurrency controller."""
+
+    def test_grows_while_latency_is_flat(self):
+        """Test additive increase after each window of flat latency, up to the cap."""
+        ctl = ConcurrencyController(initial=2, max_level=4, window=2)
+        for _ in range(10):
+            ctl.observe(5.0, success=True)
+
+        assert ctl.level == 4
+        assert ctl.stats["increases"] == 2
+        assert ctl.allows(4) and not ctl.allows(5)
+
+    def test_halves_on_congestion(self):
+        """Test multiplicative decrease on timeouts and navigation retries."""
+        ctl = ConcurrencyController(initial=6, max_level=8)
+        ctl.observe(30.0, success=False, error="Timeout 60000ms exceeded")
+        assert ctl.level == 3
+        ctl.observe(4.0, success=True, retries=1)
+        assert ctl.level == 1
+        ctl.observe(4.0, success=True, retries=1)
+        assert ctl.level == 1
+        assert ctl.stats["congestion_events"] == 3
+        assert ctl.stats["peak"] == 6
+
+    def test_steps_down_when_latency_degrades(self):
+        """Test that a p50 well above the best observed window lowers the level by one."""
+        ctl = ConcurrencyController(initial=3, max_level=3, window=2)
+        ctl.observe(4.0, success=True)
+        ctl.observe(4.0, success=True)
+        ctl.observe(12.0, success=True)
+        ctl.observe(12.0, success=True)
+
+        assert ctl.level == 2
+        assert ctl.stats["history"][-1]["reason"] == "latency_up"
+
+    def test_congestion_classification(self):
+        """Test which error messages count as server congestion."""
+        assert is_congestion_error("net::ERR_HTTP2_PROTOCOL_ERROR at https://www.in.gov.br")
+        assert not is_congestion_error("Nenhum select encontrado")
+        assert not is_congestion_error(None)
+
+
+class TestStreamingInput:
+    """Tests for jobs fed while the scheduler is running."""
+
+    def test_not_finished_until_input_closed(self):
+        """Test that streamed jobs are queued and finished waits for close_input."""
+        async def run():
+            scheduler = JobScheduler(_jobs("A"), _cost_of)
+            scheduler.accepting = True
+            first = await _drain_order(scheduler)
+            scheduler.results[1] = FakeResult(1)
+            waiting = scheduler.finished
+
+            added = scheduler.add_jobs([(2, {"key1": "B"}), (1, {"key1": "A"})])
+            second = await _drain_order(scheduler)
+            scheduler.results[2] = FakeResult(2)
+            scheduler.close_input()
+            return first, waiting, added, second, scheduler
+
+        first, waiting, added, second, scheduler = asyncio.run(run())
+        assert (first, waiting, added, second) == ([1], False, 1, [2])
+        assert scheduler.total == 2
+        assert scheduler.finished
@@ -0,0 +1,153 @@
+"""Unit tests for dou_utils.edition_listing module.
+
+Tests for the HTTP edition listing: parsing the leiturajornal params payload,
+filtering by hierarchy keys, the per-edition cache and the browser fallback.
+"""
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.edition_listing import EditionListingCache, parse_edition_html
+from dou_utils.services.edition_runner_service import EditionRunnerService, EditionRunParams
+
+ACTS = [
+    {"urlTitle": "portaria-n-1-1", "title": "PORTARIA Nº 1", "artType": "Portaria", "numberPage": "10",
+     "editionNumber": "1", "hierarchyList": ["Ministério da Fazenda", "Secretaria do Tesouro Nacional"]},
+    {"urlTitle": "portaria-n-2-2", "title": "PORTARIA Nº 2", "artType": "Portaria", "numberPage": "11",
+     "editionNumber": "1", "hierarchyList": ["Ministério da Fazenda", "Receita Federal"]},
+    {"urlTitle": "resolucao-n-3-3", "title": "RESOLUÇÃO Nº 3", "artType": "Resolução", "numberPage": "12",
+     "editionNumber": "1", "hierarchyStr": "Ministério da Saúde/Anvisa"},
+]
+
+
+def _page(acts=ACTS):
+    payload = json.dumps({"jsonArray": acts, "section": "DO1"}, ensure_ascii=False)
+    return f'<html><body><script id="params" type="application/json">{payload}</script></body></html>'
+
+
+class TestEditionListing:
+    """Tests for parse_edition_html and EditionListing.filter."""
+
+    def test_parses_acts_with_hierarchy(self):
+        """Test that acts become link items and hierarchyStr is used when the list is absent."""
+        listing = parse_edition_html(_page(), "02-01-2025", "DO1")
+
+        assert len(listing.items) == 3
+        assert listing.items[0]["link"] == "https://www.in.gov.br/web/dou/-/portaria-n-1-1"
+        assert listing.options(1) == ["Ministério da Fazenda", "Ministério da Saúde"]
+
+    def test_filter_by_levels(self):
+        """Test key1/key2 filtering, accent-insensitive matching and "Todos"."""
+        listing = parse_edition_html(_page(), "02-01-2025", "DO1")
+
+        assert [it["titulo"] for it in listing.filter("ministerio da fazenda", key2="Todos")] == [
+            "PORTARIA Nº 1", "PORTARIA Nº 2",
+        ]
+        only = listing.filter("Ministério da Fazenda", key2="Receita")
+        assert [it["titulo"] for it in only] == ["PORTARIA Nº 2"]
+        assert only[0]["orgao"] == "Ministério da Fazenda/Receita Federal"
+        assert "hierarquia" not in only[0]
+        assert listing.filter("Saúde")[0]["tipo"] == "Resolução"
+        assert listing.filter("Ministério da Defesa") == []
+        assert listing.filter("123", key1_type="value") is None
+
+    def test_partial_key_takes_first_option_in_edition_order(self):
+        """Test that a key contained in several labels picks the first option, not the alphabetical first."""
+        acts = [
+            {"urlTitle": "ato-1", "title": "ATO 1", "hierarchyList": ["Ministério da Saúde", "Anvisa"]},
+            {"urlTitle": "ato-2", "title": "ATO 2", "hierarchyList": ["Agência Nacional de Saúde Suplementar"]},
+        ]
+        listing = parse_edition_html(_page(acts), "02-01-2025", "DO1")
+
+        assert listing.options(1)[0] == "Ministério da Saúde"
+        assert [it["titulo"] for it in listing.filter("saude")] == ["ATO 1"]
+
+    def test_missing_payload_raises(self):
+        """Test that a page without the params script is rejected."""
+        with pytest.raises(ValueError):
+            parse_edition_html("<html></html>", "02-01-2025", "DO1")
+
+    def test_empty_edition_raises(self):
+        """Test that an edition without acts (not yet published) is rejected instead of answering 0 items."""
+        with pytest.raises(ValueError):
+            parse_edition_html(_page(acts=[]), "02-01-2025", "DO1")
+
+
+class FakeClient:
+    def __init__(self, html):
+        self.html = html
+        self.calls = []
+
+    def get_text(self, url, timeout_sec=None):
+        self.calls.append(url)
+        return url, self.html
+
+
+class TestEditionListingCache:
+    """Tests for EditionListingCache."""
+
+    def test_one_get_per_edition_across_threads(self):
+        """Test that concurrent jobs of one edition share a single download."""
+        client = FakeClient(_page())
+        cache = EditionListingCache(client)
+        threads = [threading.Thread(target=cache.get, args=("02-01-2025", "DO1")) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(client.calls) == 1
+        assert cache.stats == {"fetched": 1, "hits": 7, "snapshot_hits": 0, "failed": 0}
+
+    def test_failure_is_memoized_as_none(self):
+        """Test that a broken page yields None once and is not refetched."""
+        client = FakeClient("<html>sem payload</html>")
+        cache = EditionListingCache(client)
+
+        assert cache.get("02-01-2025", "DO1") is None
+        assert cache.get("02-01-2025", "DO1") is None
+        assert len(client.calls) == 1
+
+
+class TestEditionRunnerHttpListing:
+    """Tests for EditionRunnerService with the HTTP listing."""
+
+    def _params(self, **kw):
+        return EditionRunParams(
+            date="02-01-2025", secao="DO1", key1="Ministério da Fazenda", key1_type="text",
+            key2="Todos", key2_type="text", **kw,
+        )
+
+    def test_answers_without_opening_a_page(self, monkeypatch):
+        """Test that a text-keyed job is answered from the listing with no browser page."""
+        listing = parse_edition_html(_page(), "02-01-2025", "DO1")
+        monkeypatch.setattr(
+            "dou_utils.services.edition_execution_helpers.get_edition_listing", lambda *_a: listing
+        )
+
+        class Context:
+            def route(self, *_a):
+                pass
+
+            def new_page(self):
+                raise AssertionError("browser page opened")
+
+        out = EditionRunnerService(Context()).run(self._params(listing_backend="http"))
+
+        assert out["total"] == 2
+        assert out["itens"][0]["detail_url"] == "https://www.in.gov.br/web/dou/-/portaria-n-1-1"
+        assert out["_timings"]["listing"] == "http"
+
+    def test_browser_backend_skips_listing(self, monkeypatch):
+        """Test that listing_backend="browser" never fetches the edition over HTTP."""
+        monkeypatch.setattr(
+            "dou_utils.services.edition_execution_helpers.get_edition_listing",
+            lambda *_a: pytest.fail("listing fetched"),
+        )
+        from dou_utils.services.edition_execution_helpers import collect_edition_links_http
+
+        assert collect_edition_links_http(self._params(listing_backend="browser")) is None
+        assert collect_edition_links_http(self._params(listing_backend="http", query="licitação")) is None
@@ -0,0 +1,95 @@
+"""Unit tests for dou_utils.edition_snapshot module.
+
+Tests for the on-disk edition snapshots shared by the jobs of a plan: gzip
+round trip, one builder per edition under the file lock.
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.edition_listing import EditionListing, EditionListingCache
+from dou_utils.edition_snapshot import EditionSnapshotStore
+
+ITEMS = [{
+    "titulo": "PORTARIA Nº 1", "link": "https://www.in.gov.br/web/dou/-/portaria-1", "tipo": "Portaria",
+    "hierarquia": ["Ministério da Fazenda", "Receita Federal"],
+}]
+
+
+def _listing():
+    return EditionListing("02-01-2025", "DO1", [dict(it) for it in ITEMS])
+
+
+class TestEditionSnapshotStore:
+    """Tests for EditionSnapshotStore."""
+
+    def test_gzip_round_trip(self, tmp_path):
+        """Test that a saved snapshot is written under _editions and reads back."""
+        store = EditionSnapshotStore(tmp_path)
+        path = store.save(_listing())
+
+        assert path == tmp_path / "_editions" / "02-01-2025_DO1.json.gz"
+        loaded = store.load("02-01-2025", "DO1")
+        assert loaded.items == ITEMS
+        assert loaded.filter("Fazenda")[0]["orgao"] == "Ministério da Fazenda/Receita Federal"
+        assert EditionSnapshotStore(tmp_path, compress=False).load("02-01-2025", "DO1") is not None
+
+    def test_single_builder_under_contention(self, tmp_path):
+        """Test that concurrent stores build the edition once and the rest read the file."""
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.05)
+            return _listing()
+
+        results = []
+
+        def job():
+            results.append(EditionSnapshotStore(tmp_path).get_or_build("02-01-2025", "DO1", build))
+
+        threads = [threading.Thread(target=job) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(builds) == 1
+        assert sorted(built for _, built in results) == [False] * 5 + [True]
+        assert not list((tmp_path / "_editions").glob("*.lock"))
+
+
+class TestListingCacheWithSnapshot:
+    """Tests for EditionListingCache backed by snapshots."""
+
+    def test_other_process_reads_snapshot_without_fetch(self, tmp_path):
+        """Test that a second cache (another process) answers from the snapshot."""
+        EditionSnapshotStore(tmp_path).save(_listing())
+
+        class Client:
+            def get_text(self, *_a, **_kw):
+                raise AssertionError("edition fetched")
+
+        cache = EditionListingCache(Client(), snapshot_dir=str(tmp_path))
+        assert cache.get("02-01-2025", "DO1").items == ITEMS
+        assert cache.stats["snapshot_hits"] == 1
+
+    def test_empty_edition_is_not_snapshotted(self, tmp_path):
+        """Test that an empty jsonArray is not saved and the cache returns None (browser path)."""
+        page = '<script id="params" type="application/json">{"jsonArray": []}</script>'
+
+        class Client:
+            def get_text(self, url, **_kw):
+                return url, page
+
+        cache = EditionListingCache(Client(), snapshot_dir=str(tmp_path))
+
+        assert cache.get("02-01-2025", "DO1") is None
+        assert not list((tmp_path / "_editions").glob("*.json*"))
+        assert not list((tmp_path / "_editions").glob("*.lock"))
+        # Snapshot vazio gravado por uma versão anterior também não responde
+        EditionSnapshotStore(tmp_path).save(EditionListing("02-01-2025", "DO1", []))
+        assert EditionSnapshotStore(tmp_path).load("02-01-2025", "DO1") is None
@@ -0,0 +1,43 @@
+"""Unit tests for dou_utils.file_lock module.
+
+Tests for the inter-process file lock shared by the edition snapshots and the
+browser daemon state: release on exit, timeouts and stale locks.
+"""
+import os
+import time
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.file_lock import FileLock
+
+
+class TestFileLock:
+    """Tests for FileLock."""
+
+    def test_lock_file_removed_on_exit(self, tmp_path):
+        """Test that the sidecar lock file exists only while the lock is held."""
+        lock_path = tmp_path / "sub" / ".state.lock"
+
+        with FileLock(lock_path, timeout_sec=1):
+            assert lock_path.exists()
+        assert not lock_path.exists()
+
+    def test_busy_lock_times_out(self, tmp_path):
+        """Test that a lock held by someone else raises TimeoutError after timeout_sec."""
+        lock_path = tmp_path / ".busy.lock"
+
+        with FileLock(lock_path, timeout_sec=1), pytest.raises(TimeoutError), FileLock(lock_path, timeout_sec=0.2):
+            pass
+
+    def test_stale_lock_is_broken(self, tmp_path):
+        """Test that a lock left by a dead process expires instead of blocking forever."""
+        lock_path = tmp_path / ".stale.lock"
+        lock_path.write_text("{}", encoding="utf-8")
+        old = time.time() - 3600
+        os.utime(lock_path, (old, old))
+
+        with FileLock(lock_path, timeout_sec=2, stale_sec=60):
+            assert lock_path.exists()
+        assert not lock_path.exists()
@@ -0,0 +1,121 @@
+"""Unit tests for dou_utils.page_pool module.
+
+Tests for the per-context detail page pool: reuse with about:blank reset,
+recycling after K uses or on crash, and main-page detection.
+"""
+import threading
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.page_pool import PagePool, get_page_pool, is_pooled_page
+from dou_utils.page_utils import find_best_frame
+
+
+class FakePage:
+    def __init__(self):
+        self.url = ""
+        self.closed = False
+        self.main_frame = object()
+        self.frames = []
+
+    def goto(self, url, **_kw):
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        self.url = url
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+
+class TestPagePool:
+    """Tests for PagePool."""
+
+    def test_pages_are_reused_and_reset(self):
+        """Test that a released page goes back to about:blank and is handed out again."""
+        ctx = FakeContext()
+        pool = PagePool(ctx, size=2, max_uses=10)
+        with pool.page() as page:
+            page.goto("https://www.in.gov.br/web/dou/-/ato-1")
+        with pool.page() as again:
+            assert again is page
+            assert again.url == "about:blank"
+
+        assert len(ctx.pages) == 1
+        assert pool.stats["reused"] == 1
+
+    def test_recycled_after_max_uses_and_on_crash(self):
+        """Test that worn-out and crashed pages are closed and replaced."""
+        ctx = FakeContext()
+        pool = PagePool(ctx, size=1, max_uses=2)
+        first = pool.acquire()
+        pool.release(first)
+        pool.release(pool.acquire())
+        assert first.closed
+
+        second = pool.acquire()
+        assert second is not first
+        second.closed = True  # renderer crash
+        pool.release(second)
+        assert pool.acquire() not in (first, second)
+        assert (pool.stats["recycled"], pool.stats["crashed"]) == (1, 1)
+
+    def test_full_pool_times_out(self):
+        """Test that acquire waits for a free page instead of exceeding size."""
+        pool = PagePool(FakeContext(), size=1)
+        pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+    def test_reset_runs_outside_the_lock(self):
+        """Test that a slow about:blank reset does not block other threads from acquiring pages."""
+        entered, go_on = threading.Event(), threading.Event()
+
+        class SlowResetPage(FakePage):
+            def goto(self, url, **_kw):
+                if url == "about:blank":
+                    entered.set()
+                    go_on.wait(2)
+                super().goto(url)
+
+        class SlowContext(FakeContext):
+            def new_page(self):
+                self.pages.append(SlowResetPage())
+                return self.pages[-1]
+
+        pool = PagePool(SlowContext(), size=2)
+        first = pool.acquire()
+        releaser = threading.Thread(target=pool.release, args=(first,))
+        releaser.start()
+        assert entered.wait(2)
+
+        second = pool.acquire(timeout=0.5)
+        go_on.set()
+        releaser.join()
+
+        assert second is not first
+        assert pool.acquire(timeout=0.5) is first
+
+    def test_pool_attached_to_context_and_ignored_as_main_page(self):
+        """Test one pool per context and that find_best_frame skips pooled pages."""
+        ctx = FakeContext()
+        pool = get_page_pool(ctx, size=2)
+        pool.prewarm()
+        main = ctx.new_page()
+
+        assert get_page_pool(ctx) is pool
+        assert all(is_pooled_page(p) for p in ctx.pages[:2]) and not is_pooled_page(main)
+        assert find_best_frame(ctx) is main.main_frame
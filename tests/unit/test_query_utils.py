@@ -0,0 +1,83 @@
+"""Unit tests for dou_utils.query.utils module.
+
+Tests for collect_links: single-evaluate harvesting in the frame with most
+links, timings and the fallback to the Python scroll loop.
+"""
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.query.helpers import HARVEST_LINKS_JS
+from dou_utils.query.utils import collect_links
+from dou_utils.readiness import LIST_COUNT_JS, ReadyTimings
+
+ITEMS = [{"titulo": "Portaria 1", "link": "/web/dou/-/portaria-1"}]
+
+
+class FakeFrame:
+    def __init__(self, links=0, harvest=None, fail=False):
+        self.links = links
+        self.harvest = harvest
+        self.fail = fail
+        self.harvest_opts = None
+        self.page = None
+
+    def evaluate(self, script, arg=None):
+        if script == LIST_COUNT_JS:
+            return self.links
+        if script == HARVEST_LINKS_JS:
+            if self.fail:
+                raise RuntimeError("Execution context was destroyed")
+            self.harvest_opts = arg
+            return self.harvest
+        raise AssertionError("unexpected evaluate")
+
+
+class FakePage:
+    def __init__(self, frames):
+        self.frames = frames
+        for fr in frames:
+            fr.page = self
+
+
+class TestCollectLinks:
+    """Tests for collect_links."""
+
+    def test_harvests_in_frame_with_most_links(self):
+        """Test that one harvest evaluate runs in the richest frame with the given limits."""
+        main, listing = FakeFrame(links=0), FakeFrame(links=7, harvest={"items": ITEMS, "timedOut": False})
+        FakePage([main, listing])
+        timings = ReadyTimings()
+
+        items = collect_links(main, max_links=50, max_scrolls=3, ready_timings=timings)
+
+        assert items == ITEMS
+        assert listing.harvest_opts["maxLinks"] == 50
+        assert listing.harvest_opts["maxScrolls"] == 3
+        assert main.harvest_opts is None
+        assert timings.as_dict()["harvest"]["timeouts"] == 0
+
+    def test_harvest_timeout_is_recorded(self):
+        """Test that a harvest that hit its budget still returns what it collected."""
+        frame = FakeFrame(links=1, harvest={"items": ITEMS, "timedOut": True})
+        FakePage([frame])
+        timings = ReadyTimings()
+
+        assert collect_links(frame, ready_timings=timings) == ITEMS
+        assert timings.as_dict()["harvest"]["timeouts"] == 1
+
+    def test_falls_back_when_evaluate_fails(self, monkeypatch):
+        """Test that a failed harvest evaluate falls back to the Python scroll loop."""
+        from dou_utils.query import helpers
+
+        frame = FakeFrame(fail=True)
+        frame.wait_for_timeout = lambda _ms: None
+        FakePage([frame])
+        calls = []
+        monkeypatch.setattr(helpers, "find_best_frame_and_locator", lambda _page, fr: (None, fr))
+        monkeypatch.setattr(helpers, "try_load_more_button", lambda *_a, **_kw: calls.append("load_more"))
+        monkeypatch.setattr(helpers, "scroll_to_load_links", lambda *_a: calls.append("scroll"))
+        monkeypatch.setattr(helpers, "extract_links_vectorized", lambda _fr, _n: ITEMS)
+
+        assert collect_links(frame) == ITEMS
+        assert calls == ["load_more", "scroll"]
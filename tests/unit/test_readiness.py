@@ -0,0 +1,122 @@
+"""Unit tests for dou_utils.readiness module.
+
+Tests for the DOM readiness waits that replace networkidle: list link count
+stabilisation, load-more growth, detail article waits and per-step timings.
+"""
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.query.helpers import try_load_more_button
+from dou_utils.readiness import (
+    DETAIL_READY_JS,
+    LIST_COUNT_JS,
+    ReadyTimings,
+    wait_for_detail_ready,
+    wait_for_list_stable,
+)
+
+
+class FakeFrame:
+    """Frame whose link count follows a script of readings (last one repeats)."""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.polls = 0
+
+    def evaluate(self, script):
+        assert script == LIST_COUNT_JS
+        self.polls += 1
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+
+    def wait_for_timeout(self, _ms):
+        pass
+
+
+class TestWaitForListStable:
+    """Tests for wait_for_list_stable."""
+
+    def test_returns_once_count_settles(self):
+        """Test that the wait ends after the count repeats, not at the budget."""
+        frame = FakeFrame([0, 5, 12, 12, 12])
+        timings = ReadyTimings()
+
+        assert wait_for_list_stable(frame, budget_ms=5_000, timings=timings, step="view")
+        assert frame.polls == 5
+        view = timings.as_dict()["view"]
+        assert (view["count"], view["timeouts"], view["budget_ms"]) == (1, 0, 5_000)
+
+    def test_empty_list_times_out_within_budget(self):
+        """Test that an empty list is a recorded timeout, not an error."""
+        timings = ReadyTimings()
+        assert not wait_for_list_stable(FakeFrame([0]), budget_ms=30, timings=timings)
+        assert timings.as_dict()["list"]["timeouts"] == 1
+
+    def test_grow_from_requires_more_links(self):
+        """Test that load-more waits ignore a count that never grew."""
+        assert not wait_for_list_stable(FakeFrame([10]), budget_ms=30, grow_from=10)
+        assert wait_for_list_stable(FakeFrame([10, 20]), budget_ms=5_000, grow_from=10)
+
+
+class FakeButton:
+    def __init__(self, frame, clicks):
+        self.frame = frame
+        self.clicks = clicks
+
+    @property
+    def first(self):
+        return self
+
+    def count(self):
+        return 1 if self.clicks else 0
+
+    def is_visible(self):
+        return True
+
+    def click(self):
+        self.clicks -= 1
+        self.frame.counts = [self.frame.counts[0] + 10]
+
+
+class TestTryLoadMoreButton:
+    """Tests for the load-more loop."""
+
+    def test_each_click_waits_for_growth(self):
+        """Test that every click records a load_more wait that saw new links."""
+        frame = FakeFrame([10])
+        button = FakeButton(frame, clicks=2)
+        frame.get_by_role = lambda *_a, **_kw: button
+        timings = ReadyTimings()
+
+        try_load_more_button(frame, None, timings=timings)
+
+        assert frame.counts == [30]
+        assert timings.as_dict()["load_more"]["count"] == 2
+        assert timings.as_dict()["load_more"]["timeouts"] == 0
+
+
+class TestWaitForDetailReady:
+    """Tests for wait_for_detail_ready."""
+
+    def test_waits_on_article_predicate_with_budget(self):
+        """Test that the detail wait uses the article predicate and the given budget."""
+        calls = []
+
+        class Page:
+            def wait_for_function(self, script, timeout=None):
+                calls.append((script, timeout))
+
+        timings = ReadyTimings()
+        assert wait_for_detail_ready(Page(), budget_ms=1_500, timings=timings)
+        assert calls == [(DETAIL_READY_JS, 1_500)]
+        assert timings.as_dict()["detail"]["count"] == 1
+
+    def test_timeout_is_recorded(self):
+        """Test that a predicate timeout is swallowed and counted."""
+        class Page:
+            def wait_for_function(self, _script, timeout=None):
+                raise TimeoutError("Timeout 1500ms exceeded")
+
+        timings = ReadyTimings()
+        assert not wait_for_detail_ready(Page(), budget_ms=1_500, timings=timings)
+        assert timings.as_dict()["detail"]["timeouts"] == 1
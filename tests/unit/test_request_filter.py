@@ -0,0 +1,120 @@
+"""Unit tests for dou_utils.request_filter module.
+
+Tests for the per-context request filter: block decisions, idempotent
+installation (no route stacking across runners) and blocked-request counters.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.request_filter import RequestFilter, install_request_filter, install_request_filter_async
+from dou_utils.services.edition_runner_service import EditionRunnerService
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="document"):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="document"):
+        self.request = FakeRequest(url, resource_type)
+        self.result = None
+
+    def abort(self):
+        self.result = "abort"
+
+    def continue_(self):
+        self.result = "continue"
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+
+class FakeAsyncContext:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+
+class TestRequestFilter:
+    """Tests for RequestFilter decisions and counters."""
+
+    def test_reasons(self):
+        """Test that type, domain and extension (ignoring the query string) are blocked, CSS is not."""
+        rf = RequestFilter(resource_types=("image",), extensions=(".woff2",), domains=("googletagmanager.com",))
+
+        assert rf.reason("image", "https://www.in.gov.br/logo") == "type"
+        assert rf.reason("script", "https://www.googletagmanager.com/gtm.js") == "domain"
+        assert rf.reason("other", "https://www.in.gov.br/f.woff2?v=3") == "extension"
+        assert rf.reason("stylesheet", "https://www.in.gov.br/main.css") is None
+        assert rf.reason("document", "https://www.in.gov.br/web/dou/-/portaria") is None
+
+    def test_env_lists(self, monkeypatch):
+        """Test that DOU_BLOCK_* override the defaults and an empty value disables the criterion."""
+        monkeypatch.setenv("DOU_BLOCK_RESOURCE_TYPES", "media")
+        monkeypatch.setenv("DOU_BLOCK_DOMAINS", "")
+        rf = RequestFilter()
+
+        assert rf.resource_types == {"media"}
+        assert rf.domains == ()
+        assert rf.reason("image", "https://www.google-analytics.com/collect") is None
+
+    def test_counts_blocked_requests(self):
+        """Test that the handler aborts/continues and counts blocked requests and estimated bytes."""
+        rf = RequestFilter()
+        img, doc = FakeRoute("https://x/a.png", "image"), FakeRoute("https://x/page")
+        rf.handle(img)
+        rf.handle(doc)
+
+        assert (img.result, doc.result) == ("abort", "continue")
+        stats = rf.as_dict()
+        assert stats["blocked"] == 1
+        assert stats["allowed"] == 1
+        assert stats["blocked_bytes_est"] > 0
+        assert stats["by_reason"]["type"] == 1
+
+
+class TestInstall:
+    """Tests for install_request_filter / install_request_filter_async."""
+
+    def test_one_route_per_context(self):
+        """Test that repeated installs (one runner per job) register a single route."""
+        ctx = FakeContext()
+        first = install_request_filter(ctx)
+        runners = [EditionRunnerService(ctx) for _ in range(5)]
+
+        assert len(ctx.routes) == 1
+        assert all(r.request_filter is first for r in runners)
+
+    def test_failed_route_is_retried(self):
+        """Test that a failing context.route is not memoized as installed."""
+        class Broken(FakeContext):
+            def route(self, pattern, handler):
+                raise RuntimeError("closed")
+
+        ctx = Broken()
+        assert install_request_filter(ctx) is None
+        assert install_request_filter(ctx) is None
+
+    def test_async_install_once(self):
+        """Test that concurrent async installs on one context register a single route."""
+        ctx = FakeAsyncContext()
+
+        async def _main():
+            return await asyncio.gather(*(install_request_filter_async(ctx) for _ in range(4)))
+
+        filters = asyncio.run(_main())
+
+        assert len(ctx.routes) == 1
+        assert len({id(f) for f in filters}) == 1
@@ -0,0 +1,98 @@
+"""Unit tests for dou_utils.shared_browser module.
+
+Tests for the lazily started browser thread: page leasing from several caller
+threads, memoized start failures and restart after close.
+"""
+import threading
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dou_utils.page_pool import AsyncPagePool
+from dou_utils.shared_browser import SharedBrowser
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.urls = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, **_kw):
+        self.urls.append(url)
+
+    async def close(self):
+        self.closed = True
+
+
+def _fake_start(starts):
+    async def _start(self):
+        starts.append(threading.current_thread().name)
+
+        async def _new_page():
+            return FakePage()
+
+        self.pool = AsyncPagePool(_new_page, self.pool_size)
+
+    return _start
+
+
+class TestSharedBrowser:
+    """Tests for SharedBrowser."""
+
+    def test_one_start_and_bounded_pages_across_threads(self, monkeypatch):
+        """Test that calls from many threads start one browser and lease at most pool_size pages."""
+        starts = []
+        monkeypatch.setattr(SharedBrowser, "_start", _fake_start(starts))
+        browser = SharedBrowser(pool_size=2, name="test-browser")
+        seen = set()
+
+        async def _visit(page):
+            seen.add(id(page))
+            return threading.current_thread().name
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(browser.run(_visit, 5))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        browser.close()
+
+        assert starts == ["test-browser"]
+        assert results == ["test-browser"] * 8
+        assert len(seen) <= 2
+
+    def test_start_failure_is_memoized(self, monkeypatch):
+        """Test that a browser that cannot start fails fast on later calls."""
+        calls = []
+
+        async def _broken(self):
+            calls.append(1)
+            raise OSError("no chromium")
+
+        monkeypatch.setattr(SharedBrowser, "_start", _broken)
+        browser = SharedBrowser()
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                browser.run(lambda _p: None, 5)
+        assert calls == [1]
+
+    def test_restarts_after_close(self, monkeypatch):
+        """Test that run() after close() starts a new browser thread."""
+        starts = []
+        monkeypatch.setattr(SharedBrowser, "_start", _fake_start(starts))
+        browser = SharedBrowser(pool_size=1)
+
+        async def _ok(_page):
+            return "ok"
+
+        assert browser.run(_ok, 5) == "ok"
+        browser.close()
+        assert browser.run(_ok, 5) == "ok"
+        browser.close()
+        assert len(starts) == 2
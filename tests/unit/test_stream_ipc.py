@@ -0,0 +1,118 @@
+"""Unit tests for dou_snaptrack.utils.stream_ipc module.
+
+Tests for the length-prefixed NDJSON protocol between batch parents and
+collector subprocesses.
+"""
+import io
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from dou_snaptrack.utils.stream_ipc import ChildChannel, ProtocolError, StreamingChild, read_frame, write_frame
+
+SRC_DIR = str(Path(__file__).resolve().parents[2] / "src")
+
+
+def _frames(*msgs):
+    buf = io.BytesIO()
+    for msg in msgs:
+        write_frame(buf, msg)
+    buf.seek(0)
+    return buf
+
+
+class TestFrames:
+    """Tests for frame encoding."""
+
+    def test_roundtrip_with_newlines_and_unicode(self):
+        """Test that payloads containing newlines and accents survive framing."""
+        buf = _frames({"type": "job", "text": "linha 1\nlinha 2 — ção"}, {"type": "done"})
+
+        assert read_frame(buf) == {"type": "job", "text": "linha 1\nlinha 2 — ção"}
+        assert read_frame(buf) == {"type": "done"}
+        assert read_frame(buf) is None
+
+    def test_invalid_header_raises(self):
+        """Test that stray output on the channel is reported as a protocol error."""
+        with pytest.raises(ProtocolError):
+            read_frame(io.BytesIO(b"Traceback (most recent call last):\n"))
+
+    def test_truncated_frame_raises(self):
+        """Test that a frame cut short by a dying process is detected."""
+        with pytest.raises(ProtocolError):
+            read_frame(io.BytesIO(b'40\n{"type": "job"'))
+
+
+class TestChildChannel:
+    """Tests for the child side of the channel."""
+
+    def test_listen_dispatches_and_flags_cancel(self):
+        """Test that the listener forwards messages and sets the cancelled flag."""
+        out = io.BytesIO()
+        channel = ChildChannel(stdin=_frames({"type": "jobs", "jobs": [1]}, {"type": "cancel"}), stdout=out)
+        seen = []
+        channel.listen(seen.append)
+        channel._listener.join(timeout=5)
+
+        assert [m["type"] for m in seen] == ["jobs", "cancel", "cancel"]
+        assert seen[-1]["reason"] == "eof"
+        assert channel.cancelled.is_set()
+
+    def test_close_stops_listener_without_cancel(self):
+        """Test that a clean close is not treated as cancellation."""
+        channel = ChildChannel(stdin=_frames({"type": "close"}), stdout=io.BytesIO())
+        channel.listen()
+        channel._listener.join(timeout=5)
+
+        assert not channel.cancelled.is_set()
+
+    def test_send_writes_frames(self):
+        """Test that send writes one frame per event."""
+        out = io.BytesIO()
+        channel = ChildChannel(stdin=io.BytesIO(), stdout=out)
+        channel.send("job", job_index=3)
+        out.seek(0)
+
+        assert read_frame(out) == {"type": "job", "job_index": 3}
+
+
+class TestStreamingChild:
+    """Tests for the parent side against a real subprocess."""
+
+    CHILD = textwrap.dedent(
+        """
+        from dou_snaptrack.utils.stream_ipc import ChildChannel
+        chan = ChildChannel()
+        print("noise from a library")
+        run = chan.receive()
+        for i in run["jobs"]:
+            chan.send("job", job_index=i)
+        chan.send("done", result={"ok": len(run["jobs"])})
+        """
+    )
+
+    def test_events_arrive_in_order_and_stdout_noise_goes_to_stderr(self):
+        """Test that print() in the child does not corrupt the frame stream."""
+        env = {**os.environ, "PYTHONPATH": SRC_DIR}
+        child = StreamingChild([sys.executable, "-c", self.CHILD], env=env)
+        child.send("run", jobs=[1, 2])
+        child.close_input()
+
+        msgs = list(child.messages(idle_timeout=30))
+
+        assert [m["type"] for m in msgs] == ["job", "job", "done", "exit"]
+        assert msgs[2]["result"] == {"ok": 2}
+        assert msgs[-1]["returncode"] == 0
+        assert "noise from a library" in child.stderr_tail
+
+    def test_idle_child_times_out(self):
+        """Test that a silent child raises TimeoutError instead of blocking."""
+        child = StreamingChild([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            with pytest.raises(TimeoutError):
+                next(child.messages(idle_timeout=0.2))
+        finally:
+            assert child.finish(grace_sec=0.1) is None
@@ -557,3 +557,49 @@ class TestWaitHelpersPerformance:
             assert result is True
         
         assert mock_page.wait_for_function.call_count == 100
+
+
+class TestListingReadiness:
+    """Tests for event-driven listing readiness (arm + stable wait)."""
+
+    def test_listing_stable_resolves_without_fixed_sleep(self):
+        """Test that a settled listing returns True and never sleeps for the cap."""
+        import asyncio
+
+        from dou_snaptrack.utils.wait_helpers import (
+            LISTING_STABLE_JS,
+            wait_for_listing_stable_async,
+        )
+
+        mock_page = AsyncMock()
+        mock_page.wait_for_function = AsyncMock(return_value=True)
+
+        assert asyncio.run(wait_for_listing_stable_async(mock_page, max_wait_ms=2000, quiet_ms=300)) is True
+        mock_page.wait_for_timeout.assert_not_called()
+        args, kwargs = mock_page.wait_for_function.call_args
+        assert args[0] == LISTING_STABLE_JS
+        assert kwargs["arg"] == 300
+        assert kwargs["timeout"] == 2000
+
+    def test_listing_stable_cap_returns_false(self):
+        """Test that hitting the cap returns False instead of raising."""
+        import asyncio
+
+        from dou_snaptrack.utils.wait_helpers import wait_for_listing_stable_async
+
+        mock_page = AsyncMock()
+        mock_page.wait_for_function = AsyncMock(side_effect=Exception("Timeout"))
+
+        assert asyncio.run(wait_for_listing_stable_async(mock_page, max_wait_ms=10)) is False
+
+    def test_arm_listing_watch_passes_root_selector(self):
+        """Test that arming evaluates the observer script with the container selector."""
+        import asyncio
+
+        from dou_snaptrack.utils.wait_helpers import LISTING_WATCH_ARM_JS, arm_listing_watch_async
+
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(return_value=True)
+
+        assert asyncio.run(arm_listing_watch_async(mock_page, "#lista")) is True
+        mock_page.evaluate.assert_called_once_with(LISTING_WATCH_ARM_JS, "#lista")